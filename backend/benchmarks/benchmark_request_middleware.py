@@ -0,0 +1,217 @@
+"""
+Benchmark the per-request and per-chunk overhead of RequestMiddleware
+against the BaseHTTPMiddleware stack it replaced.
+
+Run from the backend directory:
+
+    python -m benchmarks.benchmark_request_middleware
+
+The apps are called directly through ASGI so that only middleware overhead
+is measured, without a server or network stack.
+"""
+
+import argparse
+import asyncio
+import time
+from types import SimpleNamespace
+from urllib.parse import parse_qs, urlencode, urlparse
+
+from starlette.applications import Starlette
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.responses import JSONResponse, RedirectResponse, StreamingResponse
+from starlette.routing import Route
+
+from open_webui.internal.db import ScopedSession
+from open_webui.main import RequestMiddleware
+from open_webui.utils.auth import get_http_authorization_cred
+from open_webui.utils.security_headers import set_security_headers
+
+CHUNK = b'data: {"choices":[{"delta":{"content":"token"}}]}\n\n'
+
+
+####################
+# Previous middleware stack
+####################
+
+
+class SecurityHeadersMiddleware(BaseHTTPMiddleware):
+    async def dispatch(self, request, call_next):
+        response = await call_next(request)
+        response.headers.update(set_security_headers())
+        return response
+
+
+class RedirectMiddleware(BaseHTTPMiddleware):
+    async def dispatch(self, request, call_next):
+        if request.method == "GET":
+            path = request.url.path
+            query_params = dict(parse_qs(urlparse(str(request.url)).query))
+
+            redirect_params = {}
+            if path.endswith("/watch") and "v" in query_params:
+                redirect_params["youtube"] = query_params["v"][0]
+            if redirect_params:
+                return RedirectResponse(url=f"/?{urlencode(redirect_params)}")
+
+        return await call_next(request)
+
+
+class APIKeyRestrictionMiddleware(BaseHTTPMiddleware):
+    async def dispatch(self, request, call_next):
+        auth_header = request.headers.get("Authorization")
+        token = None
+        if auth_header:
+            _, token = auth_header.split(" ")
+
+        if (
+            token
+            and token.startswith("sk-")
+            and request.app.state.config.ENABLE_API_KEYS_ENDPOINT_RESTRICTIONS
+        ):
+            pass
+
+        return await call_next(request)
+
+
+def add_previous_middleware(app):
+    app.add_middleware(RedirectMiddleware)
+    app.add_middleware(SecurityHeadersMiddleware)
+    app.add_middleware(APIKeyRestrictionMiddleware)
+
+    @app.middleware("http")
+    async def commit_session_after_request(request, call_next):
+        response = await call_next(request)
+        ScopedSession.commit()
+        return response
+
+    @app.middleware("http")
+    async def check_url(request, call_next):
+        start_time = int(time.time())
+        request.state.token = get_http_authorization_cred(
+            request.headers.get("Authorization")
+        )
+        request.state.enable_api_keys = app.state.config.ENABLE_API_KEYS
+        response = await call_next(request)
+        response.headers["X-Process-Time"] = str(int(time.time()) - start_time)
+        return response
+
+    @app.middleware("http")
+    async def inspect_websocket(request, call_next):
+        if (
+            "/ws/socket.io" in request.url.path
+            and request.query_params.get("transport") == "websocket"
+        ):
+            pass
+        return await call_next(request)
+
+
+####################
+# Benchmark
+####################
+
+
+def create_app(middleware: str, chunks: int) -> Starlette:
+    async def json_endpoint(request):
+        return JSONResponse({"status": True})
+
+    async def stream_endpoint(request):
+        async def generator():
+            for _ in range(chunks):
+                yield CHUNK
+
+        return StreamingResponse(generator(), media_type="text/event-stream")
+
+    app = Starlette(
+        routes=[Route("/json", json_endpoint), Route("/stream", stream_endpoint)]
+    )
+    app.state.config = SimpleNamespace(
+        ENABLE_API_KEYS=False,
+        ENABLE_API_KEYS_ENDPOINT_RESTRICTIONS=False,
+        API_KEYS_ALLOWED_ENDPOINTS="",
+    )
+
+    if middleware == "previous":
+        add_previous_middleware(app)
+    elif middleware == "request":
+        app.add_middleware(RequestMiddleware)
+    return app
+
+
+async def call(app, path: str) -> int:
+    """Send a GET request through the app, returning the number of body messages."""
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "root_path": "",
+        "query_string": b"",
+        "headers": [(b"host", b"localhost"), (b"authorization", b"Bearer token")],
+        "client": ("127.0.0.1", 12345),
+        "server": ("localhost", 80),
+    }
+
+    request_sent = False
+
+    async def receive():
+        nonlocal request_sent
+        if not request_sent:
+            request_sent = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        # Wait for a disconnect that never comes
+        await asyncio.Event().wait()
+
+    body_messages = 0
+
+    async def send(message):
+        nonlocal body_messages
+        if message["type"] == "http.response.body":
+            body_messages += 1
+
+    await app(scope, receive, send)
+    return body_messages
+
+
+async def benchmark(middleware: str, requests: int, chunks: int) -> tuple[float, float]:
+    app = create_app(middleware, chunks)
+
+    # Warm up
+    for _ in range(min(requests, 200)):
+        await call(app, "/json")
+    await call(app, "/stream")
+
+    start = time.perf_counter()
+    for _ in range(requests):
+        await call(app, "/json")
+    per_request = (time.perf_counter() - start) / requests
+
+    start = time.perf_counter()
+    body_messages = await call(app, "/stream")
+    per_chunk = (time.perf_counter() - start) / body_messages
+
+    return per_request, per_chunk
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--chunks", type=int, default=20000)
+    args = parser.parse_args()
+
+    for middleware, label in [
+        ("none", "no middleware"),
+        ("previous", "BaseHTTPMiddleware stack"),
+        ("request", "RequestMiddleware"),
+    ]:
+        per_request, per_chunk = await benchmark(middleware, args.requests, args.chunks)
+        print(
+            f"{label:<26}{per_request * 1e6:8.1f} us/request"
+            f"{per_chunk * 1e6:8.2f} us/chunk"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -30,12 +30,7 @@ def main(
     pass
 
 
-@app.command()
-def serve(
-    host: str = "0.0.0.0",
-    port: int = 8080,
-):
-    os.environ["FROM_INIT_PY"] = "true"
+def load_secret_key():
     if os.getenv("WEBUI_SECRET_KEY") is None:
         typer.echo(
             "Loading WEBUI_SECRET_KEY from file, not provided as an environment variable."
@@ -47,6 +42,14 @@ def serve(
         os.environ["WEBUI_SECRET_KEY"] = KEY_FILE.read_text()
 
 
+@app.command()
+def serve(
+    host: str = "0.0.0.0",
+    port: int = 8080,
+):
+    os.environ["FROM_INIT_PY"] = "true"
+    load_secret_key()
+
     import open_webui.main  # we need set environment variables before importing main
     from open_webui.env import UVICORN_WORKERS  # Import the workers setting
 
@@ -59,6 +62,20 @@ def serve(
     )
 
 
+@app.command()
+def worker():
+    """Run a document ingestion worker without serving HTTP requests."""
+    import asyncio
+
+    os.environ["FROM_INIT_PY"] = "true"
+    load_secret_key()
+
+    from open_webui.main import app as webui_app
+    from open_webui.utils.ingestion import run_ingestion_worker
+
+    asyncio.run(run_ingestion_worker(webui_app))
+
+
 @app.command()
 def dev(
     host: str = "0.0.0.0",
@@ -3,6 +3,7 @@ import logging
 import os
 import shutil
 import base64
+import time
 import redis
 
 from datetime import datetime
@@ -23,6 +24,7 @@ from open_webui.env import (
     ENV,
     REDIS_URL,
     REDIS_KEY_PREFIX,
+    REDIS_CONFIG_SYNC_INTERVAL,
     REDIS_SENTINEL_HOSTS,
     REDIS_SENTINEL_PORT,
     FRONTEND_BUILD_DIR,
@@ -224,10 +226,22 @@ class PersistentConfig(Generic[T]):
 
 
 class AppConfig:
+    """
+    Application config backed by PersistentConfig entries.
+
+    Reads are served from the local in-process state. When Redis is
+    configured, every write bumps a shared version key; other nodes check
+    that key at most once every REDIS_CONFIG_SYNC_INTERVAL ms and reload all
+    values in a single pipelined round-trip when it has changed.
+    """
+
     _redis: Union[redis.Redis, redis.cluster.RedisCluster] = None
     _redis_key_prefix: str
 
     _state: dict[str, PersistentConfig]
+    _version: Optional[str] = None
+    _synced: bool = False
+    _version_checked_at: float = 0.0
 
     def __init__(
         self,
@@ -253,6 +267,8 @@ class AppConfig:
     def __setattr__(self, key, value):
         if isinstance(value, PersistentConfig):
             self._state[key] = value
+            # Pick up any Redis value for the newly registered key on the next read
+            super().__setattr__("_synced", False)
         else:
             self._state[key].value = value
             self._state[key].save()
@@ -261,28 +277,56 @@ class AppConfig:
                 redis_key = f"{self._redis_key_prefix}:config:{key}"
                 self._redis.set(redis_key, json.dumps(self._state[key].value))
 
+                self._redis.incr(self._get_version_key())
+
     def __getattr__(self, key):
         if key not in self._state:
             raise AttributeError(f"Config key '{key}' not found")
 
-        # If Redis is available and persistent config is enabled, check for an updated value
+        # If Redis is available and persistent config is enabled, check for updated values
         if self._redis and ENABLE_PERSISTENT_CONFIG:
-            redis_key = f"{self._redis_key_prefix}:config:{key}"
-            redis_value = self._redis.get(redis_key)
+            now = time.monotonic()
+            if (now - self._version_checked_at) * 1000 >= REDIS_CONFIG_SYNC_INTERVAL:
+                super().__setattr__("_version_checked_at", now)
+                self._sync_from_redis()
 
-            if redis_value is not None:
-                try:
-                    decoded_value = json.loads(redis_value)
+        return self._state[key].value
+
+    def _get_version_key(self) -> str:
+        return f"{self._redis_key_prefix}:config:_version"
+
+    def _sync_from_redis(self):
+        try:
+            version = self._redis.get(self._get_version_key())
+            if self._synced and version == self._version:
+                return
+
+            keys = list(self._state.keys())
+            pipe = self._redis.pipeline()
+            for key in keys:
+                pipe.get(f"{self._redis_key_prefix}:config:{key}")
+            redis_values = pipe.execute()
+        except Exception as e:
+            log.error(f"Failed to sync config from Redis: {e}")
+            return
 
-                    # Update the in-memory value if different
-                    if self._state[key].value != decoded_value:
-                        self._state[key].value = decoded_value
-                        log.info(f"Updated {key} from Redis: {decoded_value}")
+        for key, redis_value in zip(keys, redis_values):
+            if redis_value is None:
+                continue
 
-                except json.JSONDecodeError:
-                    log.error(f"Invalid JSON format in Redis for {key}: {redis_value}")
+            try:
+                decoded_value = json.loads(redis_value)
 
-        return self._state[key].value
+                # Update the in-memory value if different
+                if self._state[key].value != decoded_value:
+                    self._state[key].value = decoded_value
+                    log.info(f"Updated {key} from Redis: {decoded_value}")
+
+            except json.JSONDecodeError:
+                log.error(f"Invalid JSON format in Redis for {key}: {redis_value}")
+
+        super().__setattr__("_version", version)
+        super().__setattr__("_synced", True)
 
 
 ####################################
@@ -2322,6 +2366,12 @@ Ensure that the tools are effectively utilized to achieve the highest-quality an
 
 VECTOR_DB = os.environ.get("VECTOR_DB", "chroma")
 
+# Threads shared by async callers of vector DBs without a native async client
+try:
+    VECTOR_DB_THREAD_POOL_SIZE = int(os.environ.get("VECTOR_DB_THREAD_POOL_SIZE", "16"))
+except ValueError:
+    VECTOR_DB_THREAD_POOL_SIZE = 16
+
 # Chroma
 CHROMA_DATA_PATH = f"{DATA_DIR}/vector_db"
 
@@ -2595,6 +2645,24 @@ log.info(f"VECTOR_DB: {VECTOR_DB}")
 S3_VECTOR_BUCKET_NAME = os.environ.get("S3_VECTOR_BUCKET_NAME", None)
 S3_VECTOR_REGION = os.environ.get("S3_VECTOR_REGION", None)
 
+# NumPy (embedded vectors in memory-mapped .npy shards, metadata in SQLite)
+NUMPY_VECTOR_DB_PATH = os.environ.get(
+    "NUMPY_VECTOR_DB_PATH", f"{DATA_DIR}/vector_db/numpy"
+)
+
+# float32 keeps vectors exact enough for search, float16 halves the size
+NUMPY_VECTOR_DB_DTYPE = os.environ.get("NUMPY_VECTOR_DB_DTYPE", "float32")
+if NUMPY_VECTOR_DB_DTYPE not in ("float32", "float16"):
+    NUMPY_VECTOR_DB_DTYPE = "float32"
+
+# Rows per shard file once a collection has grown past its first few shards
+try:
+    NUMPY_VECTOR_DB_SHARD_SIZE = int(
+        os.environ.get("NUMPY_VECTOR_DB_SHARD_SIZE", "65536")
+    )
+except ValueError:
+    NUMPY_VECTOR_DB_SHARD_SIZE = 65536
+
 ####################################
 # Information Retrieval (RAG)
 ####################################
@@ -2874,6 +2942,15 @@ ENABLE_RAG_HYBRID_SEARCH_ENRICHED_TEXTS = PersistentConfig(
     == "true",
 )
 
+# Keep a persistent BM25 index per collection for hybrid search instead of
+# rebuilding it from the full collection on every query
+ENABLE_RAG_BM25_INDEX = (
+    os.environ.get("ENABLE_RAG_BM25_INDEX", "True").lower() == "true"
+)
+RAG_BM25_INDEX_PATH = os.environ.get(
+    "RAG_BM25_INDEX_PATH", str(CACHE_DIR / "bm25" / "index.db")
+)
+
 RAG_FULL_CONTEXT = PersistentConfig(
     "RAG_FULL_CONTEXT",
     "rag.full_context",
@@ -2980,6 +3057,73 @@ ENABLE_ASYNC_EMBEDDING = PersistentConfig(
     os.environ.get("ENABLE_ASYNC_EMBEDDING", "True").lower() == "true",
 )
 
+# Limits shared by every call to a remote embedding engine (ollama, openai,
+# azure_openai): requests in flight, estimated tokens per batch, retries on
+# 429/5xx, and how long small query calls wait to be coalesced (seconds)
+try:
+    RAG_EMBEDDING_CONCURRENCY = int(os.environ.get("RAG_EMBEDDING_CONCURRENCY", "8"))
+except ValueError:
+    RAG_EMBEDDING_CONCURRENCY = 8
+
+try:
+    RAG_EMBEDDING_MAX_BATCH_TOKENS = int(
+        os.environ.get("RAG_EMBEDDING_MAX_BATCH_TOKENS", "100000")
+    )
+except ValueError:
+    RAG_EMBEDDING_MAX_BATCH_TOKENS = 100000
+
+try:
+    RAG_EMBEDDING_MAX_RETRIES = int(os.environ.get("RAG_EMBEDDING_MAX_RETRIES", "5"))
+except ValueError:
+    RAG_EMBEDDING_MAX_RETRIES = 5
+
+try:
+    RAG_EMBEDDING_QUERY_COALESCE_WINDOW = float(
+        os.environ.get("RAG_EMBEDDING_QUERY_COALESCE_WINDOW", "0.01")
+    )
+except ValueError:
+    RAG_EMBEDDING_QUERY_COALESCE_WINDOW = 0.01
+
+# Knowledge base reindex jobs: files indexed in parallel per job, and seconds
+# without a heartbeat after which another worker resumes a job
+try:
+    RAG_REINDEX_CONCURRENCY = int(os.environ.get("RAG_REINDEX_CONCURRENCY", "4"))
+except ValueError:
+    RAG_REINDEX_CONCURRENCY = 4
+
+try:
+    RAG_REINDEX_LEASE_TIMEOUT = int(os.environ.get("RAG_REINDEX_LEASE_TIMEOUT", "60"))
+except ValueError:
+    RAG_REINDEX_LEASE_TIMEOUT = 60
+
+# Document ingestion queue. Set ENABLE_INGESTION_WORKER=False on instances
+# that should only serve requests and run `open-webui worker` elsewhere.
+ENABLE_INGESTION_WORKER = (
+    os.environ.get("ENABLE_INGESTION_WORKER", "True").lower() == "true"
+)
+
+try:
+    INGESTION_WORKER_CONCURRENCY = int(
+        os.environ.get("INGESTION_WORKER_CONCURRENCY", "2")
+    )
+except ValueError:
+    INGESTION_WORKER_CONCURRENCY = 2
+
+try:
+    INGESTION_MAX_ATTEMPTS = int(os.environ.get("INGESTION_MAX_ATTEMPTS", "3"))
+except ValueError:
+    INGESTION_MAX_ATTEMPTS = 3
+
+try:
+    INGESTION_LEASE_TIMEOUT = int(os.environ.get("INGESTION_LEASE_TIMEOUT", "120"))
+except ValueError:
+    INGESTION_LEASE_TIMEOUT = 120
+
+try:
+    INGESTION_POLL_INTERVAL = float(os.environ.get("INGESTION_POLL_INTERVAL", "2"))
+except ValueError:
+    INGESTION_POLL_INTERVAL = 2.0
+
 RAG_EMBEDDING_QUERY_PREFIX = os.environ.get("RAG_EMBEDDING_QUERY_PREFIX", None)
 
 RAG_EMBEDDING_CONTENT_PREFIX = os.environ.get("RAG_EMBEDDING_CONTENT_PREFIX", None)
@@ -2988,6 +3132,26 @@ RAG_EMBEDDING_PREFIX_FIELD_NAME = os.environ.get(
     "RAG_EMBEDDING_PREFIX_FIELD_NAME", None
 )
 
+# Content-addressed cache of computed embeddings, shared by ingestion and queries
+ENABLE_RAG_EMBEDDING_CACHE = (
+    os.environ.get("ENABLE_RAG_EMBEDDING_CACHE", "True").lower() == "true"
+)
+RAG_EMBEDDING_CACHE_PATH = os.environ.get(
+    "RAG_EMBEDDING_CACHE_PATH", str(CACHE_DIR / "embeddings" / "cache.db")
+)
+
+try:
+    RAG_EMBEDDING_CACHE_MAX_ENTRIES = int(
+        os.environ.get("RAG_EMBEDDING_CACHE_MAX_ENTRIES", "1000000")
+    )
+except ValueError:
+    RAG_EMBEDDING_CACHE_MAX_ENTRIES = 1000000
+
+# float32 keeps embeddings exact enough for search, float16 halves the size
+RAG_EMBEDDING_CACHE_DTYPE = os.environ.get("RAG_EMBEDDING_CACHE_DTYPE", "float32")
+if RAG_EMBEDDING_CACHE_DTYPE not in ("float32", "float16"):
+    RAG_EMBEDDING_CACHE_DTYPE = "float32"
+
 RAG_RERANKING_ENGINE = PersistentConfig(
     "RAG_RERANKING_ENGINE",
     "rag.reranking_engine",
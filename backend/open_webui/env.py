@@ -326,6 +326,25 @@ if DATABASE_USER_ACTIVE_STATUS_UPDATE_INTERVAL is not None:
     except Exception:
         DATABASE_USER_ACTIVE_STATUS_UPDATE_INTERVAL = 0.0
 
+# Seconds between batched writes of users' last_active_at timestamps
+DATABASE_USER_ACTIVE_STATUS_FLUSH_INTERVAL = os.environ.get(
+    "DATABASE_USER_ACTIVE_STATUS_FLUSH_INTERVAL", "60"
+)
+try:
+    DATABASE_USER_ACTIVE_STATUS_FLUSH_INTERVAL = max(
+        float(DATABASE_USER_ACTIVE_STATUS_FLUSH_INTERVAL), 1.0
+    )
+except ValueError:
+    DATABASE_USER_ACTIVE_STATUS_FLUSH_INTERVAL = 60.0
+
+# Seconds an authenticated user (looked up by id or API key) is cached per worker.
+# Set to 0 to disable the cache.
+AUTH_USER_CACHE_TTL = os.environ.get("AUTH_USER_CACHE_TTL", "30")
+try:
+    AUTH_USER_CACHE_TTL = max(float(AUTH_USER_CACHE_TTL), 0)
+except ValueError:
+    AUTH_USER_CACHE_TTL = 30
+
 # When enabled, get_db_context reuses existing sessions; set to False to always create new sessions
 DATABASE_ENABLE_SESSION_SHARING = (
     os.environ.get("DATABASE_ENABLE_SESSION_SHARING", "False").lower() == "true"
@@ -434,6 +453,30 @@ try:
 except ValueError:
     REDIS_SOCKET_CONNECT_TIMEOUT = None
 
+# How often (in milliseconds) a node checks Redis for config changes made by other nodes.
+# Between checks config reads are served from the local in-process copy.
+REDIS_CONFIG_SYNC_INTERVAL = os.environ.get("REDIS_CONFIG_SYNC_INTERVAL", "1000")
+try:
+    REDIS_CONFIG_SYNC_INTERVAL = max(int(REDIS_CONFIG_SYNC_INTERVAL), 0)
+except ValueError:
+    REDIS_CONFIG_SYNC_INTERVAL = 1000
+
+# Seconds a user's group memberships and resolved permissions are cached per worker.
+# Set to 0 to disable the cache.
+GROUP_MEMBERSHIP_CACHE_TTL = os.environ.get("GROUP_MEMBERSHIP_CACHE_TTL", "60")
+try:
+    GROUP_MEMBERSHIP_CACHE_TTL = max(float(GROUP_MEMBERSHIP_CACHE_TTL), 0)
+except ValueError:
+    GROUP_MEMBERSHIP_CACHE_TTL = 60
+
+# Seconds function valves are cached per worker for filter pipelines.
+# Set to 0 to disable the cache.
+FUNCTION_VALVES_CACHE_TTL = os.environ.get("FUNCTION_VALVES_CACHE_TTL", "60")
+try:
+    FUNCTION_VALVES_CACHE_TTL = max(float(FUNCTION_VALVES_CACHE_TTL), 0)
+except ValueError:
+    FUNCTION_VALVES_CACHE_TTL = 60
+
 ####################################
 # UVICORN WORKERS
 ####################################
@@ -742,6 +785,40 @@ try:
 except ValueError:
     WEBSOCKET_SERVER_PING_INTERVAL = 25
 
+# Interval (seconds) at which buffered chat message events are written to the database.
+# Set to 0 to write every event through immediately.
+WEBSOCKET_EVENT_FLUSH_INTERVAL = os.environ.get("WEBSOCKET_EVENT_FLUSH_INTERVAL", "1")
+try:
+    WEBSOCKET_EVENT_FLUSH_INTERVAL = float(WEBSOCKET_EVENT_FLUSH_INTERVAL)
+except ValueError:
+    WEBSOCKET_EVENT_FLUSH_INTERVAL = 1.0
+
+# Buffered characters per message that trigger an early flush
+WEBSOCKET_EVENT_FLUSH_MAX_SIZE = os.environ.get(
+    "WEBSOCKET_EVENT_FLUSH_MAX_SIZE", "16384"
+)
+try:
+    WEBSOCKET_EVENT_FLUSH_MAX_SIZE = int(WEBSOCKET_EVENT_FLUSH_MAX_SIZE)
+except ValueError:
+    WEBSOCKET_EVENT_FLUSH_MAX_SIZE = 16384
+
+# Number of Yjs updates kept per collaborative document before they are merged
+# into a single snapshot update.
+WEBSOCKET_YDOC_COMPACTION_THRESHOLD = os.environ.get(
+    "WEBSOCKET_YDOC_COMPACTION_THRESHOLD", "500"
+)
+try:
+    WEBSOCKET_YDOC_COMPACTION_THRESHOLD = int(WEBSOCKET_YDOC_COMPACTION_THRESHOLD)
+except ValueError:
+    WEBSOCKET_YDOC_COMPACTION_THRESHOLD = 500
+
+# Number of collaborative documents kept in memory per node
+WEBSOCKET_YDOC_CACHE_SIZE = os.environ.get("WEBSOCKET_YDOC_CACHE_SIZE", "128")
+try:
+    WEBSOCKET_YDOC_CACHE_SIZE = int(WEBSOCKET_YDOC_CACHE_SIZE)
+except ValueError:
+    WEBSOCKET_YDOC_CACHE_SIZE = 128
+
 
 REQUESTS_VERIFY = os.environ.get("REQUESTS_VERIFY", "True").lower() == "true"
 
@@ -806,8 +883,39 @@ AIOHTTP_CLIENT_SESSION_TOOL_SERVER_SSL = (
     os.environ.get("AIOHTTP_CLIENT_SESSION_TOOL_SERVER_SSL", "True").lower() == "true"
 )
 
+# Shared connection pools used for upstream providers, embeddings and tool servers.
+# AIOHTTP_CLIENT_POOL_LIMIT caps the concurrent connections per upstream origin,
+# 0 (default) means no limit, matching the previous per-request sessions.
+AIOHTTP_CLIENT_POOL_LIMIT = os.environ.get("AIOHTTP_CLIENT_POOL_LIMIT", "0")
+try:
+    AIOHTTP_CLIENT_POOL_LIMIT = int(AIOHTTP_CLIENT_POOL_LIMIT)
+except ValueError:
+    AIOHTTP_CLIENT_POOL_LIMIT = 0
 
+# 0 means no per-host limit beyond AIOHTTP_CLIENT_POOL_LIMIT
+AIOHTTP_CLIENT_POOL_LIMIT_PER_HOST = os.environ.get(
+    "AIOHTTP_CLIENT_POOL_LIMIT_PER_HOST", "0"
+)
+try:
+    AIOHTTP_CLIENT_POOL_LIMIT_PER_HOST = int(AIOHTTP_CLIENT_POOL_LIMIT_PER_HOST)
+except ValueError:
+    AIOHTTP_CLIENT_POOL_LIMIT_PER_HOST = 0
+
+AIOHTTP_CLIENT_POOL_KEEPALIVE_TIMEOUT = os.environ.get(
+    "AIOHTTP_CLIENT_POOL_KEEPALIVE_TIMEOUT", "30"
+)
+try:
+    AIOHTTP_CLIENT_POOL_KEEPALIVE_TIMEOUT = float(AIOHTTP_CLIENT_POOL_KEEPALIVE_TIMEOUT)
+except ValueError:
+    AIOHTTP_CLIENT_POOL_KEEPALIVE_TIMEOUT = 30.0
 
+AIOHTTP_CLIENT_POOL_DNS_CACHE_TTL = os.environ.get(
+    "AIOHTTP_CLIENT_POOL_DNS_CACHE_TTL", "300"
+)
+try:
+    AIOHTTP_CLIENT_POOL_DNS_CACHE_TTL = int(AIOHTTP_CLIENT_POOL_DNS_CACHE_TTL)
+except ValueError:
+    AIOHTTP_CLIENT_POOL_DNS_CACHE_TTL = 300
 
 
 # Whether to apply sigmoid normalization to CrossEncoder reranking scores.
@@ -13,7 +13,7 @@ from uuid import uuid4
 
 
 from contextlib import asynccontextmanager
-from urllib.parse import urlencode, parse_qs, urlparse
+from urllib.parse import urlencode, parse_qs
 from pydantic import BaseModel
 from sqlalchemy import text
 
@@ -46,10 +46,10 @@ from fastapi.staticfiles import StaticFiles
 from starlette_compress import CompressMiddleware
 
 from starlette.exceptions import HTTPException as StarletteHTTPException
-from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.middleware.sessions import SessionMiddleware
 from starlette.responses import Response, StreamingResponse
-from starlette.datastructures import Headers
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 from starsessions import (
     SessionMiddleware as StarSessionsMiddleware,
@@ -62,6 +62,8 @@ from open_webui.utils.audit import AuditLevel, AuditLoggingMiddleware
 from open_webui.utils.logger import start_logger
 from open_webui.socket.main import (
     MODELS,
+    MESSAGE_EVENT_BUFFER,
+    FILE_STATUS_EVENTS,
     app as socket_app,
     periodic_usage_pool_cleanup,
     get_event_emitter,
@@ -254,6 +256,7 @@ from open_webui.config import (
     RAG_EMBEDDING_ENGINE,
     RAG_EMBEDDING_BATCH_SIZE,
     ENABLE_ASYNC_EMBEDDING,
+    ENABLE_INGESTION_WORKER,
     RAG_TOP_K,
     RAG_TOP_K_RERANKER,
     RAG_RELEVANCE_THRESHOLD,
@@ -534,8 +537,11 @@ from open_webui.utils.auth import (
     get_admin_user,
     get_verified_user,
     create_admin_user,
+    periodic_user_last_active_flush,
 )
 from open_webui.utils.plugin import install_tool_and_function_dependencies
+from open_webui.utils.reindex import periodic_reindex_job_resume
+from open_webui.utils.ingestion import run_ingestion_worker
 from open_webui.utils.oauth import (
     get_oauth_client_info_with_dynamic_client_registration,
     encrypt_data,
@@ -544,7 +550,8 @@ from open_webui.utils.oauth import (
     OAuthClientManager,
     OAuthClientInformationFull,
 )
-from open_webui.utils.security_headers import SecurityHeadersMiddleware
+from open_webui.utils.security_headers import set_security_headers
+from open_webui.utils.session_pool import CLIENT_SESSION_POOL
 from open_webui.utils.redis import get_redis_connection
 
 from open_webui.tasks import (
@@ -642,6 +649,12 @@ async def lifespan(app: FastAPI):
         limiter.total_tokens = THREAD_POOL_SIZE
 
     asyncio.create_task(periodic_usage_pool_cleanup())
+    FILE_STATUS_EVENTS.start()
+    asyncio.create_task(periodic_user_last_active_flush())
+    asyncio.create_task(periodic_reindex_job_resume(app))
+
+    if ENABLE_INGESTION_WORKER:
+        asyncio.create_task(run_ingestion_worker(app))
 
     if app.state.config.ENABLE_BASE_MODELS_CACHE:
         await get_all_models(
@@ -666,6 +679,12 @@ async def lifespan(app: FastAPI):
 
     yield
 
+    # Persist any chat message events still held in the write-behind buffer
+    await MESSAGE_EVENT_BUFFER.flush_all()
+    Users.flush_last_active()
+
+    await CLIENT_SESSION_POOL.close()
+
     if hasattr(app.state, "redis_task_command_listener"):
         app.state.redis_task_command_listener.cancel()
 
@@ -1288,57 +1307,88 @@ if ENABLE_COMPRESSION_MIDDLEWARE:
     app.add_middleware(CompressMiddleware)
 
 
-class RedirectMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request: Request, call_next):
-        # Check if the request is a GET request
-        if request.method == "GET":
-            path = request.url.path
-            query_params = dict(parse_qs(urlparse(str(request.url)).query))
-
-            redirect_params = {}
-
-            # Check for the specific watch path and the presence of 'v' parameter
-            if path.endswith("/watch") and "v" in query_params:
-                # Extract the first 'v' parameter
-                youtube_video_id = query_params["v"][0]
-                redirect_params["youtube"] = youtube_video_id
-
-            if "shared" in query_params and len(query_params["shared"]) > 0:
-                # PWA share_target support
-
-                text = query_params["shared"][0]
-                if text:
-                    urls = re.match(r"https://\S+", text)
-                    if urls:
-                        from open_webui.retrieval.loaders.youtube import _parse_video_id
-
-                        if youtube_video_id := _parse_video_id(urls[0]):
-                            redirect_params["youtube"] = youtube_video_id
-                        else:
-                            redirect_params["load-url"] = urls[0]
-                    else:
-                        redirect_params["q"] = text
+class RequestMiddleware:
+    """
+    Pure ASGI middleware for every HTTP request: websocket upgrade validation,
+    request state, API key endpoint restrictions, share/watch redirects,
+    security headers, X-Process-Time and the scoped DB session commit.
+
+    A single layer that only wraps `send`, so streamed responses pass through
+    untouched instead of through a task and memory stream per
+    BaseHTTPMiddleware.
+    """
 
-            if redirect_params:
-                redirect_url = f"/?{urlencode(redirect_params)}"
-                return RedirectResponse(url=redirect_url)
+    def __init__(self, app: ASGIApp):
+        self.app = app
+        # Read from the environment once instead of on every response
+        self.security_headers = set_security_headers()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request = Request(scope)
+
+        response = self.check_websocket_upgrade(request)
+        if response is not None:
+            await response(scope, receive, send)
+            return
+
+        start_time = int(time.time())
+        request.state.token = get_http_authorization_cred(
+            request.headers.get("Authorization")
+        )
+        request.state.enable_api_keys = request.app.state.config.ENABLE_API_KEYS
+
+        security_headers = self.security_headers
+        response = self.check_api_key_restrictions(request)
+        if response is not None:
+            # Rejected before the security headers are applied
+            security_headers = {}
+        else:
+            response = self.get_redirect_response(request)
 
-        # Proceed with the normal flow of other requests
-        response = await call_next(request)
-        return response
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                ScopedSession.commit()
 
+                headers = MutableHeaders(scope=message)
+                for key, value in security_headers.items():
+                    headers[key] = value
+                process_time = int(time.time()) - start_time
+                headers["X-Process-Time"] = str(process_time)
+            await send(message)
 
-app.add_middleware(RedirectMiddleware)
-app.add_middleware(SecurityHeadersMiddleware)
+        if response is not None:
+            await response(scope, receive, send_wrapper)
+        else:
+            await self.app(scope, receive, send_wrapper)
 
+    @staticmethod
+    def check_websocket_upgrade(request: Request) -> Optional[Response]:
+        if (
+            "/ws/socket.io" in request.url.path
+            and request.query_params.get("transport") == "websocket"
+        ):
+            upgrade = (request.headers.get("Upgrade") or "").lower()
+            connection = (request.headers.get("Connection") or "").lower().split(",")
+            # Check that there's the correct headers for an upgrade, else reject the connection
+            # This is to work around this upstream issue: https://github.com/miguelgrinberg/python-engineio/issues/367
+            if upgrade != "websocket" or "upgrade" not in connection:
+                return JSONResponse(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    content={"detail": "Invalid WebSocket upgrade request"},
+                )
+        return None
 
-class APIKeyRestrictionMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request: Request, call_next):
+    @staticmethod
+    def check_api_key_restrictions(request: Request) -> Optional[Response]:
         auth_header = request.headers.get("Authorization")
         token = None
 
         if auth_header:
-            scheme, token = auth_header.split(" ")
+            scheme, _, token = auth_header.partition(" ")
 
         # Only apply restrictions if an sk- API key is used
         if token and token.startswith("sk-"):
@@ -1367,52 +1417,48 @@ class APIKeyRestrictionMiddleware(BaseHTTPMiddleware):
                             "detail": "API key not allowed to access this endpoint."
                         },
                     )
+        return None
 
-        response = await call_next(request)
-        return response
+    @staticmethod
+    def get_redirect_response(request: Request) -> Optional[Response]:
+        # Check if the request is a GET request
+        if request.method != "GET":
+            return None
 
+        path = request.url.path
+        query_params = parse_qs(request.scope["query_string"].decode("latin-1"))
 
-app.add_middleware(APIKeyRestrictionMiddleware)
+        redirect_params = {}
 
+        # Check for the specific watch path and the presence of 'v' parameter
+        if path.endswith("/watch") and "v" in query_params:
+            # Extract the first 'v' parameter
+            youtube_video_id = query_params["v"][0]
+            redirect_params["youtube"] = youtube_video_id
 
-@app.middleware("http")
-async def commit_session_after_request(request: Request, call_next):
-    response = await call_next(request)
-    # log.debug("Commit session after request")
-    ScopedSession.commit()
-    return response
+        if "shared" in query_params and len(query_params["shared"]) > 0:
+            # PWA share_target support
 
+            text = query_params["shared"][0]
+            if text:
+                urls = re.match(r"https://\S+", text)
+                if urls:
+                    from open_webui.retrieval.loaders.youtube import _parse_video_id
 
-@app.middleware("http")
-async def check_url(request: Request, call_next):
-    start_time = int(time.time())
-    request.state.token = get_http_authorization_cred(
-        request.headers.get("Authorization")
-    )
+                    if youtube_video_id := _parse_video_id(urls[0]):
+                        redirect_params["youtube"] = youtube_video_id
+                    else:
+                        redirect_params["load-url"] = urls[0]
+                else:
+                    redirect_params["q"] = text
 
-    request.state.enable_api_keys = app.state.config.ENABLE_API_KEYS
-    response = await call_next(request)
-    process_time = int(time.time()) - start_time
-    response.headers["X-Process-Time"] = str(process_time)
-    return response
+        if redirect_params:
+            redirect_url = f"/?{urlencode(redirect_params)}"
+            return RedirectResponse(url=redirect_url)
+        return None
 
 
-@app.middleware("http")
-async def inspect_websocket(request: Request, call_next):
-    if (
-        "/ws/socket.io" in request.url.path
-        and request.query_params.get("transport") == "websocket"
-    ):
-        upgrade = (request.headers.get("Upgrade") or "").lower()
-        connection = (request.headers.get("Connection") or "").lower().split(",")
-        # Check that there's the correct headers for an upgrade, else reject the connection
-        # This is to work around this upstream issue: https://github.com/miguelgrinberg/python-engineio/issues/367
-        if upgrade != "websocket" or "upgrade" not in connection:
-            return JSONResponse(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                content={"detail": "Invalid WebSocket upgrade request"},
-            )
-    return await call_next(request)
+app.add_middleware(RequestMiddleware)
 
 
 app.add_middleware(
@@ -1515,8 +1561,13 @@ async def get_models(
             continue
 
         # Remove profile image URL to reduce payload size
+        # (on a copy, the model dicts are shared with the model registry)
         if model.get("info", {}).get("meta", {}).get("profile_image_url"):
-            model["info"]["meta"].pop("profile_image_url", None)
+            meta = model["info"]["meta"]
+            model["info"] = {
+                **model["info"],
+                "meta": {k: v for k, v in meta.items() if k != "profile_image_url"},
+            }
 
         try:
             model_tags = [
@@ -1806,6 +1857,19 @@ async def chat_completion(
                 except:
                     pass
         finally:
+            try:
+                if (
+                    metadata.get("chat_id")
+                    and metadata.get("message_id")
+                    and not metadata["chat_id"].startswith("local:")
+                ):
+                    # Fold the per-message rows written while responding back into the chat
+                    Chats.compact_chat_messages_by_id(
+                        metadata["chat_id"], message_id=metadata["message_id"]
+                    )
+            except Exception as e:
+                log.debug(f"Error compacting chat messages: {e}")
+
             try:
                 if mcp_clients := metadata.get("mcp_clients"):
                     for client in reversed(mcp_clients.values()):
@@ -2211,7 +2275,7 @@ async def get_current_usage(user=Depends(get_verified_user)):
             )
 
         return {
-            "model_ids": get_models_in_use(),
+            "model_ids": await get_models_in_use(),
             "user_count": Users.get_active_user_count(),
         }
     except HTTPException:
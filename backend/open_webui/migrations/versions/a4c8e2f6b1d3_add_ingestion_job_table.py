@@ -0,0 +1,46 @@
+"""Add ingestion job table
+
+Revision ID: a4c8e2f6b1d3
+Revises: f3b7d9a1c2e4
+Create Date: 2026-01-19 14:02:37.581904
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "a4c8e2f6b1d3"
+down_revision: Union[str, None] = "f3b7d9a1c2e4"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "ingestion_job",
+        sa.Column("id", sa.Text(), primary_key=True, unique=True),
+        sa.Column("file_id", sa.Text(), nullable=False),
+        sa.Column("user_id", sa.Text(), nullable=True),
+        sa.Column("status", sa.Text(), nullable=False),
+        sa.Column("attempts", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("error", sa.Text(), nullable=True),
+        sa.Column("worker_id", sa.Text(), nullable=True),
+        sa.Column("heartbeat_at", sa.BigInteger(), nullable=True),
+        sa.Column("available_at", sa.BigInteger(), nullable=False),
+        sa.Column("timings", sa.JSON(), nullable=True),
+        sa.Column("created_at", sa.BigInteger(), nullable=True),
+        sa.Column("updated_at", sa.BigInteger(), nullable=True),
+        sa.Column("started_at", sa.BigInteger(), nullable=True),
+        sa.Column("finished_at", sa.BigInteger(), nullable=True),
+        # indexes
+        sa.Index("ingestion_job_status_available_at_idx", "status", "available_at"),
+        sa.Index("ingestion_job_file_id_idx", "file_id"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("ingestion_job")
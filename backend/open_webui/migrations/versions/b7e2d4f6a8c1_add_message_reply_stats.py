@@ -0,0 +1,71 @@
+"""Add reply stats and indexes to message table
+
+Revision ID: b7e2d4f6a8c1
+Revises: a4c8e2f6b1d3
+Create Date: 2026-01-26 11:37:52.204718
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "b7e2d4f6a8c1"
+down_revision: Union[str, None] = "a4c8e2f6b1d3"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Denormalized thread stats, so message pages don't count replies per message
+    op.add_column(
+        "message",
+        sa.Column("reply_count", sa.Integer(), nullable=False, server_default="0"),
+    )
+    op.add_column(
+        "message",
+        sa.Column("latest_reply_at", sa.BigInteger(), nullable=True),
+    )
+
+    # Created first, the backfill below looks up replies by parent_id
+    op.create_index("message_parent_id_idx", "message", ["parent_id"])
+
+    op.execute(
+        sa.text(
+            """
+            UPDATE message
+            SET reply_count = (
+                    SELECT COUNT(*) FROM message AS reply
+                    WHERE reply.parent_id = message.id
+                ),
+                latest_reply_at = (
+                    SELECT MAX(reply.created_at) FROM message AS reply
+                    WHERE reply.parent_id = message.id
+                )
+            WHERE message.id IN (
+                SELECT parent_id FROM message WHERE parent_id IS NOT NULL
+            )
+            """
+        )
+    )
+
+    op.create_index(
+        "message_channel_id_created_at_idx", "message", ["channel_id", "created_at"]
+    )
+    op.create_index(
+        "message_reaction_message_id_idx", "message_reaction", ["message_id"]
+    )
+    pass
+
+
+def downgrade() -> None:
+    op.drop_index("message_reaction_message_id_idx", table_name="message_reaction")
+    op.drop_index("message_parent_id_idx", table_name="message")
+    op.drop_index("message_channel_id_created_at_idx", table_name="message")
+
+    op.drop_column("message", "latest_reply_at")
+    op.drop_column("message", "reply_count")
+    pass
@@ -0,0 +1,48 @@
+"""Add chat_message table
+
+Revision ID: e8a1c5b2d3f4
+Revises: c440947495f3
+Create Date: 2026-01-08 10:12:31.518204
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "e8a1c5b2d3f4"
+down_revision: Union[str, None] = "c440947495f3"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "chat_message",
+        sa.Column(
+            "chat_id",
+            sa.Text(),
+            sa.ForeignKey("chat.id", ondelete="CASCADE"),
+            primary_key=True,
+        ),
+        sa.Column("message_id", sa.Text(), primary_key=True),
+        sa.Column("parent_id", sa.Text(), nullable=True),
+        sa.Column("role", sa.Text(), nullable=True),
+        sa.Column("content", sa.Text(), nullable=True),
+        sa.Column("status", sa.JSON(), nullable=True),
+        sa.Column("sources", sa.JSON(), nullable=True),
+        sa.Column("data", sa.JSON(), nullable=True),
+        sa.Column("created_at", sa.BigInteger(), nullable=True),
+        sa.Column("updated_at", sa.BigInteger(), nullable=True),
+        # indexes
+        sa.Index("chat_message_chat_id_updated_at_idx", "chat_id", "updated_at"),
+    )
+    pass
+
+
+def downgrade() -> None:
+    op.drop_table("chat_message")
+    pass
@@ -0,0 +1,72 @@
+"""Add reindex job tables
+
+Revision ID: f3b7d9a1c2e4
+Revises: e8a1c5b2d3f4
+Create Date: 2026-01-12 09:41:05.227310
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "f3b7d9a1c2e4"
+down_revision: Union[str, None] = "e8a1c5b2d3f4"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "reindex_job",
+        sa.Column("id", sa.Text(), primary_key=True, unique=True),
+        sa.Column("user_id", sa.Text(), nullable=True),
+        sa.Column("status", sa.Text(), nullable=False),
+        sa.Column("worker_id", sa.Text(), nullable=True),
+        sa.Column("heartbeat_at", sa.BigInteger(), nullable=True),
+        sa.Column("created_at", sa.BigInteger(), nullable=True),
+        sa.Column("updated_at", sa.BigInteger(), nullable=True),
+        sa.Column("started_at", sa.BigInteger(), nullable=True),
+        sa.Column("finished_at", sa.BigInteger(), nullable=True),
+    )
+
+    op.create_table(
+        "reindex_job_knowledge",
+        sa.Column(
+            "job_id",
+            sa.Text(),
+            sa.ForeignKey("reindex_job.id", ondelete="CASCADE"),
+            primary_key=True,
+        ),
+        sa.Column("knowledge_id", sa.Text(), primary_key=True),
+        sa.Column("status", sa.Text(), nullable=False),
+        sa.Column("shadow_collection_name", sa.Text(), nullable=True),
+        sa.Column("updated_at", sa.BigInteger(), nullable=True),
+    )
+
+    op.create_table(
+        "reindex_job_file",
+        sa.Column(
+            "job_id",
+            sa.Text(),
+            sa.ForeignKey("reindex_job.id", ondelete="CASCADE"),
+            primary_key=True,
+        ),
+        sa.Column("knowledge_id", sa.Text(), primary_key=True),
+        sa.Column("file_id", sa.Text(), primary_key=True),
+        sa.Column("status", sa.Text(), nullable=False),
+        sa.Column("error", sa.Text(), nullable=True),
+        sa.Column("attempts", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("updated_at", sa.BigInteger(), nullable=True),
+        # indexes
+        sa.Index("reindex_job_file_job_id_status_idx", "job_id", "status"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("reindex_job_file")
+    op.drop_table("reindex_job_knowledge")
+    op.drop_table("reindex_job")
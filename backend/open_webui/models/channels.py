@@ -998,6 +998,20 @@ class ChannelTable:
             )
             return ChannelWebhookModel.model_validate(webhook) if webhook else None
 
+    def get_webhooks_by_ids(
+        self, webhook_ids: list[str], db: Optional[Session] = None
+    ) -> list[ChannelWebhookModel]:
+        if not webhook_ids:
+            return []
+
+        with get_db_context(db) as db:
+            webhooks = (
+                db.query(ChannelWebhook)
+                .filter(ChannelWebhook.id.in_(webhook_ids))
+                .all()
+            )
+            return [ChannelWebhookModel.model_validate(w) for w in webhooks]
+
     def get_webhook_by_id_and_token(
         self, webhook_id: str, token: str, db: Optional[Session] = None
     ) -> Optional[ChannelWebhookModel]:
@@ -9,6 +9,7 @@ from open_webui.internal.db import Base, JSONField, get_db, get_db_context
 from open_webui.models.tags import TagModel, Tag, Tags
 from open_webui.models.folders import Folders
 from open_webui.utils.misc import sanitize_data_for_db, sanitize_text_for_db
+from open_webui.utils.db.pagination import paginate_by_cursor
 
 from pydantic import BaseModel, ConfigDict
 from sqlalchemy import (
@@ -117,6 +118,66 @@ class ChatFileModel(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
 
+class ChatMessage(Base):
+    __tablename__ = "chat_message"
+
+    chat_id = Column(Text, ForeignKey("chat.id", ondelete="CASCADE"), primary_key=True)
+    message_id = Column(Text, primary_key=True)
+
+    parent_id = Column(Text, nullable=True)
+    role = Column(Text, nullable=True)
+    content = Column(Text, nullable=True)
+
+    status = Column(JSON, nullable=True)  # message.statusHistory
+    sources = Column(JSON, nullable=True)  # message.sources
+    data = Column(JSON, nullable=True)  # remaining message fields
+
+    created_at = Column(BigInteger)  # time_ns
+    updated_at = Column(BigInteger)  # time_ns
+
+    __table_args__ = (
+        # WHERE chat_id = ... ORDER BY updated_at
+        Index("chat_message_chat_id_updated_at_idx", "chat_id", "updated_at"),
+    )
+
+
+class ChatMessageModel(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    chat_id: str
+    message_id: str
+
+    parent_id: Optional[str] = None
+    role: Optional[str] = None
+    content: Optional[str] = None
+
+    status: Optional[list] = None
+    sources: Optional[list] = None
+    data: Optional[dict] = None
+
+    created_at: int  # timestamp in epoch (time_ns)
+    updated_at: int  # timestamp in epoch (time_ns)
+
+    def to_message(self) -> dict:
+        """Rebuild the `history.messages[id]` dict stored in `chat.chat`."""
+        message = {
+            **(self.data or {}),
+            "id": self.message_id,
+            "parentId": self.parent_id,
+        }
+
+        if self.role is not None:
+            message["role"] = self.role
+        if self.content is not None:
+            message["content"] = self.content
+        if self.status is not None:
+            message["statusHistory"] = self.status
+        if self.sources is not None:
+            message["sources"] = self.sources
+
+        return message
+
+
 ####################
 # Forms
 ####################
@@ -281,6 +342,87 @@ class ChatTable:
 
         return changed
 
+    def _message_to_columns(self, message: dict) -> dict:
+        """Split a history message dict into `chat_message` columns."""
+        content = message.get("content")
+        columns = {"id", "parentId", "role", "statusHistory", "sources"}
+        if isinstance(content, str):
+            columns.add("content")
+
+        return {
+            "parent_id": message.get("parentId"),
+            "role": message.get("role"),
+            "content": content if isinstance(content, str) else None,
+            "status": message.get("statusHistory"),
+            "sources": message.get("sources"),
+            "data": {k: v for k, v in message.items() if k not in columns},
+        }
+
+    def _get_chat_messages_by_chat_id(
+        self, id: str, db: Session
+    ) -> list[ChatMessageModel]:
+        return [
+            ChatMessageModel.model_validate(chat_message)
+            for chat_message in db.query(ChatMessage)
+            .filter_by(chat_id=id)
+            .order_by(ChatMessage.updated_at.asc())
+            .all()
+        ]
+
+    def _to_chat_model(self, chat_item: Chat, db: Session) -> ChatModel:
+        """
+        Build a ChatModel, overlaying any `chat_message` rows that have not
+        been folded into `chat.chat` yet onto `history.messages`.
+        """
+        return self._overlay_chat_messages(
+            ChatModel.model_validate(chat_item),
+            self._get_chat_messages_by_chat_id(chat_item.id, db),
+        )
+
+    def _to_chat_models(self, chat_items, db: Session) -> list[ChatModel]:
+        """_to_chat_model for a page of chats, reading their rows in one query."""
+        chats = [ChatModel.model_validate(chat_item) for chat_item in chat_items]
+        if not chats:
+            return chats
+
+        chat_messages = {}
+        for chat_message in (
+            db.query(ChatMessage)
+            .filter(ChatMessage.chat_id.in_([chat.id for chat in chats]))
+            .order_by(ChatMessage.updated_at.asc())
+            .all()
+        ):
+            chat_messages.setdefault(chat_message.chat_id, []).append(
+                ChatMessageModel.model_validate(chat_message)
+            )
+
+        return [
+            self._overlay_chat_messages(chat, chat_messages.get(chat.id, []))
+            for chat in chats
+        ]
+
+    def _overlay_chat_messages(
+        self, chat: ChatModel, chat_messages: list[ChatMessageModel]
+    ) -> ChatModel:
+        if not chat_messages:
+            return chat
+
+        history = chat.chat.get("history", {}) or {}
+        messages = {
+            **(history.get("messages", {}) or {}),
+            **{
+                chat_message.message_id: chat_message.to_message()
+                for chat_message in chat_messages
+            },
+        }
+
+        # currentId stays as saved, rows are also written for status and files
+        chat.chat = {**chat.chat, "history": {**history, "messages": messages}}
+        chat.updated_at = max(
+            chat.updated_at, chat_messages[-1].updated_at // 1_000_000_000
+        )
+        return chat
+
     def insert_new_chat(
         self, user_id: str, form_data: ChatForm, db: Optional[Session] = None
     ) -> Optional[ChatModel]:
@@ -365,6 +507,9 @@ class ChatTable:
 
                 chat_item.updated_at = int(time.time())
 
+                # The full document supersedes any per-message rows
+                db.query(ChatMessage).filter_by(chat_id=id).delete()
+
                 db.commit()
                 db.refresh(chat_item)
 
@@ -409,88 +554,176 @@ class ChatTable:
 
         return chat.chat.get("title", "New Chat")
 
-    def get_messages_map_by_chat_id(self, id: str) -> Optional[dict]:
-        chat = self.get_chat_by_id(id)
+    def get_messages_map_by_chat_id(
+        self, id: str, db: Optional[Session] = None
+    ) -> Optional[dict]:
+        chat = self.get_chat_by_id(id, db=db)
         if chat is None:
             return None
 
         return chat.chat.get("history", {}).get("messages", {}) or {}
 
     def get_message_by_id_and_message_id(
-        self, id: str, message_id: str
+        self, id: str, message_id: str, db: Optional[Session] = None
     ) -> Optional[dict]:
-        chat = self.get_chat_by_id(id)
-        if chat is None:
-            return None
+        with get_db_context(db) as db:
+            chat_message = db.get(ChatMessage, (id, message_id))
+            if chat_message:
+                return ChatMessageModel.model_validate(chat_message).to_message()
 
-        return chat.chat.get("history", {}).get("messages", {}).get(message_id, {})
+            chat = self.get_chat_by_id(id, db=db)
+            if chat is None:
+                return None
 
-    def upsert_message_to_chat_by_id_and_message_id(
-        self, id: str, message_id: str, message: dict
-    ) -> Optional[ChatModel]:
-        chat = self.get_chat_by_id(id)
-        if chat is None:
+            return chat.chat.get("history", {}).get("messages", {}).get(message_id, {})
+
+    def _get_chat_message_item(
+        self, id: str, message_id: str, db: Session
+    ) -> Optional[ChatMessage]:
+        """
+        Return the `chat_message` row for a message, seeding it from the
+        `chat.chat` document on first write. Returns None if the chat or the
+        message does not exist.
+        """
+        chat_message = db.get(ChatMessage, (id, message_id))
+        if chat_message:
+            return chat_message
+
+        chat_item = db.get(Chat, id)
+        if chat_item is None:
             return None
 
+        message = (
+            (chat_item.chat or {})
+            .get("history", {})
+            .get("messages", {})
+            .get(message_id)
+        )
+        if message is None:
+            return None
+
+        now = int(time.time_ns())
+        chat_message = ChatMessage(
+            chat_id=id,
+            message_id=message_id,
+            **self._message_to_columns(message),
+            created_at=now,
+            updated_at=now,
+        )
+        db.add(chat_message)
+
+        # Keep the sidebar ordering fresh without rewriting the chat document
+        chat_item.updated_at = int(time.time())
+        return chat_message
+
+    def upsert_message_to_chat_by_id_and_message_id(
+        self, id: str, message_id: str, message: dict, db: Optional[Session] = None
+    ) -> Optional[ChatMessageModel]:
         # Sanitize message content for null characters before upserting
         if isinstance(message.get("content"), str):
             message["content"] = sanitize_text_for_db(message["content"])
 
-        chat = chat.chat
-        history = chat.get("history", {})
+        try:
+            with get_db_context(db) as db:
+                chat_message = self._get_chat_message_item(id, message_id, db)
 
-        if message_id in history.get("messages", {}):
-            history["messages"][message_id] = {
-                **history["messages"][message_id],
-                **message,
-            }
-        else:
-            history["messages"][message_id] = message
+                if chat_message is None:
+                    if not db.query(exists().where(Chat.id == id)).scalar():
+                        return None
 
-        history["currentId"] = message_id
+                    now = int(time.time_ns())
+                    chat_message = ChatMessage(
+                        chat_id=id,
+                        message_id=message_id,
+                        created_at=now,
+                    )
+                    db.add(chat_message)
+                    db.query(Chat).filter_by(id=id).update(
+                        {"updated_at": int(time.time())}
+                    )
+                    current = {}
+                else:
+                    current = ChatMessageModel.model_validate(chat_message).to_message()
 
-        chat["history"] = history
-        return self.update_chat_by_id(id, chat)
+                for key, value in self._message_to_columns(
+                    self._clean_null_bytes({**current, **message})
+                ).items():
+                    setattr(chat_message, key, value)
+                chat_message.updated_at = int(time.time_ns())
 
-    def add_message_status_to_chat_by_id_and_message_id(
-        self, id: str, message_id: str, status: dict
-    ) -> Optional[ChatModel]:
-        chat = self.get_chat_by_id(id)
-        if chat is None:
+                db.commit()
+                db.refresh(chat_message)
+                return ChatMessageModel.model_validate(chat_message)
+        except Exception as e:
+            log.exception(f"Error upserting message {message_id} to chat {id}: {e}")
             return None
 
-        chat = chat.chat
-        history = chat.get("history", {})
+    def add_message_status_to_chat_by_id_and_message_id(
+        self, id: str, message_id: str, status: dict, db: Optional[Session] = None
+    ) -> Optional[ChatMessageModel]:
+        try:
+            with get_db_context(db) as db:
+                chat_message = self._get_chat_message_item(id, message_id, db)
+                if chat_message is None:
+                    return None
 
-        if message_id in history.get("messages", {}):
-            status_history = history["messages"][message_id].get("statusHistory", [])
-            status_history.append(status)
-            history["messages"][message_id]["statusHistory"] = status_history
+                chat_message.status = [
+                    *(chat_message.status or []),
+                    self._clean_null_bytes(status),
+                ]
+                chat_message.updated_at = int(time.time_ns())
 
-        chat["history"] = history
-        return self.update_chat_by_id(id, chat)
+                db.commit()
+                db.refresh(chat_message)
+                return ChatMessageModel.model_validate(chat_message)
+        except Exception as e:
+            log.exception(f"Error adding status to message {message_id}: {e}")
+            return None
 
     def add_message_files_by_id_and_message_id(
-        self, id: str, message_id: str, files: list[dict]
+        self, id: str, message_id: str, files: list[dict], db: Optional[Session] = None
     ) -> list[dict]:
-        with get_db_context() as db:
+        with get_db_context(db) as db:
+            chat_message = self._get_chat_message_item(id, message_id, db)
+            if chat_message is None:
+                return None if db.get(Chat, id) is None else []
+
+            data = chat_message.data or {}
+            message_files = data.get("files", []) + files
+
+            chat_message.data = {**data, "files": message_files}
+            chat_message.updated_at = int(time.time_ns())
+
+            db.commit()
+            return message_files
+
+    def compact_chat_messages_by_id(
+        self,
+        id: str,
+        message_id: Optional[str] = None,
+        db: Optional[Session] = None,
+    ) -> Optional[ChatModel]:
+        """
+        Fold the `chat_message` rows of a chat back into the `chat.chat`
+        document. Called once a response has completed so that JSON-based
+        queries (search, stats, exports) see the final messages.
+
+        `message_id` is the response message, made the current message.
+        """
+        with get_db_context(db) as db:
+            if not db.query(exists().where(ChatMessage.chat_id == id)).scalar():
+                return self.get_chat_by_id(id, db=db)
+
             chat = self.get_chat_by_id(id, db=db)
             if chat is None:
                 return None
 
             chat = chat.chat
             history = chat.get("history", {})
-
-            message_files = []
-
             if message_id in history.get("messages", {}):
-                message_files = history["messages"][message_id].get("files", [])
-                message_files = message_files + files
-                history["messages"][message_id]["files"] = message_files
+                history["currentId"] = message_id
 
-            chat["history"] = history
-            self.update_chat_by_id(id, chat, db=db)
-            return message_files
+            return self.update_chat_by_id(id, chat, db=db)
 
     def insert_shared_chat_by_chat_id(
         self, chat_id: str, db: Optional[Session] = None
@@ -510,7 +743,7 @@ class ChatTable:
                     "id": str(uuid.uuid4()),
                     "user_id": f"shared-{chat_id}",
                     "title": chat.title,
-                    "chat": chat.chat,
+                    "chat": self._to_chat_model(chat, db).chat,
                     "meta": chat.meta,
                     "pinned": chat.pinned,
                     "folder_id": chat.folder_id,
@@ -546,7 +779,7 @@ class ChatTable:
                     return self.insert_shared_chat_by_chat_id(chat_id, db=db)
 
                 shared_chat.title = chat.title
-                shared_chat.chat = chat.chat
+                shared_chat.chat = self._to_chat_model(chat, db).chat
                 shared_chat.meta = chat.meta
                 shared_chat.pinned = chat.pinned
                 shared_chat.folder_id = chat.folder_id
@@ -673,7 +906,7 @@ class ChatTable:
                 query = query.limit(limit)
 
             all_chats = query.all()
-            return [ChatModel.model_validate(chat) for chat in all_chats]
+            return self._to_chat_models(all_chats, db)
 
     def get_chat_list_by_user_id(
         self,
@@ -682,6 +915,7 @@ class ChatTable:
         filter: Optional[dict] = None,
         skip: int = 0,
         limit: int = 50,
+        cursor: Optional[tuple[int, str]] = None,
         db: Optional[Session] = None,
     ) -> list[ChatModel]:
         with get_db_context(db) as db:
@@ -689,6 +923,7 @@ class ChatTable:
             if not include_archived:
                 query = query.filter_by(archived=False)
 
+            order_by = direction = None
             if filter:
                 query_key = filter.get("query")
                 if query_key:
@@ -697,15 +932,15 @@ class ChatTable:
                 order_by = filter.get("order_by")
                 direction = filter.get("direction")
 
-                if order_by and direction and getattr(Chat, order_by):
-                    if direction.lower() == "asc":
-                        query = query.order_by(getattr(Chat, order_by).asc())
-                    elif direction.lower() == "desc":
-                        query = query.order_by(getattr(Chat, order_by).desc())
-                    else:
-                        raise ValueError("Invalid direction for ordering")
-            else:
-                query = query.order_by(Chat.updated_at.desc())
+            if cursor or order_by in (None, "updated_at", "created_at"):
+                query = self._paginate_by_cursor(query, order_by, direction, cursor)
+            elif direction and getattr(Chat, order_by):
+                if direction.lower() == "asc":
+                    query = query.order_by(getattr(Chat, order_by).asc())
+                elif direction.lower() == "desc":
+                    query = query.order_by(getattr(Chat, order_by).desc())
+                else:
+                    raise ValueError("Invalid direction for ordering")
 
             if skip:
                 query = query.offset(skip)
@@ -713,7 +948,7 @@ class ChatTable:
                 query = query.limit(limit)
 
             all_chats = query.all()
-            return [ChatModel.model_validate(chat) for chat in all_chats]
+            return self._to_chat_models(all_chats, db)
 
     def get_chat_title_id_list_by_user_id(
         self,
@@ -723,6 +958,7 @@ class ChatTable:
         include_pinned: bool = False,
         skip: Optional[int] = None,
         limit: Optional[int] = None,
+        cursor: Optional[tuple[int, str]] = None,
         db: Optional[Session] = None,
     ) -> list[ChatTitleIdResponse]:
         with get_db_context(db) as db:
@@ -737,9 +973,9 @@ class ChatTable:
             if not include_archived:
                 query = query.filter_by(archived=False)
 
-            query = query.order_by(Chat.updated_at.desc()).with_entities(
-                Chat.id, Chat.title, Chat.updated_at, Chat.created_at
-            )
+            query = paginate_by_cursor(
+                query, Chat.updated_at, Chat.id, cursor
+            ).with_entities(Chat.id, Chat.title, Chat.updated_at, Chat.created_at)
 
             if skip:
                 query = query.offset(skip)
@@ -776,7 +1012,7 @@ class ChatTable:
                 .order_by(Chat.updated_at.desc())
                 .all()
             )
-            return [ChatModel.model_validate(chat) for chat in all_chats]
+            return self._to_chat_models(all_chats, db)
 
     def get_chat_by_id(
         self, id: str, db: Optional[Session] = None
@@ -791,7 +1027,7 @@ class ChatTable:
                     db.commit()
                     db.refresh(chat_item)
 
-                return ChatModel.model_validate(chat_item)
+                return self._to_chat_model(chat_item, db)
         except Exception:
             return None
 
@@ -817,7 +1053,7 @@ class ChatTable:
         try:
             with get_db_context(db) as db:
                 chat = db.query(Chat).filter_by(id=id, user_id=user_id).first()
-                return ChatModel.model_validate(chat)
+                return self._to_chat_model(chat, db)
         except Exception:
             return None
 
@@ -830,7 +1066,64 @@ class ChatTable:
                 # .limit(limit).offset(skip)
                 .order_by(Chat.updated_at.desc())
             )
-            return [ChatModel.model_validate(chat) for chat in all_chats]
+            return self._to_chat_models(all_chats, db)
+
+    def get_chats_by_cursor(
+        self,
+        user_id: Optional[str] = None,
+        cursor: Optional[tuple[int, str]] = None,
+        limit: int = 100,
+        filter: Optional[dict] = None,
+        db: Optional[Session] = None,
+    ) -> list[ChatModel]:
+        """
+        Chats ordered by created_at, newest first unless `filter["direction"]`
+        is "asc", in keyset-paginated batches for exports. `cursor` is the
+        (created_at, id) of the last chat of the previous batch. The key is
+        immutable, so chats updated during an export are neither skipped nor
+        repeated.
+        """
+        with get_db_context(db) as db:
+            query = db.query(Chat)
+            if user_id:
+                query = query.filter_by(user_id=user_id)
+
+            direction = None
+            if filter:
+                if filter.get("updated_at"):
+                    query = query.filter(Chat.updated_at > filter.get("updated_at"))
+                direction = filter.get("direction")
+
+            chats = (
+                self._paginate_by_cursor(query, "created_at", direction, cursor)
+                .limit(limit)
+                .all()
+            )
+            return self._to_chat_models(chats, db)
+
+    def _paginate_by_cursor(
+        self,
+        query,
+        order_by: Optional[str],
+        direction: Optional[str],
+        cursor: Optional[tuple[int, str]],
+    ):
+        """
+        Order by a timestamp column with an id tiebreak, so a cursor taken from
+        the last chat of any page resumes exactly where that page ended.
+        """
+        if order_by not in (None, "updated_at", "created_at"):
+            raise ValueError("Cursor pagination requires ordering by a timestamp")
+        if direction and direction.lower() not in ("asc", "desc"):
+            raise ValueError("Invalid direction for ordering")
+
+        return paginate_by_cursor(
+            query,
+            getattr(Chat, order_by or "updated_at"),
+            Chat.id,
+            cursor,
+            descending=not direction or direction.lower() == "desc",
+        )
 
     def get_chats_by_user_id(
         self,
@@ -838,11 +1131,13 @@ class ChatTable:
         filter: Optional[dict] = None,
         skip: Optional[int] = None,
         limit: Optional[int] = None,
+        cursor: Optional[tuple[int, str]] = None,
         db: Optional[Session] = None,
     ) -> ChatListResponse:
         with get_db_context(db) as db:
             query = db.query(Chat).filter_by(user_id=user_id)
 
+            order_by = direction = None
             if filter:
                 if filter.get("updated_at"):
                     query = query.filter(Chat.updated_at > filter.get("updated_at"))
@@ -850,20 +1145,19 @@ class ChatTable:
                 order_by = filter.get("order_by")
                 direction = filter.get("direction")
 
-                if order_by and direction:
-                    if hasattr(Chat, order_by):
-                        if direction.lower() == "asc":
-                            query = query.order_by(getattr(Chat, order_by).asc())
-                        elif direction.lower() == "desc":
-                            query = query.order_by(getattr(Chat, order_by).desc())
-                else:
-                    query = query.order_by(Chat.updated_at.desc())
+            # The total ignores the cursor so it stays the size of the whole list
+            total = query.count()
 
+            if cursor or order_by in (None, "updated_at", "created_at"):
+                query = self._paginate_by_cursor(query, order_by, direction, cursor)
+            elif direction and hasattr(Chat, order_by):
+                if direction.lower() == "asc":
+                    query = query.order_by(getattr(Chat, order_by).asc())
+                elif direction.lower() == "desc":
+                    query = query.order_by(getattr(Chat, order_by).desc())
             else:
                 query = query.order_by(Chat.updated_at.desc())
 
-            total = query.count()
-
             if skip is not None:
                 query = query.offset(skip)
             if limit is not None:
@@ -873,7 +1167,7 @@ class ChatTable:
 
             return ChatListResponse(
                 **{
-                    "items": [ChatModel.model_validate(chat) for chat in all_chats],
+                    "items": self._to_chat_models(all_chats, db),
                     "total": total,
                 }
             )
@@ -887,7 +1181,7 @@ class ChatTable:
                 .filter_by(user_id=user_id, pinned=True, archived=False)
                 .order_by(Chat.updated_at.desc())
             )
-            return [ChatModel.model_validate(chat) for chat in all_chats]
+            return self._to_chat_models(all_chats, db)
 
     def get_archived_chats_by_user_id(
         self, user_id: str, db: Optional[Session] = None
@@ -898,7 +1192,7 @@ class ChatTable:
                 .filter_by(user_id=user_id, archived=True)
                 .order_by(Chat.updated_at.desc())
             )
-            return [ChatModel.model_validate(chat) for chat in all_chats]
+            return self._to_chat_models(all_chats, db)
 
     def get_chats_by_user_id_and_search_text(
         self,
@@ -1109,7 +1403,7 @@ class ChatTable:
             log.info(f"The number of chats: {len(all_chats)}")
 
             # Validate and return chats
-            return [ChatModel.model_validate(chat) for chat in all_chats]
+            return self._to_chat_models(all_chats, db)
 
     def get_chats_by_folder_id_and_user_id(
         self,
@@ -1132,7 +1426,7 @@ class ChatTable:
                 query = query.limit(limit)
 
             all_chats = query.all()
-            return [ChatModel.model_validate(chat) for chat in all_chats]
+            return self._to_chat_models(all_chats, db)
 
     def get_chats_by_folder_ids_and_user_id(
         self, folder_ids: list[str], user_id: str, db: Optional[Session] = None
@@ -1147,7 +1441,7 @@ class ChatTable:
             query = query.order_by(Chat.updated_at.desc())
 
             all_chats = query.all()
-            return [ChatModel.model_validate(chat) for chat in all_chats]
+            return self._to_chat_models(all_chats, db)
 
     def update_chat_folder_id_by_id_and_user_id(
         self, id: str, user_id: str, folder_id: str, db: Optional[Session] = None
@@ -1206,7 +1500,7 @@ class ChatTable:
 
             all_chats = query.all()
             log.debug(f"all_chats: {all_chats}")
-            return [ChatModel.model_validate(chat) for chat in all_chats]
+            return self._to_chat_models(all_chats, db)
 
     def add_chat_tag_by_id_and_user_id_and_tag_name(
         self, id: str, user_id: str, tag_name: str, db: Optional[Session] = None
@@ -1319,6 +1613,7 @@ class ChatTable:
     def delete_chat_by_id(self, id: str, db: Optional[Session] = None) -> bool:
         try:
             with get_db_context(db) as db:
+                db.query(ChatMessage).filter_by(chat_id=id).delete()
                 db.query(Chat).filter_by(id=id).delete()
                 db.commit()
 
@@ -1331,6 +1626,11 @@ class ChatTable:
     ) -> bool:
         try:
             with get_db_context(db) as db:
+                db.query(ChatMessage).filter(
+                    ChatMessage.chat_id.in_(
+                        select(Chat.id).where(Chat.id == id, Chat.user_id == user_id)
+                    )
+                ).delete(synchronize_session=False)
                 db.query(Chat).filter_by(id=id, user_id=user_id).delete()
                 db.commit()
 
@@ -1345,6 +1645,11 @@ class ChatTable:
             with get_db_context(db) as db:
                 self.delete_shared_chats_by_user_id(user_id, db=db)
 
+                db.query(ChatMessage).filter(
+                    ChatMessage.chat_id.in_(
+                        select(Chat.id).where(Chat.user_id == user_id)
+                    )
+                ).delete(synchronize_session=False)
                 db.query(Chat).filter_by(user_id=user_id).delete()
                 db.commit()
 
@@ -1357,6 +1662,13 @@ class ChatTable:
     ) -> bool:
         try:
             with get_db_context(db) as db:
+                db.query(ChatMessage).filter(
+                    ChatMessage.chat_id.in_(
+                        select(Chat.id).where(
+                            Chat.user_id == user_id, Chat.folder_id == folder_id
+                        )
+                    )
+                ).delete(synchronize_session=False)
                 db.query(Chat).filter_by(user_id=user_id, folder_id=folder_id).delete()
                 db.commit()
 
@@ -4,7 +4,9 @@ from typing import Optional
 
 from sqlalchemy.orm import Session
 from open_webui.internal.db import Base, JSONField, get_db, get_db_context
+from open_webui.env import FUNCTION_VALVES_CACHE_TTL
 from open_webui.models.users import Users, UserModel
+from open_webui.utils.cache import VersionedCache
 from pydantic import BaseModel, ConfigDict
 from sqlalchemy import BigInteger, Boolean, Column, String, Text, Index
 
@@ -103,6 +105,9 @@ class FunctionValves(BaseModel):
 
 
 class FunctionsTable:
+    # Used by filter pipelines: function_id -> valves
+    _valves_cache = VersionedCache("function_valves", ttl=FUNCTION_VALVES_CACHE_TTL)
+
     def insert_new_function(
         self,
         user_id: str,
@@ -176,6 +181,7 @@ class FunctionsTable:
                         db.delete(func)
 
                 db.commit()
+                self._valves_cache.invalidate()
 
                 return [
                     FunctionModel.model_validate(func)
@@ -289,6 +295,21 @@ class FunctionsTable:
                 log.exception(f"Error getting function valves by id {id}: {e}")
                 return None
 
+    def get_cached_function_valves_by_id(self, id: str) -> Optional[dict]:
+        """
+        Same as get_function_valves_by_id, served from a per-worker cache that
+        is invalidated whenever the function or its valves are updated.
+        """
+        if not FUNCTION_VALVES_CACHE_TTL:
+            return self.get_function_valves_by_id(id)
+
+        valves = self._valves_cache.get(id)
+        if valves is None:
+            valves = self.get_function_valves_by_id(id)
+            if valves is not None:
+                self._valves_cache.set(id, valves)
+        return valves
+
     def update_function_valves_by_id(
         self, id: str, valves: dict, db: Optional[Session] = None
     ) -> Optional[FunctionValves]:
@@ -299,6 +320,7 @@ class FunctionsTable:
                 function.updated_at = int(time.time())
                 db.commit()
                 db.refresh(function)
+                self._valves_cache.invalidate(id)
                 return self.get_function_by_id(id, db=db)
             except Exception:
                 return None
@@ -344,6 +366,17 @@ class FunctionsTable:
             log.exception(f"Error getting user values by id {id} and user id {user_id}")
             return None
 
+    def get_cached_user_valves_by_id_and_user_id(
+        self, id: str, user_id: str
+    ) -> Optional[dict]:
+        # User valves live in the user's settings, so the user cache covers them
+        user = Users.get_cached_user_by_id(user_id)
+        if user is None:
+            return None
+
+        user_settings = user.settings.model_dump() if user.settings else {}
+        return user_settings.get("functions", {}).get("valves", {}).get(id, {})
+
     def update_user_valves_by_id_and_user_id(
         self, id: str, user_id: str, valves: dict, db: Optional[Session] = None
     ) -> Optional[dict]:
@@ -381,6 +414,7 @@ class FunctionsTable:
                     }
                 )
                 db.commit()
+                self._valves_cache.invalidate(id)
                 return self.get_function_by_id(id, db=db)
             except Exception:
                 return None
@@ -404,6 +438,7 @@ class FunctionsTable:
             try:
                 db.query(Function).filter_by(id=id).delete()
                 db.commit()
+                self._valves_cache.invalidate(id)
 
                 return True
             except Exception:
@@ -6,6 +6,8 @@ import uuid
 
 from sqlalchemy.orm import Session
 from open_webui.internal.db import Base, JSONField, get_db, get_db_context
+from open_webui.env import GROUP_MEMBERSHIP_CACHE_TTL
+from open_webui.utils.cache import VersionedCache
 
 from open_webui.models.files import FileMetadataResponse
 
@@ -120,6 +122,9 @@ class GroupListResponse(BaseModel):
 
 
 class GroupTable:
+    # user_id -> list[GroupModel], invalidated on membership/permission changes
+    _member_cache = VersionedCache("group_members", ttl=GROUP_MEMBERSHIP_CACHE_TTL)
+
     def insert_new_group(
         self, user_id: str, form_data: GroupForm, db: Optional[Session] = None
     ) -> Optional[GroupModel]:
@@ -262,8 +267,17 @@ class GroupTable:
     def get_groups_by_member_id(
         self, user_id: str, db: Optional[Session] = None
     ) -> list[GroupModel]:
+        """
+        Returns the groups of a user. Results are cached per worker; treat the
+        returned list as read-only.
+        """
+        if GROUP_MEMBERSHIP_CACHE_TTL:
+            groups = self._member_cache.get(user_id)
+            if groups is not None:
+                return groups
+
         with get_db_context(db) as db:
-            return [
+            groups = [
                 GroupModel.model_validate(group)
                 for group in db.query(Group)
                 .join(GroupMember, GroupMember.group_id == Group.id)
@@ -272,6 +286,14 @@ class GroupTable:
                 .all()
             ]
 
+        if GROUP_MEMBERSHIP_CACHE_TTL:
+            self._member_cache.set(user_id, groups)
+        return groups
+
+    def invalidate_member_cache(self, user_ids: Optional[list[str]] = None):
+        """Drop cached memberships for the given users, or for everyone."""
+        self._member_cache.invalidate(*(user_ids or []))
+
     def get_groups_by_member_ids(
         self, user_ids: list[str], db: Optional[Session] = None
     ) -> dict[str, list[GroupModel]]:
@@ -358,6 +380,8 @@ class GroupTable:
             db.add_all(new_members)
             db.commit()
 
+        self.invalidate_member_cache()
+
     def get_group_member_count_by_id(
         self, id: str, db: Optional[Session] = None
     ) -> int:
@@ -385,6 +409,7 @@ class GroupTable:
                     }
                 )
                 db.commit()
+                self.invalidate_member_cache()
                 return self.get_group_by_id(id=id, db=db)
         except Exception as e:
             log.exception(e)
@@ -395,6 +420,7 @@ class GroupTable:
             with get_db_context(db) as db:
                 db.query(Group).filter_by(id=id).delete()
                 db.commit()
+                self.invalidate_member_cache()
                 return True
         except Exception:
             return False
@@ -404,6 +430,7 @@ class GroupTable:
             try:
                 db.query(Group).delete()
                 db.commit()
+                self.invalidate_member_cache()
 
                 return True
             except Exception:
@@ -433,6 +460,7 @@ class GroupTable:
                     )
 
                 db.commit()
+                self.invalidate_member_cache([user_id])
                 return True
 
             except Exception:
@@ -526,6 +554,7 @@ class GroupTable:
                     )
 
                 db.commit()
+                self.invalidate_member_cache([user_id])
                 return True
 
             except Exception as e:
@@ -568,6 +597,9 @@ class GroupTable:
                 db.commit()
                 db.refresh(group)
 
+                if user_ids:
+                    self.invalidate_member_cache(user_ids)
+
                 return GroupModel.model_validate(group)
 
         except Exception as e:
@@ -600,6 +632,8 @@ class GroupTable:
 
                 db.commit()
                 db.refresh(group)
+
+                self.invalidate_member_cache(user_ids)
                 return GroupModel.model_validate(group)
 
         except Exception as e:
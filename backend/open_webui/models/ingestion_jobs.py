@@ -0,0 +1,346 @@
+import logging
+import time
+import uuid
+from typing import Optional
+
+from sqlalchemy.orm import Session
+from open_webui.internal.db import Base, get_db_context
+
+from pydantic import BaseModel, ConfigDict
+from sqlalchemy import (
+    JSON,
+    BigInteger,
+    Column,
+    Index,
+    Integer,
+    Text,
+    and_,
+    func,
+    or_,
+)
+
+log = logging.getLogger(__name__)
+
+####################
+# IngestionJob DB Schema
+####################
+
+
+class IngestionJob(Base):
+    __tablename__ = "ingestion_job"
+
+    id = Column(Text, primary_key=True, unique=True)
+    file_id = Column(Text, nullable=False)
+    user_id = Column(Text)
+
+    # queued, running, completed, dead
+    status = Column(Text, nullable=False)
+    attempts = Column(Integer, nullable=False, default=0)
+    error = Column(Text, nullable=True)
+
+    # Worker processing the job and its last sign of life, jobs whose
+    # heartbeat goes stale are put back in the queue
+    worker_id = Column(Text, nullable=True)
+    heartbeat_at = Column(BigInteger, nullable=True)
+
+    # Not picked up before this time, used to back off retries
+    available_at = Column(BigInteger, nullable=False)
+
+    # Seconds spent in each processing stage, {"queue": ..., "load": ..., ...}
+    timings = Column(JSON, nullable=True)
+
+    # Nanoseconds so jobs uploaded within the same second keep their order
+    created_at = Column(BigInteger)
+    updated_at = Column(BigInteger)
+    started_at = Column(BigInteger, nullable=True)
+    finished_at = Column(BigInteger, nullable=True)
+
+    __table_args__ = (
+        # WHERE status = 'queued' AND available_at <= ...
+        Index("ingestion_job_status_available_at_idx", "status", "available_at"),
+        Index("ingestion_job_file_id_idx", "file_id"),
+    )
+
+
+class IngestionJobModel(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: str
+    file_id: str
+    user_id: str
+
+    status: str
+    attempts: int = 0
+    error: Optional[str] = None
+
+    worker_id: Optional[str] = None
+    heartbeat_at: Optional[int] = None
+    available_at: int
+
+    timings: Optional[dict] = None
+
+    created_at: int  # timestamp in epoch (time_ns)
+    updated_at: int  # timestamp in epoch
+    started_at: Optional[int] = None
+    finished_at: Optional[int] = None
+
+
+class IngestionJobTable:
+    def insert_new_job(
+        self, file_id: str, user_id: str, db: Optional[Session] = None
+    ) -> Optional[IngestionJobModel]:
+        with get_db_context(db) as db:
+            now = int(time.time())
+            job = IngestionJob(
+                id=str(uuid.uuid4()),
+                file_id=file_id,
+                user_id=user_id,
+                status="queued",
+                attempts=0,
+                available_at=now,
+                created_at=time.time_ns(),
+                updated_at=now,
+            )
+            db.add(job)
+            db.commit()
+            db.refresh(job)
+            return IngestionJobModel.model_validate(job)
+
+    def get_job_by_id(
+        self, id: str, db: Optional[Session] = None
+    ) -> Optional[IngestionJobModel]:
+        with get_db_context(db) as db:
+            job = db.get(IngestionJob, id)
+            return IngestionJobModel.model_validate(job) if job else None
+
+    def get_latest_job_by_file_id(
+        self, file_id: str, db: Optional[Session] = None
+    ) -> Optional[IngestionJobModel]:
+        with get_db_context(db) as db:
+            job = (
+                db.query(IngestionJob)
+                .filter_by(file_id=file_id)
+                .order_by(IngestionJob.created_at.desc())
+                .first()
+            )
+            return IngestionJobModel.model_validate(job) if job else None
+
+    def get_queue_position(
+        self, job: IngestionJobModel, db: Optional[Session] = None
+    ) -> int:
+        """
+        Number of queued jobs ahead of `job` in arrival order. Workers favour
+        users with fewer running jobs, so this is an estimate.
+        """
+        with get_db_context(db) as db:
+            return (
+                db.query(func.count(IngestionJob.id))
+                .filter(
+                    IngestionJob.status == "queued",
+                    or_(
+                        IngestionJob.created_at < job.created_at,
+                        and_(
+                            IngestionJob.created_at == job.created_at,
+                            IngestionJob.id < job.id,
+                        ),
+                    ),
+                )
+                .scalar()
+            )
+
+    def claim_next_job(
+        self, worker_id: str, db: Optional[Session] = None
+    ) -> Optional[IngestionJobModel]:
+        """
+        Take the next available job. Users with the fewest running jobs go
+        first so one large upload does not hold up everyone else; within a
+        user, jobs run in arrival order.
+        """
+        with get_db_context(db) as db:
+            running = (
+                db.query(
+                    IngestionJob.user_id.label("user_id"),
+                    func.count(IngestionJob.id).label("count"),
+                )
+                .filter(IngestionJob.status == "running")
+                .group_by(IngestionJob.user_id)
+                .subquery()
+            )
+
+            # Another worker may claim the candidate first, try the next one
+            for _ in range(5):
+                now = int(time.time())
+                candidate = (
+                    db.query(IngestionJob.id)
+                    .outerjoin(running, running.c.user_id == IngestionJob.user_id)
+                    .filter(
+                        IngestionJob.status == "queued",
+                        IngestionJob.available_at <= now,
+                    )
+                    .order_by(
+                        func.coalesce(running.c.count, 0),
+                        IngestionJob.created_at,
+                        IngestionJob.id,
+                    )
+                    .first()
+                )
+                if candidate is None:
+                    return None
+
+                claimed = (
+                    db.query(IngestionJob)
+                    .filter(
+                        IngestionJob.id == candidate.id,
+                        IngestionJob.status == "queued",
+                    )
+                    .update(
+                        {
+                            "status": "running",
+                            "worker_id": worker_id,
+                            "heartbeat_at": now,
+                            "started_at": now,
+                            "updated_at": now,
+                            "attempts": IngestionJob.attempts + 1,
+                        },
+                        synchronize_session=False,
+                    )
+                )
+                db.commit()
+                if claimed:
+                    job = db.get(IngestionJob, candidate.id)
+                    db.refresh(job)
+                    return IngestionJobModel.model_validate(job)
+            return None
+
+    def heartbeat_job(
+        self, id: str, worker_id: str, db: Optional[Session] = None
+    ) -> bool:
+        """Extend the lease, returns False once the job is no longer ours."""
+        with get_db_context(db) as db:
+            updated = (
+                db.query(IngestionJob)
+                .filter(
+                    IngestionJob.id == id,
+                    IngestionJob.worker_id == worker_id,
+                    IngestionJob.status == "running",
+                )
+                .update({"heartbeat_at": int(time.time())}, synchronize_session=False)
+            )
+            db.commit()
+            return bool(updated)
+
+    def complete_job(
+        self,
+        id: str,
+        worker_id: str,
+        timings: Optional[dict] = None,
+        db: Optional[Session] = None,
+    ) -> bool:
+        with get_db_context(db) as db:
+            now = int(time.time())
+            updated = (
+                db.query(IngestionJob)
+                .filter(IngestionJob.id == id, IngestionJob.worker_id == worker_id)
+                .update(
+                    {
+                        "status": "completed",
+                        "error": None,
+                        "worker_id": None,
+                        "timings": timings,
+                        "updated_at": now,
+                        "finished_at": now,
+                    },
+                    synchronize_session=False,
+                )
+            )
+            db.commit()
+            return bool(updated)
+
+    def fail_job(
+        self,
+        id: str,
+        worker_id: str,
+        error: str,
+        max_attempts: int,
+        retry_delay: int,
+        timings: Optional[dict] = None,
+        db: Optional[Session] = None,
+    ) -> Optional[IngestionJobModel]:
+        """
+        Put the job back in the queue after `retry_delay` seconds, or move it
+        to the dead letter state ("dead") once `max_attempts` is reached.
+        """
+        with get_db_context(db) as db:
+            job = (
+                db.query(IngestionJob)
+                .filter(IngestionJob.id == id, IngestionJob.worker_id == worker_id)
+                .first()
+            )
+            if job is None:
+                return None
+
+            now = int(time.time())
+            job.error = error
+            job.timings = timings
+            job.worker_id = None
+            job.updated_at = now
+            if job.attempts >= max_attempts:
+                job.status = "dead"
+                job.finished_at = now
+            else:
+                job.status = "queued"
+                job.available_at = now + retry_delay
+            db.commit()
+            db.refresh(job)
+            return IngestionJobModel.model_validate(job)
+
+    def requeue_stale_jobs(
+        self, lease_timeout: int, max_attempts: int, db: Optional[Session] = None
+    ) -> list[IngestionJobModel]:
+        """
+        Release running jobs whose worker stopped sending heartbeats. Returns
+        the jobs that ran out of attempts and were moved to "dead".
+        """
+        with get_db_context(db) as db:
+            now = int(time.time())
+            jobs = (
+                db.query(IngestionJob)
+                .filter(
+                    IngestionJob.status == "running",
+                    IngestionJob.heartbeat_at < now - lease_timeout,
+                )
+                .all()
+            )
+
+            dead_jobs = []
+            for job in jobs:
+                job.worker_id = None
+                job.updated_at = now
+                if job.attempts >= max_attempts:
+                    job.status = "dead"
+                    job.error = "Worker stopped while processing the file"
+                    job.finished_at = now
+                    dead_jobs.append(job)
+                else:
+                    job.status = "queued"
+                    job.available_at = now
+            db.commit()
+            return [IngestionJobModel.model_validate(job) for job in dead_jobs]
+
+    def delete_completed_jobs(
+        self, older_than: int, db: Optional[Session] = None
+    ) -> int:
+        with get_db_context(db) as db:
+            deleted = (
+                db.query(IngestionJob)
+                .filter(
+                    IngestionJob.status == "completed",
+                    IngestionJob.finished_at < older_than,
+                )
+                .delete(synchronize_session=False)
+            )
+            db.commit()
+            return deleted
+
+
+IngestionJobs = IngestionJobTable()
@@ -503,6 +503,29 @@ class KnowledgeTable:
         except Exception:
             return []
 
+    def get_files_by_cursor(
+        self,
+        knowledge_id: str,
+        cursor: Optional[str] = None,
+        limit: int = 100,
+        db: Optional[Session] = None,
+    ) -> list[FileModel]:
+        """
+        Files of a knowledge base ordered by id, in keyset-paginated batches
+        for exports. `cursor` is the id of the last file of the previous batch.
+        """
+        with get_db_context(db) as db:
+            query = (
+                db.query(File)
+                .join(KnowledgeFile, File.id == KnowledgeFile.file_id)
+                .filter(KnowledgeFile.knowledge_id == knowledge_id)
+            )
+            if cursor:
+                query = query.filter(File.id > cursor)
+
+            files = query.order_by(File.id).limit(limit).all()
+            return [FileModel.model_validate(file) for file in files]
+
     def get_file_metadatas_by_id(
         self, knowledge_id: str, db: Optional[Session] = None
     ) -> list[FileMetadataResponse]:
@@ -8,11 +8,12 @@ from open_webui.internal.db import Base, JSONField, get_db, get_db_context
 from open_webui.models.tags import TagModel, Tag, Tags
 from open_webui.models.users import Users, User, UserNameResponse
 from open_webui.models.channels import Channels, ChannelMember
+from open_webui.utils.db.pagination import paginate_by_cursor
 
 
 from pydantic import BaseModel, ConfigDict, field_validator
-from sqlalchemy import BigInteger, Boolean, Column, String, Text, JSON
-from sqlalchemy import or_, func, select, and_, text
+from sqlalchemy import BigInteger, Boolean, Column, Index, Integer, String, Text, JSON
+from sqlalchemy import or_, func, select, and_, text, case
 from sqlalchemy.sql import exists
 
 ####################
@@ -28,6 +29,11 @@ class MessageReaction(Base):
     name = Column(Text)
     created_at = Column(BigInteger)
 
+    __table_args__ = (
+        # WHERE message_id IN (...)
+        Index("message_reaction_message_id_idx", "message_id"),
+    )
+
 
 class MessageReactionModel(BaseModel):
     model_config = ConfigDict(from_attributes=True)
@@ -58,9 +64,20 @@ class Message(Base):
     data = Column(JSON, nullable=True)
     meta = Column(JSON, nullable=True)
 
+    # Thread stats, kept up to date when replies are added or deleted
+    reply_count = Column(Integer, nullable=False, default=0, server_default="0")
+    latest_reply_at = Column(BigInteger, nullable=True)  # time_ns
+
     created_at = Column(BigInteger)  # time_ns
     updated_at = Column(BigInteger)  # time_ns
 
+    __table_args__ = (
+        # WHERE channel_id = ... ORDER BY created_at
+        Index("message_channel_id_created_at_idx", "channel_id", "created_at"),
+        # WHERE parent_id = ...
+        Index("message_parent_id_idx", "parent_id"),
+    )
+
 
 class MessageModel(BaseModel):
     model_config = ConfigDict(from_attributes=True)
@@ -81,6 +98,9 @@ class MessageModel(BaseModel):
     data: Optional[dict] = None
     meta: Optional[dict] = None
 
+    reply_count: int = 0
+    latest_reply_at: Optional[int] = None  # timestamp in epoch (time_ns)
+
     created_at: int  # timestamp in epoch (time_ns)
     updated_at: int  # timestamp in epoch (time_ns)
 
@@ -170,75 +190,161 @@ class MessageTable:
             result = Message(**message.model_dump())
 
             db.add(result)
+            if form_data.parent_id:
+                db.query(Message).filter_by(id=form_data.parent_id).update(
+                    {
+                        Message.reply_count: Message.reply_count + 1,
+                        Message.latest_reply_at: case(
+                            (
+                                func.coalesce(Message.latest_reply_at, 0) > ts,
+                                Message.latest_reply_at,
+                            ),
+                            else_=ts,
+                        ),
+                    },
+                    synchronize_session=False,
+                )
             db.commit()
             db.refresh(result)
             return MessageModel.model_validate(result) if result else None
 
-    def get_message_by_id(
-        self,
-        id: str,
-        include_thread_replies: Optional[bool] = True,
-        db: Optional[Session] = None,
-    ) -> Optional[MessageResponse]:
+    def update_reply_stats_by_id(self, id: str, db: Optional[Session] = None):
+        """Recount the thread replies of a message after some were removed."""
         with get_db_context(db) as db:
-            message = db.get(Message, id)
-            if not message:
-                return None
+            reply_count, latest_reply_at = (
+                db.query(func.count(Message.id), func.max(Message.created_at))
+                .filter(Message.parent_id == id)
+                .one()
+            )
+            db.query(Message).filter_by(id=id).update(
+                {
+                    Message.reply_count: reply_count,
+                    Message.latest_reply_at: latest_reply_at,
+                },
+                synchronize_session=False,
+            )
+            db.commit()
 
-            reply_to_message = (
-                self.get_message_by_id(
-                    message.reply_to_id, include_thread_replies=False, db=db
-                )
-                if message.reply_to_id
-                else None
+    def get_message_responses(
+        self, messages: list[Message], db: Optional[Session] = None
+    ) -> list[MessageResponse]:
+        """
+        Build the responses for a page of messages with a fixed number of
+        queries: reply-to targets, webhooks, users and reactions are each
+        loaded for the whole page at once.
+        """
+        if not messages:
+            return []
+
+        with get_db_context(db) as db:
+            reply_to_ids = list(
+                {message.reply_to_id for message in messages if message.reply_to_id}
+            )
+            reply_to_messages = (
+                {
+                    message.id: message
+                    for message in db.query(Message)
+                    .filter(Message.id.in_(reply_to_ids))
+                    .all()
+                }
+                if reply_to_ids
+                else {}
             )
 
-            reactions = self.get_reactions_by_message_id(id, db=db)
+            user_infos = self._get_user_infos(
+                [*messages, *reply_to_messages.values()], db=db
+            )
+            reactions = self.get_reactions_by_message_ids(
+                [message.id for message in messages], db=db
+            )
 
-            thread_replies = []
-            if include_thread_replies:
-                thread_replies = self.get_thread_replies_by_message_id(id, db=db)
+            responses = []
+            for message in messages:
+                reply_to_message = reply_to_messages.get(message.reply_to_id)
 
-            # Check if message was sent by webhook (webhook info in meta takes precedence)
+                responses.append(
+                    MessageResponse.model_validate(
+                        {
+                            **MessageModel.model_validate(message).model_dump(),
+                            "user": user_infos.get(message.id),
+                            "reply_to_message": (
+                                {
+                                    **MessageModel.model_validate(
+                                        reply_to_message
+                                    ).model_dump(),
+                                    "user": user_infos.get(reply_to_message.id),
+                                }
+                                if reply_to_message
+                                else None
+                            ),
+                            "reactions": reactions.get(message.id, []),
+                        }
+                    )
+                )
+            return responses
+
+    def _get_user_infos(
+        self, messages: list[Message], db: Optional[Session] = None
+    ) -> dict[str, dict]:
+        # Webhook info in meta takes precedence over the user who sent the message
+        webhook_ids = {}
+        user_ids = {}
+        for message in messages:
             webhook_info = message.meta.get("webhook") if message.meta else None
             if webhook_info and webhook_info.get("id"):
-                # Look up webhook by ID to get current name
-                webhook = Channels.get_webhook_by_id(webhook_info.get("id"), db=db)
-                if webhook:
-                    user_info = {
-                        "id": webhook.id,
-                        "name": webhook.name,
-                        "role": "webhook",
-                    }
-                else:
-                    # Webhook was deleted, use placeholder
-                    user_info = {
-                        "id": webhook_info.get("id"),
-                        "name": "Deleted Webhook",
-                        "role": "webhook",
-                    }
+                webhook_ids[message.id] = webhook_info.get("id")
             else:
-                user = Users.get_user_by_id(message.user_id, db=db)
-                user_info = user.model_dump() if user else None
+                user_ids[message.id] = message.user_id
 
-            return MessageResponse.model_validate(
-                {
-                    **MessageModel.model_validate(message).model_dump(),
-                    "user": user_info,
-                    "reply_to_message": (
-                        reply_to_message.model_dump() if reply_to_message else None
-                    ),
-                    "latest_reply_at": (
-                        thread_replies[0].created_at if thread_replies else None
-                    ),
-                    "reply_count": len(thread_replies),
-                    "reactions": reactions,
-                }
+        webhooks = {
+            webhook.id: webhook
+            for webhook in Channels.get_webhooks_by_ids(
+                list(set(webhook_ids.values())), db=db
+            )
+        }
+        users = {
+            user.id: user
+            for user in (
+                Users.get_users_by_user_ids(list(set(user_ids.values())), db=db)
+                if user_ids
+                else []
             )
+        }
+
+        user_infos = {}
+        for message_id, webhook_id in webhook_ids.items():
+            webhook = webhooks.get(webhook_id)
+            user_infos[message_id] = {
+                "id": webhook_id,
+                # Webhook was deleted, use placeholder
+                "name": webhook.name if webhook else "Deleted Webhook",
+                "role": "webhook",
+            }
+        for message_id, user_id in user_ids.items():
+            if user_id in users:
+                user_infos[message_id] = users[user_id].model_dump()
+        return user_infos
+
+    def get_message_by_id(
+        self,
+        id: str,
+        include_thread_replies: Optional[bool] = True,
+        db: Optional[Session] = None,
+    ) -> Optional[MessageResponse]:
+        with get_db_context(db) as db:
+            message = db.get(Message, id)
+            if not message:
+                return None
+
+            response = self.get_message_responses([message], db=db)[0]
+            if not include_thread_replies:
+                response.reply_count = 0
+                response.latest_reply_at = None
+            return response
 
     def get_thread_replies_by_message_id(
         self, id: str, db: Optional[Session] = None
-    ) -> list[MessageReplyToResponse]:
+    ) -> list[MessageResponse]:
         with get_db_context(db) as db:
             all_messages = (
                 db.query(Message)
@@ -246,48 +352,7 @@ class MessageTable:
                 .order_by(Message.created_at.desc())
                 .all()
             )
-
-            messages = []
-            for message in all_messages:
-                reply_to_message = (
-                    self.get_message_by_id(
-                        message.reply_to_id, include_thread_replies=False, db=db
-                    )
-                    if message.reply_to_id
-                    else None
-                )
-
-                webhook_info = message.meta.get("webhook") if message.meta else None
-                user_info = None
-                if webhook_info and webhook_info.get("id"):
-                    webhook = Channels.get_webhook_by_id(webhook_info.get("id"), db=db)
-                    if webhook:
-                        user_info = {
-                            "id": webhook.id,
-                            "name": webhook.name,
-                            "role": "webhook",
-                        }
-                    else:
-                        user_info = {
-                            "id": webhook_info.get("id"),
-                            "name": "Deleted Webhook",
-                            "role": "webhook",
-                        }
-
-                messages.append(
-                    MessageReplyToResponse.model_validate(
-                        {
-                            **MessageModel.model_validate(message).model_dump(),
-                            "user": user_info,
-                            "reply_to_message": (
-                                reply_to_message.model_dump()
-                                if reply_to_message
-                                else None
-                            ),
-                        }
-                    )
-                )
-            return messages
+            return self.get_message_responses(all_messages, db=db)
 
     def get_reply_user_ids_by_message_id(
         self, id: str, db: Optional[Session] = None
@@ -303,59 +368,18 @@ class MessageTable:
         channel_id: str,
         skip: int = 0,
         limit: int = 50,
+        cursor: Optional[tuple[int, str]] = None,
         db: Optional[Session] = None,
-    ) -> list[MessageReplyToResponse]:
+    ) -> list[MessageResponse]:
         with get_db_context(db) as db:
+            query = db.query(Message).filter_by(channel_id=channel_id, parent_id=None)
             all_messages = (
-                db.query(Message)
-                .filter_by(channel_id=channel_id, parent_id=None)
-                .order_by(Message.created_at.desc())
+                paginate_by_cursor(query, Message.created_at, Message.id, cursor)
                 .offset(skip)
                 .limit(limit)
                 .all()
             )
-
-            messages = []
-            for message in all_messages:
-                reply_to_message = (
-                    self.get_message_by_id(
-                        message.reply_to_id, include_thread_replies=False, db=db
-                    )
-                    if message.reply_to_id
-                    else None
-                )
-
-                webhook_info = message.meta.get("webhook") if message.meta else None
-                user_info = None
-                if webhook_info and webhook_info.get("id"):
-                    webhook = Channels.get_webhook_by_id(webhook_info.get("id"), db=db)
-                    if webhook:
-                        user_info = {
-                            "id": webhook.id,
-                            "name": webhook.name,
-                            "role": "webhook",
-                        }
-                    else:
-                        user_info = {
-                            "id": webhook_info.get("id"),
-                            "name": "Deleted Webhook",
-                            "role": "webhook",
-                        }
-
-                messages.append(
-                    MessageReplyToResponse.model_validate(
-                        {
-                            **MessageModel.model_validate(message).model_dump(),
-                            "user": user_info,
-                            "reply_to_message": (
-                                reply_to_message.model_dump()
-                                if reply_to_message
-                                else None
-                            ),
-                        }
-                    )
-                )
-            return messages
+            return self.get_message_responses(all_messages, db=db)
 
     def get_messages_by_parent_id(
         self,
@@ -364,7 +388,7 @@ class MessageTable:
         skip: int = 0,
         limit: int = 50,
         db: Optional[Session] = None,
-    ) -> list[MessageReplyToResponse]:
+    ) -> list[MessageResponse]:
         with get_db_context(db) as db:
             message = db.get(Message, parent_id)
 
@@ -384,47 +408,7 @@ class MessageTable:
             if len(all_messages) < limit:
                 all_messages.append(message)
 
-            messages = []
-            for message in all_messages:
-                reply_to_message = (
-                    self.get_message_by_id(
-                        message.reply_to_id, include_thread_replies=False, db=db
-                    )
-                    if message.reply_to_id
-                    else None
-                )
-
-                webhook_info = message.meta.get("webhook") if message.meta else None
-                user_info = None
-                if webhook_info and webhook_info.get("id"):
-                    webhook = Channels.get_webhook_by_id(webhook_info.get("id"), db=db)
-                    if webhook:
-                        user_info = {
-                            "id": webhook.id,
-                            "name": webhook.name,
-                            "role": "webhook",
-                        }
-                    else:
-                        user_info = {
-                            "id": webhook_info.get("id"),
-                            "name": "Deleted Webhook",
-                            "role": "webhook",
-                        }
-
-                messages.append(
-                    MessageReplyToResponse.model_validate(
-                        {
-                            **MessageModel.model_validate(message).model_dump(),
-                            "user": user_info,
-                            "reply_to_message": (
-                                reply_to_message.model_dump()
-                                if reply_to_message
-                                else None
-                            ),
-                        }
-                    )
-                )
-            return messages
+            return self.get_message_responses(all_messages, db=db)
 
     def get_last_message_by_channel_id(
         self, channel_id: str, db: Optional[Session] = None
@@ -538,34 +522,47 @@ class MessageTable:
     def get_reactions_by_message_id(
         self, id: str, db: Optional[Session] = None
     ) -> list[Reactions]:
+        return self.get_reactions_by_message_ids([id], db=db).get(id, [])
+
+    def get_reactions_by_message_ids(
+        self, ids: list[str], db: Optional[Session] = None
+    ) -> dict[str, list[Reactions]]:
+        if not ids:
+            return {}
+
         with get_db_context(db) as db:
             # JOIN User so all user info is fetched in one query
             results = (
-                db.query(MessageReaction, User)
+                db.query(MessageReaction, User.id, User.name)
                 .join(User, MessageReaction.user_id == User.id)
-                .filter(MessageReaction.message_id == id)
+                .filter(MessageReaction.message_id.in_(ids))
+                .order_by(MessageReaction.created_at)
                 .all()
             )
 
             reactions = {}
 
-            for reaction, user in results:
-                if reaction.name not in reactions:
-                    reactions[reaction.name] = {
+            for reaction, user_id, user_name in results:
+                message_reactions = reactions.setdefault(reaction.message_id, {})
+                if reaction.name not in message_reactions:
+                    message_reactions[reaction.name] = {
                         "name": reaction.name,
                         "users": [],
                         "count": 0,
                     }
 
-                reactions[reaction.name]["users"].append(
+                message_reactions[reaction.name]["users"].append(
                     {
-                        "id": user.id,
-                        "name": user.name,
+                        "id": user_id,
+                        "name": user_name,
                     }
                 )
-                reactions[reaction.name]["count"] += 1
+                message_reactions[reaction.name]["count"] += 1
 
-            return [Reactions(**reaction) for reaction in reactions.values()]
+            return {
+                message_id: [Reactions(**reaction) for reaction in values.values()]
+                for message_id, values in reactions.items()
+            }
 
     def remove_reaction_by_id_and_user_id_and_name(
         self, id: str, user_id: str, name: str, db: Optional[Session] = None
@@ -586,17 +583,27 @@ class MessageTable:
     def delete_replies_by_id(self, id: str, db: Optional[Session] = None) -> bool:
         with get_db_context(db) as db:
             db.query(Message).filter_by(parent_id=id).delete()
+            db.query(Message).filter_by(id=id).update(
+                {Message.reply_count: 0, Message.latest_reply_at: None},
+                synchronize_session=False,
+            )
             db.commit()
             return True
 
     def delete_message_by_id(self, id: str, db: Optional[Session] = None) -> bool:
         with get_db_context(db) as db:
+            message = db.get(Message, id)
+            parent_id = message.parent_id if message else None
+
             db.query(Message).filter_by(id=id).delete()
 
             # Delete all reactions to this message
             db.query(MessageReaction).filter_by(message_id=id).delete()
 
             db.commit()
+
+            if parent_id:
+                self.update_reply_stats_by_id(parent_id, db=db)
             return True
 
     def search_messages_by_channel_ids(
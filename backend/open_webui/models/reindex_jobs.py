@@ -0,0 +1,434 @@
+import logging
+import time
+import uuid
+from typing import Optional
+
+from sqlalchemy.orm import Session
+from open_webui.internal.db import Base, get_db_context
+
+from pydantic import BaseModel, ConfigDict
+from sqlalchemy import (
+    BigInteger,
+    Column,
+    ForeignKey,
+    Index,
+    Integer,
+    Text,
+    func,
+    or_,
+)
+
+log = logging.getLogger(__name__)
+
+####################
+# ReindexJob DB Schema
+####################
+
+
+class ReindexJob(Base):
+    __tablename__ = "reindex_job"
+
+    id = Column(Text, primary_key=True, unique=True)
+    user_id = Column(Text)
+
+    # pending, running, completed, cancelled
+    status = Column(Text, nullable=False)
+
+    # Worker currently running the job and its last sign of life, so another
+    # worker can take over (resume) the job when the heartbeat goes stale
+    worker_id = Column(Text, nullable=True)
+    heartbeat_at = Column(BigInteger, nullable=True)
+
+    created_at = Column(BigInteger)
+    updated_at = Column(BigInteger)
+    started_at = Column(BigInteger, nullable=True)
+    finished_at = Column(BigInteger, nullable=True)
+
+
+class ReindexJobKnowledge(Base):
+    __tablename__ = "reindex_job_knowledge"
+
+    job_id = Column(
+        Text, ForeignKey("reindex_job.id", ondelete="CASCADE"), primary_key=True
+    )
+    knowledge_id = Column(Text, primary_key=True)
+
+    # pending, building, swapping, completed, failed
+    status = Column(Text, nullable=False)
+    # Collection the files are indexed into before replacing the live one,
+    # None when the vector DB cannot copy vectors between collections
+    shadow_collection_name = Column(Text, nullable=True)
+
+    updated_at = Column(BigInteger)
+
+
+class ReindexJobFile(Base):
+    __tablename__ = "reindex_job_file"
+
+    job_id = Column(
+        Text, ForeignKey("reindex_job.id", ondelete="CASCADE"), primary_key=True
+    )
+    knowledge_id = Column(Text, primary_key=True)
+    file_id = Column(Text, primary_key=True)
+
+    # pending, running, completed, failed
+    status = Column(Text, nullable=False)
+    error = Column(Text, nullable=True)
+    attempts = Column(Integer, nullable=False, default=0)
+
+    updated_at = Column(BigInteger)
+
+    __table_args__ = (
+        # WHERE job_id = ... AND status = ...
+        Index("reindex_job_file_job_id_status_idx", "job_id", "status"),
+    )
+
+
+class ReindexJobModel(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: str
+    user_id: str
+    status: str
+
+    worker_id: Optional[str] = None
+    heartbeat_at: Optional[int] = None
+
+    created_at: int  # timestamp in epoch
+    updated_at: int  # timestamp in epoch
+    started_at: Optional[int] = None
+    finished_at: Optional[int] = None
+
+
+class ReindexJobKnowledgeModel(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    job_id: str
+    knowledge_id: str
+    status: str
+    shadow_collection_name: Optional[str] = None
+    updated_at: int
+
+
+class ReindexJobFileModel(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    job_id: str
+    knowledge_id: str
+    file_id: str
+    status: str
+    error: Optional[str] = None
+    attempts: int = 0
+    updated_at: int
+
+
+####################
+# Forms
+####################
+
+
+class ReindexJobProgressResponse(ReindexJobModel):
+    total: int = 0
+    pending: int = 0
+    running: int = 0
+    completed: int = 0
+    failed: int = 0
+
+    knowledge_total: int = 0
+    knowledge_completed: int = 0
+
+    eta_seconds: Optional[int] = None
+
+
+class ReindexJobTable:
+    def insert_new_job(
+        self,
+        user_id: str,
+        knowledge_files: dict[str, list[str]],
+        db: Optional[Session] = None,
+    ) -> Optional[ReindexJobModel]:
+        """Create a job covering `knowledge_files` ({knowledge_id: [file_id, ...]})."""
+        with get_db_context(db) as db:
+            now = int(time.time())
+            job = ReindexJob(
+                id=str(uuid.uuid4()),
+                user_id=user_id,
+                status="pending",
+                created_at=now,
+                updated_at=now,
+            )
+            db.add(job)
+            db.add_all(
+                [
+                    ReindexJobKnowledge(
+                        job_id=job.id,
+                        knowledge_id=knowledge_id,
+                        status="pending",
+                        updated_at=now,
+                    )
+                    for knowledge_id in knowledge_files
+                ]
+            )
+            db.add_all(
+                [
+                    ReindexJobFile(
+                        job_id=job.id,
+                        knowledge_id=knowledge_id,
+                        file_id=file_id,
+                        status="pending",
+                        attempts=0,
+                        updated_at=now,
+                    )
+                    for knowledge_id, file_ids in knowledge_files.items()
+                    for file_id in dict.fromkeys(file_ids)
+                ]
+            )
+            db.commit()
+            db.refresh(job)
+            return ReindexJobModel.model_validate(job)
+
+    def get_job_by_id(
+        self, id: str, db: Optional[Session] = None
+    ) -> Optional[ReindexJobModel]:
+        with get_db_context(db) as db:
+            job = db.get(ReindexJob, id)
+            return ReindexJobModel.model_validate(job) if job else None
+
+    def get_jobs(
+        self, limit: int = 50, db: Optional[Session] = None
+    ) -> list[ReindexJobModel]:
+        with get_db_context(db) as db:
+            return [
+                ReindexJobModel.model_validate(job)
+                for job in db.query(ReindexJob)
+                .order_by(ReindexJob.created_at.desc())
+                .limit(limit)
+                .all()
+            ]
+
+    def get_resumable_jobs(
+        self, lease_timeout: int, db: Optional[Session] = None
+    ) -> list[ReindexJobModel]:
+        """Unfinished jobs that no live worker is running."""
+        with get_db_context(db) as db:
+            stale_before = int(time.time()) - lease_timeout
+            return [
+                ReindexJobModel.model_validate(job)
+                for job in db.query(ReindexJob)
+                .filter(
+                    ReindexJob.status.in_(["pending", "running"]),
+                    or_(
+                        ReindexJob.heartbeat_at.is_(None),
+                        ReindexJob.heartbeat_at < stale_before,
+                    ),
+                )
+                .order_by(ReindexJob.created_at)
+                .all()
+            ]
+
+    def claim_job(
+        self,
+        id: str,
+        worker_id: str,
+        lease_timeout: int,
+        db: Optional[Session] = None,
+    ) -> bool:
+        """
+        Atomically take ownership of an unfinished job that is not held by
+        another live worker. Files left running by a previous owner are put
+        back to pending.
+        """
+        with get_db_context(db) as db:
+            now = int(time.time())
+            claimed = (
+                db.query(ReindexJob)
+                .filter(
+                    ReindexJob.id == id,
+                    ReindexJob.status.in_(["pending", "running"]),
+                    or_(
+                        ReindexJob.worker_id.is_(None),
+                        ReindexJob.worker_id == worker_id,
+                        ReindexJob.heartbeat_at.is_(None),
+                        ReindexJob.heartbeat_at < now - lease_timeout,
+                    ),
+                )
+                .update(
+                    {
+                        "status": "running",
+                        "worker_id": worker_id,
+                        "heartbeat_at": now,
+                        "started_at": now,
+                        "updated_at": now,
+                    },
+                    synchronize_session=False,
+                )
+            )
+            if claimed:
+                db.query(ReindexJobFile).filter(
+                    ReindexJobFile.job_id == id,
+                    ReindexJobFile.status == "running",
+                ).update(
+                    {"status": "pending", "updated_at": now},
+                    synchronize_session=False,
+                )
+            db.commit()
+            return bool(claimed)
+
+    def heartbeat_job(
+        self, id: str, worker_id: str, db: Optional[Session] = None
+    ) -> bool:
+        """Extend the lease, returns False once the job is no longer ours to run."""
+        with get_db_context(db) as db:
+            updated = (
+                db.query(ReindexJob)
+                .filter(
+                    ReindexJob.id == id,
+                    ReindexJob.worker_id == worker_id,
+                    ReindexJob.status == "running",
+                )
+                .update({"heartbeat_at": int(time.time())}, synchronize_session=False)
+            )
+            db.commit()
+            return bool(updated)
+
+    def update_job_status_by_id(
+        self, id: str, status: str, db: Optional[Session] = None
+    ) -> Optional[ReindexJobModel]:
+        with get_db_context(db) as db:
+            job = db.get(ReindexJob, id)
+            if job is None:
+                return None
+
+            now = int(time.time())
+            job.status = status
+            job.updated_at = now
+            if status in ("completed", "cancelled"):
+                job.finished_at = now
+                job.worker_id = None
+            db.commit()
+            db.refresh(job)
+            return ReindexJobModel.model_validate(job)
+
+    def get_knowledge_by_job_id(
+        self, job_id: str, db: Optional[Session] = None
+    ) -> list[ReindexJobKnowledgeModel]:
+        with get_db_context(db) as db:
+            return [
+                ReindexJobKnowledgeModel.model_validate(item)
+                for item in db.query(ReindexJobKnowledge)
+                .filter_by(job_id=job_id)
+                .order_by(ReindexJobKnowledge.knowledge_id)
+                .all()
+            ]
+
+    def update_knowledge_status(
+        self,
+        job_id: str,
+        knowledge_id: str,
+        status: str,
+        shadow_collection_name: Optional[str] = None,
+        db: Optional[Session] = None,
+    ):
+        with get_db_context(db) as db:
+            values = {"status": status, "updated_at": int(time.time())}
+            if shadow_collection_name is not None:
+                values["shadow_collection_name"] = shadow_collection_name
+
+            db.query(ReindexJobKnowledge).filter_by(
+                job_id=job_id, knowledge_id=knowledge_id
+            ).update(values, synchronize_session=False)
+            db.commit()
+
+    def get_files_by_job_id_and_knowledge_id(
+        self,
+        job_id: str,
+        knowledge_id: str,
+        status: Optional[str] = None,
+        db: Optional[Session] = None,
+    ) -> list[ReindexJobFileModel]:
+        with get_db_context(db) as db:
+            query = db.query(ReindexJobFile).filter_by(
+                job_id=job_id, knowledge_id=knowledge_id
+            )
+            if status:
+                query = query.filter_by(status=status)
+            return [ReindexJobFileModel.model_validate(item) for item in query.all()]
+
+    def update_file_status(
+        self,
+        job_id: str,
+        knowledge_id: str,
+        file_id: str,
+        status: str,
+        error: Optional[str] = None,
+        db: Optional[Session] = None,
+    ):
+        with get_db_context(db) as db:
+            values = {
+                "status": status,
+                "error": error,
+                "updated_at": int(time.time()),
+            }
+            if status == "running":
+                values["attempts"] = ReindexJobFile.attempts + 1
+
+            db.query(ReindexJobFile).filter_by(
+                job_id=job_id, knowledge_id=knowledge_id, file_id=file_id
+            ).update(values, synchronize_session=False)
+            db.commit()
+
+    def get_job_progress_by_id(
+        self, id: str, db: Optional[Session] = None
+    ) -> Optional[ReindexJobProgressResponse]:
+        with get_db_context(db) as db:
+            job = db.get(ReindexJob, id)
+            if job is None:
+                return None
+
+            counts = dict(
+                db.query(ReindexJobFile.status, func.count())
+                .filter(ReindexJobFile.job_id == id)
+                .group_by(ReindexJobFile.status)
+                .all()
+            )
+            knowledge_counts = dict(
+                db.query(ReindexJobKnowledge.status, func.count())
+                .filter(ReindexJobKnowledge.job_id == id)
+                .group_by(ReindexJobKnowledge.status)
+                .all()
+            )
+
+            progress = ReindexJobProgressResponse(
+                **ReindexJobModel.model_validate(job).model_dump(),
+                total=sum(counts.values()),
+                pending=counts.get("pending", 0),
+                running=counts.get("running", 0),
+                completed=counts.get("completed", 0),
+                failed=counts.get("failed", 0),
+                knowledge_total=sum(knowledge_counts.values()),
+                knowledge_completed=knowledge_counts.get("completed", 0)
+                + knowledge_counts.get("failed", 0),
+            )
+
+            if job.status == "running" and job.started_at:
+                # Rate of the current run only, earlier runs may have been
+                # interrupted for an unknown amount of time
+                done_this_run = (
+                    db.query(func.count())
+                    .select_from(ReindexJobFile)
+                    .filter(
+                        ReindexJobFile.job_id == id,
+                        ReindexJobFile.status.in_(["completed", "failed"]),
+                        ReindexJobFile.updated_at >= job.started_at,
+                    )
+                    .scalar()
+                )
+                elapsed = int(time.time()) - job.started_at
+                remaining = progress.pending + progress.running
+                if done_this_run and elapsed > 0:
+                    progress.eta_seconds = int(remaining * elapsed / done_this_run)
+
+            return progress
+
+
+ReindexJobs = ReindexJobTable()
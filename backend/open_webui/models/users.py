@@ -1,3 +1,6 @@
+import hashlib
+import logging
+import threading
 import time
 from typing import Optional
 
@@ -5,12 +8,16 @@ from sqlalchemy.orm import Session
 from open_webui.internal.db import Base, JSONField, get_db, get_db_context
 
 
-from open_webui.env import DATABASE_USER_ACTIVE_STATUS_UPDATE_INTERVAL
+from open_webui.env import (
+    AUTH_USER_CACHE_TTL,
+    DATABASE_USER_ACTIVE_STATUS_UPDATE_INTERVAL,
+)
 
 from open_webui.models.chats import Chats
 from open_webui.models.groups import Groups, GroupMember
 from open_webui.models.channels import ChannelMember
 
+from open_webui.utils.cache import VersionedCache
 from open_webui.utils.misc import throttle
 
 
@@ -27,11 +34,13 @@ from sqlalchemy import (
     select,
     cast,
 )
-from sqlalchemy import or_, case
+from sqlalchemy import or_, case, update, bindparam
 from sqlalchemy.dialects.postgresql import JSONB
 
 import datetime
 
+log = logging.getLogger(__name__)
+
 ####################
 # User DB Schema
 ####################
@@ -236,6 +245,14 @@ class UserUpdateForm(BaseModel):
 
 
 class UsersTable:
+    # Used by request authentication: user_id -> UserModel, sha256(api_key) -> user_id
+    _user_cache = VersionedCache("users", ttl=AUTH_USER_CACHE_TTL)
+    _api_key_cache = VersionedCache("api_keys", ttl=AUTH_USER_CACHE_TTL)
+
+    # user_id -> last seen timestamp, written in bulk by flush_last_active()
+    _pending_last_active: dict[str, int] = {}
+    _pending_last_active_lock = threading.Lock()
+
     def insert_new_user(
         self,
         id: str,
@@ -279,6 +296,40 @@ class UsersTable:
         except Exception:
             return None
 
+    def get_cached_user_by_id(self, id: str) -> Optional[UserModel]:
+        """
+        Same as get_user_by_id, served from a short-lived per-worker cache that
+        is invalidated whenever the user, their role or their API key changes.
+        """
+        if not AUTH_USER_CACHE_TTL:
+            return self.get_user_by_id(id)
+
+        user = self._user_cache.get(id)
+        if user is None:
+            user = self.get_user_by_id(id)
+            if user is not None:
+                self._user_cache.set(id, user)
+        return user
+
+    def get_cached_user_by_api_key(self, api_key: str) -> Optional[UserModel]:
+        if not AUTH_USER_CACHE_TTL:
+            return self.get_user_by_api_key(api_key)
+
+        api_key_hash = hashlib.sha256(api_key.encode()).hexdigest()
+
+        user_id = self._api_key_cache.get(api_key_hash)
+        if user_id is not None:
+            return self.get_cached_user_by_id(user_id)
+
+        user = self.get_user_by_api_key(api_key)
+        if user is not None:
+            self._api_key_cache.set(api_key_hash, user.id)
+            self._user_cache.set(user.id, user)
+        return user
+
+    def invalidate_user_cache(self, id: str):
+        self._user_cache.invalidate(id)
+
     def get_user_by_api_key(
         self, api_key: str, db: Optional[Session] = None
     ) -> Optional[UserModel]:
@@ -532,6 +583,7 @@ class UsersTable:
             with get_db_context(db) as db:
                 db.query(User).filter_by(id=id).update({"role": role})
                 db.commit()
+                self.invalidate_user_cache(id)
                 user = db.query(User).filter_by(id=id).first()
                 return UserModel.model_validate(user)
         except Exception:
@@ -546,6 +598,7 @@ class UsersTable:
                     {**form_data.model_dump(exclude_none=True)}
                 )
                 db.commit()
+                self.invalidate_user_cache(id)
 
                 user = db.query(User).filter_by(id=id).first()
                 return UserModel.model_validate(user)
@@ -561,12 +614,51 @@ class UsersTable:
                     {"profile_image_url": profile_image_url}
                 )
                 db.commit()
+                self.invalidate_user_cache(id)
 
                 user = db.query(User).filter_by(id=id).first()
                 return UserModel.model_validate(user)
         except Exception:
             return None
 
+    def mark_user_active_by_id(self, id: str):
+        """
+        Record activity for a user without touching the database. Pending
+        timestamps are written in a single batch by flush_last_active().
+        """
+        with self._pending_last_active_lock:
+            self._pending_last_active[id] = int(time.time())
+
+    def flush_last_active(self, db: Optional[Session] = None) -> int:
+        with self._pending_last_active_lock:
+            pending = self._pending_last_active
+            self._pending_last_active = {}
+
+        if not pending:
+            return 0
+
+        try:
+            with get_db_context(db) as db:
+                db.connection().execute(
+                    update(User)
+                    .where(User.id == bindparam("user_id"))
+                    .values(last_active_at=bindparam("last_active_at")),
+                    [
+                        {"user_id": user_id, "last_active_at": last_active_at}
+                        for user_id, last_active_at in pending.items()
+                    ],
+                )
+                db.commit()
+            return len(pending)
+        except Exception as e:
+            log.error(f"Error updating last active timestamps: {e}")
+
+            # Keep the timestamps for the next flush unless newer ones arrived
+            with self._pending_last_active_lock:
+                for user_id, last_active_at in pending.items():
+                    self._pending_last_active.setdefault(user_id, last_active_at)
+            return 0
+
     @throttle(DATABASE_USER_ACTIVE_STATUS_UPDATE_INTERVAL)
     def update_last_active_by_id(
         self, id: str, db: Optional[Session] = None
@@ -609,6 +701,7 @@ class UsersTable:
                 # Persist updated JSON
                 db.query(User).filter_by(id=id).update({"oauth": oauth})
                 db.commit()
+                self.invalidate_user_cache(id)
 
                 return UserModel.model_validate(user)
 
@@ -622,6 +715,7 @@ class UsersTable:
             with get_db_context(db) as db:
                 db.query(User).filter_by(id=id).update(updated)
                 db.commit()
+                self.invalidate_user_cache(id)
 
                 user = db.query(User).filter_by(id=id).first()
                 return UserModel.model_validate(user)
@@ -648,6 +742,7 @@ class UsersTable:
 
                 db.query(User).filter_by(id=id).update({"settings": user_settings})
                 db.commit()
+                self.invalidate_user_cache(id)
 
                 user = db.query(User).filter_by(id=id).first()
                 return UserModel.model_validate(user)
@@ -666,6 +761,7 @@ class UsersTable:
                     # Delete User
                     db.query(User).filter_by(id=id).delete()
                     db.commit()
+                    self.invalidate_user_cache(id)
 
                 return True
             else:
@@ -690,6 +786,7 @@ class UsersTable:
             with get_db_context(db) as db:
                 db.query(ApiKey).filter_by(user_id=id).delete()
                 db.commit()
+                self._api_key_cache.invalidate()
 
                 now = int(time.time())
                 new_api_key = ApiKey(
@@ -712,6 +809,7 @@ class UsersTable:
             with get_db_context(db) as db:
                 db.query(ApiKey).filter_by(user_id=id).delete()
                 db.commit()
+                self._api_key_cache.invalidate()
                 return True
         except Exception:
             return False
@@ -0,0 +1,684 @@
+import json
+import logging
+import math
+import os
+import sqlite3
+import threading
+from collections import Counter
+from concurrent.futures import Executor
+from typing import Any, Dict, List, Optional, Union
+
+from open_webui.retrieval.vector.main import (
+    AsyncVectorDBBase,
+    GetResult,
+    SearchResult,
+    ThreadedAsyncVectorDB,
+    VectorDBBase,
+    VectorItem,
+)
+
+log = logging.getLogger(__name__)
+
+
+# Same tokenization as langchain's BM25Retriever default preprocessing
+def tokenize(text: str) -> list[str]:
+    return text.split()
+
+
+def get_enrichment_text(metadata: dict) -> str:
+    """Metadata text appended to a chunk for BM25 scoring when enriched texts are enabled."""
+    metadata_parts = []
+
+    # Add filename (repeat twice for extra weight in BM25 scoring)
+    if metadata.get("name"):
+        filename = metadata["name"]
+        filename_tokens = filename.replace("_", " ").replace("-", " ").replace(".", " ")
+        metadata_parts.append(
+            f"Filename: {filename} {filename_tokens} {filename_tokens}"
+        )
+
+    # Add title if available
+    if metadata.get("title"):
+        metadata_parts.append(f"Title: {metadata['title']}")
+
+    # Add document section headings if available (from markdown splitter)
+    if metadata.get("headings") and isinstance(metadata["headings"], list):
+        headings = " > ".join(str(h) for h in metadata["headings"])
+        metadata_parts.append(f"Section: {headings}")
+
+    # Add source URL/path if available
+    if metadata.get("source"):
+        metadata_parts.append(f"Source: {metadata['source']}")
+
+    # Add snippet for web search results
+    if metadata.get("snippet"):
+        metadata_parts.append(f"Snippet: {metadata['snippet']}")
+
+    return " ".join(metadata_parts)
+
+
+class BM25Index:
+    """
+    Persistent BM25 inverted index for vector DB collections, stored in SQLite.
+
+    Every chunk keeps two term frequencies: one over its text and one over its
+    text plus metadata enrichment, so both hybrid search modes share the index.
+    Scores use Okapi BM25 (k1=1.5, b=0.75) with a non-negative idf.
+    """
+
+    # Keep IN (...) lists below SQLite's bound-parameter limit
+    _BATCH_SIZE = 500
+
+    def __init__(self, path: str, k1: float = 1.5, b: float = 0.75):
+        self.path = path
+        self.k1 = k1
+        self.b = b
+
+        self._local = threading.local()
+        self._initialized = False
+        self._init_lock = threading.Lock()
+
+    def _get_connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+
+        if not self._initialized:
+            with self._init_lock:
+                if not self._initialized:
+                    self._create_tables(conn)
+                    self._initialized = True
+        return conn
+
+    @staticmethod
+    def _create_tables(conn: sqlite3.Connection):
+        with conn:
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS bm25_collection (
+                    name TEXT PRIMARY KEY,
+                    doc_count INTEGER NOT NULL,
+                    total_length INTEGER NOT NULL,
+                    total_enriched_length INTEGER NOT NULL
+                )
+                """
+            )
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS bm25_document (
+                    collection TEXT NOT NULL,
+                    id TEXT NOT NULL,
+                    text TEXT,
+                    metadata TEXT,
+                    length INTEGER NOT NULL,
+                    enriched_length INTEGER NOT NULL,
+                    PRIMARY KEY (collection, id)
+                )
+                """
+            )
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS bm25_posting (
+                    collection TEXT NOT NULL,
+                    term TEXT NOT NULL,
+                    doc_id TEXT NOT NULL,
+                    tf INTEGER NOT NULL,
+                    enriched_tf INTEGER NOT NULL,
+                    PRIMARY KEY (collection, term, doc_id)
+                )
+                """
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS bm25_posting_doc_idx "
+                "ON bm25_posting (collection, doc_id)"
+            )
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS bm25_version (
+                    name TEXT PRIMARY KEY,
+                    version TEXT NOT NULL
+                )
+                """
+            )
+
+    def has_collection(self, collection_name: str) -> bool:
+        conn = self._get_connection()
+        row = conn.execute(
+            "SELECT 1 FROM bm25_collection WHERE name = ?", (collection_name,)
+        ).fetchone()
+        return row is not None
+
+    def get_document_count(self, collection_name: str) -> int:
+        conn = self._get_connection()
+        row = conn.execute(
+            "SELECT doc_count FROM bm25_collection WHERE name = ?", (collection_name,)
+        ).fetchone()
+        return row[0] if row else 0
+
+    def get_version(self, collection_name: str) -> Optional[str]:
+        """The BM25IndexVersions version the collection's index is current with."""
+        conn = self._get_connection()
+        row = conn.execute(
+            "SELECT version FROM bm25_version WHERE name = ?", (collection_name,)
+        ).fetchone()
+        return row[0] if row else None
+
+    def set_version(self, collection_name: str, version: str):
+        conn = self._get_connection()
+        with conn:
+            # Only for indexed collections, a dropped index stays dropped
+            conn.execute(
+                "INSERT OR REPLACE INTO bm25_version "
+                "SELECT name, ? FROM bm25_collection WHERE name = ?",
+                (version, collection_name),
+            )
+
+    def build(self, collection_name: str, result: Optional[GetResult]):
+        """(Re)build a collection's index from a full VECTOR_DB_CLIENT.get result."""
+        conn = self._get_connection()
+        with conn:
+            self._delete_collection(conn, collection_name)
+            conn.execute(
+                "INSERT INTO bm25_collection VALUES (?, 0, 0, 0)", (collection_name,)
+            )
+            if result and result.ids and result.ids[0]:
+                self._add(
+                    conn,
+                    collection_name,
+                    zip(result.ids[0], result.documents[0], result.metadatas[0]),
+                )
+
+    def add(self, collection_name: str, items: List[VectorItem]):
+        """Add or replace items in an already indexed collection."""
+        if not self.has_collection(collection_name):
+            return
+
+        conn = self._get_connection()
+        with conn:
+            self._remove(conn, collection_name, [item["id"] for item in items])
+            self._add(
+                conn,
+                collection_name,
+                ((item["id"], item["text"], item["metadata"]) for item in items),
+            )
+
+    def remove(
+        self,
+        collection_name: str,
+        ids: Optional[List[str]] = None,
+        filter: Optional[Dict] = None,
+    ):
+        if not self.has_collection(collection_name):
+            return
+
+        conn = self._get_connection()
+        with conn:
+            if (
+                ids is None
+                and filter
+                and all(
+                    isinstance(value, (str, int, float, bool))
+                    for value in filter.values()
+                )
+            ):
+                ids = self._get_ids_by_filter(conn, collection_name, filter)
+
+            if ids is None:
+                # Filter we cannot evaluate here: rebuild on the next search
+                self._delete_collection(conn, collection_name)
+            else:
+                self._remove(conn, collection_name, ids)
+
+    def delete_collection(self, collection_name: str):
+        conn = self._get_connection()
+        with conn:
+            self._delete_collection(conn, collection_name)
+
+    def reset(self):
+        conn = self._get_connection()
+        with conn:
+            conn.execute("DELETE FROM bm25_posting")
+            conn.execute("DELETE FROM bm25_document")
+            conn.execute("DELETE FROM bm25_collection")
+            conn.execute("DELETE FROM bm25_version")
+
+    def search(
+        self, collection_name: str, query: str, k: int, enriched: bool = False
+    ) -> SearchResult:
+        conn = self._get_connection()
+
+        stats = conn.execute(
+            "SELECT doc_count, total_length, total_enriched_length "
+            "FROM bm25_collection WHERE name = ?",
+            (collection_name,),
+        ).fetchone()
+        if not stats or not stats[0]:
+            return SearchResult(
+                ids=[[]], documents=[[]], metadatas=[[]], distances=[[]]
+            )
+
+        doc_count, total_length, total_enriched_length = stats
+        avg_length = (total_enriched_length if enriched else total_length) / doc_count
+        avg_length = avg_length or 1
+
+        tf_column = "p.enriched_tf" if enriched else "p.tf"
+        length_column = "d.enriched_length" if enriched else "d.length"
+
+        scores: dict[str, float] = {}
+        for term, query_tf in Counter(tokenize(query)).items():
+            postings = conn.execute(
+                f"SELECT p.doc_id, {tf_column}, {length_column} "
+                "FROM bm25_posting p JOIN bm25_document d "
+                "ON d.collection = p.collection AND d.id = p.doc_id "
+                f"WHERE p.collection = ? AND p.term = ? AND {tf_column} > 0",
+                (collection_name, term),
+            ).fetchall()
+            if not postings:
+                continue
+
+            df = len(postings)
+            idf = math.log(1 + (doc_count - df + 0.5) / (df + 0.5))
+            for doc_id, tf, length in postings:
+                score = (
+                    idf
+                    * tf
+                    * (self.k1 + 1)
+                    / (tf + self.k1 * (1 - self.b + self.b * length / avg_length))
+                )
+                scores[doc_id] = scores.get(doc_id, 0.0) + score * query_tf
+
+        top = sorted(scores.items(), key=lambda x: x[1], reverse=True)[:k]
+
+        rows = {}
+        for batch in self._batches([doc_id for doc_id, _ in top]):
+            for doc_id, text, metadata in conn.execute(
+                "SELECT id, text, metadata FROM bm25_document "
+                f"WHERE collection = ? AND id IN ({','.join('?' * len(batch))})",
+                (collection_name, *batch),
+            ):
+                rows[doc_id] = (text, json.loads(metadata) if metadata else {})
+
+        ids, documents, metadatas, distances = [], [], [], []
+        for doc_id, score in top:
+            if doc_id not in rows:
+                continue
+            text, metadata = rows[doc_id]
+            ids.append(doc_id)
+            documents.append(text)
+            metadatas.append(metadata)
+            distances.append(score)
+
+        return SearchResult(
+            ids=[ids],
+            documents=[documents],
+            metadatas=[metadatas],
+            distances=[distances],
+        )
+
+    @classmethod
+    def _batches(cls, values: list) -> list[list]:
+        return [
+            values[i : i + cls._BATCH_SIZE]
+            for i in range(0, len(values), cls._BATCH_SIZE)
+        ]
+
+    def _add(self, conn: sqlite3.Connection, collection_name: str, items):
+        documents = []
+        postings = []
+        total_length = 0
+        total_enriched_length = 0
+
+        for doc_id, text, metadata in items:
+            text = text or ""
+            metadata = metadata if isinstance(metadata, dict) else {}
+
+            tokens = tokenize(text)
+            enrichment_tokens = tokenize(get_enrichment_text(metadata))
+
+            tf = Counter(tokens)
+            enriched_tf = tf + Counter(enrichment_tokens)
+
+            length = len(tokens)
+            enriched_length = length + len(enrichment_tokens)
+            total_length += length
+            total_enriched_length += enriched_length
+
+            documents.append(
+                (
+                    collection_name,
+                    doc_id,
+                    text,
+                    json.dumps(metadata, default=str),
+                    length,
+                    enriched_length,
+                )
+            )
+            postings.extend(
+                (collection_name, term, doc_id, tf.get(term, 0), count)
+                for term, count in enriched_tf.items()
+            )
+
+        if not documents:
+            return
+
+        conn.executemany(
+            "INSERT OR REPLACE INTO bm25_document VALUES (?, ?, ?, ?, ?, ?)",
+            documents,
+        )
+        conn.executemany(
+            "INSERT OR REPLACE INTO bm25_posting VALUES (?, ?, ?, ?, ?)", postings
+        )
+        conn.execute(
+            "UPDATE bm25_collection SET doc_count = doc_count + ?, "
+            "total_length = total_length + ?, "
+            "total_enriched_length = total_enriched_length + ? WHERE name = ?",
+            (len(documents), total_length, total_enriched_length, collection_name),
+        )
+
+    def _remove(self, conn: sqlite3.Connection, collection_name: str, ids: list[str]):
+        for batch in self._batches(list(ids)):
+            placeholders = ",".join("?" * len(batch))
+            count, total_length, total_enriched_length = conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(length), 0), "
+                "COALESCE(SUM(enriched_length), 0) FROM bm25_document "
+                f"WHERE collection = ? AND id IN ({placeholders})",
+                (collection_name, *batch),
+            ).fetchone()
+            if not count:
+                continue
+
+            conn.execute(
+                "DELETE FROM bm25_posting "
+                f"WHERE collection = ? AND doc_id IN ({placeholders})",
+                (collection_name, *batch),
+            )
+            conn.execute(
+                "DELETE FROM bm25_document "
+                f"WHERE collection = ? AND id IN ({placeholders})",
+                (collection_name, *batch),
+            )
+            conn.execute(
+                "UPDATE bm25_collection SET doc_count = doc_count - ?, "
+                "total_length = total_length - ?, "
+                "total_enriched_length = total_enriched_length - ? WHERE name = ?",
+                (count, total_length, total_enriched_length, collection_name),
+            )
+
+    @staticmethod
+    def _get_ids_by_filter(
+        conn: sqlite3.Connection, collection_name: str, filter: Dict
+    ) -> list[str]:
+        clauses = []
+        params = [collection_name]
+        for key, value in filter.items():
+            clauses.append("json_extract(metadata, ?) = ?")
+            params.extend([f'$."{key}"', value])
+
+        return [
+            row[0]
+            for row in conn.execute(
+                "SELECT id FROM bm25_document WHERE collection = ? AND "
+                + " AND ".join(clauses),
+                params,
+            )
+        ]
+
+    @staticmethod
+    def _delete_collection(conn: sqlite3.Connection, collection_name: str):
+        conn.execute(
+            "DELETE FROM bm25_posting WHERE collection = ?", (collection_name,)
+        )
+        conn.execute(
+            "DELETE FROM bm25_document WHERE collection = ?", (collection_name,)
+        )
+        conn.execute("DELETE FROM bm25_collection WHERE name = ?", (collection_name,))
+        conn.execute("DELETE FROM bm25_version WHERE name = ?", (collection_name,))
+
+
+class BM25IndexVersions:
+    """
+    Per-collection write counters shared in Redis, so nodes that did not make
+    a write notice that their local BM25 index of that collection is stale.
+
+    Versions are "<epoch>:<count>". The count is bumped by every write to a
+    collection, the epoch by a reset of the whole vector DB.
+    """
+
+    # Collection names never contain "*"
+    EPOCH_FIELD = "*"
+
+    def __init__(self, redis, key: str):
+        self.redis = redis
+        self.key = key
+
+    def get(self, collection_name: str) -> str:
+        count, epoch = self.redis.hmget(self.key, collection_name, self.EPOCH_FIELD)
+        return f"{epoch or 0}:{count or 0}"
+
+    def bump(self, collection_name: str) -> tuple[str, str]:
+        """Record a write, returns the versions before and after it."""
+        pipe = self.redis.pipeline()
+        pipe.hincrby(self.key, collection_name, 1)
+        pipe.hget(self.key, self.EPOCH_FIELD)
+        count, epoch = pipe.execute()
+        return f"{epoch or 0}:{count - 1}", f"{epoch or 0}:{count}"
+
+    def bump_all(self):
+        self.redis.hincrby(self.key, self.EPOCH_FIELD, 1)
+
+
+class BM25IndexedVectorDB:
+    """
+    Wraps a vector DB client and mirrors its writes into a BM25Index, so
+    every insert, upsert and delete path keeps the keyword index current.
+    Everything else is passed through to the wrapped client unchanged.
+
+    Collections are indexed lazily on their first hybrid search. If updating
+    the index fails, that collection's index is dropped and rebuilt on the
+    next search instead of serving stale results.
+
+    The index is local to the node. With `versions`, writes made by other
+    nodes and workers are noticed before a search, and the collection's
+    index is rebuilt.
+    """
+
+    def __init__(
+        self,
+        client: VectorDBBase,
+        index: BM25Index,
+        versions: Optional[BM25IndexVersions] = None,
+    ):
+        self.client = client
+        self.index = index
+        self.versions = versions
+
+    def __getattr__(self, name: str) -> Any:
+        if name in ("client", "index", "versions"):
+            raise AttributeError(name)
+        return getattr(self.client, name)
+
+    def _sync_index(self, collection_name: Optional[str], fn, *args, **kwargs):
+        try:
+            if self.versions is None:
+                fn(*args, **kwargs)
+            elif collection_name is None:
+                self.versions.bump_all()
+                fn(*args, **kwargs)
+            else:
+                previous, current = self.versions.bump(collection_name)
+                if self.index.get_version(collection_name) == previous:
+                    fn(*args, **kwargs)
+                    self.index.set_version(collection_name, current)
+                else:
+                    # Missed a write made elsewhere, rebuild on the next search
+                    self.index.delete_collection(collection_name)
+        except Exception as e:
+            log.exception(f"Failed to update BM25 index for {collection_name}: {e}")
+            try:
+                if collection_name is None:
+                    self.index.reset()
+                else:
+                    self.index.delete_collection(collection_name)
+            except Exception:
+                pass
+
+    def ensure_bm25_index(self, collection_name: str):
+        version = None
+        if self.versions is not None:
+            try:
+                version = self.versions.get(collection_name)
+            except Exception as e:
+                log.warning(f"Failed to read BM25 index version: {e}")
+                # Unknown version, rebuild
+                version = ""
+
+        if not self.index.has_collection(collection_name) or (
+            version is not None and self.index.get_version(collection_name) != version
+        ):
+            log.info(f"Building BM25 index for collection {collection_name}")
+            # Read before the build, a write during it triggers another rebuild
+            self.index.build(
+                collection_name, self.client.get(collection_name=collection_name)
+            )
+            if version:
+                self.index.set_version(collection_name, version)
+
+    def get_bm25_document_count(self, collection_name: str) -> int:
+        self.ensure_bm25_index(collection_name)
+        return self.index.get_document_count(collection_name)
+
+    def bm25_search(
+        self, collection_name: str, query: str, k: int, enriched: bool = False
+    ) -> SearchResult:
+        self.ensure_bm25_index(collection_name)
+        return self.index.search(collection_name, query, k, enriched=enriched)
+
+    def delete_collection(self, collection_name: str) -> None:
+        self.client.delete_collection(collection_name)
+        self._sync_index(collection_name, self.index.delete_collection, collection_name)
+
+    def insert(self, collection_name: str, items: List[VectorItem]) -> None:
+        self.client.insert(collection_name, items)
+        self._sync_index(collection_name, self.index.add, collection_name, items)
+
+    def upsert(self, collection_name: str, items: List[VectorItem]) -> None:
+        self.client.upsert(collection_name, items)
+        self._sync_index(collection_name, self.index.add, collection_name, items)
+
+    def delete(
+        self,
+        collection_name: str,
+        ids: Optional[List[str]] = None,
+        filter: Optional[Dict] = None,
+    ) -> None:
+        self.client.delete(collection_name=collection_name, ids=ids, filter=filter)
+        self._sync_index(
+            collection_name, self.index.remove, collection_name, ids=ids, filter=filter
+        )
+
+    def reset(self) -> None:
+        self.client.reset()
+        self._sync_index(None, self.index.reset)
+
+
+class AsyncBM25IndexedVectorDB(ThreadedAsyncVectorDB):
+    """
+    Async counterpart of BM25IndexedVectorDB. Reads and writes go to the
+    backend's async client `async_client`, so backends with a native async
+    API keep using it; writes are then mirrored into the BM25 index of
+    `client` in the executor.
+    """
+
+    def __init__(
+        self,
+        client: BM25IndexedVectorDB,
+        async_client: AsyncVectorDBBase,
+        executor: Executor,
+    ):
+        super().__init__(client, executor)
+        self.async_client = async_client
+
+    async def has_collection(self, collection_name: str) -> bool:
+        return await self.async_client.has_collection(collection_name)
+
+    async def search(
+        self,
+        collection_name: str,
+        vectors: List[List[Union[float, int]]],
+        filter: Optional[Dict] = None,
+        limit: int = 10,
+    ) -> Optional[SearchResult]:
+        return await self.async_client.search(
+            collection_name=collection_name, vectors=vectors, filter=filter, limit=limit
+        )
+
+    async def search_collections(
+        self,
+        collection_names: List[str],
+        vectors: List[List[Union[float, int]]],
+        limit: int = 10,
+    ) -> Dict[str, Optional[SearchResult]]:
+        return await self.async_client.search_collections(
+            collection_names, vectors, limit
+        )
+
+    async def query(
+        self, collection_name: str, filter: Dict, limit: Optional[int] = None
+    ) -> Optional[GetResult]:
+        return await self.async_client.query(
+            collection_name=collection_name, filter=filter, limit=limit
+        )
+
+    async def get(self, collection_name: str) -> Optional[GetResult]:
+        return await self.async_client.get(collection_name)
+
+    async def delete_collection(self, collection_name: str) -> None:
+        await self.async_client.delete_collection(collection_name)
+        await self._run(
+            self.client._sync_index,
+            collection_name,
+            self.client.index.delete_collection,
+            collection_name,
+        )
+
+    async def insert(self, collection_name: str, items: List[VectorItem]) -> None:
+        await self.async_client.insert(collection_name, items)
+        await self._run(
+            self.client._sync_index,
+            collection_name,
+            self.client.index.add,
+            collection_name,
+            items,
+        )
+
+    async def upsert(self, collection_name: str, items: List[VectorItem]) -> None:
+        await self.async_client.upsert(collection_name, items)
+        await self._run(
+            self.client._sync_index,
+            collection_name,
+            self.client.index.add,
+            collection_name,
+            items,
+        )
+
+    async def delete(
+        self,
+        collection_name: str,
+        ids: Optional[List[str]] = None,
+        filter: Optional[Dict] = None,
+    ) -> None:
+        await self.async_client.delete(
+            collection_name=collection_name, ids=ids, filter=filter
+        )
+        await self._run(
+            self.client._sync_index,
+            collection_name,
+            self.client.index.remove,
+            collection_name,
+            ids=ids,
+            filter=filter,
+        )
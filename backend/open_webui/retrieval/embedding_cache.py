@@ -0,0 +1,224 @@
+import asyncio
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Optional
+
+import numpy as np
+from opentelemetry import metrics
+
+from open_webui.config import (
+    ENABLE_RAG_EMBEDDING_CACHE,
+    RAG_EMBEDDING_CACHE_PATH,
+    RAG_EMBEDDING_CACHE_MAX_ENTRIES,
+    RAG_EMBEDDING_CACHE_DTYPE,
+)
+
+log = logging.getLogger(__name__)
+meter = metrics.get_meter(__name__)
+
+embedding_cache_hits = meter.create_counter(
+    name="webui.rag.embedding_cache.hits",
+    description="Embeddings served from the embedding cache",
+    unit="embeddings",
+)
+embedding_cache_misses = meter.create_counter(
+    name="webui.rag.embedding_cache.misses",
+    description="Embeddings that had to be computed by the embedding engine",
+    unit="embeddings",
+)
+
+
+class EmbeddingCache:
+    """
+    Content-addressed embedding store in SQLite.
+
+    Entries are keyed by (engine, model, prefix, sha256(text)) and stored as
+    float32 or float16 blobs. Once the cache grows past `max_entries`, the
+    least recently used tenth is evicted.
+    """
+
+    # Keep IN (...) lists below SQLite's bound-parameter limit
+    _BATCH_SIZE = 500
+
+    def __init__(self, path: str, max_entries: int = 1_000_000, dtype: str = "float32"):
+        self.path = path
+        self.max_entries = max_entries
+        self.dtype = np.dtype(dtype)
+
+        self._local = threading.local()
+        self._initialized = False
+        self._init_lock = threading.Lock()
+
+        self._count: Optional[int] = None
+        self._count_lock = threading.Lock()
+
+    def _get_connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+
+        if not self._initialized:
+            with self._init_lock:
+                if not self._initialized:
+                    with conn:
+                        conn.execute(
+                            """
+                            CREATE TABLE IF NOT EXISTS embedding (
+                                key BLOB PRIMARY KEY,
+                                dtype TEXT NOT NULL,
+                                vector BLOB NOT NULL,
+                                accessed_at INTEGER NOT NULL
+                            )
+                            """
+                        )
+                        conn.execute(
+                            "CREATE INDEX IF NOT EXISTS embedding_accessed_at_idx "
+                            "ON embedding (accessed_at)"
+                        )
+                    self._initialized = True
+        return conn
+
+    @staticmethod
+    def get_key(engine: str, model: str, prefix: Optional[str], text: str) -> bytes:
+        text_hash = hashlib.sha256(text.encode("utf-8", "surrogatepass")).hexdigest()
+        return hashlib.sha256(
+            "\0".join([engine or "", model or "", prefix or "", text_hash]).encode()
+        ).digest()
+
+    def get_many(self, keys: list[bytes]) -> dict[bytes, list[float]]:
+        conn = self._get_connection()
+
+        found = {}
+        for i in range(0, len(keys), self._BATCH_SIZE):
+            batch = list(set(keys[i : i + self._BATCH_SIZE]))
+            for key, dtype, vector in conn.execute(
+                "SELECT key, dtype, vector FROM embedding "
+                f"WHERE key IN ({','.join('?' * len(batch))})",
+                batch,
+            ):
+                found[key] = np.frombuffer(vector, dtype=dtype).tolist()
+
+        if found:
+            now = int(time.time())
+            with conn:
+                conn.executemany(
+                    "UPDATE embedding SET accessed_at = ? WHERE key = ?",
+                    [(now, key) for key in found],
+                )
+        return found
+
+    def set_many(self, entries: dict[bytes, list[float]]):
+        if not entries:
+            return
+
+        conn = self._get_connection()
+        now = int(time.time())
+        with conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO embedding VALUES (?, ?, ?, ?)",
+                [
+                    (
+                        key,
+                        self.dtype.name,
+                        np.asarray(vector, dtype=self.dtype).tobytes(),
+                        now,
+                    )
+                    for key, vector in entries.items()
+                ],
+            )
+
+        with self._count_lock:
+            if self._count is None:
+                self._count = conn.execute("SELECT COUNT(*) FROM embedding").fetchone()[
+                    0
+                ]
+            else:
+                self._count += len(entries)
+
+            if self._count > self.max_entries:
+                self._evict(conn)
+
+    def _evict(self, conn: sqlite3.Connection):
+        evict_count = max(self._count - self.max_entries, self.max_entries // 10)
+        with conn:
+            conn.execute(
+                "DELETE FROM embedding WHERE key IN ("
+                "SELECT key FROM embedding ORDER BY accessed_at LIMIT ?)",
+                (evict_count,),
+            )
+        self._count = conn.execute("SELECT COUNT(*) FROM embedding").fetchone()[0]
+        log.info(f"Evicted embeddings from cache, {self._count} entries left")
+
+    def wrap(self, embedding_function, engine: str, model: str):
+        """
+        Wrap an async embedding function (query, prefix=None, user=None) so that
+        only texts missing from the cache are sent to the embedding engine.
+        """
+
+        async def cached_embedding_function(query, prefix=None, user=None):
+            texts = query if isinstance(query, list) else [query]
+            if not texts:
+                return await embedding_function(query, prefix=prefix, user=user)
+
+            keys = [self.get_key(engine, model, prefix, text) for text in texts]
+            try:
+                cached = await asyncio.to_thread(self.get_many, keys)
+            except Exception as e:
+                log.error(f"Failed to read embedding cache: {e}")
+                cached = {}
+
+            missing = [idx for idx, key in enumerate(keys) if key not in cached]
+            embedding_cache_hits.add(len(texts) - len(missing))
+            embedding_cache_misses.add(len(missing))
+
+            if missing:
+                if isinstance(query, list):
+                    result = await embedding_function(
+                        [texts[idx] for idx in missing], prefix=prefix, user=user
+                    )
+                    embeddings = result
+                else:
+                    result = await embedding_function(query, prefix=prefix, user=user)
+                    embeddings = [result] if result is not None else None
+
+                if not embeddings or len(embeddings) != len(missing):
+                    # Failed or partial results cannot be aligned with the
+                    # cached entries: return them as the engine produced them
+                    if len(missing) == len(texts):
+                        return result
+                    log.warning(
+                        "Embedding engine returned an unexpected number of "
+                        "embeddings, retrying without the cache"
+                    )
+                    return await embedding_function(query, prefix=prefix, user=user)
+
+                computed = {keys[idx]: embeddings[i] for i, idx in enumerate(missing)}
+                try:
+                    await asyncio.to_thread(self.set_many, computed)
+                except Exception as e:
+                    log.error(f"Failed to write embedding cache: {e}")
+                cached.update(computed)
+
+            results = [cached[key] for key in keys]
+            return results if isinstance(query, list) else results[0]
+
+        return cached_embedding_function
+
+
+EMBEDDING_CACHE = (
+    EmbeddingCache(
+        RAG_EMBEDDING_CACHE_PATH,
+        max_entries=RAG_EMBEDDING_CACHE_MAX_ENTRIES,
+        dtype=RAG_EMBEDDING_CACHE_DTYPE,
+    )
+    if ENABLE_RAG_EMBEDDING_CACHE
+    else None
+)
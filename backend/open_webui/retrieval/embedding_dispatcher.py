@@ -0,0 +1,318 @@
+import asyncio
+import logging
+import random
+from typing import Awaitable, Callable, Hashable, Optional, Union
+
+import aiohttp
+
+from open_webui.config import (
+    RAG_EMBEDDING_CONCURRENCY,
+    RAG_EMBEDDING_MAX_BATCH_TOKENS,
+    RAG_EMBEDDING_MAX_RETRIES,
+    RAG_EMBEDDING_QUERY_COALESCE_WINDOW,
+)
+from open_webui.env import AIOHTTP_CLIENT_TIMEOUT
+from open_webui.utils.session_pool import CLIENT_SESSION_POOL
+
+log = logging.getLogger(__name__)
+
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+
+EmbeddingFunction = Callable[..., Awaitable[Optional[list]]]
+
+
+def estimate_tokens(text: str) -> int:
+    # Roughly four characters per token for BPE tokenizers; cheap enough to
+    # run over every chunk of a large document
+    return len(text) // 4 + 1
+
+
+class _CoalescedBatch:
+    def __init__(self):
+        self.texts: list[str] = []
+        self.positions: dict[str, int] = {}
+        self.tokens = 0
+        self.waiters: list[tuple[asyncio.Future, list[int], bool]] = []
+        self.full = asyncio.Event()
+
+
+class EmbeddingDispatcher:
+    """
+    Shared scheduler for calls to remote embedding engines.
+
+    - At most `max_concurrency` embedding requests are in flight per event
+      loop, however many documents are being ingested at once.
+    - Batches are cut by both text count and an estimated token budget so a
+      handful of long chunks does not exceed the provider's request limit.
+    - Requests answered with 429 or 5xx are retried with exponential backoff,
+      honouring Retry-After when the provider sends it.
+    - Small calls (typically single query embeddings) issued by concurrent
+      requests within `coalesce_window` seconds are merged into one batch.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = 8,
+        max_batch_tokens: int = 100_000,
+        max_retries: int = 5,
+        coalesce_window: float = 0.01,
+        backoff_base: float = 0.5,
+        backoff_max: float = 30.0,
+    ):
+        self.max_concurrency = max(1, max_concurrency)
+        self.max_batch_tokens = max_batch_tokens
+        self.max_retries = max_retries
+        self.coalesce_window = coalesce_window
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+
+        self._semaphores: dict[
+            int, tuple[asyncio.AbstractEventLoop, asyncio.Semaphore]
+        ] = {}
+        self._pending: dict[tuple, _CoalescedBatch] = {}
+        self._tasks: set[asyncio.Task] = set()
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        entry = self._semaphores.get(id(loop))
+        if entry is None or entry[0] is not loop:
+            for key, (other_loop, _) in list(self._semaphores.items()):
+                if other_loop.is_closed():
+                    del self._semaphores[key]
+            entry = (loop, asyncio.Semaphore(self.max_concurrency))
+            self._semaphores[id(loop)] = entry
+        return entry[1]
+
+    def get_batches(self, texts: list[str], batch_size: int) -> list[list[str]]:
+        batch_size = max(1, int(batch_size))
+
+        batches = []
+        batch, tokens = [], 0
+        for text in texts:
+            text_tokens = estimate_tokens(text)
+            if batch and (
+                len(batch) >= batch_size
+                or (
+                    self.max_batch_tokens > 0
+                    and tokens + text_tokens > self.max_batch_tokens
+                )
+            ):
+                batches.append(batch)
+                batch, tokens = [], 0
+            batch.append(text)
+            tokens += text_tokens
+
+        if batch:
+            batches.append(batch)
+        return batches
+
+    async def _call(
+        self,
+        embedding_function: EmbeddingFunction,
+        texts: list[str],
+        prefix: Optional[str],
+        user,
+    ) -> Optional[list]:
+        async with self._get_semaphore():
+            return await embedding_function(texts, prefix=prefix, user=user)
+
+    async def embed(
+        self,
+        embedding_function: EmbeddingFunction,
+        query: Union[str, list[str]],
+        prefix: Optional[str] = None,
+        user=None,
+        batch_size: int = 1,
+        parallel: bool = True,
+        coalesce_key: Optional[Hashable] = None,
+    ):
+        """
+        Embed `query` (a text or a list of texts) with `embedding_function`,
+        which takes a batch of texts and returns their embeddings or None.
+        Returns a single embedding for a text, a list for a list.
+        """
+        texts = query if isinstance(query, list) else [query]
+
+        if (
+            coalesce_key is not None
+            and self.coalesce_window > 0
+            and texts
+            and len(self.get_batches(texts, batch_size)) == 1
+        ):
+            return await self._embed_coalesced(
+                embedding_function,
+                query,
+                prefix=prefix,
+                user=user,
+                batch_size=batch_size,
+                coalesce_key=coalesce_key,
+            )
+
+        if not isinstance(query, list):
+            result = await self._call(embedding_function, texts, prefix, user)
+            return result[0] if result else None
+
+        batches = self.get_batches(texts, batch_size)
+        if parallel:
+            log.debug(
+                f"EmbeddingDispatcher: Processing {len(batches)} batches with up to {self.max_concurrency} in flight"
+            )
+            batch_results = await asyncio.gather(
+                *[
+                    self._call(embedding_function, batch, prefix, user)
+                    for batch in batches
+                ]
+            )
+        else:
+            log.debug(
+                f"EmbeddingDispatcher: Processing {len(batches)} batches sequentially"
+            )
+            batch_results = []
+            for batch in batches:
+                batch_results.append(
+                    await self._call(embedding_function, batch, prefix, user)
+                )
+
+        # Flatten results
+        embeddings = []
+        for batch_embeddings in batch_results:
+            if isinstance(batch_embeddings, list):
+                embeddings.extend(batch_embeddings)
+
+        log.debug(
+            f"EmbeddingDispatcher: Generated {len(embeddings)} embeddings from {len(batches)} batches"
+        )
+        return embeddings
+
+    async def _embed_coalesced(
+        self,
+        embedding_function: EmbeddingFunction,
+        query: Union[str, list[str]],
+        prefix: Optional[str],
+        user,
+        batch_size: int,
+        coalesce_key: Hashable,
+    ):
+        loop = asyncio.get_running_loop()
+        texts = query if isinstance(query, list) else [query]
+        key = (id(loop), coalesce_key, prefix)
+
+        batch = self._pending.get(key)
+        if batch is not None:
+            new_texts = [text for text in set(texts) if text not in batch.positions]
+            new_tokens = sum(estimate_tokens(text) for text in new_texts)
+            if len(batch.texts) + len(new_texts) > max(1, int(batch_size)) or (
+                self.max_batch_tokens > 0
+                and batch.tokens + new_tokens > self.max_batch_tokens
+            ):
+                batch.full.set()
+                del self._pending[key]
+                batch = None
+
+        if batch is None:
+            batch = _CoalescedBatch()
+            self._pending[key] = batch
+            task = asyncio.create_task(
+                self._flush_coalesced(key, batch, embedding_function, prefix, user)
+            )
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+        indices = []
+        for text in texts:
+            if text not in batch.positions:
+                batch.positions[text] = len(batch.texts)
+                batch.texts.append(text)
+                batch.tokens += estimate_tokens(text)
+            indices.append(batch.positions[text])
+
+        if len(batch.texts) >= max(1, int(batch_size)):
+            batch.full.set()
+            if self._pending.get(key) is batch:
+                del self._pending[key]
+
+        future = loop.create_future()
+        batch.waiters.append((future, indices, isinstance(query, list)))
+        return await future
+
+    async def _flush_coalesced(
+        self,
+        key: tuple,
+        batch: _CoalescedBatch,
+        embedding_function: EmbeddingFunction,
+        prefix: Optional[str],
+        user,
+    ):
+        try:
+            await asyncio.wait_for(batch.full.wait(), timeout=self.coalesce_window)
+        except asyncio.TimeoutError:
+            pass
+        if self._pending.get(key) is batch:
+            del self._pending[key]
+
+        log.debug(
+            f"EmbeddingDispatcher: Coalesced {len(batch.waiters)} calls into a batch of {len(batch.texts)}"
+        )
+        try:
+            result = await self._call(embedding_function, batch.texts, prefix, user)
+        except Exception as e:
+            for future, _, _ in batch.waiters:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        if not isinstance(result, list) or len(result) != len(batch.texts):
+            result = None
+
+        for future, indices, is_list in batch.waiters:
+            if future.done():
+                continue
+            if result is None:
+                future.set_result([] if is_list else None)
+            elif is_list:
+                future.set_result([result[idx] for idx in indices])
+            else:
+                future.set_result(result[indices[0]])
+
+    def _get_retry_delay(self, response: aiohttp.ClientResponse, attempt: int) -> float:
+        retry_after = response.headers.get("Retry-After")
+        if retry_after:
+            try:
+                return min(float(retry_after), self.backoff_max)
+            except ValueError:
+                pass
+        delay = min(self.backoff_base * (2**attempt), self.backoff_max)
+        return delay * random.uniform(0.5, 1.5)
+
+    async def post(self, url: str, **kwargs) -> dict:
+        """
+        POST to an embedding endpoint through the shared session pool,
+        retrying 429 and 5xx responses. Returns the decoded JSON body.
+        """
+        kwargs.setdefault(
+            "timeout", aiohttp.ClientTimeout(total=AIOHTTP_CLIENT_TIMEOUT)
+        )
+
+        attempt = 0
+        while True:
+            async with CLIENT_SESSION_POOL.session(url) as session:
+                async with session.post(url, **kwargs) as r:
+                    if r.status in RETRY_STATUS_CODES and attempt < self.max_retries:
+                        delay = self._get_retry_delay(r, attempt)
+                        log.warning(
+                            f"Embedding request returned {r.status}, retrying in {delay:.2f}s ({attempt + 1}/{self.max_retries})"
+                        )
+                    else:
+                        r.raise_for_status()
+                        return await r.json()
+
+            attempt += 1
+            await asyncio.sleep(delay)
+
+
+EMBEDDING_DISPATCHER = EmbeddingDispatcher(
+    max_concurrency=RAG_EMBEDDING_CONCURRENCY,
+    max_batch_tokens=RAG_EMBEDDING_MAX_BATCH_TOKENS,
+    max_retries=RAG_EMBEDDING_MAX_RETRIES,
+    coalesce_window=RAG_EMBEDDING_QUERY_COALESCE_WINDOW,
+)
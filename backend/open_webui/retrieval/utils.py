@@ -3,10 +3,8 @@ import os
 from typing import Awaitable, Optional, Union
 
 import requests
-import aiohttp
 import asyncio
 import hashlib
-from concurrent.futures import ThreadPoolExecutor
 import time
 import re
 
@@ -20,7 +18,10 @@ from langchain_community.retrievers import BM25Retriever
 from langchain_core.documents import Document
 
 from open_webui.config import VECTOR_DB
-from open_webui.retrieval.vector.factory import VECTOR_DB_CLIENT
+from open_webui.retrieval.vector.factory import (
+    ASYNC_VECTOR_DB_CLIENT,
+    VECTOR_DB_CLIENT,
+)
 
 
 from open_webui.models.users import UserModel
@@ -31,6 +32,9 @@ from open_webui.models.chats import Chats
 from open_webui.models.notes import Notes
 
 from open_webui.retrieval.vector.main import GetResult
+from open_webui.retrieval.bm25 import get_enrichment_text
+from open_webui.retrieval.embedding_cache import EMBEDDING_CACHE
+from open_webui.retrieval.embedding_dispatcher import EMBEDDING_DISPATCHER
 from open_webui.utils.access_control import has_access
 from open_webui.utils.headers import include_user_info_headers
 from open_webui.utils.misc import get_message_list
@@ -40,7 +44,6 @@ from open_webui.retrieval.loaders.youtube import YoutubeLoader
 
 
 from open_webui.env import (
-    AIOHTTP_CLIENT_TIMEOUT,
     OFFLINE_MODE,
     ENABLE_FORWARD_USER_INFO_HEADERS,
     AIOHTTP_CLIENT_SESSION_SSL,
@@ -114,7 +117,7 @@ class VectorSearchRetriever(BaseRetriever):
         run_manager: CallbackManagerForRetrieverRun,
     ) -> list[Document]:
         embedding = await self.embedding_function(query, RAG_EMBEDDING_QUERY_PREFIX)
-        result = VECTOR_DB_CLIENT.search(
+        result = await ASYNC_VECTOR_DB_CLIENT.search(
             collection_name=self.collection_name,
             vectors=[embedding],
             limit=self.top_k,
@@ -135,6 +138,27 @@ class VectorSearchRetriever(BaseRetriever):
         return results
 
 
+class BM25IndexRetriever(BaseRetriever):
+    collection_name: Any
+    top_k: int
+    enriched: bool = False
+
+    def _get_relevant_documents(
+        self, query: str, *, run_manager: CallbackManagerForRetrieverRun
+    ) -> list[Document]:
+        result = VECTOR_DB_CLIENT.bm25_search(
+            collection_name=self.collection_name,
+            query=query,
+            k=self.top_k,
+            enriched=self.enriched,
+        )
+
+        return [
+            Document(metadata=metadata, page_content=document)
+            for document, metadata in zip(result.documents[0], result.metadatas[0])
+        ]
+
+
 def query_doc(
     collection_name: str, query_embedding: list[float], k: int, user: UserModel = None
 ):
@@ -173,43 +197,20 @@ def get_enriched_texts(collection_result: GetResult) -> list[str]:
     enriched_texts = []
     for idx, text in enumerate(collection_result.documents[0]):
         metadata = collection_result.metadatas[0][idx]
-        metadata_parts = [text]
-
-        # Add filename (repeat twice for extra weight in BM25 scoring)
-        if metadata.get("name"):
-            filename = metadata["name"]
-            filename_tokens = (
-                filename.replace("_", " ").replace("-", " ").replace(".", " ")
-            )
-            metadata_parts.append(
-                f"Filename: {filename} {filename_tokens} {filename_tokens}"
-            )
-
-        # Add title if available
-        if metadata.get("title"):
-            metadata_parts.append(f"Title: {metadata['title']}")
-
-        # Add document section headings if available (from markdown splitter)
-        if metadata.get("headings") and isinstance(metadata["headings"], list):
-            headings = " > ".join(str(h) for h in metadata["headings"])
-            metadata_parts.append(f"Section: {headings}")
+        enrichment_text = get_enrichment_text(metadata)
+        enriched_texts.append(f"{text} {enrichment_text}" if enrichment_text else text)
 
-        # Add source URL/path if available
-        if metadata.get("source"):
-            metadata_parts.append(f"Source: {metadata['source']}")
-
-        # Add snippet for web search results
-        if metadata.get("snippet"):
-            metadata_parts.append(f"Snippet: {metadata['snippet']}")
+    return enriched_texts
 
-        enriched_texts.append(" ".join(metadata_parts))
 
-    return enriched_texts
+def has_bm25_index() -> bool:
+    # VECTOR_DB_CLIENT is wrapped with a persistent BM25 index (ENABLE_RAG_BM25_INDEX)
+    return hasattr(VECTOR_DB_CLIENT, "bm25_search")
 
 
 async def query_doc_with_hybrid_search(
     collection_name: str,
-    collection_result: GetResult,
+    collection_result: Optional[GetResult],
     query: str,
     embedding_function,
     k: int,
@@ -220,37 +221,51 @@ async def query_doc_with_hybrid_search(
     enable_enriched_texts: bool = False,
 ) -> dict:
     try:
-        # First check if collection_result has the required attributes
-        if (
-            not collection_result
-            or not hasattr(collection_result, "documents")
-            or not hasattr(collection_result, "metadatas")
-        ):
-            log.warning(f"query_doc_with_hybrid_search:no_docs {collection_name}")
-            return {"documents": [], "metadatas": [], "distances": []}
+        if has_bm25_index():
+            # Query the persistent index; collection_result is not needed
+            if not VECTOR_DB_CLIENT.get_bm25_document_count(collection_name):
+                log.warning(f"query_doc_with_hybrid_search:no_docs {collection_name}")
+                return {"documents": [], "metadatas": [], "distances": []}
 
-        # Now safely check the documents content after confirming attributes exist
-        if (
-            not collection_result.documents
-            or len(collection_result.documents) == 0
-            or not collection_result.documents[0]
-        ):
-            log.warning(f"query_doc_with_hybrid_search:no_docs {collection_name}")
-            return {"documents": [], "metadatas": [], "distances": []}
+            log.debug(f"query_doc_with_hybrid_search:doc {collection_name}")
+
+            bm25_retriever = BM25IndexRetriever(
+                collection_name=collection_name,
+                top_k=k,
+                enriched=enable_enriched_texts,
+            )
+        else:
+            # First check if collection_result has the required attributes
+            if (
+                not collection_result
+                or not hasattr(collection_result, "documents")
+                or not hasattr(collection_result, "metadatas")
+            ):
+                log.warning(f"query_doc_with_hybrid_search:no_docs {collection_name}")
+                return {"documents": [], "metadatas": [], "distances": []}
 
-        log.debug(f"query_doc_with_hybrid_search:doc {collection_name}")
+            # Now safely check the documents content after confirming attributes exist
+            if (
+                not collection_result.documents
+                or len(collection_result.documents) == 0
+                or not collection_result.documents[0]
+            ):
+                log.warning(f"query_doc_with_hybrid_search:no_docs {collection_name}")
+                return {"documents": [], "metadatas": [], "distances": []}
 
-        bm25_texts = (
-            get_enriched_texts(collection_result)
-            if enable_enriched_texts
-            else collection_result.documents[0]
-        )
+            log.debug(f"query_doc_with_hybrid_search:doc {collection_name}")
 
-        bm25_retriever = BM25Retriever.from_texts(
-            texts=bm25_texts,
-            metadatas=collection_result.metadatas[0],
-        )
-        bm25_retriever.k = k
+            bm25_texts = (
+                get_enriched_texts(collection_result)
+                if enable_enriched_texts
+                else collection_result.documents[0]
+            )
+
+            bm25_retriever = BM25Retriever.from_texts(
+                texts=bm25_texts,
+                metadatas=collection_result.metadatas[0],
+            )
+            bm25_retriever.k = k
 
         vector_search_retriever = VectorSearchRetriever(
             collection_name=collection_name,
@@ -350,23 +365,23 @@ def merge_and_sort_query_results(query_results: list[dict], k: int) -> dict:
         ):
             continue
 
-        distances = data["distances"][0]
-        documents = data["documents"][0]
-        metadatas = data["metadatas"][0]
-
-        for distance, document, metadata in zip(distances, documents, metadatas):
-            if isinstance(document, str):
-                doc_hash = hashlib.sha256(
-                    document.encode()
-                ).hexdigest()  # Compute a hash for uniqueness
+        # One row per query vector when a collection was searched with several
+        for distances, documents, metadatas in zip(
+            data["distances"], data["documents"], data["metadatas"]
+        ):
+            for distance, document, metadata in zip(distances, documents, metadatas):
+                if isinstance(document, str):
+                    doc_hash = hashlib.sha256(
+                        document.encode()
+                    ).hexdigest()  # Compute a hash for uniqueness
 
-                if doc_hash not in combined.keys():
-                    combined[doc_hash] = (distance, document, metadata)
-                    continue  # if doc is new, no further comparison is needed
+                    if doc_hash not in combined.keys():
+                        combined[doc_hash] = (distance, document, metadata)
+                        continue  # if doc is new, no further comparison is needed
 
-                # if doc is alredy in, but new distance is better, update
-                if distance > combined[doc_hash][0]:
-                    combined[doc_hash] = (distance, document, metadata)
+                    # if doc is alredy in, but new distance is better, update
+                    if distance > combined[doc_hash][0]:
+                        combined[doc_hash] = (distance, document, metadata)
 
     combined = list(combined.values())
     # Sort the list based on distances
@@ -411,21 +426,6 @@ async def query_collection(
     results = []
     error = False
 
-    def process_query_collection(collection_name, query_embedding):
-        try:
-            if collection_name:
-                result = query_doc(
-                    collection_name=collection_name,
-                    k=k,
-                    query_embedding=query_embedding,
-                )
-                if result is not None:
-                    return result.model_dump(), None
-            return None, None
-        except Exception as e:
-            log.exception(f"Error when querying the collection: {e}")
-            return None, e
-
     # Generate all query embeddings (in one call)
     query_embeddings = await embedding_function(
         queries, prefix=RAG_EMBEDDING_QUERY_PREFIX
@@ -434,21 +434,22 @@ async def query_collection(
         f"query_collection: processing {len(queries)} queries across {len(collection_names)} collections"
     )
 
-    with ThreadPoolExecutor() as executor:
-        future_results = []
-        for query_embedding in query_embeddings:
-            for collection_name in collection_names:
-                result = executor.submit(
-                    process_query_collection, collection_name, query_embedding
-                )
-                future_results.append(result)
-        task_results = [future.result() for future in future_results]
-
-    for result, err in task_results:
-        if err is not None:
-            error = True
-        elif result is not None:
-            results.append(result)
+    # Every query vector goes to every collection in one batched search, backends
+    # that can also batch across collections do so in a single request
+    try:
+        search_results = await ASYNC_VECTOR_DB_CLIENT.search_collections(
+            collection_names=[name for name in collection_names if name],
+            vectors=query_embeddings,
+            limit=k,
+        )
+        results = [
+            result.model_dump()
+            for result in search_results.values()
+            if result is not None
+        ]
+    except Exception as e:
+        log.exception(f"Error when querying the collections: {e}")
+        error = True
 
     if error and not results:
         log.warning("All collection queries failed. No results returned.")
@@ -474,15 +475,21 @@ async def query_collection_with_hybrid_search(
     collection_results = {}
     for collection_name in collection_names:
         try:
+            if has_bm25_index():
+                # The persistent BM25 index is queried directly, so only make
+                # sure it has been built instead of fetching the collection
+                VECTOR_DB_CLIENT.ensure_bm25_index(collection_name)
+                collection_results[collection_name] = None
+                continue
+
             log.debug(
                 f"query_collection_with_hybrid_search:VECTOR_DB_CLIENT.get:collection {collection_name}"
             )
-            collection_results[collection_name] = VECTOR_DB_CLIENT.get(
-                collection_name=collection_name
-            )
+            result = await ASYNC_VECTOR_DB_CLIENT.get(collection_name=collection_name)
+            if result is not None:
+                collection_results[collection_name] = result
         except Exception as e:
             log.exception(f"Failed to fetch collection {collection_name}: {e}")
-            collection_results[collection_name] = None
 
     log.info(
         f"Starting hybrid search for {len(queries)} queries in {len(collection_names)} collections..."
@@ -508,11 +515,11 @@ async def query_collection_with_hybrid_search(
             return None, e
 
     # Prepare tasks for all collections and queries
-    # Avoid running any tasks for collections that failed to fetch data (have assigned None)
+    # Avoid running any tasks for collections that failed to fetch data
     tasks = [
         (collection_name, query)
         for collection_name in collection_names
-        if collection_results[collection_name] is not None
+        if collection_name in collection_results
         for query in queries
     ]
 
@@ -597,18 +604,15 @@ async def agenerate_openai_batch_embeddings(
         if ENABLE_FORWARD_USER_INFO_HEADERS and user:
             headers = include_user_info_headers(headers, user)
 
-        async with aiohttp.ClientSession(
-            trust_env=True, timeout=aiohttp.ClientTimeout(total=AIOHTTP_CLIENT_TIMEOUT)
-        ) as session:
-            async with session.post(
-                f"{url}/embeddings", headers=headers, json=form_data
-            ) as r:
-                r.raise_for_status()
-                data = await r.json()
-                if "data" in data:
-                    return [item["embedding"] for item in data["data"]]
-                else:
-                    raise Exception("Something went wrong :/")
+        data = await EMBEDDING_DISPATCHER.post(
+            f"{url}/embeddings",
+            headers=headers,
+            json=form_data,
+        )
+        if "data" in data:
+            return [item["embedding"] for item in data["data"]]
+        else:
+            raise Exception("Something went wrong :/")
     except Exception as e:
         log.exception(f"Error generating openai batch embeddings: {e}")
         return None
@@ -688,16 +692,15 @@ async def agenerate_azure_openai_batch_embeddings(
         if ENABLE_FORWARD_USER_INFO_HEADERS and user:
             headers = include_user_info_headers(headers, user)
 
-        async with aiohttp.ClientSession(
-            trust_env=True, timeout=aiohttp.ClientTimeout(total=AIOHTTP_CLIENT_TIMEOUT)
-        ) as session:
-            async with session.post(full_url, headers=headers, json=form_data) as r:
-                r.raise_for_status()
-                data = await r.json()
-                if "data" in data:
-                    return [item["embedding"] for item in data["data"]]
-                else:
-                    raise Exception("Something went wrong :/")
+        data = await EMBEDDING_DISPATCHER.post(
+            full_url,
+            headers=headers,
+            json=form_data,
+        )
+        if "data" in data:
+            return [item["embedding"] for item in data["data"]]
+        else:
+            raise Exception("Something went wrong :/")
     except Exception as e:
         log.exception(f"Error generating azure openai batch embeddings: {e}")
         return None
@@ -766,26 +769,27 @@ async def agenerate_ollama_batch_embeddings(
         if ENABLE_FORWARD_USER_INFO_HEADERS and user:
             headers = include_user_info_headers(headers, user)
 
-        async with aiohttp.ClientSession(
-            trust_env=True, timeout=aiohttp.ClientTimeout(total=AIOHTTP_CLIENT_TIMEOUT)
-        ) as session:
-            async with session.post(
-                f"{url}/api/embed",
-                headers=headers,
-                json=form_data,
-                ssl=AIOHTTP_CLIENT_SESSION_SSL,
-            ) as r:
-                r.raise_for_status()
-                data = await r.json()
-                if "embeddings" in data:
-                    return data["embeddings"]
-                else:
-                    raise Exception("Something went wrong :/")
+        data = await EMBEDDING_DISPATCHER.post(
+            f"{url}/api/embed",
+            headers=headers,
+            json=form_data,
+            ssl=AIOHTTP_CLIENT_SESSION_SSL,
+        )
+        if "embeddings" in data:
+            return data["embeddings"]
+        else:
+            raise Exception("Something went wrong :/")
     except Exception as e:
         log.exception(f"Error generating ollama batch embeddings: {e}")
         return None
 
 
+def with_embedding_cache(embedding_function, embedding_engine, embedding_model):
+    if EMBEDDING_CACHE is None:
+        return embedding_function
+    return EMBEDDING_CACHE.wrap(embedding_function, embedding_engine, embedding_model)
+
+
 def get_embedding_function(
     embedding_engine,
     embedding_model,
@@ -810,7 +814,9 @@ def get_embedding_function(
                 prefix,
             )
 
-        return async_embedding_function
+        return with_embedding_cache(
+            async_embedding_function, embedding_engine, embedding_model
+        )
     elif embedding_engine in ["ollama", "openai", "azure_openai"]:
         embedding_function = lambda query, prefix=None, user=None: generate_embeddings(
             engine=embedding_engine,
@@ -824,47 +830,24 @@ def get_embedding_function(
         )
 
         async def async_embedding_function(query, prefix=None, user=None):
-            if isinstance(query, list):
-                # Create batches
-                batches = [
-                    query[i : i + embedding_batch_size]
-                    for i in range(0, len(query), embedding_batch_size)
-                ]
+            coalesce_key = (embedding_engine, embedding_model, url, key)
+            if ENABLE_FORWARD_USER_INFO_HEADERS:
+                # User info headers are per request, only coalesce per user
+                coalesce_key += (user.id if user else None,)
 
-                if enable_async:
-                    log.debug(
-                        f"generate_multiple_async: Processing {len(batches)} batches in parallel"
-                    )
-                    # Execute all batches in parallel
-                    tasks = [
-                        embedding_function(batch, prefix=prefix, user=user)
-                        for batch in batches
-                    ]
-                    batch_results = await asyncio.gather(*tasks)
-                else:
-                    log.debug(
-                        f"generate_multiple_async: Processing {len(batches)} batches sequentially"
-                    )
-                    batch_results = []
-                    for batch in batches:
-                        batch_results.append(
-                            await embedding_function(batch, prefix=prefix, user=user)
-                        )
-
-                # Flatten results
-                embeddings = []
-                for batch_embeddings in batch_results:
-                    if isinstance(batch_embeddings, list):
-                        embeddings.extend(batch_embeddings)
-
-                log.debug(
-                    f"generate_multiple_async: Generated {len(embeddings)} embeddings from {len(batches)} parallel batches"
-                )
-                return embeddings
-            else:
-                return await embedding_function(query, prefix, user)
+            return await EMBEDDING_DISPATCHER.embed(
+                embedding_function,
+                query,
+                prefix=prefix,
+                user=user,
+                batch_size=embedding_batch_size,
+                parallel=enable_async,
+                coalesce_key=coalesce_key,
+            )
 
-        return async_embedding_function
+        return with_embedding_cache(
+            async_embedding_function, embedding_engine, embedding_model
+        )
     else:
         raise ValueError(f"Unknown embedding engine: {embedding_engine}")
 
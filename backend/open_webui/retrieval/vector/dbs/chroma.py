@@ -1,5 +1,6 @@
 import chromadb
 import logging
+import numpy as np
 from chromadb import Settings
 from chromadb.utils.batch_utils import create_batches
 
@@ -10,6 +11,7 @@ from open_webui.retrieval.vector.main import (
     VectorItem,
     SearchResult,
     GetResult,
+    VectorGetResult,
 )
 from open_webui.retrieval.vector.utils import process_metadata
 
@@ -61,7 +63,11 @@ class ChromaClient(VectorDBBase):
 
     def has_collection(self, collection_name: str) -> bool:
         # Check if the collection exists based on the collection name.
-        collection_names = self.client.list_collections()
+        # chromadb >= 0.6 lists Collection objects rather than names
+        collection_names = [
+            getattr(collection, "name", collection)
+            for collection in self.client.list_collections()
+        ]
         return collection_name in collection_names
 
     def delete_collection(self, collection_name: str):
@@ -87,9 +93,10 @@ class ChromaClient(VectorDBBase):
 
                 # chromadb has cosine distance, 2 (worst) -> 0 (best). Re-odering to 0 -> 1
                 # https://docs.trychroma.com/docs/collections/configure cosine equation
-                distances: list = result["distances"][0]
-                distances = [2 - dist for dist in distances]
-                distances = [[dist / 2 for dist in distances]]
+                distances = [
+                    [(2 - dist) / 2 for dist in query_distances]
+                    for query_distances in result["distances"]
+                ]
 
                 return SearchResult(
                     **{
@@ -126,6 +133,33 @@ class ChromaClient(VectorDBBase):
         except:
             return None
 
+    def query_with_vectors(
+        self, collection_name: str, filter: dict, limit: Optional[int] = None
+    ) -> Optional[VectorGetResult]:
+        # Query the items and their embeddings from the collection based on the filter.
+        try:
+            collection = self.client.get_collection(name=collection_name)
+            if collection:
+                result = collection.get(
+                    where=filter,
+                    limit=limit,
+                    include=["documents", "metadatas", "embeddings"],
+                )
+
+                return VectorGetResult(
+                    **{
+                        "ids": [result["ids"]],
+                        "documents": [result["documents"]],
+                        "metadatas": [result["metadatas"]],
+                        "vectors": [
+                            np.asarray(result["embeddings"], dtype=float).tolist()
+                        ],
+                    }
+                )
+            return None
+        except:
+            return None
+
     def get(self, collection_name: str) -> Optional[GetResult]:
         # Get all the items in the collection.
         collection = self.client.get_collection(name=collection_name)
@@ -1,7 +1,9 @@
-from elasticsearch import Elasticsearch, BadRequestError
+from elasticsearch import AsyncElasticsearch, Elasticsearch, BadRequestError
+from concurrent.futures import Executor
 from typing import Optional
 import ssl
-from elasticsearch.helpers import bulk, scan
+from itertools import islice
+from elasticsearch.helpers import async_bulk, async_scan, bulk, scan
 
 from open_webui.retrieval.vector.utils import process_metadata
 from open_webui.retrieval.vector.main import (
@@ -9,6 +11,8 @@ from open_webui.retrieval.vector.main import (
     VectorItem,
     SearchResult,
     GetResult,
+    VectorGetResult,
+    ThreadedAsyncVectorDB,
 )
 from open_webui.config import (
     ELASTICSEARCH_URL,
@@ -32,18 +36,19 @@ class ElasticsearchClient(VectorDBBase):
 
     def __init__(self):
         self.index_prefix = ELASTICSEARCH_INDEX_PREFIX
-        self.client = Elasticsearch(
-            hosts=[ELASTICSEARCH_URL],
-            ca_certs=ELASTICSEARCH_CA_CERTS,
-            api_key=ELASTICSEARCH_API_KEY,
-            cloud_id=ELASTICSEARCH_CLOUD_ID,
-            basic_auth=(
+        self.client_kwargs = {
+            "hosts": [ELASTICSEARCH_URL],
+            "ca_certs": ELASTICSEARCH_CA_CERTS,
+            "api_key": ELASTICSEARCH_API_KEY,
+            "cloud_id": ELASTICSEARCH_CLOUD_ID,
+            "basic_auth": (
                 (ELASTICSEARCH_USERNAME, ELASTICSEARCH_PASSWORD)
                 if ELASTICSEARCH_USERNAME and ELASTICSEARCH_PASSWORD
                 else None
             ),
-            ssl_assert_fingerprint=SSL_ASSERT_FINGERPRINT,
-        )
+            "ssl_assert_fingerprint": SSL_ASSERT_FINGERPRINT,
+        }
+        self.client = Elasticsearch(**self.client_kwargs)
 
     # Status: works
     def _get_index_name(self, dimension: int) -> str:
@@ -133,12 +138,14 @@ class ElasticsearchClient(VectorDBBase):
         for i in range(0, len(items), batch_size):
             yield items[i : min(i + batch_size, len(items))]
 
+    def _get_collection_query(self, collection_name: str) -> dict:
+        return {
+            "query": {"bool": {"filter": [{"term": {"collection": collection_name}}]}}
+        }
+
     # Status: works
     def has_collection(self, collection_name) -> bool:
-        query_body = {"query": {"bool": {"filter": []}}}
-        query_body["query"]["bool"]["filter"].append(
-            {"term": {"collection": collection_name}}
-        )
+        query_body = self._get_collection_query(collection_name)
 
         try:
             result = self.client.count(index=f"{self.index_prefix}*", body=query_body)
@@ -159,7 +166,66 @@ class ElasticsearchClient(VectorDBBase):
         filter: Optional[dict] = None,
         limit: int = 10,
     ) -> Optional[SearchResult]:
-        query = {
+        return self.search_collections([collection_name], vectors, limit)[
+            collection_name
+        ]
+
+    def search_collections(
+        self,
+        collection_names: list[str],
+        vectors: list[list[float]],
+        limit: int = 10,
+    ) -> dict[str, Optional[SearchResult]]:
+        # Every collection and query vector pair goes out in a single msearch
+        collection_names = list(dict.fromkeys(collection_names))
+        if not collection_names or not vectors:
+            return {collection_name: None for collection_name in collection_names}
+
+        result = self.client.msearch(
+            searches=self._get_msearch_body(collection_names, vectors, limit)
+        )
+        return self._msearch_to_search_results(
+            collection_names, vectors, result["responses"]
+        )
+
+    def _get_msearch_body(
+        self, collection_names: list[str], vectors: list[list[float]], limit: int
+    ) -> list[dict]:
+        searches = []
+        for collection_name in collection_names:
+            for vector in vectors:
+                searches.append({"index": self._get_index_name(len(vector))})
+                searches.append(self._get_search_body(collection_name, vector, limit))
+        return searches
+
+    def _msearch_to_search_results(
+        self, collection_names: list[str], vectors: list[list[float]], responses
+    ) -> dict[str, Optional[SearchResult]]:
+        results = {}
+        for index, collection_name in enumerate(collection_names):
+            collection_responses = responses[
+                index * len(vectors) : (index + 1) * len(vectors)
+            ]
+            if any("error" in response for response in collection_responses):
+                results[collection_name] = None
+                continue
+
+            ids, distances, documents, metadatas = [], [], [], []
+            for response in collection_responses:
+                search_result = self._result_to_search_result(response)
+                ids.extend(search_result.ids)
+                distances.extend(search_result.distances)
+                documents.extend(search_result.documents)
+                metadatas.extend(search_result.metadatas)
+            results[collection_name] = SearchResult(
+                ids=ids, distances=distances, documents=documents, metadatas=metadatas
+            )
+        return results
+
+    def _get_search_body(
+        self, collection_name: str, vector: list[float], limit: int
+    ) -> dict:
+        return {
             "size": limit,
             "_source": ["text", "metadata"],
             "query": {
@@ -169,20 +235,12 @@ class ElasticsearchClient(VectorDBBase):
                     },
                     "script": {
                         "source": "cosineSimilarity(params.vector, 'vector') + 1.0",
-                        "params": {
-                            "vector": vectors[0]
-                        },  # Assuming single query vector
+                        "params": {"vector": vector},
                     },
                 }
             },
         }
 
-        result = self.client.search(
-            index=self._get_index_name(len(vectors[0])), body=query
-        )
-
-        return self._result_to_search_result(result)
-
     # Status: only tested halfwat
     def query(
         self, collection_name: str, filter: dict, limit: Optional[int] = None
@@ -190,6 +248,19 @@ class ElasticsearchClient(VectorDBBase):
         if not self.has_collection(collection_name):
             return None
 
+        try:
+            result = self.client.search(
+                index=f"{self.index_prefix}*",
+                body=self._get_query_body(collection_name, filter),
+                size=limit if limit else 10,
+            )
+
+            return self._result_to_get_result(result)
+
+        except Exception as e:
+            return None
+
+    def _get_query_body(self, collection_name: str, filter: dict) -> dict:
         query_body = {
             "query": {"bool": {"filter": []}},
             "_source": ["text", "metadata"],
@@ -200,17 +271,42 @@ class ElasticsearchClient(VectorDBBase):
         query_body["query"]["bool"]["filter"].append(
             {"term": {"collection": collection_name}}
         )
-        size = limit if limit else 10
+        return query_body
 
-        try:
-            result = self.client.search(
-                index=f"{self.index_prefix}*",
-                body=query_body,
-                size=size,
-            )
+    def query_with_vectors(
+        self, collection_name: str, filter: dict, limit: Optional[int] = None
+    ) -> Optional[VectorGetResult]:
+        if not self.has_collection(collection_name):
+            return None
 
-            return self._result_to_get_result(result)
+        query_body = {
+            "query": {"bool": {"filter": []}},
+            "_source": ["text", "metadata", "vector"],
+        }
+
+        for field, value in filter.items():
+            query_body["query"]["bool"]["filter"].append({"term": {field: value}})
+        query_body["query"]["bool"]["filter"].append(
+            {"term": {"collection": collection_name}}
+        )
 
+        try:
+            # Scroll through every match, search() would stop at `size` hits
+            results = list(
+                islice(
+                    scan(self.client, index=f"{self.index_prefix}*", query=query_body),
+                    limit,
+                )
+            )
+            get_result = self._scan_result_to_get_result(results)
+            if get_result is None:
+                return None
+            return VectorGetResult(
+                ids=get_result.ids,
+                documents=get_result.documents,
+                metadatas=get_result.metadatas,
+                vectors=[[hit["_source"]["vector"] for hit in results]],
+            )
         except Exception as e:
             return None
 
@@ -228,7 +324,7 @@ class ElasticsearchClient(VectorDBBase):
     def get(self, collection_name: str) -> Optional[GetResult]:
         # Get all the items in the collection.
         query = {
-            "query": {"bool": {"filter": [{"term": {"collection": collection_name}}]}},
+            **self._get_collection_query(collection_name),
             "_source": ["text", "metadata"],
         }
         results = list(scan(self.client, index=f"{self.index_prefix}*", query=query))
@@ -237,46 +333,52 @@ class ElasticsearchClient(VectorDBBase):
 
     # Status: works
     def insert(self, collection_name: str, items: list[VectorItem]):
-        if not self._has_index(dimension=len(items[0]["vector"])):
-            self._create_index(dimension=len(items[0]["vector"]))
+        self.get_or_create_index(dimension=len(items[0]["vector"]))
 
         for batch in self._create_batches(items):
-            actions = [
-                {
-                    "_index": self._get_index_name(dimension=len(items[0]["vector"])),
-                    "_id": item["id"],
-                    "_source": {
-                        "collection": collection_name,
-                        "vector": item["vector"],
-                        "text": item["text"],
-                        "metadata": process_metadata(item["metadata"]),
-                    },
-                }
-                for item in batch
-            ]
-            bulk(self.client, actions)
+            bulk(self.client, self._get_insert_actions(collection_name, batch))
+
+    def _get_insert_actions(
+        self, collection_name: str, items: list[VectorItem]
+    ) -> list[dict]:
+        return [
+            {
+                "_index": self._get_index_name(dimension=len(items[0]["vector"])),
+                "_id": item["id"],
+                "_source": {
+                    "collection": collection_name,
+                    "vector": item["vector"],
+                    "text": item["text"],
+                    "metadata": process_metadata(item["metadata"]),
+                },
+            }
+            for item in items
+        ]
 
     # Upsert documents using the update API with doc_as_upsert=True.
     def upsert(self, collection_name: str, items: list[VectorItem]):
-        if not self._has_index(dimension=len(items[0]["vector"])):
-            self._create_index(dimension=len(items[0]["vector"]))
+        self.get_or_create_index(dimension=len(items[0]["vector"]))
         for batch in self._create_batches(items):
-            actions = [
-                {
-                    "_op_type": "update",
-                    "_index": self._get_index_name(dimension=len(item["vector"])),
-                    "_id": item["id"],
-                    "doc": {
-                        "collection": collection_name,
-                        "vector": item["vector"],
-                        "text": item["text"],
-                        "metadata": process_metadata(item["metadata"]),
-                    },
-                    "doc_as_upsert": True,
-                }
-                for item in batch
-            ]
-            bulk(self.client, actions)
+            bulk(self.client, self._get_upsert_actions(collection_name, batch))
+
+    def _get_upsert_actions(
+        self, collection_name: str, items: list[VectorItem]
+    ) -> list[dict]:
+        return [
+            {
+                "_op_type": "update",
+                "_index": self._get_index_name(dimension=len(item["vector"])),
+                "_id": item["id"],
+                "doc": {
+                    "collection": collection_name,
+                    "vector": item["vector"],
+                    "text": item["text"],
+                    "metadata": process_metadata(item["metadata"]),
+                },
+                "doc_as_upsert": True,
+            }
+            for item in items
+        ]
 
     # Delete specific documents from a collection by filtering on both collection and document IDs.
     def delete(
@@ -285,10 +387,18 @@ class ElasticsearchClient(VectorDBBase):
         ids: Optional[list[str]] = None,
         filter: Optional[dict] = None,
     ):
+        self.client.delete_by_query(
+            index=f"{self.index_prefix}*",
+            body=self._get_delete_query(collection_name, ids, filter),
+        )
 
-        query = {
-            "query": {"bool": {"filter": [{"term": {"collection": collection_name}}]}}
-        }
+    def _get_delete_query(
+        self,
+        collection_name: str,
+        ids: Optional[list[str]] = None,
+        filter: Optional[dict] = None,
+    ) -> dict:
+        query = self._get_collection_query(collection_name)
         # logic based on chromaDB
         if ids:
             query["query"]["bool"]["filter"].append({"terms": {"_id": ids}})
@@ -297,10 +407,132 @@ class ElasticsearchClient(VectorDBBase):
                 query["query"]["bool"]["filter"].append(
                     {"term": {f"metadata.{field}": value}}
                 )
-
-        self.client.delete_by_query(index=f"{self.index_prefix}*", body=query)
+        return query
 
     def reset(self):
         indices = self.client.indices.get(index=f"{self.index_prefix}*")
         for index in indices:
             self.client.indices.delete(index=index)
+
+
+class AsyncElasticsearchClient(ThreadedAsyncVectorDB):
+    """
+    Searches, queries and writes through AsyncElasticsearch, which keeps its
+    own connection pool. Creating indexes is left to the sync client in the
+    shared executor.
+    """
+
+    def __init__(self, client: ElasticsearchClient, executor: Executor):
+        super().__init__(client, executor)
+        self.index_prefix = client.index_prefix
+        self._async_client = None
+
+    @property
+    def async_client(self) -> AsyncElasticsearch:
+        # Created on first use, inside the event loop it is bound to
+        if self._async_client is None:
+            self._async_client = AsyncElasticsearch(**self.client.client_kwargs)
+        return self._async_client
+
+    async def has_collection(self, collection_name: str) -> bool:
+        try:
+            result = await self.async_client.count(
+                index=f"{self.index_prefix}*",
+                body=self.client._get_collection_query(collection_name),
+            )
+            return result.body["count"] > 0
+        except Exception as e:
+            return None
+
+    async def delete_collection(self, collection_name: str):
+        await self.async_client.delete_by_query(
+            index=f"{self.index_prefix}*",
+            body=self.client._get_collection_query(collection_name),
+        )
+
+    async def search(
+        self,
+        collection_name: str,
+        vectors: list[list[float]],
+        filter: Optional[dict] = None,
+        limit: int = 10,
+    ) -> Optional[SearchResult]:
+        results = await self.search_collections([collection_name], vectors, limit)
+        return results[collection_name]
+
+    async def search_collections(
+        self,
+        collection_names: list[str],
+        vectors: list[list[float]],
+        limit: int = 10,
+    ) -> dict[str, Optional[SearchResult]]:
+        collection_names = list(dict.fromkeys(collection_names))
+        if not collection_names or not vectors:
+            return {collection_name: None for collection_name in collection_names}
+
+        result = await self.async_client.msearch(
+            searches=self.client._get_msearch_body(collection_names, vectors, limit)
+        )
+        return self.client._msearch_to_search_results(
+            collection_names, vectors, result["responses"]
+        )
+
+    async def query(
+        self, collection_name: str, filter: dict, limit: Optional[int] = None
+    ) -> Optional[GetResult]:
+        if not await self.has_collection(collection_name):
+            return None
+
+        try:
+            result = await self.async_client.search(
+                index=f"{self.index_prefix}*",
+                body=self.client._get_query_body(collection_name, filter),
+                size=limit if limit else 10,
+            )
+            return self.client._result_to_get_result(result)
+        except Exception as e:
+            return None
+
+    async def get(self, collection_name: str) -> Optional[GetResult]:
+        query = {
+            **self.client._get_collection_query(collection_name),
+            "_source": ["text", "metadata"],
+        }
+        results = [
+            hit
+            async for hit in async_scan(
+                self.async_client, index=f"{self.index_prefix}*", query=query
+            )
+        ]
+        return self.client._scan_result_to_get_result(results)
+
+    async def insert(self, collection_name: str, items: list[VectorItem]):
+        await self._run(
+            self.client.get_or_create_index, dimension=len(items[0]["vector"])
+        )
+        for batch in self.client._create_batches(items):
+            await async_bulk(
+                self.async_client,
+                self.client._get_insert_actions(collection_name, batch),
+            )
+
+    async def upsert(self, collection_name: str, items: list[VectorItem]):
+        await self._run(
+            self.client.get_or_create_index, dimension=len(items[0]["vector"])
+        )
+        for batch in self.client._create_batches(items):
+            await async_bulk(
+                self.async_client,
+                self.client._get_upsert_actions(collection_name, batch),
+            )
+
+    async def delete(
+        self,
+        collection_name: str,
+        ids: Optional[list[str]] = None,
+        filter: Optional[dict] = None,
+    ):
+        await self.async_client.delete_by_query(
+            index=f"{self.index_prefix}*",
+            body=self.client._get_delete_query(collection_name, ids, filter),
+        )
@@ -1,9 +1,11 @@
+from pymilvus import AsyncMilvusClient as AsyncClient
 from pymilvus import MilvusClient as Client
 from pymilvus import FieldSchema, DataType
 from pymilvus import connections, Collection
 
 import json
 import logging
+from concurrent.futures import Executor
 from typing import Optional
 
 from open_webui.retrieval.vector.utils import process_metadata
@@ -12,6 +14,8 @@ from open_webui.retrieval.vector.main import (
     VectorItem,
     SearchResult,
     GetResult,
+    VectorGetResult,
+    ThreadedAsyncVectorDB,
 )
 from open_webui.config import (
     MILVUS_URI,
@@ -33,9 +37,14 @@ class MilvusClient(VectorDBBase):
     def __init__(self):
         self.collection_prefix = "open_webui"
         if MILVUS_TOKEN is None:
-            self.client = Client(uri=MILVUS_URI, db_name=MILVUS_DB)
+            self.client_kwargs = {"uri": MILVUS_URI, "db_name": MILVUS_DB}
         else:
-            self.client = Client(uri=MILVUS_URI, db_name=MILVUS_DB, token=MILVUS_TOKEN)
+            self.client_kwargs = {
+                "uri": MILVUS_URI,
+                "db_name": MILVUS_DB,
+                "token": MILVUS_TOKEN,
+            }
+        self.client = Client(**self.client_kwargs)
 
     def _result_to_get_result(self, result) -> GetResult:
         ids = []
@@ -200,6 +209,22 @@ class MilvusClient(VectorDBBase):
         return self._result_to_search_result(result)
 
     def query(self, collection_name: str, filter: dict, limit: int = -1):
+        return self._query(collection_name, filter, limit)
+
+    def query_with_vectors(
+        self, collection_name: str, filter: dict, limit: Optional[int] = None
+    ) -> Optional[VectorGetResult]:
+        return self._query(
+            collection_name, filter, limit if limit else -1, with_vectors=True
+        )
+
+    def _query(
+        self,
+        collection_name: str,
+        filter: dict,
+        limit: int = -1,
+        with_vectors: bool = False,
+    ):
         connections.connect(uri=MILVUS_URI, token=MILVUS_TOKEN, db_name=MILVUS_DB)
 
         collection_name = collection_name.replace("-", "_")
@@ -232,6 +257,7 @@ class MilvusClient(VectorDBBase):
                     "id",
                     "data",
                     "metadata",
+                    *(["vector"] if with_vectors else []),
                 ],
                 limit=limit if limit > 0 else -1,
             )
@@ -245,7 +271,19 @@ class MilvusClient(VectorDBBase):
                 all_results.extend(batch)
 
             log.debug(f"Total results from query: {len(all_results)}")
-            return self._result_to_get_result([all_results] if all_results else [[]])
+            get_result = self._result_to_get_result(
+                [all_results] if all_results else [[]]
+            )
+            if with_vectors:
+                return VectorGetResult(
+                    ids=get_result.ids,
+                    documents=get_result.documents,
+                    metadatas=get_result.metadatas,
+                    vectors=[
+                        [list(map(float, item["vector"])) for item in all_results]
+                    ],
+                )
+            return get_result
 
         except Exception as e:
             log.exception(
@@ -288,15 +326,7 @@ class MilvusClient(VectorDBBase):
         )
         return self.client.insert(
             collection_name=f"{self.collection_prefix}_{collection_name}",
-            data=[
-                {
-                    "id": item["id"],
-                    "vector": item["vector"],
-                    "data": {"text": item["text"]},
-                    "metadata": process_metadata(item["metadata"]),
-                }
-                for item in items
-            ],
+            data=self._get_rows(items),
         )
 
     def upsert(self, collection_name: str, items: list[VectorItem]):
@@ -324,15 +354,26 @@ class MilvusClient(VectorDBBase):
         )
         return self.client.upsert(
             collection_name=f"{self.collection_prefix}_{collection_name}",
-            data=[
-                {
-                    "id": item["id"],
-                    "vector": item["vector"],
-                    "data": {"text": item["text"]},
-                    "metadata": process_metadata(item["metadata"]),
-                }
-                for item in items
-            ],
+            data=self._get_rows(items),
+        )
+
+    def _get_rows(self, items: list[VectorItem]) -> list[dict]:
+        return [
+            {
+                "id": item["id"],
+                "vector": item["vector"],
+                "data": {"text": item["text"]},
+                "metadata": process_metadata(item["metadata"]),
+            }
+            for item in items
+        ]
+
+    def _get_delete_filter(self, filter: dict) -> str:
+        return " && ".join(
+            [
+                f'metadata["{key}"] == {json.dumps(value)}'
+                for key, value in filter.items()
+            ]
         )
 
     def delete(
@@ -358,12 +399,7 @@ class MilvusClient(VectorDBBase):
                 ids=ids,
             )
         elif filter:
-            filter_string = " && ".join(
-                [
-                    f'metadata["{key}"] == {json.dumps(value)}'
-                    for key, value in filter.items()
-                ]
-            )
+            filter_string = self._get_delete_filter(filter)
             log.info(
                 f"Deleting items by filter from {self.collection_prefix}_{collection_name}. Filter: {filter_string}"
             )
@@ -393,3 +429,88 @@ class MilvusClient(VectorDBBase):
                 except Exception as e:
                     log.error(f"Error deleting collection {collection_name_full}: {e}")
         log.info(f"Milvus reset complete. Deleted collections: {deleted_collections}")
+
+
+class AsyncMilvusClient(ThreadedAsyncVectorDB):
+    """
+    Searches and writes through Milvus' async client. Collection management
+    and paginated queries, which need the ORM query iterator, are left to
+    the sync client in the shared executor.
+    """
+
+    def __init__(self, client: MilvusClient, executor: Executor):
+        super().__init__(client, executor)
+        self.collection_prefix = client.collection_prefix
+        self._async_client = None
+
+    @property
+    def async_client(self) -> AsyncClient:
+        # Created on first use, inside the event loop it is bound to
+        if self._async_client is None:
+            self._async_client = AsyncClient(**self.client.client_kwargs)
+        return self._async_client
+
+    def _get_collection_name(self, collection_name: str) -> str:
+        return f"{self.collection_prefix}_{collection_name.replace('-', '_')}"
+
+    async def search(
+        self,
+        collection_name: str,
+        vectors: list[list[float | int]],
+        filter: Optional[dict] = None,
+        limit: int = 10,
+    ) -> Optional[SearchResult]:
+        result = await self.async_client.search(
+            collection_name=self._get_collection_name(collection_name),
+            data=vectors,
+            limit=limit,
+            output_fields=["data", "metadata"],
+        )
+        return self.client._result_to_search_result(result)
+
+    async def _ensure_collection(self, collection_name: str, items: list[VectorItem]):
+        if not await self.has_collection(collection_name):
+            if not items:
+                raise ValueError(
+                    "Cannot create Milvus collection without items to determine vector dimension."
+                )
+            await self._run(
+                self.client._create_collection,
+                collection_name=collection_name.replace("-", "_"),
+                dimension=len(items[0]["vector"]),
+            )
+
+    async def insert(self, collection_name: str, items: list[VectorItem]):
+        await self._ensure_collection(collection_name, items)
+        return await self.async_client.insert(
+            collection_name=self._get_collection_name(collection_name),
+            data=self.client._get_rows(items),
+        )
+
+    async def upsert(self, collection_name: str, items: list[VectorItem]):
+        await self._ensure_collection(collection_name, items)
+        return await self.async_client.upsert(
+            collection_name=self._get_collection_name(collection_name),
+            data=self.client._get_rows(items),
+        )
+
+    async def delete(
+        self,
+        collection_name: str,
+        ids: Optional[list[str]] = None,
+        filter: Optional[dict] = None,
+    ):
+        if not await self.has_collection(collection_name):
+            return None
+
+        if ids:
+            return await self.async_client.delete(
+                collection_name=self._get_collection_name(collection_name),
+                ids=ids,
+            )
+        elif filter:
+            return await self.async_client.delete(
+                collection_name=self._get_collection_name(collection_name),
+                filter=self.client._get_delete_filter(filter),
+            )
+        return None
@@ -16,6 +16,7 @@ from open_webui.retrieval.vector.main import (
     GetResult,
     SearchResult,
     VectorDBBase,
+    VectorGetResult,
     VectorItem,
 )
 from pymilvus import (
@@ -246,6 +247,20 @@ class MilvusClient(VectorDBBase):
 
     def query(
         self, collection_name: str, filter: Dict[str, Any], limit: Optional[int] = None
+    ) -> Optional[GetResult]:
+        return self._query(collection_name, filter, limit)
+
+    def query_with_vectors(
+        self, collection_name: str, filter: Dict[str, Any], limit: Optional[int] = None
+    ) -> Optional[VectorGetResult]:
+        return self._query(collection_name, filter, limit, with_vectors=True)
+
+    def _query(
+        self,
+        collection_name: str,
+        filter: Dict[str, Any],
+        limit: Optional[int] = None,
+        with_vectors: bool = False,
     ) -> Optional[GetResult]:
         mt_collection, resource_id = self._get_collection_and_resource_id(
             collection_name
@@ -266,7 +281,12 @@ class MilvusClient(VectorDBBase):
 
         iterator = collection.query_iterator(
             expr=" and ".join(expr),
-            output_fields=["id", "text", "metadata"],
+            output_fields=[
+                "id",
+                "text",
+                "metadata",
+                *(["vector"] if with_vectors else []),
+            ],
             limit=limit if limit else -1,
         )
 
@@ -282,6 +302,14 @@ class MilvusClient(VectorDBBase):
         documents = [res["text"] for res in all_results]
         metadatas = [res["metadata"] for res in all_results]
 
+        if with_vectors:
+            vectors = [list(map(float, res["vector"])) for res in all_results]
+            return VectorGetResult(
+                ids=[ids],
+                documents=[documents],
+                metadatas=[metadatas],
+                vectors=[vectors],
+            )
         return GetResult(ids=[ids], documents=[documents], metadatas=[metadatas])
 
     def get(self, collection_name: str) -> Optional[GetResult]:
@@ -0,0 +1,672 @@
+import hashlib
+import json
+import logging
+import os
+import shutil
+import sqlite3
+import threading
+import uuid
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+
+import numpy as np
+
+from open_webui.config import (
+    NUMPY_VECTOR_DB_DTYPE,
+    NUMPY_VECTOR_DB_PATH,
+    NUMPY_VECTOR_DB_SHARD_SIZE,
+)
+from open_webui.retrieval.vector.main import (
+    GetResult,
+    SearchResult,
+    VectorDBBase,
+    VectorGetResult,
+    VectorItem,
+)
+from open_webui.retrieval.vector.utils import process_metadata
+
+log = logging.getLogger(__name__)
+
+# The first shard of a collection holds this many rows and every following one
+# twice as many, up to the configured shard size, so small collections stay small
+FIRST_SHARD_SIZE = 1024
+
+
+@dataclass(frozen=True)
+class CollectionState:
+    """
+    Snapshot of a collection's shards. Writers replace the snapshot instead of
+    changing it, so a search keeps a consistent view while rows are written.
+    """
+
+    version: int
+    directory: str
+    dimension: int
+    shards: Tuple[np.memmap, ...]
+    # Document id per shard row, None marks a free row
+    ids: Tuple[np.ndarray, ...]
+    live: Tuple[np.ndarray, ...]
+
+
+class NumpyVectorClient(VectorDBBase):
+    """
+    Embedded vector store without any external service.
+
+    Vectors are L2-normalized on write and kept in memory-mapped .npy shards,
+    one directory per collection. Ids, texts and metadata live in SQLite, which
+    also serializes writers across worker processes. Search is exact: each
+    shard is scored against all query vectors in one matrix product.
+    """
+
+    # Keep IN (...) lists below SQLite's bound-parameter limit
+    _BATCH_SIZE = 500
+
+    def __init__(
+        self,
+        path: str = NUMPY_VECTOR_DB_PATH,
+        dtype: str = NUMPY_VECTOR_DB_DTYPE,
+        shard_size: int = NUMPY_VECTOR_DB_SHARD_SIZE,
+    ):
+        self.path = path
+        self.dtype = np.dtype(dtype)
+        self.shard_size = max(shard_size, FIRST_SHARD_SIZE)
+
+        self._local = threading.local()
+        self._initialized = False
+        self._init_lock = threading.Lock()
+        self._write_lock = threading.Lock()
+
+        # Collections are loaded on first use, the client itself starts empty
+        self._collections: Dict[str, CollectionState] = {}
+        self._indexed_keys: set[str] = set()
+
+    def _get_connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            os.makedirs(self.path, exist_ok=True)
+            conn = sqlite3.connect(os.path.join(self.path, "metadata.db"), timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+
+        if not self._initialized:
+            with self._init_lock:
+                if not self._initialized:
+                    self._create_tables(conn)
+                    self._initialized = True
+        return conn
+
+    @staticmethod
+    def _create_tables(conn: sqlite3.Connection):
+        with conn:
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS numpy_collection (
+                    name TEXT PRIMARY KEY,
+                    directory TEXT NOT NULL,
+                    dimension INTEGER NOT NULL,
+                    dtype TEXT NOT NULL,
+                    shard_count INTEGER NOT NULL,
+                    version INTEGER NOT NULL
+                )
+                """
+            )
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS numpy_document (
+                    collection TEXT NOT NULL,
+                    id TEXT NOT NULL,
+                    shard INTEGER NOT NULL,
+                    row INTEGER NOT NULL,
+                    text TEXT,
+                    metadata TEXT,
+                    PRIMARY KEY (collection, id)
+                )
+                """
+            )
+
+    @contextmanager
+    def _write_transaction(self) -> Iterator[sqlite3.Connection]:
+        conn = self._get_connection()
+        with self._write_lock:
+            # IMMEDIATE takes SQLite's write lock up front, so row allocation
+            # is never interleaved with a writer in another process
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+            except BaseException:
+                conn.rollback()
+                raise
+            conn.commit()
+
+    @classmethod
+    def _batches(cls, values: list) -> list[list]:
+        return [
+            values[i : i + cls._BATCH_SIZE]
+            for i in range(0, len(values), cls._BATCH_SIZE)
+        ]
+
+    def _shard_capacity(self, shard: int) -> int:
+        return min(FIRST_SHARD_SIZE << min(shard, 32), self.shard_size)
+
+    def _open_shard(
+        self,
+        directory: str,
+        shard: int,
+        dtype: np.dtype,
+        dimension: int,
+        create: bool = False,
+    ) -> np.memmap:
+        path = os.path.join(self.path, directory, f"{shard:05d}.npy")
+        if create:
+            return np.lib.format.open_memmap(
+                path,
+                mode="w+",
+                dtype=dtype,
+                shape=(self._shard_capacity(shard), dimension),
+            )
+        return np.load(path, mmap_mode="r+")
+
+    def _get_state(
+        self, conn: sqlite3.Connection, collection_name: str
+    ) -> Optional[CollectionState]:
+        row = conn.execute(
+            "SELECT directory, dimension, dtype, shard_count, version "
+            "FROM numpy_collection WHERE name = ?",
+            (collection_name,),
+        ).fetchone()
+        if row is None:
+            self._collections.pop(collection_name, None)
+            return None
+
+        directory, dimension, dtype, shard_count, version = row
+        state = self._collections.get(collection_name)
+        if (
+            state is not None
+            and state.version == version
+            and state.directory == directory
+        ):
+            return state
+
+        # Written by another process (or not loaded yet), shards that are
+        # already mapped are reused and the row ids are read again
+        shards = []
+        if state is not None and state.directory == directory:
+            shards = list(state.shards[:shard_count])
+        shards += [
+            self._open_shard(directory, shard, np.dtype(dtype), dimension)
+            for shard in range(len(shards), shard_count)
+        ]
+        ids = [np.full(len(shard), None, dtype=object) for shard in shards]
+        for doc_id, shard, shard_row in conn.execute(
+            "SELECT id, shard, row FROM numpy_document WHERE collection = ?",
+            (collection_name,),
+        ):
+            # Rows of shards added after the collection row was read are
+            # picked up on the next load, as the version has moved on
+            if shard < len(ids):
+                ids[shard][shard_row] = doc_id
+
+        state = CollectionState(
+            version=version,
+            directory=directory,
+            dimension=dimension,
+            shards=tuple(shards),
+            ids=tuple(ids),
+            live=tuple(np.not_equal(shard_ids, None) for shard_ids in ids),
+        )
+        self._collections[collection_name] = state
+        return state
+
+    def _create_collection(
+        self, conn: sqlite3.Connection, collection_name: str, dimension: int
+    ) -> CollectionState:
+        directory = uuid.uuid4().hex
+        os.makedirs(os.path.join(self.path, directory), exist_ok=True)
+        conn.execute(
+            "INSERT INTO numpy_collection "
+            "(name, directory, dimension, dtype, shard_count, version) "
+            "VALUES (?, ?, ?, ?, 0, 0)",
+            (collection_name, directory, dimension, self.dtype.name),
+        )
+        log.info(f"Collection {collection_name} created with dimension {dimension}")
+        return CollectionState(
+            version=0,
+            directory=directory,
+            dimension=dimension,
+            shards=(),
+            ids=(),
+            live=(),
+        )
+
+    @staticmethod
+    def _normalize(vectors: np.ndarray) -> np.ndarray:
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        return vectors / np.where(norms == 0, 1, norms)
+
+    def _get_metadata_expression(self, conn: sqlite3.Connection, key: str) -> str:
+        """
+        SQL expression for a metadata key. Filter keys come from a handful of
+        call sites, so each one gets an expression index on first use.
+        """
+        path = '$."' + key.replace('"', '""') + '"'
+        expression = "json_extract(metadata, '" + path.replace("'", "''") + "')"
+        if key not in self._indexed_keys:
+            index_name = hashlib.sha256(key.encode()).hexdigest()[:16]
+            conn.execute(
+                f"CREATE INDEX IF NOT EXISTS numpy_document_metadata_{index_name} "
+                f"ON numpy_document (collection, {expression})"
+            )
+            self._indexed_keys.add(key)
+        return expression
+
+    def _get_filter_clause(
+        self, conn: sqlite3.Connection, filter: Optional[Dict]
+    ) -> Tuple[str, list]:
+        """
+        Translates a metadata filter into SQL over the JSON metadata column.
+        Supports equality and the $eq, $ne, $in and $nin operators.
+        """
+        clauses, params = [], []
+        for key, value in (filter or {}).items():
+            expression = self._get_metadata_expression(conn, key)
+            if not isinstance(value, dict):
+                value = {"$eq": value}
+            for op, operand in value.items():
+                if op in ("$in", "$nin"):
+                    operand = list(operand)
+                    if not operand:
+                        clauses.append("0" if op == "$in" else "1")
+                        continue
+                    placeholders = ", ".join("?" * len(operand))
+                    negate = "NOT " if op == "$nin" else ""
+                    clauses.append(f"{expression} {negate}IN ({placeholders})")
+                    params += operand
+                elif op in ("$eq", "$ne"):
+                    comparison = "IS" if op == "$eq" else "IS NOT"
+                    clauses.append(f"{expression} {comparison} ?")
+                    params.append(operand)
+                else:
+                    raise ValueError(f"Unsupported filter operator: {op}")
+        return " AND ".join(clauses) or "1", params
+
+    def _select_documents(
+        self,
+        conn: sqlite3.Connection,
+        collection_name: str,
+        columns: str,
+        filter: Optional[Dict] = None,
+        limit: Optional[int] = None,
+    ) -> list[tuple]:
+        clause, params = self._get_filter_clause(conn, filter)
+        sql = (
+            f"SELECT {columns} FROM numpy_document "
+            f"WHERE collection = ? AND {clause} ORDER BY rowid"
+        )
+        params = [collection_name, *params]
+        if limit is not None and limit > 0:
+            sql += " LIMIT ?"
+            params.append(limit)
+        return conn.execute(sql, params).fetchall()
+
+    def has_collection(self, collection_name: str) -> bool:
+        conn = self._get_connection()
+        return self._get_state(conn, collection_name) is not None
+
+    def delete_collection(self, collection_name: str):
+        with self._write_transaction() as conn:
+            row = conn.execute(
+                "SELECT directory FROM numpy_collection WHERE name = ?",
+                (collection_name,),
+            ).fetchone()
+            conn.execute(
+                "DELETE FROM numpy_document WHERE collection = ?", (collection_name,)
+            )
+            conn.execute(
+                "DELETE FROM numpy_collection WHERE name = ?", (collection_name,)
+            )
+        self._collections.pop(collection_name, None)
+        if row is not None:
+            shutil.rmtree(os.path.join(self.path, row[0]), ignore_errors=True)
+
+    def search(
+        self,
+        collection_name: str,
+        vectors: List[List[Union[float, int]]],
+        filter: Optional[Dict] = None,
+        limit: int = 10,
+    ) -> Optional[SearchResult]:
+        if not vectors:
+            return None
+
+        conn = self._get_connection()
+        state = self._get_state(conn, collection_name)
+        if state is None:
+            return None
+
+        queries = self._normalize(np.asarray(vectors, dtype=np.float32))
+        if queries.shape[1] != state.dimension:
+            log.warning(
+                f"Query dimension {queries.shape[1]} does not match collection "
+                f"{collection_name} dimension {state.dimension}"
+            )
+            return None
+
+        masks = state.live
+        if filter:
+            masks = [np.zeros(len(shard), dtype=bool) for shard in state.shards]
+            for shard, shard_row in self._select_documents(
+                conn, collection_name, "shard, row", filter
+            ):
+                if shard < len(masks):
+                    masks[shard][shard_row] = True
+            masks = [mask & live for mask, live in zip(masks, state.live)]
+
+        if limit is None or limit <= 0:
+            limit = sum(int(mask.sum()) for mask in masks)
+
+        # Best rows of each shard per query vector, merged below
+        candidate_scores, candidate_shards, candidate_rows = [], [], []
+        for shard_index, (shard, mask) in enumerate(zip(state.shards, masks)):
+            rows = np.flatnonzero(mask)
+            if rows.size == 0:
+                continue
+
+            end = rows[-1] + 1
+            if rows.size * 4 < end:
+                # Few matching rows, score only those
+                scores = np.asarray(shard[rows], dtype=np.float32) @ queries.T
+            else:
+                # Mostly live rows, one contiguous read is faster than a gather
+                scores = np.asarray(shard[:end], dtype=np.float32) @ queries.T
+                scores[~mask[:end]] = -np.inf
+                rows = np.arange(end)
+
+            k = min(limit, len(rows))
+            top = np.argpartition(scores, len(rows) - k, axis=0)[-k:]
+            candidate_scores.append(np.take_along_axis(scores, top, axis=0))
+            candidate_rows.append(rows[top])
+            candidate_shards.append(np.full(top.shape, shard_index))
+
+        ids, distances = [[] for _ in vectors], [[] for _ in vectors]
+        if candidate_scores:
+            scores = np.concatenate(candidate_scores)
+            shards = np.concatenate(candidate_shards)
+            rows = np.concatenate(candidate_rows)
+            for query_index in range(len(vectors)):
+                order = np.argsort(-scores[:, query_index], kind="stable")[:limit]
+                for index in order:
+                    score = scores[index, query_index]
+                    if not np.isfinite(score):
+                        break
+                    shard = shards[index, query_index]
+                    row = rows[index, query_index]
+                    ids[query_index].append(state.ids[shard][row])
+                    # cosine similarity is [-1, 1], normalize to [0, 1]
+                    distances[query_index].append((float(score) + 1.0) / 2.0)
+
+        documents = {}
+        unique_ids = list(dict.fromkeys(doc_id for row in ids for doc_id in row))
+        for batch in self._batches(unique_ids):
+            placeholders = ", ".join("?" * len(batch))
+            for doc_id, text, metadata in conn.execute(
+                "SELECT id, text, metadata FROM numpy_document "
+                f"WHERE collection = ? AND id IN ({placeholders})",
+                (collection_name, *batch),
+            ):
+                documents[doc_id] = (text, json.loads(metadata or "{}"))
+
+        # Rows deleted since the snapshot was taken are dropped
+        result = SearchResult(ids=[], distances=[], documents=[], metadatas=[])
+        for query_ids, query_distances in zip(ids, distances):
+            matches = [
+                (doc_id, distance)
+                for doc_id, distance in zip(query_ids, query_distances)
+                if doc_id in documents
+            ]
+            result.ids.append([doc_id for doc_id, _ in matches])
+            result.distances.append([distance for _, distance in matches])
+            result.documents.append([documents[doc_id][0] for doc_id, _ in matches])
+            result.metadatas.append([documents[doc_id][1] for doc_id, _ in matches])
+        return result
+
+    def query(
+        self, collection_name: str, filter: Dict, limit: Optional[int] = None
+    ) -> Optional[GetResult]:
+        try:
+            conn = self._get_connection()
+            if self._get_state(conn, collection_name) is None:
+                return None
+
+            rows = self._select_documents(
+                conn, collection_name, "id, text, metadata", filter, limit
+            )
+            return GetResult(
+                ids=[[row[0] for row in rows]],
+                documents=[[row[1] for row in rows]],
+                metadatas=[[json.loads(row[2] or "{}") for row in rows]],
+            )
+        except Exception as e:
+            log.exception(f"Error querying collection {collection_name}: {e}")
+            return None
+
+    def query_with_vectors(
+        self, collection_name: str, filter: Dict, limit: Optional[int] = None
+    ) -> Optional[VectorGetResult]:
+        try:
+            conn = self._get_connection()
+            state = self._get_state(conn, collection_name)
+            if state is None:
+                return None
+
+            rows = self._select_documents(
+                conn,
+                collection_name,
+                "id, text, metadata, shard, row",
+                filter,
+                limit,
+            )
+            return VectorGetResult(
+                ids=[[row[0] for row in rows]],
+                documents=[[row[1] for row in rows]],
+                metadatas=[[json.loads(row[2] or "{}") for row in rows]],
+                vectors=[
+                    [
+                        np.asarray(state.shards[row[3]][row[4]], dtype=float).tolist()
+                        for row in rows
+                    ]
+                ],
+            )
+        except Exception as e:
+            log.exception(f"Error querying collection {collection_name}: {e}")
+            return None
+
+    def get(self, collection_name: str) -> Optional[GetResult]:
+        return self.query(collection_name, filter={})
+
+    def insert(self, collection_name: str, items: List[VectorItem]):
+        # Ids are unique per collection, inserting an existing id replaces it
+        self.upsert(collection_name, items)
+
+    def upsert(self, collection_name: str, items: List[VectorItem]):
+        # The last item wins when an id is repeated
+        items = list({item["id"]: item for item in items}.values())
+        if not items:
+            return
+
+        vectors = self._normalize(
+            np.asarray([item["vector"] for item in items], dtype=np.float32)
+        )
+
+        with self._write_transaction() as conn:
+            state = self._get_state(conn, collection_name)
+            if state is None:
+                state = self._create_collection(conn, collection_name, vectors.shape[1])
+            if vectors.shape[1] != state.dimension:
+                raise ValueError(
+                    f"Vector dimension {vectors.shape[1]} does not match collection "
+                    f"{collection_name} dimension {state.dimension}"
+                )
+
+            # Existing ids are written in place, new ones take free rows
+            slots = {}
+            item_ids = [item["id"] for item in items]
+            for batch in self._batches(item_ids):
+                placeholders = ", ".join("?" * len(batch))
+                for doc_id, shard, shard_row in conn.execute(
+                    "SELECT id, shard, row FROM numpy_document "
+                    f"WHERE collection = ? AND id IN ({placeholders})",
+                    (collection_name, *batch),
+                ):
+                    slots[doc_id] = (shard, shard_row)
+
+            shards = list(state.shards)
+            ids = list(state.ids)
+            free = [
+                (shard, int(shard_row))
+                for shard, live in enumerate(state.live)
+                for shard_row in np.flatnonzero(~live)
+            ]
+            free.reverse()
+            new_count = sum(1 for item_id in item_ids if item_id not in slots)
+            while len(free) < new_count:
+                shard = len(shards)
+                shards.append(
+                    self._open_shard(
+                        state.directory,
+                        shard,
+                        shards[0].dtype if shards else self.dtype,
+                        state.dimension,
+                        create=True,
+                    )
+                )
+                ids.append(np.full(len(shards[shard]), None, dtype=object))
+                free[:0] = [
+                    (shard, shard_row)
+                    for shard_row in reversed(range(len(shards[shard])))
+                ]
+            for item_id in item_ids:
+                if item_id not in slots:
+                    slots[item_id] = free.pop()
+
+            touched = set()
+            for item_id, vector in zip(item_ids, vectors):
+                shard, shard_row = slots[item_id]
+                if shard not in touched:
+                    touched.add(shard)
+                    ids[shard] = ids[shard].copy()
+                shards[shard][shard_row] = vector
+                ids[shard][shard_row] = item_id
+            for shard in touched:
+                shards[shard].flush()
+
+            conn.executemany(
+                "INSERT OR REPLACE INTO numpy_document "
+                "(collection, id, shard, row, text, metadata) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                [
+                    (
+                        collection_name,
+                        item["id"],
+                        *slots[item["id"]],
+                        item["text"],
+                        json.dumps(
+                            process_metadata(item["metadata"] or {}), default=str
+                        ),
+                    )
+                    for item in items
+                ],
+            )
+            conn.execute(
+                "UPDATE numpy_collection SET shard_count = ?, version = version + 1 "
+                "WHERE name = ?",
+                (len(shards), collection_name),
+            )
+            state = self._replace_state(state, shards, ids, touched)
+
+        self._collections[collection_name] = state
+
+    @staticmethod
+    def _replace_state(
+        state: CollectionState,
+        shards: list[np.memmap],
+        ids: list[np.ndarray],
+        touched: set[int],
+    ) -> CollectionState:
+        return CollectionState(
+            version=state.version + 1,
+            directory=state.directory,
+            dimension=state.dimension,
+            shards=tuple(shards),
+            ids=tuple(ids),
+            live=tuple(
+                (
+                    np.not_equal(shard_ids, None)
+                    if shard in touched or shard >= len(state.live)
+                    else state.live[shard]
+                )
+                for shard, shard_ids in enumerate(ids)
+            ),
+        )
+
+    def delete(
+        self,
+        collection_name: str,
+        ids: Optional[List[str]] = None,
+        filter: Optional[Dict] = None,
+    ):
+        if not ids and not filter:
+            return
+
+        with self._write_transaction() as conn:
+            state = self._get_state(conn, collection_name)
+            if state is None:
+                return
+
+            if ids:
+                rows = []
+                for batch in self._batches(list(ids)):
+                    placeholders = ", ".join("?" * len(batch))
+                    rows += conn.execute(
+                        "SELECT id, shard, row FROM numpy_document "
+                        f"WHERE collection = ? AND id IN ({placeholders})",
+                        (collection_name, *batch),
+                    ).fetchall()
+            else:
+                rows = self._select_documents(
+                    conn, collection_name, "id, shard, row", filter
+                )
+            if not rows:
+                return
+
+            shard_ids = list(state.ids)
+            touched = set()
+            for _, shard, shard_row in rows:
+                if shard not in touched:
+                    touched.add(shard)
+                    shard_ids[shard] = shard_ids[shard].copy()
+                shard_ids[shard][shard_row] = None
+
+            conn.executemany(
+                "DELETE FROM numpy_document WHERE collection = ? AND id = ?",
+                [(collection_name, row[0]) for row in rows],
+            )
+            conn.execute(
+                "UPDATE numpy_collection SET version = version + 1 WHERE name = ?",
+                (collection_name,),
+            )
+            state = self._replace_state(state, list(state.shards), shard_ids, touched)
+
+        self._collections[collection_name] = state
+
+    def reset(self):
+        with self._write_transaction() as conn:
+            directories = [
+                row[0] for row in conn.execute("SELECT directory FROM numpy_collection")
+            ]
+            conn.execute("DELETE FROM numpy_document")
+            conn.execute("DELETE FROM numpy_collection")
+        self._collections.clear()
+        for directory in directories:
+            shutil.rmtree(os.path.join(self.path, directory), ignore_errors=True)
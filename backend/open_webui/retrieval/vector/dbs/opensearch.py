@@ -1,5 +1,6 @@
-from opensearchpy import OpenSearch
-from opensearchpy.helpers import bulk
+from opensearchpy import AsyncOpenSearch, OpenSearch
+from opensearchpy.helpers import async_bulk, bulk
+from concurrent.futures import Executor
 from typing import Optional
 
 from open_webui.retrieval.vector.utils import process_metadata
@@ -8,6 +9,8 @@ from open_webui.retrieval.vector.main import (
     VectorItem,
     SearchResult,
     GetResult,
+    VectorGetResult,
+    ThreadedAsyncVectorDB,
 )
 from open_webui.config import (
     OPENSEARCH_URI,
@@ -21,12 +24,13 @@ from open_webui.config import (
 class OpenSearchClient(VectorDBBase):
     def __init__(self):
         self.index_prefix = "open_webui"
-        self.client = OpenSearch(
-            hosts=[OPENSEARCH_URI],
-            use_ssl=OPENSEARCH_SSL,
-            verify_certs=OPENSEARCH_CERT_VERIFY,
-            http_auth=(OPENSEARCH_USERNAME, OPENSEARCH_PASSWORD),
-        )
+        self.client_kwargs = {
+            "hosts": [OPENSEARCH_URI],
+            "use_ssl": OPENSEARCH_SSL,
+            "verify_certs": OPENSEARCH_CERT_VERIFY,
+            "http_auth": (OPENSEARCH_USERNAME, OPENSEARCH_PASSWORD),
+        }
+        self.client = OpenSearch(**self.client_kwargs)
 
     def _get_index_name(self, collection_name: str) -> str:
         return f"{self.index_prefix}_{collection_name}"
@@ -120,65 +124,143 @@ class OpenSearchClient(VectorDBBase):
         limit: int = 10,
     ) -> Optional[SearchResult]:
         try:
-            if not self.has_collection(collection_name):
-                return None
-
-            query = {
-                "size": limit,
-                "_source": ["text", "metadata"],
-                "query": {
-                    "script_score": {
-                        "query": {"match_all": {}},
-                        "script": {
-                            "source": "(cosineSimilarity(params.query_value, doc[params.field]) + 1.0) / 2.0",
-                            "params": {
-                                "field": "vector",
-                                "query_value": vectors[0],
-                            },  # Assuming single query vector
-                        },
-                    }
-                },
-            }
+            return self.search_collections([collection_name], vectors, limit)[
+                collection_name
+            ]
+        except Exception as e:
+            return None
 
-            result = self.client.search(
-                index=self._get_index_name(collection_name), body=query
-            )
+    def search_collections(
+        self,
+        collection_names: list[str],
+        vectors: list[list[float | int]],
+        limit: int = 10,
+    ) -> dict[str, Optional[SearchResult]]:
+        # Every collection and query vector pair goes out in a single msearch,
+        # missing indexes come back as per-search errors
+        collection_names = list(dict.fromkeys(collection_names))
+        if not collection_names or not vectors:
+            return {collection_name: None for collection_name in collection_names}
+
+        result = self.client.msearch(
+            body=self._get_msearch_body(collection_names, vectors, limit)
+        )
+        return self._msearch_to_search_results(
+            collection_names, vectors, result["responses"]
+        )
 
-            return self._result_to_search_result(result)
+    def _get_msearch_body(
+        self,
+        collection_names: list[str],
+        vectors: list[list[float | int]],
+        limit: int,
+    ) -> list[dict]:
+        searches = []
+        for collection_name in collection_names:
+            for vector in vectors:
+                searches.append({"index": self._get_index_name(collection_name)})
+                searches.append(self._get_search_body(vector, limit))
+        return searches
+
+    def _msearch_to_search_results(
+        self, collection_names: list[str], vectors: list[list[float | int]], responses
+    ) -> dict[str, Optional[SearchResult]]:
+        results = {}
+        for index, collection_name in enumerate(collection_names):
+            collection_responses = responses[
+                index * len(vectors) : (index + 1) * len(vectors)
+            ]
+            if any("error" in response for response in collection_responses):
+                results[collection_name] = None
+                continue
+            if not any(response["hits"]["hits"] for response in collection_responses):
+                results[collection_name] = None
+                continue
+
+            ids, distances, documents, metadatas = [], [], [], []
+            for response in collection_responses:
+                hits = response["hits"]["hits"]
+                ids.append([hit["_id"] for hit in hits])
+                distances.append([hit["_score"] for hit in hits])
+                documents.append([hit["_source"].get("text") for hit in hits])
+                metadatas.append([hit["_source"].get("metadata") for hit in hits])
+            results[collection_name] = SearchResult(
+                ids=ids, distances=distances, documents=documents, metadatas=metadatas
+            )
+        return results
 
-        except Exception as e:
-            return None
+    def _get_search_body(self, vector: list[float | int], limit: int) -> dict:
+        return {
+            "size": limit,
+            "_source": ["text", "metadata"],
+            "query": {
+                "script_score": {
+                    "query": {"match_all": {}},
+                    "script": {
+                        "source": "(cosineSimilarity(params.query_value, doc[params.field]) + 1.0) / 2.0",
+                        "params": {
+                            "field": "vector",
+                            "query_value": vector,
+                        },
+                    },
+                }
+            },
+        }
 
     def query(
         self, collection_name: str, filter: dict, limit: Optional[int] = None
     ) -> Optional[GetResult]:
-        if not self.has_collection(collection_name):
-            return None
-
-        query_body = {
-            "query": {"bool": {"filter": []}},
-            "_source": ["text", "metadata"],
-        }
+        return self._query(collection_name, filter, limit)
 
-        for field, value in filter.items():
-            query_body["query"]["bool"]["filter"].append(
-                {"term": {"metadata." + str(field) + ".keyword": value}}
-            )
+    def query_with_vectors(
+        self, collection_name: str, filter: dict, limit: Optional[int] = None
+    ) -> Optional[VectorGetResult]:
+        return self._query(collection_name, filter, limit, with_vectors=True)
 
-        size = limit if limit else 10000
+    def _query(
+        self,
+        collection_name: str,
+        filter: dict,
+        limit: Optional[int] = None,
+        with_vectors: bool = False,
+    ) -> Optional[GetResult]:
+        if not self.has_collection(collection_name):
+            return None
 
         try:
             result = self.client.search(
                 index=self._get_index_name(collection_name),
-                body=query_body,
-                size=size,
+                body=self._get_query_body(filter, with_vectors),
+                size=limit if limit else 10000,
             )
 
-            return self._result_to_get_result(result)
+            get_result = self._result_to_get_result(result)
+            if with_vectors and get_result is not None:
+                return VectorGetResult(
+                    ids=get_result.ids,
+                    documents=get_result.documents,
+                    metadatas=get_result.metadatas,
+                    vectors=[
+                        [hit["_source"]["vector"] for hit in result["hits"]["hits"]]
+                    ],
+                )
+            return get_result
 
         except Exception as e:
             return None
 
+    def _get_query_body(self, filter: dict, with_vectors: bool = False) -> dict:
+        query_body = {
+            "query": {"bool": {"filter": []}},
+            "_source": ["text", "metadata", *(["vector"] if with_vectors else [])],
+        }
+
+        for field, value in filter.items():
+            query_body["query"]["bool"]["filter"].append(
+                {"term": {"metadata." + str(field) + ".keyword": value}}
+            )
+        return query_body
+
     def _create_index_if_not_exists(self, collection_name: str, dimension: int):
         if not self.has_collection(collection_name):
             self._create_index(collection_name, dimension)
@@ -197,45 +279,53 @@ class OpenSearchClient(VectorDBBase):
         )
 
         for batch in self._create_batches(items):
-            actions = [
-                {
-                    "_op_type": "index",
-                    "_index": self._get_index_name(collection_name),
-                    "_id": item["id"],
-                    "_source": {
-                        "vector": item["vector"],
-                        "text": item["text"],
-                        "metadata": process_metadata(item["metadata"]),
-                    },
-                }
-                for item in batch
-            ]
-            bulk(self.client, actions)
+            bulk(self.client, self._get_insert_actions(collection_name, batch))
         self.client.indices.refresh(self._get_index_name(collection_name))
 
+    def _get_insert_actions(
+        self, collection_name: str, items: list[VectorItem]
+    ) -> list[dict]:
+        return [
+            {
+                "_op_type": "index",
+                "_index": self._get_index_name(collection_name),
+                "_id": item["id"],
+                "_source": {
+                    "vector": item["vector"],
+                    "text": item["text"],
+                    "metadata": process_metadata(item["metadata"]),
+                },
+            }
+            for item in items
+        ]
+
     def upsert(self, collection_name: str, items: list[VectorItem]):
         self._create_index_if_not_exists(
             collection_name=collection_name, dimension=len(items[0]["vector"])
         )
 
         for batch in self._create_batches(items):
-            actions = [
-                {
-                    "_op_type": "update",
-                    "_index": self._get_index_name(collection_name),
-                    "_id": item["id"],
-                    "doc": {
-                        "vector": item["vector"],
-                        "text": item["text"],
-                        "metadata": process_metadata(item["metadata"]),
-                    },
-                    "doc_as_upsert": True,
-                }
-                for item in batch
-            ]
-            bulk(self.client, actions)
+            bulk(self.client, self._get_upsert_actions(collection_name, batch))
         self.client.indices.refresh(self._get_index_name(collection_name))
 
+    def _get_upsert_actions(
+        self, collection_name: str, items: list[VectorItem]
+    ) -> list[dict]:
+        return [
+            {
+                "_op_type": "update",
+                "_index": self._get_index_name(collection_name),
+                "_id": item["id"],
+                "doc": {
+                    "vector": item["vector"],
+                    "text": item["text"],
+                    "metadata": process_metadata(item["metadata"]),
+                },
+                "doc_as_upsert": True,
+            }
+            for item in items
+        ]
+
     def delete(
         self,
         collection_name: str,
@@ -243,29 +333,167 @@ class OpenSearchClient(VectorDBBase):
         filter: Optional[dict] = None,
     ):
         if ids:
-            actions = [
-                {
-                    "_op_type": "delete",
-                    "_index": self._get_index_name(collection_name),
-                    "_id": id,
-                }
-                for id in ids
-            ]
-            bulk(self.client, actions)
+            bulk(self.client, self._get_delete_actions(collection_name, ids))
         elif filter:
-            query_body = {
-                "query": {"bool": {"filter": []}},
-            }
-            for field, value in filter.items():
-                query_body["query"]["bool"]["filter"].append(
-                    {"term": {"metadata." + str(field) + ".keyword": value}}
-                )
             self.client.delete_by_query(
-                index=self._get_index_name(collection_name), body=query_body
+                index=self._get_index_name(collection_name),
+                body=self._get_delete_query(filter),
             )
         self.client.indices.refresh(self._get_index_name(collection_name))
 
+    def _get_delete_actions(self, collection_name: str, ids: list[str]) -> list[dict]:
+        return [
+            {
+                "_op_type": "delete",
+                "_index": self._get_index_name(collection_name),
+                "_id": id,
+            }
+            for id in ids
+        ]
+
+    def _get_delete_query(self, filter: dict) -> dict:
+        query_body = {
+            "query": {"bool": {"filter": []}},
+        }
+        for field, value in filter.items():
+            query_body["query"]["bool"]["filter"].append(
+                {"term": {"metadata." + str(field) + ".keyword": value}}
+            )
+        return query_body
+
     def reset(self):
         indices = self.client.indices.get(index=f"{self.index_prefix}_*")
         for index in indices:
             self.client.indices.delete(index=index)
+
+
+class AsyncOpenSearchClient(ThreadedAsyncVectorDB):
+    """
+    Searches, queries and writes through AsyncOpenSearch, which keeps its own
+    connection pool. Creating indexes is left to the sync client in the
+    shared executor.
+    """
+
+    def __init__(self, client: OpenSearchClient, executor: Executor):
+        super().__init__(client, executor)
+        self._async_client = None
+
+    @property
+    def async_client(self) -> AsyncOpenSearch:
+        # Created on first use, inside the event loop it is bound to
+        if self._async_client is None:
+            self._async_client = AsyncOpenSearch(**self.client.client_kwargs)
+        return self._async_client
+
+    async def has_collection(self, collection_name: str) -> bool:
+        return await self.async_client.indices.exists(
+            index=self.client._get_index_name(collection_name)
+        )
+
+    async def delete_collection(self, collection_name: str):
+        await self.async_client.indices.delete(
+            index=self.client._get_index_name(collection_name)
+        )
+
+    async def search(
+        self,
+        collection_name: str,
+        vectors: list[list[float | int]],
+        filter: Optional[dict] = None,
+        limit: int = 10,
+    ) -> Optional[SearchResult]:
+        try:
+            results = await self.search_collections([collection_name], vectors, limit)
+            return results[collection_name]
+        except Exception as e:
+            return None
+
+    async def search_collections(
+        self,
+        collection_names: list[str],
+        vectors: list[list[float | int]],
+        limit: int = 10,
+    ) -> dict[str, Optional[SearchResult]]:
+        collection_names = list(dict.fromkeys(collection_names))
+        if not collection_names or not vectors:
+            return {collection_name: None for collection_name in collection_names}
+
+        result = await self.async_client.msearch(
+            body=self.client._get_msearch_body(collection_names, vectors, limit)
+        )
+        return self.client._msearch_to_search_results(
+            collection_names, vectors, result["responses"]
+        )
+
+    async def query(
+        self, collection_name: str, filter: dict, limit: Optional[int] = None
+    ) -> Optional[GetResult]:
+        if not await self.has_collection(collection_name):
+            return None
+
+        try:
+            result = await self.async_client.search(
+                index=self.client._get_index_name(collection_name),
+                body=self.client._get_query_body(filter),
+                size=limit if limit else 10000,
+            )
+            return self.client._result_to_get_result(result)
+        except Exception as e:
+            return None
+
+    async def get(self, collection_name: str) -> Optional[GetResult]:
+        result = await self.async_client.search(
+            index=self.client._get_index_name(collection_name),
+            body={"query": {"match_all": {}}, "_source": ["text", "metadata"]},
+        )
+        return self.client._result_to_get_result(result)
+
+    async def insert(self, collection_name: str, items: list[VectorItem]):
+        await self._run(
+            self.client._create_index_if_not_exists,
+            collection_name=collection_name,
+            dimension=len(items[0]["vector"]),
+        )
+        for batch in self.client._create_batches(items):
+            await async_bulk(
+                self.async_client,
+                self.client._get_insert_actions(collection_name, batch),
+            )
+        await self.async_client.indices.refresh(
+            index=self.client._get_index_name(collection_name)
+        )
+
+    async def upsert(self, collection_name: str, items: list[VectorItem]):
+        await self._run(
+            self.client._create_index_if_not_exists,
+            collection_name=collection_name,
+            dimension=len(items[0]["vector"]),
+        )
+        for batch in self.client._create_batches(items):
+            await async_bulk(
+                self.async_client,
+                self.client._get_upsert_actions(collection_name, batch),
+            )
+        await self.async_client.indices.refresh(
+            index=self.client._get_index_name(collection_name)
+        )
+
+    async def delete(
+        self,
+        collection_name: str,
+        ids: Optional[list[str]] = None,
+        filter: Optional[dict] = None,
+    ):
+        if ids:
+            await async_bulk(
+                self.async_client,
+                self.client._get_delete_actions(collection_name, ids),
+            )
+        elif filter:
+            await self.async_client.delete_by_query(
+                index=self.client._get_index_name(collection_name),
+                body=self.client._get_delete_query(filter),
+            )
+        await self.async_client.indices.refresh(
+            index=self.client._get_index_name(collection_name)
+        )
@@ -33,6 +33,7 @@ from open_webui.retrieval.vector.main import (
     VectorItem,
     SearchResult,
     GetResult,
+    VectorGetResult,
 )
 from open_webui.config import (
     PGVECTOR_DB_URL,
@@ -575,6 +576,20 @@ class PgvectorClient(VectorDBBase):
 
     def query(
         self, collection_name: str, filter: Dict[str, Any], limit: Optional[int] = None
+    ) -> Optional[GetResult]:
+        return self._query(collection_name, filter, limit)
+
+    def query_with_vectors(
+        self, collection_name: str, filter: Dict[str, Any], limit: Optional[int] = None
+    ) -> Optional[VectorGetResult]:
+        return self._query(collection_name, filter, limit, with_vectors=True)
+
+    def _query(
+        self,
+        collection_name: str,
+        filter: Dict[str, Any],
+        limit: Optional[int] = None,
+        with_vectors: bool = False,
     ) -> Optional[GetResult]:
         try:
             if PGVECTOR_PGCRYPTO:
@@ -596,14 +611,20 @@ class PgvectorClient(VectorDBBase):
                     pgcrypto_decrypt(
                         DocumentChunk.vmetadata, PGVECTOR_PGCRYPTO_KEY, JSONB
                     ).label("vmetadata"),
+                    *([DocumentChunk.vector] if with_vectors else []),
                 ).where(*where_clauses)
                 if limit is not None:
                     stmt = stmt.limit(limit)
                 results = self.session.execute(stmt).all()
             else:
-                query = self.session.query(DocumentChunk).filter(
-                    DocumentChunk.collection_name == collection_name
-                )
+                # Plain columns rather than ORM instances, which the rollback
+                # below would expire
+                query = self.session.query(
+                    DocumentChunk.id,
+                    DocumentChunk.text,
+                    DocumentChunk.vmetadata,
+                    *([DocumentChunk.vector] if with_vectors else []),
+                ).filter(DocumentChunk.collection_name == collection_name)
 
                 for key, value in filter.items():
                     query = query.filter(
@@ -621,8 +642,27 @@ class PgvectorClient(VectorDBBase):
             ids = [[result.id for result in results]]
             documents = [[result.text for result in results]]
             metadatas = [[result.vmetadata for result in results]]
+            if with_vectors:
+                vectors = [
+                    [
+                        # Vector columns load as numpy arrays, halfvec as HalfVector
+                        (
+                            result.vector.tolist()
+                            if hasattr(result.vector, "tolist")
+                            else result.vector.to_list()
+                        )
+                        for result in results
+                    ]
+                ]
 
             self.session.rollback()  # read-only transaction
+            if with_vectors:
+                return VectorGetResult(
+                    ids=ids,
+                    documents=documents,
+                    metadatas=metadatas,
+                    vectors=vectors,
+                )
             return GetResult(
                 ids=ids,
                 documents=documents,
@@ -1,7 +1,9 @@
+from concurrent.futures import Executor
 from typing import Optional
 import logging
 from urllib.parse import urlparse
 
+from qdrant_client import AsyncQdrantClient as AsyncQclient
 from qdrant_client import QdrantClient as Qclient
 from qdrant_client.http.models import PointStruct
 from qdrant_client.models import models
@@ -11,6 +13,8 @@ from open_webui.retrieval.vector.main import (
     VectorItem,
     SearchResult,
     GetResult,
+    VectorGetResult,
+    ThreadedAsyncVectorDB,
 )
 from open_webui.config import (
     QDRANT_URI,
@@ -49,20 +53,21 @@ class QdrantClient(VectorDBBase):
         http_port = parsed.port or 6333  # default REST port
 
         if self.PREFER_GRPC:
-            self.client = Qclient(
-                host=host,
-                port=http_port,
-                grpc_port=self.GRPC_PORT,
-                prefer_grpc=self.PREFER_GRPC,
-                api_key=self.QDRANT_API_KEY,
-                timeout=self.QDRANT_TIMEOUT,
-            )
+            self.client_kwargs = {
+                "host": host,
+                "port": http_port,
+                "grpc_port": self.GRPC_PORT,
+                "prefer_grpc": self.PREFER_GRPC,
+                "api_key": self.QDRANT_API_KEY,
+                "timeout": self.QDRANT_TIMEOUT,
+            }
         else:
-            self.client = Qclient(
-                url=self.QDRANT_URI,
-                api_key=self.QDRANT_API_KEY,
-                timeout=QDRANT_TIMEOUT,
-            )
+            self.client_kwargs = {
+                "url": self.QDRANT_URI,
+                "api_key": self.QDRANT_API_KEY,
+                "timeout": QDRANT_TIMEOUT,
+            }
+        self.client = Qclient(**self.client_kwargs)
 
     def _result_to_get_result(self, points) -> GetResult:
         ids = []
@@ -83,6 +88,30 @@ class QdrantClient(VectorDBBase):
             }
         )
 
+    def _responses_to_search_result(self, query_responses) -> SearchResult:
+        ids, documents, metadatas, distances = [], [], [], []
+        for query_response in query_responses:
+            get_result = self._result_to_get_result(query_response.points)
+            ids.extend(get_result.ids)
+            documents.extend(get_result.documents)
+            metadatas.extend(get_result.metadatas)
+            # qdrant distance is [-1, 1], normalize to [0, 1]
+            distances.append(
+                [(point.score + 1.0) / 2.0 for point in query_response.points]
+            )
+        return SearchResult(
+            ids=ids, documents=documents, metadatas=metadatas, distances=distances
+        )
+
+    def _get_query_requests(
+        self, vectors: list[list[float | int]], limit: int
+    ) -> list[models.QueryRequest]:
+        # One request per query vector, sent together with query_batch_points
+        return [
+            models.QueryRequest(query=vector, limit=limit, with_payload=True)
+            for vector in vectors
+        ]
+
     def _create_collection(self, collection_name: str, dimension: int):
         collection_name_with_prefix = f"{self.collection_prefix}_{collection_name}"
         self.client.create_collection(
@@ -155,42 +184,65 @@ class QdrantClient(VectorDBBase):
         if limit is None:
             limit = NO_LIMIT  # otherwise qdrant would set limit to 10!
 
-        query_response = self.client.query_points(
+        query_responses = self.client.query_batch_points(
             collection_name=f"{self.collection_prefix}_{collection_name}",
-            query=vectors[0],
-            limit=limit,
+            requests=self._get_query_requests(vectors, limit),
         )
-        get_result = self._result_to_get_result(query_response.points)
-        return SearchResult(
-            ids=get_result.ids,
-            documents=get_result.documents,
-            metadatas=get_result.metadatas,
-            # qdrant distance is [-1, 1], normalize to [0, 1]
-            distances=[[(point.score + 1.0) / 2.0 for point in query_response.points]],
+        return self._responses_to_search_result(query_responses)
+
+    def _scroll(
+        self,
+        collection_name: str,
+        filter: dict,
+        limit: Optional[int] = None,
+        with_vectors: bool = False,
+    ):
+        if limit is None:
+            limit = NO_LIMIT  # otherwise qdrant would set limit to 10!
+
+        points = self.client.scroll(
+            collection_name=f"{self.collection_prefix}_{collection_name}",
+            scroll_filter=self._get_scroll_filter(filter),
+            limit=limit,
+            with_vectors=with_vectors,
         )
+        return points[0]
+
+    def _get_scroll_filter(self, filter: dict) -> models.Filter:
+        field_conditions = []
+        for key, value in filter.items():
+            field_conditions.append(
+                models.FieldCondition(
+                    key=f"metadata.{key}", match=models.MatchValue(value=value)
+                )
+            )
+        return models.Filter(should=field_conditions)
 
     def query(self, collection_name: str, filter: dict, limit: Optional[int] = None):
         # Construct the filter string for querying
         if not self.has_collection(collection_name):
             return None
         try:
-            if limit is None:
-                limit = NO_LIMIT  # otherwise qdrant would set limit to 10!
-
-            field_conditions = []
-            for key, value in filter.items():
-                field_conditions.append(
-                    models.FieldCondition(
-                        key=f"metadata.{key}", match=models.MatchValue(value=value)
-                    )
-                )
+            points = self._scroll(collection_name, filter, limit)
+            return self._result_to_get_result(points)
+        except Exception as e:
+            log.exception(f"Error querying a collection '{collection_name}': {e}")
+            return None
 
-            points = self.client.scroll(
-                collection_name=f"{self.collection_prefix}_{collection_name}",
-                scroll_filter=models.Filter(should=field_conditions),
-                limit=limit,
+    def query_with_vectors(
+        self, collection_name: str, filter: dict, limit: Optional[int] = None
+    ) -> Optional[VectorGetResult]:
+        if not self.has_collection(collection_name):
+            return None
+        try:
+            points = self._scroll(collection_name, filter, limit, with_vectors=True)
+            get_result = self._result_to_get_result(points)
+            return VectorGetResult(
+                ids=get_result.ids,
+                documents=get_result.documents,
+                metadatas=get_result.metadatas,
+                vectors=[[point.vector for point in points]],
             )
-            return self._result_to_get_result(points[0])
         except Exception as e:
             log.exception(f"Error querying a collection '{collection_name}': {e}")
             return None
@@ -222,6 +274,14 @@ class QdrantClient(VectorDBBase):
         filter: Optional[dict] = None,
     ):
         # Delete the items from the collection based on the ids.
+        return self.client.delete(
+            collection_name=f"{self.collection_prefix}_{collection_name}",
+            points_selector=self._get_delete_selector(ids, filter),
+        )
+
+    def _get_delete_selector(
+        self, ids: Optional[list[str]] = None, filter: Optional[dict] = None
+    ) -> models.FilterSelector:
         field_conditions = []
 
         if ids:
@@ -241,12 +301,7 @@ class QdrantClient(VectorDBBase):
                     ),
                 ),
 
-        return self.client.delete(
-            collection_name=f"{self.collection_prefix}_{collection_name}",
-            points_selector=models.FilterSelector(
-                filter=models.Filter(must=field_conditions)
-            ),
-        )
+        return models.FilterSelector(filter=models.Filter(must=field_conditions))
 
     def reset(self):
         # Resets the database. This will delete all collections and item entries.
@@ -254,3 +309,91 @@ class QdrantClient(VectorDBBase):
         for collection_name in collection_names:
             if collection_name.name.startswith(self.collection_prefix):
                 self.client.delete_collection(collection_name=collection_name.name)
+
+
+class AsyncQdrantClient(ThreadedAsyncVectorDB):
+    """
+    Searches, queries and writes through Qdrant's async client. Creating
+    collections is left to the sync client in the shared executor.
+    """
+
+    def __init__(self, client: QdrantClient, executor: Executor):
+        super().__init__(client, executor)
+        self.collection_prefix = client.collection_prefix
+        self._async_client = None
+
+    @property
+    def async_client(self) -> AsyncQclient:
+        # Created on first use, inside the event loop it is bound to
+        if self._async_client is None:
+            self._async_client = AsyncQclient(**self.client.client_kwargs)
+        return self._async_client
+
+    async def has_collection(self, collection_name: str) -> bool:
+        return await self.async_client.collection_exists(
+            f"{self.collection_prefix}_{collection_name}"
+        )
+
+    async def search(
+        self,
+        collection_name: str,
+        vectors: list[list[float | int]],
+        filter: Optional[dict] = None,
+        limit: int = 10,
+    ) -> Optional[SearchResult]:
+        if limit is None:
+            limit = NO_LIMIT  # otherwise qdrant would set limit to 10!
+
+        query_responses = await self.async_client.query_batch_points(
+            collection_name=f"{self.collection_prefix}_{collection_name}",
+            requests=self.client._get_query_requests(vectors, limit),
+        )
+        return self.client._responses_to_search_result(query_responses)
+
+    async def query(
+        self, collection_name: str, filter: dict, limit: Optional[int] = None
+    ) -> Optional[GetResult]:
+        if not await self.has_collection(collection_name):
+            return None
+        try:
+            points, _ = await self.async_client.scroll(
+                collection_name=f"{self.collection_prefix}_{collection_name}",
+                scroll_filter=self.client._get_scroll_filter(filter),
+                limit=limit if limit is not None else NO_LIMIT,
+            )
+            return self.client._result_to_get_result(points)
+        except Exception as e:
+            log.exception(f"Error querying a collection '{collection_name}': {e}")
+            return None
+
+    async def get(self, collection_name: str) -> Optional[GetResult]:
+        points, _ = await self.async_client.scroll(
+            collection_name=f"{self.collection_prefix}_{collection_name}",
+            limit=NO_LIMIT,  # otherwise qdrant would set limit to 10!
+        )
+        return self.client._result_to_get_result(points)
+
+    async def insert(self, collection_name: str, items: list[VectorItem]):
+        await self.upsert(collection_name, items)
+
+    async def upsert(self, collection_name: str, items: list[VectorItem]):
+        await self._run(
+            self.client._create_collection_if_not_exists,
+            collection_name,
+            len(items[0]["vector"]),
+        )
+        return await self.async_client.upsert(
+            f"{self.collection_prefix}_{collection_name}",
+            self.client._create_points(items),
+        )
+
+    async def delete(
+        self,
+        collection_name: str,
+        ids: Optional[list[str]] = None,
+        filter: Optional[dict] = None,
+    ):
+        return await self.async_client.delete(
+            collection_name=f"{self.collection_prefix}_{collection_name}",
+            points_selector=self.client._get_delete_selector(ids, filter),
+        )
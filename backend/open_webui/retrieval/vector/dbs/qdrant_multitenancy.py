@@ -1,4 +1,6 @@
+import asyncio
 import logging
+from concurrent.futures import Executor
 from typing import Optional, Tuple, List, Dict, Any
 from urllib.parse import urlparse
 
@@ -16,9 +18,12 @@ from open_webui.config import (
 from open_webui.retrieval.vector.main import (
     GetResult,
     SearchResult,
+    ThreadedAsyncVectorDB,
     VectorDBBase,
+    VectorGetResult,
     VectorItem,
 )
+from qdrant_client import AsyncQdrantClient as AsyncQclient
 from qdrant_client import QdrantClient as Qclient
 from qdrant_client.http.exceptions import UnexpectedResponse
 from qdrant_client.http.models import PointStruct
@@ -64,22 +69,23 @@ class QdrantClient(VectorDBBase):
         host = parsed.hostname or self.QDRANT_URI
         http_port = parsed.port or 6333  # default REST port
 
-        self.client = (
-            Qclient(
-                host=host,
-                port=http_port,
-                grpc_port=self.GRPC_PORT,
-                prefer_grpc=self.PREFER_GRPC,
-                api_key=self.QDRANT_API_KEY,
-                timeout=self.QDRANT_TIMEOUT,
-            )
+        self.client_kwargs = (
+            {
+                "host": host,
+                "port": http_port,
+                "grpc_port": self.GRPC_PORT,
+                "prefer_grpc": self.PREFER_GRPC,
+                "api_key": self.QDRANT_API_KEY,
+                "timeout": self.QDRANT_TIMEOUT,
+            }
             if self.PREFER_GRPC
-            else Qclient(
-                url=self.QDRANT_URI,
-                api_key=self.QDRANT_API_KEY,
-                timeout=self.QDRANT_TIMEOUT,
-            )
+            else {
+                "url": self.QDRANT_URI,
+                "api_key": self.QDRANT_API_KEY,
+                "timeout": self.QDRANT_TIMEOUT,
+            }
         )
+        self.client = Qclient(**self.client_kwargs)
 
         # Main collection types for multi-tenancy
         self.MEMORY_COLLECTION = f"{self.collection_prefix}_memories"
@@ -134,6 +140,62 @@ class QdrantClient(VectorDBBase):
         else:
             return self.KNOWLEDGE_COLLECTION, tenant_id
 
+    def _group_by_collection(
+        self, collection_names: List[str]
+    ) -> Dict[str, List[Tuple[str, str]]]:
+        """
+        Groups logical collection names by the multi-tenant collection they live in,
+        so each group can be searched with a single batched request.
+        """
+        groups = {}
+        for collection_name in dict.fromkeys(collection_names):
+            mt_collection, tenant_id = self._get_collection_and_tenant_id(
+                collection_name
+            )
+            groups.setdefault(mt_collection, []).append((collection_name, tenant_id))
+        return groups
+
+    def _get_query_requests(
+        self,
+        tenants: List[Tuple[str, str]],
+        vectors: List[List[float | int]],
+        limit: int,
+    ) -> List[models.QueryRequest]:
+        # Ordered tenant by tenant, one request per query vector
+        return [
+            models.QueryRequest(
+                query=vector,
+                limit=limit,
+                filter=models.Filter(must=[_tenant_filter(tenant_id)]),
+                with_payload=True,
+            )
+            for _, tenant_id in tenants
+            for vector in vectors
+        ]
+
+    def _responses_to_search_results(
+        self,
+        tenants: List[Tuple[str, str]],
+        vectors: List[List[float | int]],
+        query_responses,
+    ) -> Dict[str, SearchResult]:
+        results = {}
+        for index, (collection_name, _) in enumerate(tenants):
+            ids, documents, metadatas, distances = [], [], [], []
+            start = index * len(vectors)
+            for query_response in query_responses[start : start + len(vectors)]:
+                get_result = self._result_to_get_result(query_response.points)
+                ids.extend(get_result.ids)
+                documents.extend(get_result.documents)
+                metadatas.extend(get_result.metadatas)
+                distances.append(
+                    [(point.score + 1.0) / 2.0 for point in query_response.points]
+                )
+            results[collection_name] = SearchResult(
+                ids=ids, documents=documents, metadatas=metadatas, distances=distances
+            )
+        return results
+
     def _create_multi_tenant_collection(
         self, mt_collection_name: str, dimension: int = DEFAULT_DIMENSION
     ):
@@ -265,25 +327,43 @@ class QdrantClient(VectorDBBase):
         """
         if not self.client or not vectors:
             return None
-        mt_collection, tenant_id = self._get_collection_and_tenant_id(collection_name)
-        if not self.client.collection_exists(collection_name=mt_collection):
-            log.debug(f"Collection {mt_collection} doesn't exist, search returns None")
-            return None
+        return self.search_collections([collection_name], vectors, limit)[
+            collection_name
+        ]
 
-        tenant_filter = _tenant_filter(tenant_id)
-        query_response = self.client.query_points(
-            collection_name=mt_collection,
-            query=vectors[0],
-            limit=limit,
-            query_filter=models.Filter(must=[tenant_filter]),
-        )
-        get_result = self._result_to_get_result(query_response.points)
-        return SearchResult(
-            ids=get_result.ids,
-            documents=get_result.documents,
-            metadatas=get_result.metadatas,
-            distances=[[(point.score + 1.0) / 2.0 for point in query_response.points]],
-        )
+    def search_collections(
+        self,
+        collection_names: List[str],
+        vectors: List[List[float | int]],
+        limit: int = 10,
+    ) -> Dict[str, Optional[SearchResult]]:
+        """
+        Search several logical collections at once. Collections sharing a
+        multi-tenant collection are searched in one query_batch_points call.
+        """
+        results = {collection_name: None for collection_name in collection_names}
+        if not self.client or not vectors:
+            return results
+
+        for mt_collection, tenants in self._group_by_collection(
+            collection_names
+        ).items():
+            try:
+                if not self.client.collection_exists(collection_name=mt_collection):
+                    log.debug(
+                        f"Collection {mt_collection} doesn't exist, search returns None"
+                    )
+                    continue
+                query_responses = self.client.query_batch_points(
+                    collection_name=mt_collection,
+                    requests=self._get_query_requests(tenants, vectors, limit),
+                )
+                results.update(
+                    self._responses_to_search_results(tenants, vectors, query_responses)
+                )
+            except Exception as e:
+                log.exception(f"Error searching collection {mt_collection}: {e}")
+        return results
 
     def query(
         self, collection_name: str, filter: Dict[str, Any], limit: Optional[int] = None
@@ -291,6 +371,35 @@ class QdrantClient(VectorDBBase):
         """
         Query points with filters and tenant isolation.
         """
+        points = self._scroll(collection_name, filter, limit)
+        if points is None:
+            return None
+        return self._result_to_get_result(points)
+
+    def query_with_vectors(
+        self, collection_name: str, filter: Dict[str, Any], limit: Optional[int] = None
+    ) -> Optional[VectorGetResult]:
+        """
+        Query points and their vectors with filters and tenant isolation.
+        """
+        points = self._scroll(collection_name, filter, limit, with_vectors=True)
+        if points is None:
+            return None
+        get_result = self._result_to_get_result(points)
+        return VectorGetResult(
+            ids=get_result.ids,
+            documents=get_result.documents,
+            metadatas=get_result.metadatas,
+            vectors=[[point.vector for point in points]],
+        )
+
+    def _scroll(
+        self,
+        collection_name: str,
+        filter: Dict[str, Any],
+        limit: Optional[int] = None,
+        with_vectors: bool = False,
+    ):
         if not self.client:
             return None
         mt_collection, tenant_id = self._get_collection_and_tenant_id(collection_name)
@@ -306,8 +415,9 @@ class QdrantClient(VectorDBBase):
             collection_name=mt_collection,
             scroll_filter=combined_filter,
             limit=limit,
+            with_vectors=with_vectors,
         )
-        return self._result_to_get_result(points[0])
+        return points[0]
 
     def get(self, collection_name: str) -> Optional[GetResult]:
         """
@@ -372,3 +482,156 @@ class QdrantClient(VectorDBBase):
                 filter=models.Filter(must=[_tenant_filter(tenant_id)])
             ),
         )
+
+
+class AsyncQdrantClient(ThreadedAsyncVectorDB):
+    """
+    Searches, queries and writes through Qdrant's async client with the same
+    tenant isolation as QdrantClient. Creating collections is left to the
+    sync client in the shared executor.
+    """
+
+    def __init__(self, client: QdrantClient, executor: Executor):
+        super().__init__(client, executor)
+        self._async_client = None
+
+    @property
+    def async_client(self) -> AsyncQclient:
+        # Created on first use, inside the event loop it is bound to
+        if self._async_client is None:
+            self._async_client = AsyncQclient(**self.client.client_kwargs)
+        return self._async_client
+
+    async def has_collection(self, collection_name: str) -> bool:
+        mt_collection, tenant_id = self.client._get_collection_and_tenant_id(
+            collection_name
+        )
+        if not await self.async_client.collection_exists(collection_name=mt_collection):
+            return False
+        count_result = await self.async_client.count(
+            collection_name=mt_collection,
+            count_filter=models.Filter(must=[_tenant_filter(tenant_id)]),
+        )
+        return count_result.count > 0
+
+    async def delete(
+        self,
+        collection_name: str,
+        ids: Optional[List[str]] = None,
+        filter: Optional[Dict[str, Any]] = None,
+    ):
+        mt_collection, tenant_id = self.client._get_collection_and_tenant_id(
+            collection_name
+        )
+        if not await self.async_client.collection_exists(collection_name=mt_collection):
+            log.debug(f"Collection {mt_collection} doesn't exist, nothing to delete")
+            return None
+
+        must_conditions = [_tenant_filter(tenant_id)]
+        should_conditions = []
+        if ids:
+            should_conditions = [_metadata_filter("id", id_value) for id_value in ids]
+        elif filter:
+            must_conditions += [_metadata_filter(k, v) for k, v in filter.items()]
+
+        return await self.async_client.delete(
+            collection_name=mt_collection,
+            points_selector=models.FilterSelector(
+                filter=models.Filter(must=must_conditions, should=should_conditions)
+            ),
+        )
+
+    async def search(
+        self,
+        collection_name: str,
+        vectors: List[List[float | int]],
+        filter: Optional[Dict] = None,
+        limit: int = 10,
+    ) -> Optional[SearchResult]:
+        if not vectors:
+            return None
+        results = await self.search_collections([collection_name], vectors, limit)
+        return results[collection_name]
+
+    async def _search_mt_collection(
+        self,
+        mt_collection: str,
+        tenants: List[Tuple[str, str]],
+        vectors: List[List[float | int]],
+        limit: int,
+    ) -> Dict[str, SearchResult]:
+        if not await self.async_client.collection_exists(collection_name=mt_collection):
+            log.debug(f"Collection {mt_collection} doesn't exist, search returns None")
+            return {}
+        query_responses = await self.async_client.query_batch_points(
+            collection_name=mt_collection,
+            requests=self.client._get_query_requests(tenants, vectors, limit),
+        )
+        return self.client._responses_to_search_results(
+            tenants, vectors, query_responses
+        )
+
+    async def search_collections(
+        self,
+        collection_names: List[str],
+        vectors: List[List[float | int]],
+        limit: int = 10,
+    ) -> Dict[str, Optional[SearchResult]]:
+        results = {collection_name: None for collection_name in collection_names}
+        if not vectors:
+            return results
+
+        groups = self.client._group_by_collection(collection_names)
+        group_results = await asyncio.gather(
+            *[
+                self._search_mt_collection(mt_collection, tenants, vectors, limit)
+                for mt_collection, tenants in groups.items()
+            ],
+            return_exceptions=True,
+        )
+        for mt_collection, group_result in zip(groups, group_results):
+            if isinstance(group_result, Exception):
+                log.error(f"Error searching collection {mt_collection}: {group_result}")
+                continue
+            results.update(group_result)
+        return results
+
+    async def query(
+        self, collection_name: str, filter: Dict[str, Any], limit: Optional[int] = None
+    ) -> Optional[GetResult]:
+        mt_collection, tenant_id = self.client._get_collection_and_tenant_id(
+            collection_name
+        )
+        if not await self.async_client.collection_exists(collection_name=mt_collection):
+            log.debug(f"Collection {mt_collection} doesn't exist, query returns None")
+            return None
+
+        field_conditions = [_metadata_filter(k, v) for k, v in filter.items()]
+        points, _ = await self.async_client.scroll(
+            collection_name=mt_collection,
+            scroll_filter=models.Filter(
+                must=[_tenant_filter(tenant_id), *field_conditions]
+            ),
+            limit=limit if limit is not None else NO_LIMIT,
+        )
+        return self.client._result_to_get_result(points)
+
+    async def get(self, collection_name: str) -> Optional[GetResult]:
+        return await self.query(collection_name, filter={})
+
+    async def upsert(self, collection_name: str, items: List[VectorItem]):
+        if not items:
+            return None
+        mt_collection, tenant_id = self.client._get_collection_and_tenant_id(
+            collection_name
+        )
+        await self._run(
+            self.client._ensure_collection, mt_collection, len(items[0]["vector"])
+        )
+        await self.async_client.upsert(
+            mt_collection, self.client._create_points(items, tenant_id)
+        )
+        return None
+
+    async def insert(self, collection_name: str, items: List[VectorItem]):
+        return await self.upsert(collection_name, items)
@@ -1,10 +1,32 @@
-from open_webui.retrieval.vector.main import VectorDBBase
+import logging
+from concurrent.futures import Executor, ThreadPoolExecutor
+
+from open_webui.retrieval.vector.main import (
+    AsyncVectorDBBase,
+    ThreadedAsyncVectorDB,
+    VectorDBBase,
+)
 from open_webui.retrieval.vector.type import VectorType
 from open_webui.config import (
     VECTOR_DB,
+    VECTOR_DB_THREAD_POOL_SIZE,
     ENABLE_QDRANT_MULTITENANCY_MODE,
     ENABLE_MILVUS_MULTITENANCY_MODE,
+    ENABLE_RAG_BM25_INDEX,
+    RAG_BM25_INDEX_PATH,
+    ENABLE_INGESTION_WORKER,
 )
+from open_webui.env import (
+    REDIS_KEY_PREFIX,
+    WEBSOCKET_MANAGER,
+    WEBSOCKET_REDIS_URL,
+    WEBSOCKET_REDIS_CLUSTER,
+    WEBSOCKET_SENTINEL_HOSTS,
+    WEBSOCKET_SENTINEL_PORT,
+)
+from open_webui.utils.redis import get_redis_connection, get_sentinels_from_env
+
+log = logging.getLogger(__name__)
 
 
 class Vector:
@@ -75,8 +97,110 @@ class Vector:
                 from open_webui.retrieval.vector.dbs.weaviate import WeaviateClient
 
                 return WeaviateClient()
+            case VectorType.NUMPY:
+                from open_webui.retrieval.vector.dbs.numpy_vector import (
+                    NumpyVectorClient,
+                )
+
+                return NumpyVectorClient()
             case _:
                 raise ValueError(f"Unsupported vector type: {vector_type}")
 
+    @staticmethod
+    def get_async_vector(
+        vector_type: str, client: VectorDBBase, executor: Executor
+    ) -> AsyncVectorDBBase:
+        """
+        get async vector db instance for the vector db instance `client`,
+        backends without an async client library run `client` in `executor`
+        """
+        match vector_type:
+            case VectorType.MILVUS if not ENABLE_MILVUS_MULTITENANCY_MODE:
+                from open_webui.retrieval.vector.dbs.milvus import AsyncMilvusClient
+
+                return AsyncMilvusClient(client, executor)
+            case VectorType.QDRANT if client.client is not None:
+                if ENABLE_QDRANT_MULTITENANCY_MODE:
+                    from open_webui.retrieval.vector.dbs.qdrant_multitenancy import (
+                        AsyncQdrantClient,
+                    )
+
+                    return AsyncQdrantClient(client, executor)
+                else:
+                    from open_webui.retrieval.vector.dbs.qdrant import (
+                        AsyncQdrantClient,
+                    )
+
+                    return AsyncQdrantClient(client, executor)
+            case VectorType.OPENSEARCH:
+                from open_webui.retrieval.vector.dbs.opensearch import (
+                    AsyncOpenSearchClient,
+                )
+
+                return AsyncOpenSearchClient(client, executor)
+            case VectorType.ELASTICSEARCH:
+                from open_webui.retrieval.vector.dbs.elasticsearch import (
+                    AsyncElasticsearchClient,
+                )
+
+                return AsyncElasticsearchClient(client, executor)
+            case _:
+                return ThreadedAsyncVectorDB(client, executor)
+
 
 VECTOR_DB_CLIENT = Vector.get_vector(VECTOR_DB)
+
+VECTOR_DB_EXECUTOR = ThreadPoolExecutor(
+    max_workers=max(VECTOR_DB_THREAD_POOL_SIZE, 1), thread_name_prefix="vector-db"
+)
+
+BM25_INDEX_ENABLED = ENABLE_RAG_BM25_INDEX
+if BM25_INDEX_ENABLED and WEBSOCKET_MANAGER != "redis" and not ENABLE_INGESTION_WORKER:
+    # Without Redis, writes made by `open-webui worker` processes on other
+    # nodes would never reach this node's index
+    log.warning(
+        "ENABLE_RAG_BM25_INDEX requires WEBSOCKET_MANAGER=redis when ingestion "
+        "runs in separate workers, disabling the BM25 index"
+    )
+    BM25_INDEX_ENABLED = False
+
+if BM25_INDEX_ENABLED:
+    from open_webui.retrieval.bm25 import (
+        AsyncBM25IndexedVectorDB,
+        BM25Index,
+        BM25IndexedVectorDB,
+        BM25IndexVersions,
+    )
+
+    ASYNC_VECTOR_DB_CLIENT = Vector.get_async_vector(
+        VECTOR_DB, VECTOR_DB_CLIENT, VECTOR_DB_EXECUTOR
+    )
+    VECTOR_DB_CLIENT = BM25IndexedVectorDB(
+        VECTOR_DB_CLIENT,
+        BM25Index(RAG_BM25_INDEX_PATH),
+        versions=(
+            BM25IndexVersions(
+                get_redis_connection(
+                    WEBSOCKET_REDIS_URL,
+                    get_sentinels_from_env(
+                        WEBSOCKET_SENTINEL_HOSTS, WEBSOCKET_SENTINEL_PORT
+                    ),
+                    redis_cluster=WEBSOCKET_REDIS_CLUSTER,
+                    decode_responses=True,
+                ),
+                f"{REDIS_KEY_PREFIX}:bm25:versions",
+            )
+            if WEBSOCKET_MANAGER == "redis"
+            else None
+        ),
+    )
+
+    # Writes are mirrored into the BM25 index, everything else uses the
+    # backend's async client
+    ASYNC_VECTOR_DB_CLIENT = AsyncBM25IndexedVectorDB(
+        VECTOR_DB_CLIENT, ASYNC_VECTOR_DB_CLIENT, VECTOR_DB_EXECUTOR
+    )
+else:
+    ASYNC_VECTOR_DB_CLIENT = Vector.get_async_vector(
+        VECTOR_DB, VECTOR_DB_CLIENT, VECTOR_DB_EXECUTOR
+    )
@@ -1,7 +1,15 @@
+import asyncio
+import contextvars
+import functools
+import logging
+from concurrent.futures import Executor
+
 from pydantic import BaseModel
 from abc import ABC, abstractmethod
 from typing import Any, Dict, List, Optional, Union
 
+log = logging.getLogger(__name__)
+
 
 class VectorItem(BaseModel):
     id: str
@@ -20,6 +28,10 @@ class SearchResult(GetResult):
     distances: Optional[List[List[float | int]]]
 
 
+class VectorGetResult(GetResult):
+    vectors: Optional[List[List[List[float | int]]]]
+
+
 class VectorDBBase(ABC):
     """
     Abstract base class for all vector database backends.
@@ -62,6 +74,29 @@ class VectorDBBase(ABC):
         """Search for similar vectors in a collection."""
         pass
 
+    def search_collections(
+        self,
+        collection_names: List[str],
+        vectors: List[List[Union[float, int]]],
+        limit: int = 10,
+    ) -> Dict[str, Optional[SearchResult]]:
+        """Search several collections with the same query vectors.
+
+        Returns a result per collection, each holding one list of matches per
+        query vector. Backends that can search several collections in one
+        request override this.
+        """
+        results = {}
+        for collection_name in collection_names:
+            try:
+                results[collection_name] = self.search(
+                    collection_name=collection_name, vectors=vectors, limit=limit
+                )
+            except Exception as e:
+                log.exception(f"Error searching collection {collection_name}: {e}")
+                results[collection_name] = None
+        return results
+
     @abstractmethod
     def query(
         self, collection_name: str, filter: Dict, limit: Optional[int] = None
@@ -69,6 +104,17 @@ class VectorDBBase(ABC):
         """Query vectors from a collection using metadata filter."""
         pass
 
+    def query_with_vectors(
+        self, collection_name: str, filter: Dict, limit: Optional[int] = None
+    ) -> Optional[VectorGetResult]:
+        """Query items and their stored vectors from a collection using metadata filter.
+
+        Used to copy already embedded chunks into another collection. Backends
+        that cannot return stored vectors return None, callers then fall back
+        to embedding the documents again.
+        """
+        return None
+
     @abstractmethod
     def get(self, collection_name: str) -> Optional[GetResult]:
         """Retrieve all vectors from a collection."""
@@ -88,3 +134,180 @@ class VectorDBBase(ABC):
     def reset(self) -> None:
         """Reset the vector database by removing all collections or those matching a condition."""
         pass
+
+
+class AsyncVectorDBBase(ABC):
+    """
+    Async counterpart of VectorDBBase, for callers running on the event loop.
+
+    Backends whose client library has an async API implement the hot paths
+    (search, query and writes) natively, the others are served by
+    ThreadedAsyncVectorDB.
+    """
+
+    @abstractmethod
+    async def has_collection(self, collection_name: str) -> bool:
+        """Check if the collection exists in the vector DB."""
+        pass
+
+    @abstractmethod
+    async def delete_collection(self, collection_name: str) -> None:
+        """Delete a collection from the vector DB."""
+        pass
+
+    @abstractmethod
+    async def insert(self, collection_name: str, items: List[VectorItem]) -> None:
+        """Insert a list of vector items into a collection."""
+        pass
+
+    @abstractmethod
+    async def upsert(self, collection_name: str, items: List[VectorItem]) -> None:
+        """Insert or update vector items in a collection."""
+        pass
+
+    @abstractmethod
+    async def search(
+        self,
+        collection_name: str,
+        vectors: List[List[Union[float, int]]],
+        filter: Optional[Dict] = None,
+        limit: int = 10,
+    ) -> Optional[SearchResult]:
+        """Search for similar vectors in a collection."""
+        pass
+
+    async def search_collections(
+        self,
+        collection_names: List[str],
+        vectors: List[List[Union[float, int]]],
+        limit: int = 10,
+    ) -> Dict[str, Optional[SearchResult]]:
+        """Search several collections, see VectorDBBase.search_collections."""
+        collection_names = list(dict.fromkeys(collection_names))
+        results = await asyncio.gather(
+            *[
+                self.search(
+                    collection_name=collection_name, vectors=vectors, limit=limit
+                )
+                for collection_name in collection_names
+            ],
+            return_exceptions=True,
+        )
+
+        search_results = {}
+        for collection_name, result in zip(collection_names, results):
+            if isinstance(result, Exception):
+                log.error(f"Error searching collection {collection_name}: {result}")
+                result = None
+            search_results[collection_name] = result
+        return search_results
+
+    @abstractmethod
+    async def query(
+        self, collection_name: str, filter: Dict, limit: Optional[int] = None
+    ) -> Optional[GetResult]:
+        """Query vectors from a collection using metadata filter."""
+        pass
+
+    @abstractmethod
+    async def get(self, collection_name: str) -> Optional[GetResult]:
+        """Retrieve all vectors from a collection."""
+        pass
+
+    @abstractmethod
+    async def delete(
+        self,
+        collection_name: str,
+        ids: Optional[List[str]] = None,
+        filter: Optional[Dict] = None,
+    ) -> None:
+        """Delete vectors by ID or filter from a collection."""
+        pass
+
+
+class ThreadedAsyncVectorDB(AsyncVectorDBBase):
+    """
+    Runs a synchronous VectorDBBase client in a bounded executor shared by
+    all callers, instead of blocking the event loop or starting a thread
+    pool per call.
+    """
+
+    def __init__(self, client: VectorDBBase, executor: Executor):
+        self.client = client
+        self.executor = executor
+
+    async def _run(self, fn, *args, **kwargs):
+        # Like asyncio.to_thread, keep context variables (e.g. tracing spans)
+        context = contextvars.copy_context()
+        return await asyncio.get_running_loop().run_in_executor(
+            self.executor, functools.partial(context.run, fn, *args, **kwargs)
+        )
+
+    async def has_collection(self, collection_name: str) -> bool:
+        return await self._run(self.client.has_collection, collection_name)
+
+    async def delete_collection(self, collection_name: str) -> None:
+        return await self._run(self.client.delete_collection, collection_name)
+
+    async def insert(self, collection_name: str, items: List[VectorItem]) -> None:
+        return await self._run(self.client.insert, collection_name, items)
+
+    async def upsert(self, collection_name: str, items: List[VectorItem]) -> None:
+        return await self._run(self.client.upsert, collection_name, items)
+
+    async def search(
+        self,
+        collection_name: str,
+        vectors: List[List[Union[float, int]]],
+        filter: Optional[Dict] = None,
+        limit: int = 10,
+    ) -> Optional[SearchResult]:
+        return await self._run(
+            self.client.search,
+            collection_name=collection_name,
+            vectors=vectors,
+            filter=filter,
+            limit=limit,
+        )
+
+    async def search_collections(
+        self,
+        collection_names: List[str],
+        vectors: List[List[Union[float, int]]],
+        limit: int = 10,
+    ) -> Dict[str, Optional[SearchResult]]:
+        method = getattr(self.client.search_collections, "__func__", None)
+        if method is not None and method is not VectorDBBase.search_collections:
+            # The backend searches several collections in one request
+            return await self._run(
+                self.client.search_collections, collection_names, vectors, limit
+            )
+        return await super().search_collections(collection_names, vectors, limit)
+
+    async def query(
+        self, collection_name: str, filter: Dict, limit: Optional[int] = None
+    ) -> Optional[GetResult]:
+        # Backends have different defaults for an unset limit
+        kwargs = {"limit": limit} if limit is not None else {}
+        return await self._run(
+            self.client.query,
+            collection_name=collection_name,
+            filter=filter,
+            **kwargs,
+        )
+
+    async def get(self, collection_name: str) -> Optional[GetResult]:
+        return await self._run(self.client.get, collection_name)
+
+    async def delete(
+        self,
+        collection_name: str,
+        ids: Optional[List[str]] = None,
+        filter: Optional[Dict] = None,
+    ) -> None:
+        return await self._run(
+            self.client.delete,
+            collection_name=collection_name,
+            ids=ids,
+            filter=filter,
+        )
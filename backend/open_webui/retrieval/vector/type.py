@@ -13,3 +13,4 @@ class VectorType(StrEnum):
     S3VECTOR = "s3vector"
     WEAVIATE = "weaviate"
     OPENGAUSS = "opengauss"
+    NUMPY = "numpy"
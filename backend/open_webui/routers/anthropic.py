@@ -45,6 +45,7 @@ from open_webui.utils.misc import (
 )
 from open_webui.utils.auth import get_admin_user, get_verified_user
 from open_webui.utils.access_control import has_access
+from open_webui.utils.session_pool import CLIENT_SESSION_POOL, get_client_session
 from starlette.background import BackgroundTask
 
 
@@ -62,7 +63,7 @@ log.setLevel(SRC_LOG_LEVELS["OPENAI"])
 async def send_get_request(url, key=None, user: UserModel = None):
     timeout = aiohttp.ClientTimeout(total=AIOHTTP_CLIENT_TIMEOUT_MODEL_LIST)
     try:
-        async with aiohttp.ClientSession(timeout=timeout, trust_env=True) as session:
+        async with CLIENT_SESSION_POOL.session(url) as session:
             async with session.get(
                 url,
                 headers={
@@ -79,6 +80,7 @@ async def send_get_request(url, key=None, user: UserModel = None):
                         else {}
                     ),
                 },
+                timeout=timeout,
                 ssl=AIOHTTP_CLIENT_SESSION_SSL,
             ) as response:
                 return await response.json()
@@ -88,14 +90,10 @@ async def send_get_request(url, key=None, user: UserModel = None):
         return None
 
 
-async def cleanup_response(
-    response: Optional[aiohttp.ClientResponse],
-    session: Optional[aiohttp.ClientSession],
-):
+async def cleanup_response(response: Optional[aiohttp.ClientResponse]):
+    # Sessions are pooled, so release the connection instead of closing it
     if response:
-        response.close()
-    if session:
-        await session.close()
+        response.release()
 
 
 async def get_headers_and_cookies(
@@ -435,21 +433,18 @@ async def generate_chat_completion(
     payload_json = json.dumps(anthropic_payload)
 
     r = None
-    session = None
     streaming = False
     response = None
 
     try:
-        session = aiohttp.ClientSession(
-            trust_env=True, timeout=aiohttp.ClientTimeout(total=AIOHTTP_CLIENT_TIMEOUT)
-        )
-
+        session = await get_client_session(request_url)
         r = await session.request(
             method="POST",
             url=request_url,
             data=payload_json,
             headers=headers,
             cookies=cookies,
+            timeout=aiohttp.ClientTimeout(total=AIOHTTP_CLIENT_TIMEOUT),
             ssl=AIOHTTP_CLIENT_SESSION_SSL,
         )
 
@@ -462,9 +457,7 @@ async def generate_chat_completion(
                 r.content,
                 status_code=r.status,
                 headers=dict(r.headers),
-                background=BackgroundTask(
-                    cleanup_response, response=r, session=session
-                ),
+                background=BackgroundTask(cleanup_response, response=r),
             )
         else:
             try:
@@ -530,7 +523,7 @@ async def generate_chat_completion(
         )
     finally:
         if not streaming:
-            await cleanup_response(r, session)
+            await cleanup_response(r)
 
 
 @router.post("/messages")
@@ -570,20 +563,17 @@ async def create_message(
     payload_json = json.dumps(anthropic_payload)
 
     r = None
-    session = None
     response = None
 
     try:
-        session = aiohttp.ClientSession(
-            trust_env=True, timeout=aiohttp.ClientTimeout(total=AIOHTTP_CLIENT_TIMEOUT)
-        )
-
+        session = await get_client_session(request_url)
         r = await session.request(
             method="POST",
             url=request_url,
             data=payload_json,
             headers=headers,
             cookies=cookies,
+            timeout=aiohttp.ClientTimeout(total=AIOHTTP_CLIENT_TIMEOUT),
             ssl=AIOHTTP_CLIENT_SESSION_SSL,
         )
 
@@ -594,9 +584,7 @@ async def create_message(
                 r.content,
                 status_code=r.status,
                 headers=dict(r.headers),
-                background=BackgroundTask(
-                    cleanup_response, response=r, session=session
-                ),
+                background=BackgroundTask(cleanup_response, response=r),
             )
         else:
             try:
@@ -618,14 +606,13 @@ async def create_message(
     except Exception as e:
         log.exception(e)
         if r and not r.closed:
-            await cleanup_response(r, session)
+            await cleanup_response(r)
         raise HTTPException(
             status_code=r.status if r else 500,
             detail="Open WebUI: Server Connection Error",
         )
 
 
-
 class ConnectionVerificationForm(BaseModel):
     url: str
     key: str
@@ -653,10 +640,7 @@ async def verify_connection(
         "x-api-key": key,
     }
 
-    async with aiohttp.ClientSession(
-        trust_env=True,
-        timeout=aiohttp.ClientTimeout(total=AIOHTTP_CLIENT_TIMEOUT_MODEL_LIST),
-    ) as session:
+    async with CLIENT_SESSION_POOL.session(url) as session:
         try:
             # We use a dummy model list check or something minimal if possible
             # Since Anthropic doesn't have /models endpoint, we might need to send a dummy message
@@ -674,6 +658,7 @@ async def verify_connection(
                 f"{url}/messages",
                 headers=headers,
                 json=payload,
+                timeout=aiohttp.ClientTimeout(total=AIOHTTP_CLIENT_TIMEOUT_MODEL_LIST),
                 ssl=AIOHTTP_CLIENT_SESSION_SSL,
             ) as r:
                 if r.status != 200:
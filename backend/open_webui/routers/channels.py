@@ -69,6 +69,7 @@ from open_webui.utils.access_control import (
 from open_webui.utils.webhook import post_webhook
 from open_webui.utils.channels import extract_mentions, replace_mentions
 from open_webui.internal.db import get_session
+from open_webui.utils.db.pagination import parse_cursor
 from sqlalchemy.orm import Session
 
 log = logging.getLogger(__name__)
@@ -795,10 +796,19 @@ async def get_channel_messages(
     id: str,
     skip: int = 0,
     limit: int = 50,
+    cursor: Optional[str] = None,
     user=Depends(get_verified_user),
     db: Session = Depends(get_session),
 ):
     check_channels_access(request, user)
+
+    try:
+        cursor = parse_cursor(cursor)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail=ERROR_MESSAGES.DEFAULT(e)
+        )
+
     channel = Channels.get_channel_by_id(id, db=db)
     if not channel:
         raise HTTPException(
@@ -822,42 +832,12 @@ async def get_channel_messages(
             id, user.id, db=db
         )  # Ensure user is a member of the channel
 
-    message_list = Messages.get_messages_by_channel_id(id, skip, limit, db=db)
-
-    if not message_list:
-        return []
-
-    # Batch fetch all users in a single query (fixes N+1 problem)
-    user_ids = list(set(m.user_id for m in message_list))
-    users = {u.id: u for u in Users.get_users_by_user_ids(user_ids, db=db)}
-
-    messages = []
-    for message in message_list:
-        thread_replies = Messages.get_thread_replies_by_message_id(message.id, db=db)
-        latest_thread_reply_at = (
-            thread_replies[0].created_at if thread_replies else None
-        )
-
-        # Use message.user if present (for webhooks), otherwise look up by user_id
-        user_info = message.user
-        if user_info is None and message.user_id in users:
-            user_info = UserNameResponse(**users[message.user_id].model_dump())
-
-        messages.append(
-            MessageUserResponse(
-                **{
-                    **message.model_dump(),
-                    "reply_count": len(thread_replies),
-                    "latest_reply_at": latest_thread_reply_at,
-                    "reactions": Messages.get_reactions_by_message_id(
-                        message.id, db=db
-                    ),
-                    "user": user_info,
-                }
-            )
-        )
+    # Users, reply-to targets, reactions and thread stats are loaded per page
+    message_list = Messages.get_messages_by_channel_id(
+        id, skip, limit, cursor=cursor, db=db
+    )
 
-    return messages
+    return [MessageUserResponse(**message.model_dump()) for message in message_list]
 
 
 ############################
@@ -904,9 +884,12 @@ async def get_pinned_channel_messages(
     if not message_list:
         return []
 
-    # Batch fetch all users in a single query (fixes N+1 problem)
+    # Batch fetch all users and reactions in a single query each (fixes N+1 problem)
     user_ids = list(set(m.user_id for m in message_list))
     users = {u.id: u for u in Users.get_users_by_user_ids(user_ids, db=db)}
+    reactions = Messages.get_reactions_by_message_ids(
+        [m.id for m in message_list], db=db
+    )
 
     messages = []
     for message in message_list:
@@ -927,9 +910,7 @@ async def get_pinned_channel_messages(
             MessageWithReactionsResponse(
                 **{
                     **message.model_dump(),
-                    "reactions": Messages.get_reactions_by_message_id(
-                        message.id, db=db
-                    ),
+                    "reactions": reactions.get(message.id, []),
                     "user": user_info,
                 }
             )
@@ -1264,7 +1245,7 @@ async def post_new_message(
         except Exception as e:
             log.debug(e)
 
-        active_user_ids = get_user_ids_from_room(f"channel:{channel.id}")
+        active_user_ids = await get_user_ids_from_room(f"channel:{channel.id}")
 
         # NOTE: We intentionally do NOT pass db to background_handler.
         # Background tasks should manage their own short-lived sessions to avoid
@@ -1503,35 +1484,16 @@ async def get_channel_thread_messages(
         id, message_id, skip, limit, db=db
     )
 
-    if not message_list:
-        return []
-
-    # Batch fetch all users in a single query (fixes N+1 problem)
-    user_ids = list(set(m.user_id for m in message_list))
-    users = {u.id: u for u in Users.get_users_by_user_ids(user_ids, db=db)}
-
-    messages = []
-    for message in message_list:
-        # Use message.user if present (for webhooks), otherwise look up by user_id
-        user_info = message.user
-        if user_info is None and message.user_id in users:
-            user_info = UserNameResponse(**users[message.user_id].model_dump())
-
-        messages.append(
-            MessageUserResponse(
-                **{
-                    **message.model_dump(),
-                    "reply_count": 0,
-                    "latest_reply_at": None,
-                    "reactions": Messages.get_reactions_by_message_id(
-                        message.id, db=db
-                    ),
-                    "user": user_info,
-                }
-            )
+    return [
+        MessageUserResponse(
+            **{
+                **message.model_dump(),
+                "reply_count": 0,
+                "latest_reply_at": None,
+            }
         )
-
-    return messages
+        for message in message_list
+    ]
 
 
 ############################
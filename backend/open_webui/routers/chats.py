@@ -34,6 +34,7 @@ from pydantic import BaseModel
 
 from open_webui.utils.auth import get_admin_user, get_verified_user
 from open_webui.utils.access_control import has_permission
+from open_webui.utils.db.pagination import parse_cursor
 
 log = logging.getLogger(__name__)
 
@@ -49,12 +50,22 @@ router = APIRouter()
 def get_session_user_chat_list(
     user=Depends(get_verified_user),
     page: Optional[int] = None,
+    cursor: Optional[str] = None,
     include_pinned: Optional[bool] = False,
     include_folders: Optional[bool] = False,
     db: Session = Depends(get_session),
 ):
     try:
-        if page is not None:
+        if cursor:
+            return Chats.get_chat_title_id_list_by_user_id(
+                user.id,
+                include_folders=include_folders,
+                include_pinned=include_pinned,
+                limit=60,
+                cursor=parse_cursor(cursor),
+                db=db,
+            )
+        elif page is not None:
             limit = 60
             skip = (page - 1) * limit
 
@@ -90,14 +101,17 @@ def get_session_user_chat_list(
 def get_session_user_chat_usage_stats(
     items_per_page: Optional[int] = 50,
     page: Optional[int] = 1,
+    cursor: Optional[str] = None,
     user=Depends(get_verified_user),
     db: Session = Depends(get_session),
 ):
     try:
         limit = items_per_page
-        skip = (page - 1) * limit
+        skip = None if cursor else (page - 1) * limit
 
-        result = Chats.get_chats_by_user_id(user.id, skip=skip, limit=limit, db=db)
+        result = Chats.get_chats_by_user_id(
+            user.id, skip=skip, limit=limit, cursor=parse_cursor(cursor), db=db
+        )
 
         chats = result.items
         total = result.total
@@ -357,7 +371,7 @@ def _process_chat_for_export(chat) -> Optional[ChatStatsExport]:
         return None
 
 
-def calculate_chat_stats(user_id, skip=0, limit=10, filter=None):
+def calculate_chat_stats(user_id, skip=0, limit=10, filter=None, cursor=None):
     if filter is None:
         filter = {}
 
@@ -366,6 +380,7 @@ def calculate_chat_stats(user_id, skip=0, limit=10, filter=None):
         skip=skip,
         limit=limit,
         filter=filter,
+        cursor=cursor,
     )
 
     chat_stats_export_list = []
@@ -388,22 +403,24 @@ def generate_chat_stats_jsonl_generator(user_id, filter):
     2. Holding a session open for the entire streaming duration blocks other requests
     3. Short-lived sessions release locks between batches, allowing other operations
     """
-    skip = 0
+    cursor = None
     limit = CHAT_EXPORT_PAGE_ITEM_COUNT
 
     while True:
-        # Each batch gets its own session that closes after the query
-        result = Chats.get_chats_by_user_id(
+        # Each batch gets its own session that closes after the query, and
+        # resumes after the last chat of the previous batch instead of
+        # re-scanning every earlier row with OFFSET
+        chats = Chats.get_chats_by_cursor(
             user_id,
-            filter=filter,
-            skip=skip,
+            cursor=cursor,
             limit=limit,
+            filter=filter,
             db=None,  # Let get_db_context create a fresh session per batch
         )
-        if not result.items:
+        if not chats:
             break
 
-        for chat in result.items:
+        for chat in chats:
             try:
                 chat_stat = _process_chat_for_export(chat)
                 if chat_stat:
@@ -411,7 +428,9 @@ def generate_chat_stats_jsonl_generator(user_id, filter):
             except Exception as e:
                 log.exception(f"Error processing chat {chat.id}: {e}")
 
-        skip += limit
+        if len(chats) < limit:
+            break
+        cursor = (chats[-1].created_at, chats[-1].id)
 
 
 @router.get("/stats/export", response_model=ChatStatsExportList)
@@ -419,6 +438,7 @@ async def export_chat_stats(
     request: Request,
     updated_at: Optional[int] = None,
     page: Optional[int] = 1,
+    cursor: Optional[str] = None,
     stream: bool = False,
     user=Depends(get_verified_user),
 ):
@@ -448,10 +468,15 @@ async def export_chat_stats(
             )
         else:
             limit = CHAT_EXPORT_PAGE_ITEM_COUNT
-            skip = (page - 1) * limit
+            skip = None if cursor else (page - 1) * limit
 
             chat_stats_export_list, total = await asyncio.to_thread(
-                calculate_chat_stats, user.id, skip, limit, filter
+                calculate_chat_stats,
+                user.id,
+                skip,
+                limit,
+                filter,
+                parse_cursor(cursor),
             )
 
             return ChatStatsExportList(
@@ -554,6 +579,7 @@ async def delete_all_user_chats(
 async def get_user_chat_list_by_user_id(
     user_id: str,
     page: Optional[int] = None,
+    cursor: Optional[str] = None,
     query: Optional[str] = None,
     order_by: Optional[str] = None,
     direction: Optional[str] = None,
@@ -570,7 +596,7 @@ async def get_user_chat_list_by_user_id(
         page = 1
 
     limit = 60
-    skip = (page - 1) * limit
+    skip = None if cursor else (page - 1) * limit
 
     filter = {}
     if query:
@@ -580,9 +606,20 @@ async def get_user_chat_list_by_user_id(
     if direction:
         filter["direction"] = direction
 
-    return Chats.get_chat_list_by_user_id(
-        user_id, include_archived=True, filter=filter, skip=skip, limit=limit, db=db
-    )
+    try:
+        return Chats.get_chat_list_by_user_id(
+            user_id,
+            include_archived=True,
+            filter=filter,
+            skip=skip,
+            limit=limit,
+            cursor=parse_cursor(cursor),
+            db=db,
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail=ERROR_MESSAGES.DEFAULT(e)
+        )
 
 
 ############################
@@ -733,12 +770,40 @@ async def get_user_pinned_chats(
 ############################
 
 
+# Chats read per batch while streaming an export
+CHAT_EXPORT_BATCH_SIZE = 100
+
+
+def generate_chats_json_generator(user_id: Optional[str] = None):
+    """
+    Synchronous generator streaming chats, newest created first, as a JSON array.
+
+    Chats are read in keyset-paginated batches, each with its own short-lived
+    session (db=None), so only one batch is held in memory at a time.
+    """
+    yield "["
+    cursor = None
+    separator = ""
+    while True:
+        chats = Chats.get_chats_by_cursor(
+            user_id=user_id, cursor=cursor, limit=CHAT_EXPORT_BATCH_SIZE, db=None
+        )
+        if not chats:
+            break
+
+        for chat in chats:
+            yield separator + ChatResponse(**chat.model_dump()).model_dump_json()
+            separator = ","
+
+        cursor = (chats[-1].created_at, chats[-1].id)
+    yield "]"
+
+
 @router.get("/all", response_model=list[ChatResponse])
-async def get_user_chats(
-    user=Depends(get_verified_user), db: Session = Depends(get_session)
-):
-    result = Chats.get_chats_by_user_id(user.id, db=db)
-    return [ChatResponse(**chat.model_dump()) for chat in result.items]
+async def get_user_chats(user=Depends(get_verified_user)):
+    return StreamingResponse(
+        generate_chats_json_generator(user.id), media_type="application/json"
+    )
 
 
 ############################
@@ -781,15 +846,15 @@ async def get_all_user_tags(
 
 
 @router.get("/all/db", response_model=list[ChatResponse])
-async def get_all_user_chats_in_db(
-    user=Depends(get_admin_user), db: Session = Depends(get_session)
-):
+async def get_all_user_chats_in_db(user=Depends(get_admin_user)):
     if not ENABLE_ADMIN_EXPORT:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail=ERROR_MESSAGES.ACCESS_PROHIBITED,
         )
-    return [ChatResponse(**chat.model_dump()) for chat in Chats.get_chats(db=db)]
+    return StreamingResponse(
+        generate_chats_json_generator(), media_type="application/json"
+    )
 
 
 ############################
@@ -988,7 +1053,7 @@ async def update_chat_message_by_id(
             detail=ERROR_MESSAGES.ACCESS_PROHIBITED,
         )
 
-    chat = Chats.upsert_message_to_chat_by_id_and_message_id(
+    Chats.upsert_message_to_chat_by_id_and_message_id(
         id,
         message_id,
         {
@@ -996,6 +1061,7 @@ async def update_chat_message_by_id(
         },
         db=db,
     )
+    chat = Chats.get_chat_by_id(id, db=db)
 
     event_emitter = get_event_emitter(
         {
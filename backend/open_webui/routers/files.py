@@ -1,5 +1,6 @@
 import logging
 import os
+import time
 import uuid
 import json
 from pathlib import Path
@@ -25,7 +26,10 @@ from sqlalchemy.orm import Session
 from open_webui.internal.db import get_session, SessionLocal
 
 from open_webui.constants import ERROR_MESSAGES
-from open_webui.retrieval.vector.factory import VECTOR_DB_CLIENT
+from open_webui.retrieval.vector.factory import (
+    ASYNC_VECTOR_DB_CLIENT,
+    VECTOR_DB_CLIENT,
+)
 
 from open_webui.models.channels import Channels
 from open_webui.models.users import Users
@@ -38,6 +42,7 @@ from open_webui.models.files import (
 from open_webui.models.chats import Chats
 from open_webui.models.knowledge import Knowledges
 from open_webui.models.groups import Groups
+from open_webui.socket.main import FILE_STATUS_EVENTS
 
 
 from open_webui.routers.retrieval import ProcessFileForm, process_file
@@ -48,6 +53,12 @@ from open_webui.storage.provider import Storage
 
 from open_webui.utils.auth import get_admin_user, get_verified_user
 from open_webui.utils.access_control import has_access
+from open_webui.utils.ingestion import (
+    enqueue_file,
+    get_file_processing_status,
+    ingestion_stage,
+    notify_file_status,
+)
 from open_webui.utils.misc import strict_match_mime_type
 from pydantic import BaseModel
 
@@ -115,62 +126,64 @@ def has_access_to_file(
 ############################
 
 
+def process_file_item(
+    request,
+    file_item: FileModel,
+    user,
+    db: Session,
+):
+    """Extract, embed and index an uploaded file. Raises on failure."""
+    content_type = (file_item.meta or {}).get("content_type")
+    file_metadata = (file_item.meta or {}).get("data") or {}
+
+    if content_type:
+        stt_supported_content_types = getattr(
+            request.app.state.config, "STT_SUPPORTED_CONTENT_TYPES", []
+        )
+
+        if strict_match_mime_type(stt_supported_content_types, content_type):
+            file_path_processed = Storage.get_file(file_item.path)
+            with ingestion_stage("transcribe"):
+                result = transcribe(request, file_path_processed, file_metadata, user)
+
+            process_file(
+                request,
+                ProcessFileForm(file_id=file_item.id, content=result.get("text", "")),
+                user=user,
+                db=db,
+            )
+        elif (not content_type.startswith(("image/", "video/"))) or (
+            request.app.state.config.CONTENT_EXTRACTION_ENGINE == "external"
+        ):
+            process_file(
+                request,
+                ProcessFileForm(file_id=file_item.id),
+                user=user,
+                db=db,
+            )
+        else:
+            raise Exception(f"File type {content_type} is not supported for processing")
+    else:
+        log.info(
+            f"File type {content_type} is not provided, but trying to process anyway"
+        )
+        process_file(
+            request,
+            ProcessFileForm(file_id=file_item.id),
+            user=user,
+            db=db,
+        )
+
+
 def process_uploaded_file(
     request,
-    file,
-    file_path,
-    file_item,
-    file_metadata,
+    file_item: FileModel,
     user,
     db: Optional[Session] = None,
 ):
     def _process_handler(db_session):
         try:
-            if file.content_type:
-                stt_supported_content_types = getattr(
-                    request.app.state.config, "STT_SUPPORTED_CONTENT_TYPES", []
-                )
-
-                if strict_match_mime_type(
-                    stt_supported_content_types, file.content_type
-                ):
-                    file_path_processed = Storage.get_file(file_path)
-                    result = transcribe(
-                        request, file_path_processed, file_metadata, user
-                    )
-
-                    process_file(
-                        request,
-                        ProcessFileForm(
-                            file_id=file_item.id, content=result.get("text", "")
-                        ),
-                        user=user,
-                        db=db_session,
-                    )
-                elif (not file.content_type.startswith(("image/", "video/"))) or (
-                    request.app.state.config.CONTENT_EXTRACTION_ENGINE == "external"
-                ):
-                    process_file(
-                        request,
-                        ProcessFileForm(file_id=file_item.id),
-                        user=user,
-                        db=db_session,
-                    )
-                else:
-                    raise Exception(
-                        f"File type {file.content_type} is not supported for processing"
-                    )
-            else:
-                log.info(
-                    f"File type {file.content_type} is not provided, but trying to process anyway"
-                )
-                process_file(
-                    request,
-                    ProcessFileForm(file_id=file_item.id),
-                    user=user,
-                    db=db_session,
-                )
-
+            process_file_item(request, file_item, user, db=db_session)
         except Exception as e:
             log.error(f"Error processing file: {file_item.id}")
             Files.update_file_data_by_id(
@@ -181,6 +194,7 @@ def process_uploaded_file(
                 },
                 db=db_session,
             )
+            notify_file_status(file_item.id, db=db_session)
 
     if db:
         _process_handler(db)
@@ -302,26 +316,11 @@ def upload_file_handler(
 
         if process:
             if background_tasks and process_in_background:
-                background_tasks.add_task(
-                    process_uploaded_file,
-                    request,
-                    file,
-                    file_path,
-                    file_item,
-                    file_metadata,
-                    user,
-                )
+                # Picked up by an ingestion worker, see utils/ingestion.py
+                enqueue_file(file_item.id, user.id, db=db)
                 return {"status": True, **file_item.model_dump()}
             else:
-                process_uploaded_file(
-                    request,
-                    file,
-                    file_path,
-                    file_item,
-                    file_metadata,
-                    user,
-                    db=db,
-                )
+                process_uploaded_file(request, file_item, user, db=db)
                 return {"status": True, **file_item.model_dump()}
         else:
             if file_item:
@@ -496,40 +495,50 @@ async def get_file_process_status(
     ):
         if stream:
             MAX_FILE_PROCESSING_DURATION = 3600 * 2
+            # Fallback for status changes published where this process cannot
+            # receive them, e.g. by another instance when Redis is not used
+            STATUS_RECHECK_INTERVAL = 30
 
             async def event_stream(file_id):
                 # NOTE: We intentionally do NOT capture the request's db session here.
-                # Each poll creates its own short-lived session to avoid holding a
-                # connection for hours. A WebSocket push would be more efficient.
-                for _ in range(MAX_FILE_PROCESSING_DURATION):
-                    file_item = Files.get_file_by_id(file_id)  # Creates own session
-                    if file_item:
-                        data = file_item.model_dump().get("data", {})
-                        status = data.get("status")
-
-                        if status:
-                            event = {"status": status}
-                            if status == "failed":
-                                event["error"] = data.get("error")
-
-                            yield f"data: {json.dumps(event)}\n\n"
-                            if status in ("completed", "failed"):
+                # Status changes are pushed to the stream, the file is only read
+                # when subscribing and then every STATUS_RECHECK_INTERVAL seconds.
+                queue = FILE_STATUS_EVENTS.subscribe(file_id)
+                try:
+                    deadline = time.monotonic() + MAX_FILE_PROCESSING_DURATION
+                    event = None
+                    while time.monotonic() < deadline:
+                        if event is None:
+                            file_item = Files.get_file_by_id(file_id)  # Own session
+                            if not file_item:
+                                yield f"data: {json.dumps({'status': 'not_found'})}\n\n"
                                 break
-                        else:
+                            event = get_file_processing_status(file_item)
+
+                        status = event.get("status")
+                        if not status:
                             # Legacy
                             break
-                    else:
-                        yield f"data: {json.dumps({'status': 'not_found'})}\n\n"
-                        break
 
-                    await asyncio.sleep(1)
+                        yield f"data: {json.dumps(event)}\n\n"
+                        if status in ("completed", "failed"):
+                            break
+
+                        try:
+                            event = await asyncio.wait_for(
+                                queue.get(), timeout=STATUS_RECHECK_INTERVAL
+                            )
+                        except asyncio.TimeoutError:
+                            event = None
+                finally:
+                    FILE_STATUS_EVENTS.unsubscribe(file_id, queue)
 
             return StreamingResponse(
                 event_stream(file.id),
                 media_type="text/event-stream",
             )
         else:
-            return {"status": file.data.get("status", "pending")}
+            return {"status": "pending", **get_file_processing_status(file, db=db)}
     else:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -831,7 +840,7 @@ async def delete_file_by_id(
         if result:
             try:
                 Storage.delete_file(file.path)
-                VECTOR_DB_CLIENT.delete(collection_name=f"file-{id}")
+                await ASYNC_VECTOR_DB_CLIENT.delete(collection_name=f"file-{id}")
             except Exception as e:
                 log.exception(e)
                 log.error("Error deleting files")
@@ -25,6 +25,7 @@ from open_webui.config import CACHE_DIR
 from open_webui.constants import ERROR_MESSAGES
 from fastapi import APIRouter, Depends, HTTPException, Request, status
 from open_webui.utils.auth import get_admin_user, get_verified_user
+from open_webui.utils.models import MODEL_REGISTRY
 from pydantic import BaseModel, HttpUrl
 from open_webui.internal.db import get_session
 from sqlalchemy.orm import Session
@@ -181,7 +182,9 @@ async def sync_functions(
                     )
                     raise e
 
-        return Functions.sync_functions(user.id, form_data.functions, db=db)
+        functions = Functions.sync_functions(user.id, form_data.functions, db=db)
+        MODEL_REGISTRY.invalidate()
+        return functions
     except Exception as e:
         log.exception(f"Failed to load a function: {e}")
         raise HTTPException(
@@ -236,6 +239,7 @@ async def create_new_function(
                 )
 
             if function:
+                MODEL_REGISTRY.invalidate()
                 return function
             else:
                 raise HTTPException(
@@ -291,6 +295,7 @@ async def toggle_function_by_id(
         )
 
         if function:
+            MODEL_REGISTRY.invalidate()
             return function
         else:
             raise HTTPException(
@@ -320,6 +325,7 @@ async def toggle_global_by_id(
         )
 
         if function:
+            MODEL_REGISTRY.invalidate()
             return function
         else:
             raise HTTPException(
@@ -365,6 +371,7 @@ async def update_function_by_id(
             Functions.update_function_metadata_by_id(id, {"toggle": True}, db=db)
 
         if function:
+            MODEL_REGISTRY.invalidate()
             return function
         else:
             raise HTTPException(
@@ -394,6 +401,7 @@ async def delete_function_by_id(
     result = Functions.delete_function_by_id(id, db=db)
 
     if result:
+        MODEL_REGISTRY.invalidate()
         FUNCTIONS = request.app.state.FUNCTIONS
         if id in FUNCTIONS:
             del FUNCTIONS[id]
@@ -487,6 +495,8 @@ async def update_function_valves_by_id(
 
                 valves_dict = valves.model_dump(exclude_unset=True)
                 Functions.update_function_valves_by_id(id, valves_dict, db=db)
+                # Pipes may derive their models from valves
+                MODEL_REGISTRY.invalidate()
                 return valves_dict
             except Exception as e:
                 log.exception(f"Error updating function values by id {id}: {e}")
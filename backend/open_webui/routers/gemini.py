@@ -46,6 +46,7 @@ from open_webui.utils.misc import (
 )
 from open_webui.utils.auth import get_admin_user, get_verified_user
 from open_webui.utils.access_control import has_access
+from open_webui.utils.session_pool import CLIENT_SESSION_POOL, get_client_session
 from starlette.background import BackgroundTask
 
 
@@ -63,7 +64,7 @@ log.setLevel(SRC_LOG_LEVELS["OPENAI"])
 async def send_get_request(url, key=None, user: UserModel = None):
     timeout = aiohttp.ClientTimeout(total=AIOHTTP_CLIENT_TIMEOUT_MODEL_LIST)
     try:
-        async with aiohttp.ClientSession(timeout=timeout, trust_env=True) as session:
+        async with CLIENT_SESSION_POOL.session(url) as session:
             async with session.get(
                 url,
                 headers={
@@ -79,6 +80,7 @@ async def send_get_request(url, key=None, user: UserModel = None):
                         else {}
                     ),
                 },
+                timeout=timeout,
                 ssl=AIOHTTP_CLIENT_SESSION_SSL,
             ) as response:
                 return await response.json()
@@ -88,14 +90,10 @@ async def send_get_request(url, key=None, user: UserModel = None):
         return None
 
 
-async def cleanup_response(
-    response: Optional[aiohttp.ClientResponse],
-    session: Optional[aiohttp.ClientSession],
-):
+async def cleanup_response(response: Optional[aiohttp.ClientResponse]):
+    # Sessions are pooled, so release the connection instead of closing it
     if response:
-        response.close()
-    if session:
-        await session.close()
+        response.release()
 
 
 async def get_headers_and_cookies(
@@ -353,7 +351,9 @@ async def get_models(request: Request, user=Depends(get_verified_user)):
                         else:
                             clean_id = model_id
 
-                        if isinstance(model_name, str) and model_name.startswith("models/"):
+                        if isinstance(model_name, str) and model_name.startswith(
+                            "models/"
+                        ):
                             model_name = model_name.replace("models/", "")
 
                         models[clean_id] = {
@@ -442,20 +442,17 @@ async def generate_content(
     payload_json = json.dumps(gemini_payload)
 
     r = None
-    session = None
     response = None
 
     try:
-        session = aiohttp.ClientSession(
-            trust_env=True, timeout=aiohttp.ClientTimeout(total=AIOHTTP_CLIENT_TIMEOUT)
-        )
-
+        session = await get_client_session(request_url)
         r = await session.request(
             method="POST",
             url=request_url,
             data=payload_json,
             headers=headers,
             cookies=cookies,
+            timeout=aiohttp.ClientTimeout(total=AIOHTTP_CLIENT_TIMEOUT),
             ssl=AIOHTTP_CLIENT_SESSION_SSL,
         )
 
@@ -482,7 +479,7 @@ async def generate_content(
             detail="Open WebUI: Server Connection Error",
         )
     finally:
-        await cleanup_response(r, session)
+        await cleanup_response(r)
 
 
 @router.post("/models/{model}:streamGenerateContent")
@@ -535,20 +532,16 @@ async def stream_generate_content(
     payload_json = json.dumps(gemini_payload)
 
     r = None
-    session = None
 
     try:
-        session = aiohttp.ClientSession(
-            trust_env=True,
-            timeout=aiohttp.ClientTimeout(total=AIOHTTP_CLIENT_TIMEOUT_STREAMING),
-        )
-
+        session = await get_client_session(request_url)
         r = await session.request(
             method="POST",
             url=request_url,
             data=payload_json,
             headers=headers,
             cookies=cookies,
+            timeout=aiohttp.ClientTimeout(total=AIOHTTP_CLIENT_TIMEOUT_STREAMING),
             ssl=AIOHTTP_CLIENT_SESSION_SSL,
         )
 
@@ -557,12 +550,12 @@ async def stream_generate_content(
             r.content,
             status_code=r.status,
             headers=dict(r.headers),
-            background=BackgroundTask(cleanup_response, response=r, session=session),
+            background=BackgroundTask(cleanup_response, response=r),
         )
 
     except Exception as e:
         log.exception(e)
-        await cleanup_response(r, session)
+        await cleanup_response(r)
         raise HTTPException(
             status_code=r.status if r else 500,
             detail="Open WebUI: Server Connection Error",
@@ -586,16 +579,14 @@ async def verify_connection(
     key = form_data.key
     api_config = form_data.config or {}
 
-    async with aiohttp.ClientSession(
-        trust_env=True,
-        timeout=aiohttp.ClientTimeout(total=AIOHTTP_CLIENT_TIMEOUT_MODEL_LIST),
-    ) as session:
+    async with CLIENT_SESSION_POOL.session(url) as session:
         try:
             # Verify using get models or simple generation
             # https://generativelanguage.googleapis.com/v1beta/models?key=API_KEY
 
             async with session.get(
                 f"{url}/models?key={key}",
+                timeout=aiohttp.ClientTimeout(total=AIOHTTP_CLIENT_TIMEOUT_MODEL_LIST),
                 ssl=AIOHTTP_CLIENT_SESSION_SSL,
             ) as r:
                 if r.status != 200:
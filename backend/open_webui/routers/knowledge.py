@@ -2,10 +2,7 @@ from typing import List, Optional
 from pydantic import BaseModel
 from fastapi import APIRouter, Depends, HTTPException, status, Request, Query
 from fastapi.responses import StreamingResponse
-from fastapi.concurrency import run_in_threadpool
 import logging
-import io
-import zipfile
 
 from sqlalchemy.orm import Session
 from open_webui.internal.db import get_session
@@ -18,7 +15,15 @@ from open_webui.models.knowledge import (
     KnowledgeUserResponse,
 )
 from open_webui.models.files import Files, FileModel, FileMetadataResponse
-from open_webui.retrieval.vector.factory import VECTOR_DB_CLIENT
+from open_webui.models.reindex_jobs import (
+    ReindexJobs,
+    ReindexJobModel,
+    ReindexJobProgressResponse,
+)
+from open_webui.retrieval.vector.factory import (
+    ASYNC_VECTOR_DB_CLIENT,
+    VECTOR_DB_CLIENT,
+)
 from open_webui.routers.retrieval import (
     process_file,
     ProcessFileForm,
@@ -29,7 +34,10 @@ from open_webui.storage.provider import Storage
 
 from open_webui.constants import ERROR_MESSAGES
 from open_webui.utils.auth import get_verified_user, get_admin_user
+from open_webui.utils.misc import stream_zip
+from open_webui.utils.models import MODEL_REGISTRY
 from open_webui.utils.access_control import has_access, has_permission
+from open_webui.utils.reindex import start_reindex_job, cancel_reindex_job
 
 
 from open_webui.config import BYPASS_ADMIN_ACCESS_CONTROL
@@ -63,7 +71,7 @@ async def embed_knowledge_base_metadata(
     try:
         content = f"{name}\n\n{description}" if description else name
         embedding = await request.app.state.EMBEDDING_FUNCTION(content)
-        VECTOR_DB_CLIENT.upsert(
+        await ASYNC_VECTOR_DB_CLIENT.upsert(
             collection_name=KNOWLEDGE_BASES_COLLECTION,
             items=[
                 {
@@ -287,55 +295,56 @@ async def reindex_knowledge_files(
             detail=ERROR_MESSAGES.UNAUTHORIZED,
         )
 
+    # Only one reindex at a time, a second request joins the running job
+    for job in ReindexJobs.get_jobs(db=db):
+        if job.status in ("pending", "running"):
+            start_reindex_job(request.app, job.id)
+            return True
+
     knowledge_bases = Knowledges.get_knowledge_bases(db=db)
+    knowledge_files = {
+        knowledge_base.id: [
+            file.id for file in Knowledges.get_files_by_id(knowledge_base.id, db=db)
+        ]
+        for knowledge_base in knowledge_bases
+    }
+
+    job = ReindexJobs.insert_new_job(user.id, knowledge_files, db=db)
+    log.info(
+        f"Starting reindex job {job.id} for {len(knowledge_bases)} knowledge bases"
+    )
+    start_reindex_job(request.app, job.id)
+    return True
 
-    log.info(f"Starting reindexing for {len(knowledge_bases)} knowledge bases")
 
-    for knowledge_base in knowledge_bases:
-        try:
-            files = Knowledges.get_files_by_id(knowledge_base.id, db=db)
-            try:
-                if VECTOR_DB_CLIENT.has_collection(collection_name=knowledge_base.id):
-                    VECTOR_DB_CLIENT.delete_collection(
-                        collection_name=knowledge_base.id
-                    )
-            except Exception as e:
-                log.error(f"Error deleting collection {knowledge_base.id}: {str(e)}")
-                continue  # Skip, don't raise
+@router.get("/reindex/jobs", response_model=list[ReindexJobModel])
+async def get_reindex_jobs(user=Depends(get_admin_user)):
+    return ReindexJobs.get_jobs()
 
-            failed_files = []
-            for file in files:
-                try:
-                    await run_in_threadpool(
-                        process_file,
-                        request,
-                        ProcessFileForm(
-                            file_id=file.id, collection_name=knowledge_base.id
-                        ),
-                        user=user,
-                        db=db,
-                    )
-                except Exception as e:
-                    log.error(
-                        f"Error processing file {file.filename} (ID: {file.id}): {str(e)}"
-                    )
-                    failed_files.append({"file_id": file.id, "error": str(e)})
-                    continue
 
-        except Exception as e:
-            log.error(f"Error processing knowledge base {knowledge_base.id}: {str(e)}")
-            # Don't raise, just continue
-            continue
+@router.get("/reindex/jobs/{job_id}", response_model=ReindexJobProgressResponse)
+async def get_reindex_job_progress(job_id: str, user=Depends(get_admin_user)):
+    progress = ReindexJobs.get_job_progress_by_id(job_id)
+    if progress is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=ERROR_MESSAGES.NOT_FOUND,
+        )
+    return progress
 
-        if failed_files:
-            log.warning(
-                f"Failed to process {len(failed_files)} files in knowledge base {knowledge_base.id}"
-            )
-            for failed in failed_files:
-                log.warning(f"File ID: {failed['file_id']}, Error: {failed['error']}")
 
-    log.info(f"Reindexing completed.")
-    return True
+@router.post("/reindex/jobs/{job_id}/cancel", response_model=ReindexJobModel)
+async def cancel_reindex_job_by_id(job_id: str, user=Depends(get_admin_user)):
+    job = ReindexJobs.get_job_by_id(job_id)
+    if job is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=ERROR_MESSAGES.NOT_FOUND,
+        )
+
+    if job.status in ("pending", "running"):
+        cancel_reindex_job(job_id)
+    return ReindexJobs.get_job_by_id(job_id)
 
 
 ############################
@@ -806,10 +815,11 @@ async def delete_knowledge_by_id(
                     is_active=model.is_active,
                 )
                 Models.update_model_by_id(model.id, model_form, db=db)
+                MODEL_REGISTRY.invalidate()
 
     # Clean up vector DB
     try:
-        VECTOR_DB_CLIENT.delete_collection(collection_name=id)
+        await ASYNC_VECTOR_DB_CLIENT.delete_collection(collection_name=id)
     except Exception as e:
         log.debug(e)
         pass
@@ -848,7 +858,7 @@ async def reset_knowledge_by_id(
         )
 
     try:
-        VECTOR_DB_CLIENT.delete_collection(collection_name=id)
+        await ASYNC_VECTOR_DB_CLIENT.delete_collection(collection_name=id)
     except Exception as e:
         log.debug(e)
         pass
@@ -946,6 +956,45 @@ async def add_files_to_knowledge_batch(
 ############################
 
 
+# Files read per batch while streaming an export
+KNOWLEDGE_EXPORT_BATCH_SIZE = 50
+
+
+def generate_knowledge_export_zip_generator(knowledge_id: str):
+    """
+    Synchronous generator streaming a knowledge base's files as a zip archive.
+
+    Files are read in keyset-paginated batches, each with its own short-lived
+    session (db=None), so neither the archive nor the file list is ever held
+    in memory as a whole and the database isn't locked for the whole export.
+    """
+
+    def entries():
+        cursor = None
+        while True:
+            files = Knowledges.get_files_by_cursor(
+                knowledge_id,
+                cursor=cursor,
+                limit=KNOWLEDGE_EXPORT_BATCH_SIZE,
+                db=None,
+            )
+            if not files:
+                break
+
+            for file in files:
+                content = file.data.get("content", "") if file.data else ""
+                if content:
+                    # Use original filename with .txt extension
+                    filename = file.filename
+                    if not filename.endswith(".txt"):
+                        filename = f"{filename}.txt"
+                    yield filename, content
+
+            cursor = files[-1].id
+
+    yield from stream_zip(entries())
+
+
 @router.get("/{id}/export")
 async def export_knowledge_by_id(
     id: str, user=Depends(get_admin_user), db: Session = Depends(get_session)
@@ -962,28 +1011,12 @@ async def export_knowledge_by_id(
             detail=ERROR_MESSAGES.NOT_FOUND,
         )
 
-    files = Knowledges.get_files_by_id(id, db=db)
-
-    # Create zip file in memory
-    zip_buffer = io.BytesIO()
-    with zipfile.ZipFile(zip_buffer, "w", zipfile.ZIP_DEFLATED) as zf:
-        for file in files:
-            content = file.data.get("content", "") if file.data else ""
-            if content:
-                # Use original filename with .txt extension
-                filename = file.filename
-                if not filename.endswith(".txt"):
-                    filename = f"{filename}.txt"
-                zf.writestr(filename, content)
-
-    zip_buffer.seek(0)
-
     # Sanitize knowledge name for filename
     safe_name = "".join(c if c.isalnum() or c in " -_" else "_" for c in knowledge.name)
     zip_filename = f"{safe_name}.zip"
 
     return StreamingResponse(
-        zip_buffer,
+        generate_knowledge_export_zip_generator(knowledge.id),
         media_type="application/zip",
         headers={"Content-Disposition": f"attachment; filename={zip_filename}"},
     )
@@ -31,6 +31,7 @@ from fastapi.responses import FileResponse, StreamingResponse
 
 from open_webui.utils.auth import get_admin_user, get_verified_user
 from open_webui.utils.access_control import has_access, has_permission
+from open_webui.utils.models import MODEL_REGISTRY
 from open_webui.config import BYPASS_ADMIN_ACCESS_CONTROL, STATIC_DIR
 from open_webui.internal.db import get_session
 from sqlalchemy.orm import Session
@@ -181,6 +182,7 @@ async def create_new_model(
     else:
         model = Models.insert_new_model(form_data, user.id, db=db)
         if model:
+            MODEL_REGISTRY.invalidate()
             return model
         else:
             raise HTTPException(
@@ -269,6 +271,7 @@ async def import_models(
                         Models.insert_new_model(
                             user_id=user.id, form_data=new_model, db=db
                         )
+            MODEL_REGISTRY.invalidate()
             return True
         else:
             raise HTTPException(status_code=400, detail="Invalid JSON format")
@@ -293,7 +296,9 @@ async def sync_models(
     user=Depends(get_admin_user),
     db: Session = Depends(get_session),
 ):
-    return Models.sync_models(user.id, form_data.models, db=db)
+    models = Models.sync_models(user.id, form_data.models, db=db)
+    MODEL_REGISTRY.invalidate()
+    return models
 
 
 ###########################
@@ -398,6 +403,7 @@ async def toggle_model_by_id(
             model = Models.toggle_model_by_id(id, db=db)
 
             if model:
+                MODEL_REGISTRY.invalidate()
                 return model
             else:
                 raise HTTPException(
@@ -447,6 +453,7 @@ async def update_model_by_id(
     model = Models.update_model_by_id(
         form_data.id, ModelForm(**form_data.model_dump()), db=db
     )
+    MODEL_REGISTRY.invalidate()
     return model
 
 
@@ -479,6 +486,7 @@ async def delete_model_by_id(
         )
 
     result = Models.delete_model_by_id(form_data.id, db=db)
+    MODEL_REGISTRY.invalidate()
     return result
 
 
@@ -487,4 +495,5 @@ async def delete_all_models(
     user=Depends(get_admin_user), db: Session = Depends(get_session)
 ):
     result = Models.delete_all_models(db=db)
+    MODEL_REGISTRY.invalidate()
     return result
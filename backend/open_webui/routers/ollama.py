@@ -18,6 +18,7 @@ from aiocache import cached
 import requests
 
 from open_webui.utils.headers import include_user_info_headers
+from open_webui.utils.session_pool import CLIENT_SESSION_POOL, get_client_session
 from open_webui.models.chats import Chats
 from open_webui.models.users import UserModel
 
@@ -82,7 +83,7 @@ log = logging.getLogger(__name__)
 async def send_get_request(url, key=None, user: UserModel = None):
     timeout = aiohttp.ClientTimeout(total=AIOHTTP_CLIENT_TIMEOUT_MODEL_LIST)
     try:
-        async with aiohttp.ClientSession(timeout=timeout, trust_env=True) as session:
+        async with CLIENT_SESSION_POOL.session(url) as session:
             headers = {
                 "Content-Type": "application/json",
                 **({"Authorization": f"Bearer {key}"} if key else {}),
@@ -94,6 +95,7 @@ async def send_get_request(url, key=None, user: UserModel = None):
             async with session.get(
                 url,
                 headers=headers,
+                timeout=timeout,
                 ssl=AIOHTTP_CLIENT_SESSION_SSL,
             ) as response:
                 return await response.json()
@@ -103,14 +105,10 @@ async def send_get_request(url, key=None, user: UserModel = None):
         return None
 
 
-async def cleanup_response(
-    response: Optional[aiohttp.ClientResponse],
-    session: Optional[aiohttp.ClientSession],
-):
+async def cleanup_response(response: Optional[aiohttp.ClientResponse]):
+    # Sessions are pooled, so release the connection instead of closing it
     if response:
-        response.close()
-    if session:
-        await session.close()
+        response.release()
 
 
 async def send_post_request(
@@ -125,9 +123,7 @@ async def send_post_request(
 
     r = None
     try:
-        session = aiohttp.ClientSession(
-            trust_env=True, timeout=aiohttp.ClientTimeout(total=AIOHTTP_CLIENT_TIMEOUT)
-        )
+        session = await get_client_session(url)
 
         headers = {
             "Content-Type": "application/json",
@@ -143,13 +139,14 @@ async def send_post_request(
             url,
             data=payload,
             headers=headers,
+            timeout=aiohttp.ClientTimeout(total=AIOHTTP_CLIENT_TIMEOUT),
             ssl=AIOHTTP_CLIENT_SESSION_SSL,
         )
 
         if r.ok is False:
             try:
                 res = await r.json()
-                await cleanup_response(r, session)
+                await cleanup_response(r)
                 if "error" in res:
                     raise HTTPException(status_code=r.status, detail=res["error"])
             except HTTPException as e:
@@ -172,9 +169,7 @@ async def send_post_request(
                 r.content,
                 status_code=r.status,
                 headers=response_headers,
-                background=BackgroundTask(
-                    cleanup_response, response=r, session=session
-                ),
+                background=BackgroundTask(cleanup_response, response=r),
             )
         else:
             res = await r.json()
@@ -191,7 +186,7 @@ async def send_post_request(
         )
     finally:
         if not stream:
-            await cleanup_response(r, session)
+            await cleanup_response(r)
 
 
 def get_api_key(idx, url, configs):
@@ -229,10 +224,7 @@ async def verify_connection(
     url = form_data.url
     key = form_data.key
 
-    async with aiohttp.ClientSession(
-        trust_env=True,
-        timeout=aiohttp.ClientTimeout(total=AIOHTTP_CLIENT_TIMEOUT_MODEL_LIST),
-    ) as session:
+    async with CLIENT_SESSION_POOL.session(url) as session:
         try:
             headers = {
                 **({"Authorization": f"Bearer {key}"} if key else {}),
@@ -244,6 +236,7 @@ async def verify_connection(
             async with session.get(
                 f"{url}/api/version",
                 headers=headers,
+                timeout=aiohttp.ClientTimeout(total=AIOHTTP_CLIENT_TIMEOUT_MODEL_LIST),
                 ssl=AIOHTTP_CLIENT_SESSION_SSL,
             ) as r:
                 if r.status != 200:
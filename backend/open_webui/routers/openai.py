@@ -52,6 +52,7 @@ from open_webui.utils.misc import (
 from open_webui.utils.auth import get_admin_user, get_verified_user
 from open_webui.utils.access_control import has_access
 from open_webui.utils.headers import include_user_info_headers
+from open_webui.utils.session_pool import CLIENT_SESSION_POOL, get_client_session
 
 
 log = logging.getLogger(__name__)
@@ -67,7 +68,7 @@ log = logging.getLogger(__name__)
 async def send_get_request(url, key=None, user: UserModel = None):
     timeout = aiohttp.ClientTimeout(total=AIOHTTP_CLIENT_TIMEOUT_MODEL_LIST)
     try:
-        async with aiohttp.ClientSession(timeout=timeout, trust_env=True) as session:
+        async with CLIENT_SESSION_POOL.session(url) as session:
             headers = {
                 **({"Authorization": f"Bearer {key}"} if key else {}),
             }
@@ -78,6 +79,7 @@ async def send_get_request(url, key=None, user: UserModel = None):
             async with session.get(
                 url,
                 headers=headers,
+                timeout=timeout,
                 ssl=AIOHTTP_CLIENT_SESSION_SSL,
             ) as response:
                 return await response.json()
@@ -87,14 +89,10 @@ async def send_get_request(url, key=None, user: UserModel = None):
         return None
 
 
-async def cleanup_response(
-    response: Optional[aiohttp.ClientResponse],
-    session: Optional[aiohttp.ClientSession],
-):
+async def cleanup_response(response: Optional[aiohttp.ClientResponse]):
+    # Sessions are pooled, so release the connection instead of closing it
     if response:
-        response.close()
-    if session:
-        await session.close()
+        response.release()
 
 
 def openai_reasoning_model_handler(payload):
@@ -560,10 +558,7 @@ async def get_models(
         )
 
         r = None
-        async with aiohttp.ClientSession(
-            trust_env=True,
-            timeout=aiohttp.ClientTimeout(total=AIOHTTP_CLIENT_TIMEOUT_MODEL_LIST),
-        ) as session:
+        async with CLIENT_SESSION_POOL.session(url) as session:
             try:
                 headers, cookies = await get_headers_and_cookies(
                     request, url, key, api_config, user=user
@@ -579,6 +574,9 @@ async def get_models(
                         f"{url}/models",
                         headers=headers,
                         cookies=cookies,
+                        timeout=aiohttp.ClientTimeout(
+                            total=AIOHTTP_CLIENT_TIMEOUT_MODEL_LIST
+                        ),
                         ssl=AIOHTTP_CLIENT_SESSION_SSL,
                     ) as r:
                         if r.status != 200:
@@ -646,10 +644,8 @@ async def verify_connection(
 
     api_config = form_data.config or {}
 
-    async with aiohttp.ClientSession(
-        trust_env=True,
-        timeout=aiohttp.ClientTimeout(total=AIOHTTP_CLIENT_TIMEOUT_MODEL_LIST),
-    ) as session:
+    timeout = aiohttp.ClientTimeout(total=AIOHTTP_CLIENT_TIMEOUT_MODEL_LIST)
+    async with CLIENT_SESSION_POOL.session(url) as session:
         try:
             headers, cookies = await get_headers_and_cookies(
                 request, url, key, api_config, user=user
@@ -666,6 +662,7 @@ async def verify_connection(
                     url=f"{url}/openai/models?api-version={api_version}",
                     headers=headers,
                     cookies=cookies,
+                    timeout=timeout,
                     ssl=AIOHTTP_CLIENT_SESSION_SSL,
                 ) as r:
                     try:
@@ -689,6 +686,7 @@ async def verify_connection(
                     f"{url}/models",
                     headers=headers,
                     cookies=cookies,
+                    timeout=timeout,
                     ssl=AIOHTTP_CLIENT_SESSION_SSL,
                 ) as r:
                     try:
@@ -932,21 +930,18 @@ async def generate_chat_completion(
     payload = json.dumps(payload)
 
     r = None
-    session = None
     streaming = False
     response = None
 
     try:
-        session = aiohttp.ClientSession(
-            trust_env=True, timeout=aiohttp.ClientTimeout(total=AIOHTTP_CLIENT_TIMEOUT)
-        )
-
+        session = await get_client_session(request_url)
         r = await session.request(
             method="POST",
             url=request_url,
             data=payload,
             headers=headers,
             cookies=cookies,
+            timeout=aiohttp.ClientTimeout(total=AIOHTTP_CLIENT_TIMEOUT),
             ssl=AIOHTTP_CLIENT_SESSION_SSL,
         )
 
@@ -957,9 +952,7 @@ async def generate_chat_completion(
                 stream_chunks_handler(r.content),
                 status_code=r.status,
                 headers=dict(r.headers),
-                background=BackgroundTask(
-                    cleanup_response, response=r, session=session
-                ),
+                background=BackgroundTask(cleanup_response, response=r),
             )
         else:
             try:
@@ -984,7 +977,7 @@ async def generate_chat_completion(
         )
     finally:
         if not streaming:
-            await cleanup_response(r, session)
+            await cleanup_response(r)
 
 
 async def embeddings(request: Request, form_data: dict, user):
@@ -1017,14 +1010,13 @@ async def embeddings(request: Request, form_data: dict, user):
     )
 
     r = None
-    session = None
     streaming = False
 
     headers, cookies = await get_headers_and_cookies(
         request, url, key, api_config, user=user
     )
     try:
-        session = aiohttp.ClientSession(trust_env=True)
+        session = await get_client_session(url)
         r = await session.request(
             method="POST",
             url=f"{url}/embeddings",
@@ -1039,9 +1031,7 @@ async def embeddings(request: Request, form_data: dict, user):
                 r.content,
                 status_code=r.status,
                 headers=dict(r.headers),
-                background=BackgroundTask(
-                    cleanup_response, response=r, session=session
-                ),
+                background=BackgroundTask(cleanup_response, response=r),
             )
         else:
             try:
@@ -1066,7 +1056,7 @@ async def embeddings(request: Request, form_data: dict, user):
         )
     finally:
         if not streaming:
-            await cleanup_response(r, session)
+            await cleanup_response(r)
 
 
 @router.api_route("/{path:path}", methods=["GET", "POST", "PUT", "DELETE"])
@@ -1088,7 +1078,6 @@ async def proxy(path: str, request: Request, user=Depends(get_verified_user)):
     )
 
     r = None
-    session = None
     streaming = False
 
     try:
@@ -1114,7 +1103,7 @@ async def proxy(path: str, request: Request, user=Depends(get_verified_user)):
         else:
             request_url = f"{url}/{path}"
 
-        session = aiohttp.ClientSession(trust_env=True)
+        session = await get_client_session(request_url)
         r = await session.request(
             method=request.method,
             url=request_url,
@@ -1131,9 +1120,7 @@ async def proxy(path: str, request: Request, user=Depends(get_verified_user)):
                 r.content,
                 status_code=r.status,
                 headers=dict(r.headers),
-                background=BackgroundTask(
-                    cleanup_response, response=r, session=session
-                ),
+                background=BackgroundTask(cleanup_response, response=r),
             )
         else:
             try:
@@ -1159,4 +1146,4 @@ async def proxy(path: str, request: Request, user=Depends(get_verified_user)):
         )
     finally:
         if not streaming:
-            await cleanup_response(r, session)
+            await cleanup_response(r)
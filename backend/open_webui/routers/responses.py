@@ -30,6 +30,7 @@ from open_webui.utils.payload import (
 )
 from open_webui.utils.auth import get_admin_user, get_verified_user
 from open_webui.utils.access_control import has_access
+from open_webui.utils.session_pool import CLIENT_SESSION_POOL, get_client_session
 from starlette.background import BackgroundTask
 
 
@@ -47,7 +48,7 @@ log.setLevel(SRC_LOG_LEVELS["OPENAI"])
 async def send_get_request(url, key=None, user: UserModel = None):
     timeout = aiohttp.ClientTimeout(total=AIOHTTP_CLIENT_TIMEOUT_MODEL_LIST)
     try:
-        async with aiohttp.ClientSession(timeout=timeout, trust_env=True) as session:
+        async with CLIENT_SESSION_POOL.session(url) as session:
             async with session.get(
                 url,
                 headers={
@@ -63,6 +64,7 @@ async def send_get_request(url, key=None, user: UserModel = None):
                         else {}
                     ),
                 },
+                timeout=timeout,
                 ssl=AIOHTTP_CLIENT_SESSION_SSL,
             ) as response:
                 return await response.json()
@@ -72,14 +74,10 @@ async def send_get_request(url, key=None, user: UserModel = None):
         return None
 
 
-async def cleanup_response(
-    response: Optional[aiohttp.ClientResponse],
-    session: Optional[aiohttp.ClientSession],
-):
+async def cleanup_response(response: Optional[aiohttp.ClientResponse]):
+    # Sessions are pooled, so release the connection instead of closing it
     if response:
-        response.close()
-    if session:
-        await session.close()
+        response.release()
 
 
 async def get_headers_and_cookies(
@@ -248,10 +246,7 @@ async def verify_connection(
     key = form_data.key
     api_config = form_data.config or {}
 
-    async with aiohttp.ClientSession(
-        trust_env=True,
-        timeout=aiohttp.ClientTimeout(total=AIOHTTP_CLIENT_TIMEOUT_MODEL_LIST),
-    ) as session:
+    async with CLIENT_SESSION_POOL.session(url) as session:
         try:
             headers, cookies = await get_headers_and_cookies(
                 request, url, key, api_config, user=user
@@ -262,6 +257,7 @@ async def verify_connection(
                 f"{url}/models",
                 headers=headers,
                 cookies=cookies,
+                timeout=aiohttp.ClientTimeout(total=AIOHTTP_CLIENT_TIMEOUT_MODEL_LIST),
                 ssl=AIOHTTP_CLIENT_SESSION_SSL,
             ) as r:
                 try:
@@ -390,21 +386,18 @@ async def create_response(
     payload_json = json.dumps(payload)
 
     r = None
-    session = None
     streaming = False
     response = None
 
     try:
-        session = aiohttp.ClientSession(
-            trust_env=True, timeout=aiohttp.ClientTimeout(total=AIOHTTP_CLIENT_TIMEOUT)
-        )
-
+        session = await get_client_session(request_url)
         r = await session.request(
             method="POST",
             url=request_url,
             data=payload_json,
             headers=headers,
             cookies=cookies,
+            timeout=aiohttp.ClientTimeout(total=AIOHTTP_CLIENT_TIMEOUT),
             ssl=AIOHTTP_CLIENT_SESSION_SSL,
         )
 
@@ -415,9 +408,7 @@ async def create_response(
                 r.content,
                 status_code=r.status,
                 headers=dict(r.headers),
-                background=BackgroundTask(
-                    cleanup_response, response=r, session=session
-                ),
+                background=BackgroundTask(cleanup_response, response=r),
             )
         else:
             try:
@@ -442,7 +433,7 @@ async def create_response(
         )
     finally:
         if not streaming:
-            await cleanup_response(r, session)
+            await cleanup_response(r)
 
 
 @router.post("/{response_id}/cancel")
@@ -478,19 +469,16 @@ async def cancel_response(
     request_url = f"{url}/responses/{response_id}/cancel"
 
     r = None
-    session = None
     response = None
 
     try:
-        session = aiohttp.ClientSession(
-            trust_env=True, timeout=aiohttp.ClientTimeout(total=AIOHTTP_CLIENT_TIMEOUT)
-        )
-
+        session = await get_client_session(request_url)
         r = await session.request(
             method="POST",
             url=request_url,
             headers=headers,
             cookies=cookies,
+            timeout=aiohttp.ClientTimeout(total=AIOHTTP_CLIENT_TIMEOUT),
             ssl=AIOHTTP_CLIENT_SESSION_SSL,
         )
 
@@ -515,4 +503,4 @@ async def cancel_response(
             detail="Open WebUI: Server Connection Error",
         )
     finally:
-        await cleanup_response(r, session)
+        await cleanup_response(r)
@@ -43,7 +43,10 @@ from open_webui.internal.db import get_session, get_db
 from sqlalchemy.orm import Session
 
 
-from open_webui.retrieval.vector.factory import VECTOR_DB_CLIENT
+from open_webui.retrieval.vector.factory import (
+    ASYNC_VECTOR_DB_CLIENT,
+    VECTOR_DB_CLIENT,
+)
 
 # Document loaders
 from open_webui.retrieval.loaders.main import Loader
@@ -86,7 +89,9 @@ from open_webui.retrieval.utils import (
     query_collection_with_hybrid_search,
     query_doc,
     query_doc_with_hybrid_search,
+    has_bm25_index,
 )
+from open_webui.retrieval.vector.main import GetResult
 from open_webui.retrieval.vector.utils import filter_metadata
 from open_webui.utils.misc import (
     calculate_sha256_string,
@@ -94,6 +99,7 @@ from open_webui.utils.misc import (
 )
 from open_webui.utils.auth import get_admin_user, get_verified_user
 from open_webui.utils.access_control import has_permission
+from open_webui.utils.ingestion import ingestion_stage, notify_file_status
 
 from open_webui.config import (
     ENV,
@@ -1354,6 +1360,167 @@ def merge_docs_to_target_size(
     return processed_chunks
 
 
+def get_embedding_config_metadata(request: Request) -> dict:
+    return {
+        "engine": request.app.state.config.RAG_EMBEDDING_ENGINE,
+        "model": request.app.state.config.RAG_EMBEDDING_MODEL,
+    }
+
+
+def check_duplicate_content(collection_name: str, metadata: Optional[dict] = None):
+    # Check if entries with the same hash (metadata.hash) already exist
+    if metadata and "hash" in metadata:
+        result = VECTOR_DB_CLIENT.query(
+            collection_name=collection_name,
+            filter={"hash": metadata["hash"]},
+        )
+
+        if result is not None and result.ids and len(result.ids) > 0:
+            existing_doc_ids = result.ids[0]
+            if existing_doc_ids:
+                # Check if the existing document belongs to the same file
+                # If same file_id, this is a re-add/reindex - allow it
+                # If different file_id, this is a duplicate - block it
+                existing_file_id = None
+                if result.metadatas and result.metadatas[0]:
+                    existing_file_id = result.metadatas[0][0].get("file_id")
+
+                if existing_file_id != metadata.get("file_id"):
+                    log.info(f"Document with hash {metadata['hash']} already exists")
+                    raise ValueError(ERROR_MESSAGES.DUPLICATE_CONTENT)
+
+
+def get_file_chunks(file_id: str) -> Optional[GetResult]:
+    """
+    Read the chunks stored in a file's collection, with their vectors when the
+    backend can return them, in a single query.
+    """
+    result = VECTOR_DB_CLIENT.query_with_vectors(
+        collection_name=f"file-{file_id}", filter={"file_id": file_id}
+    )
+    if result is None:
+        result = VECTOR_DB_CLIENT.query(
+            collection_name=f"file-{file_id}", filter={"file_id": file_id}
+        )
+    return result
+
+
+def copy_file_vectors_to_collection(
+    request: Request,
+    file_id: str,
+    collection_name: str,
+    metadata: Optional[dict] = None,
+    result: Optional[GetResult] = None,
+) -> bool:
+    """
+    Copy the chunks and vectors already stored in a file's collection into
+    another collection, without calling the embedding engine. `result` is the
+    file's chunks when the caller has already read them with get_file_chunks.
+
+    Returns False when the stored vectors cannot be reused (the backend does
+    not return vectors, the file has not been embedded yet, or it was embedded
+    with a different model), in which case the caller embeds the documents.
+    """
+    if result is None:
+        result = get_file_chunks(file_id)
+    if (
+        result is None
+        or not result.ids
+        or not result.ids[0]
+        or not getattr(result, "vectors", None)
+    ):
+        return False
+
+    # Most backends store nested metadata values as strings
+    embedding_config = get_embedding_config_metadata(request)
+    if any(
+        (item_metadata or {}).get("embedding_config")
+        not in (embedding_config, str(embedding_config))
+        for item_metadata in result.metadatas[0]
+    ):
+        log.info(
+            f"file-{file_id} was embedded with a different embedding model, re-embedding"
+        )
+        return False
+
+    check_duplicate_content(collection_name, metadata)
+
+    items = [
+        {
+            "id": str(uuid.uuid4()),
+            "text": result.documents[0][idx],
+            "vector": result.vectors[0][idx],
+            "metadata": {
+                **result.metadatas[0][idx],
+                **(metadata if metadata else {}),
+                "embedding_config": embedding_config,
+            },
+        }
+        for idx in range(len(result.ids[0]))
+    ]
+
+    log.info(f"copying {len(items)} items from file-{file_id} to {collection_name}")
+    VECTOR_DB_CLIENT.insert(collection_name=collection_name, items=items)
+    return True
+
+
+def add_file_to_collection(
+    request: Request, file: FileModel, collection_name: str, user=None
+) -> bool:
+    """
+    Add an already processed file to a collection, reusing its stored vectors
+    when possible and embedding its stored chunks otherwise. Unlike
+    process_file this leaves the file's own status and metadata untouched.
+    """
+    text_content = (file.data or {}).get("content", "")
+    metadata = {
+        "file_id": file.id,
+        "name": file.filename,
+        "hash": calculate_sha256_string(text_content),
+    }
+
+    result = get_file_chunks(file.id)
+    if copy_file_vectors_to_collection(
+        request,
+        file_id=file.id,
+        collection_name=collection_name,
+        metadata=metadata,
+        result=result,
+    ):
+        return True
+
+    if result is not None and len(result.ids[0]) > 0:
+        docs = [
+            Document(
+                page_content=result.documents[0][idx],
+                metadata=result.metadatas[0][idx],
+            )
+            for idx in range(len(result.ids[0]))
+        ]
+    else:
+        docs = [
+            Document(
+                page_content=text_content,
+                metadata={
+                    **file.meta,
+                    "name": file.filename,
+                    "created_by": file.user_id,
+                    "file_id": file.id,
+                    "source": file.filename,
+                },
+            )
+        ]
+
+    return save_docs_to_vector_db(
+        request,
+        docs=docs,
+        collection_name=collection_name,
+        metadata=metadata,
+        add=True,
+        user=user,
+    )
+
+
 def save_docs_to_vector_db(
     request: Request,
     docs,
@@ -1384,83 +1551,67 @@ def save_docs_to_vector_db(
         f"save_docs_to_vector_db: document {_get_docs_info(docs)} {collection_name}"
     )
 
-    # Check if entries with the same hash (metadata.hash) already exist
-    if metadata and "hash" in metadata:
-        result = VECTOR_DB_CLIENT.query(
-            collection_name=collection_name,
-            filter={"hash": metadata["hash"]},
-        )
-
-        if result is not None and result.ids and len(result.ids) > 0:
-            existing_doc_ids = result.ids[0]
-            if existing_doc_ids:
-                # Check if the existing document belongs to the same file
-                # If same file_id, this is a re-add/reindex - allow it
-                # If different file_id, this is a duplicate - block it
-                existing_file_id = None
-                if result.metadatas and result.metadatas[0]:
-                    existing_file_id = result.metadatas[0][0].get("file_id")
-
-                if existing_file_id != metadata.get("file_id"):
-                    log.info(f"Document with hash {metadata['hash']} already exists")
-                    raise ValueError(ERROR_MESSAGES.DUPLICATE_CONTENT)
+    check_duplicate_content(collection_name, metadata)
 
     if split:
-        if request.app.state.config.ENABLE_MARKDOWN_HEADER_TEXT_SPLITTER:
-            log.info("Using markdown header text splitter")
-            # Define headers to split on - covering most common markdown header levels
-            markdown_splitter = MarkdownHeaderTextSplitter(
-                headers_to_split_on=[
-                    ("#", "Header 1"),
-                    ("##", "Header 2"),
-                    ("###", "Header 3"),
-                    ("####", "Header 4"),
-                    ("#####", "Header 5"),
-                    ("######", "Header 6"),
-                ],
-                strip_headers=False,  # Keep headers in content for context
-            )
-
-            split_docs = []
-            for doc in docs:
-                split_docs.extend(
-                    [
-                        Document(
-                            page_content=split_chunk.page_content,
-                            metadata={**doc.metadata},
-                        )
-                        for split_chunk in markdown_splitter.split_text(
-                            doc.page_content
-                        )
-                    ]
+        with ingestion_stage("split"):
+            if request.app.state.config.ENABLE_MARKDOWN_HEADER_TEXT_SPLITTER:
+                log.info("Using markdown header text splitter")
+                # Define headers to split on - covering most common markdown header levels
+                markdown_splitter = MarkdownHeaderTextSplitter(
+                    headers_to_split_on=[
+                        ("#", "Header 1"),
+                        ("##", "Header 2"),
+                        ("###", "Header 3"),
+                        ("####", "Header 4"),
+                        ("#####", "Header 5"),
+                        ("######", "Header 6"),
+                    ],
+                    strip_headers=False,  # Keep headers in content for context
                 )
 
-            docs = split_docs
-            if request.app.state.config.CHUNK_MIN_SIZE_TARGET > 0:
-                docs = merge_docs_to_target_size(request, docs)
+                split_docs = []
+                for doc in docs:
+                    split_docs.extend(
+                        [
+                            Document(
+                                page_content=split_chunk.page_content,
+                                metadata={**doc.metadata},
+                            )
+                            for split_chunk in markdown_splitter.split_text(
+                                doc.page_content
+                            )
+                        ]
+                    )
 
-        if request.app.state.config.TEXT_SPLITTER in ["", "character"]:
-            text_splitter = RecursiveCharacterTextSplitter(
-                chunk_size=request.app.state.config.CHUNK_SIZE,
-                chunk_overlap=request.app.state.config.CHUNK_OVERLAP,
-                add_start_index=True,
-            )
-            docs = text_splitter.split_documents(docs)
-        elif request.app.state.config.TEXT_SPLITTER == "token":
-            log.info(
-                f"Using token text splitter: {request.app.state.config.TIKTOKEN_ENCODING_NAME}"
-            )
+                docs = split_docs
+                if request.app.state.config.CHUNK_MIN_SIZE_TARGET > 0:
+                    docs = merge_docs_to_target_size(request, docs)
 
-            tiktoken.get_encoding(str(request.app.state.config.TIKTOKEN_ENCODING_NAME))
-            text_splitter = TokenTextSplitter(
-                encoding_name=str(request.app.state.config.TIKTOKEN_ENCODING_NAME),
-                chunk_size=request.app.state.config.CHUNK_SIZE,
-                chunk_overlap=request.app.state.config.CHUNK_OVERLAP,
-                add_start_index=True,
-            )
-            docs = text_splitter.split_documents(docs)
-        else:
-            raise ValueError(ERROR_MESSAGES.DEFAULT("Invalid text splitter"))
+            if request.app.state.config.TEXT_SPLITTER in ["", "character"]:
+                text_splitter = RecursiveCharacterTextSplitter(
+                    chunk_size=request.app.state.config.CHUNK_SIZE,
+                    chunk_overlap=request.app.state.config.CHUNK_OVERLAP,
+                    add_start_index=True,
+                )
+                docs = text_splitter.split_documents(docs)
+            elif request.app.state.config.TEXT_SPLITTER == "token":
+                log.info(
+                    f"Using token text splitter: {request.app.state.config.TIKTOKEN_ENCODING_NAME}"
+                )
+
+                tiktoken.get_encoding(
+                    str(request.app.state.config.TIKTOKEN_ENCODING_NAME)
+                )
+                text_splitter = TokenTextSplitter(
+                    encoding_name=str(request.app.state.config.TIKTOKEN_ENCODING_NAME),
+                    chunk_size=request.app.state.config.CHUNK_SIZE,
+                    chunk_overlap=request.app.state.config.CHUNK_OVERLAP,
+                    add_start_index=True,
+                )
+                docs = text_splitter.split_documents(docs)
+            else:
+                raise ValueError(ERROR_MESSAGES.DEFAULT("Invalid text splitter"))
 
     if len(docs) == 0:
         raise ValueError(ERROR_MESSAGES.EMPTY_CONTENT)
@@ -1470,10 +1621,7 @@ def save_docs_to_vector_db(
         {
             **doc.metadata,
             **(metadata if metadata else {}),
-            "embedding_config": {
-                "engine": request.app.state.config.RAG_EMBEDDING_ENGINE,
-                "model": request.app.state.config.RAG_EMBEDDING_MODEL,
-            },
+            "embedding_config": get_embedding_config_metadata(request),
         }
         for doc in docs
     ]
@@ -1524,13 +1672,14 @@ def save_docs_to_vector_db(
         )
 
         # Run async embedding in sync context
-        embeddings = asyncio.run(
-            embedding_function(
-                list(map(lambda x: x.replace("\n", " "), texts)),
-                prefix=RAG_EMBEDDING_CONTENT_PREFIX,
-                user=user,
+        with ingestion_stage("embed"):
+            embeddings = asyncio.run(
+                embedding_function(
+                    list(map(lambda x: x.replace("\n", " "), texts)),
+                    prefix=RAG_EMBEDDING_CONTENT_PREFIX,
+                    user=user,
+                )
             )
-        )
         log.info(f"embeddings generated {len(embeddings)} for {len(texts)} items")
 
         items = [
@@ -1544,10 +1693,11 @@ def save_docs_to_vector_db(
         ]
 
         log.info(f"adding to collection {collection_name}")
-        VECTOR_DB_CLIENT.insert(
-            collection_name=collection_name,
-            items=items,
-        )
+        with ingestion_stage("insert"):
+            VECTOR_DB_CLIENT.insert(
+                collection_name=collection_name,
+                items=items,
+            )
 
         log.info(f"added {len(items)} items to collection {collection_name}")
         return True
@@ -1619,17 +1769,15 @@ def process_file(
                 # Check if the file has already been processed and save the content
                 # Usage: /knowledge/{id}/file/add, /knowledge/{id}/file/update
 
-                result = VECTOR_DB_CLIENT.query(
-                    collection_name=f"file-{file.id}", filter={"file_id": file.id}
-                )
+                file_chunks = get_file_chunks(file.id)
 
-                if result is not None and len(result.ids[0]) > 0:
+                if file_chunks is not None and len(file_chunks.ids[0]) > 0:
                     docs = [
                         Document(
-                            page_content=result.documents[0][idx],
-                            metadata=result.metadatas[0][idx],
+                            page_content=file_chunks.documents[0][idx],
+                            metadata=file_chunks.metadatas[0][idx],
                         )
-                        for idx, id in enumerate(result.ids[0])
+                        for idx, id in enumerate(file_chunks.ids[0])
                     ]
                 else:
                     docs = [
@@ -1684,9 +1832,10 @@ def process_file(
                         MINERU_API_TIMEOUT=request.app.state.config.MINERU_API_TIMEOUT,
                         MINERU_PARAMS=request.app.state.config.MINERU_PARAMS,
                     )
-                    docs = loader.load(
-                        file.filename, file.meta.get("content_type"), file_path
-                    )
+                    with ingestion_stage("load"):
+                        docs = loader.load(
+                            file.filename, file.meta.get("content_type"), file_path
+                        )
 
                     docs = [
                         Document(
@@ -1727,6 +1876,7 @@ def process_file(
             if request.app.state.config.BYPASS_EMBEDDING_AND_RETRIEVAL:
                 Files.update_file_data_by_id(file.id, {"status": "completed"}, db=db)
                 Files.update_file_hash_by_id(file.id, hash, db=db)
+                notify_file_status(file.id, db=db)
                 return {
                     "status": True,
                     "collection_name": None,
@@ -1740,21 +1890,37 @@ def process_file(
                     db.expunge(file)
                     db.commit()
 
-                    # External embedding API takes time (5-60s+).
-                    # No DB connection is held here.
-                    result = save_docs_to_vector_db(
-                        request,
-                        docs=docs,
-                        collection_name=collection_name,
-                        metadata={
-                            "file_id": file.id,
-                            "name": file.filename,
-                            "hash": hash,
-                        },
-                        add=(True if form_data.collection_name else False),
-                        user=user,
-                    )
-                    log.info(f"added {len(docs)} items to collection {collection_name}")
+                    metadata = {
+                        "file_id": file.id,
+                        "name": file.filename,
+                        "hash": hash,
+                    }
+
+                    result = False
+                    if form_data.collection_name and not form_data.content:
+                        # Attaching an already processed file, reuse its vectors
+                        result = copy_file_vectors_to_collection(
+                            request,
+                            file_id=file.id,
+                            collection_name=collection_name,
+                            metadata=metadata,
+                            result=file_chunks,
+                        )
+
+                    if not result:
+                        # External embedding API takes time (5-60s+).
+                        # No DB connection is held here.
+                        result = save_docs_to_vector_db(
+                            request,
+                            docs=docs,
+                            collection_name=collection_name,
+                            metadata=metadata,
+                            add=(True if form_data.collection_name else False),
+                            user=user,
+                        )
+                        log.info(
+                            f"added {len(docs)} items to collection {collection_name}"
+                        )
 
                     if result:
                         # Fresh session for the final update.
@@ -1773,6 +1939,7 @@ def process_file(
                                 db=session,
                             )
                             Files.update_file_hash_by_id(file.id, hash, db=session)
+                            notify_file_status(file.id, db=session)
 
                             return {
                                 "status": True,
@@ -1796,6 +1963,7 @@ def process_file(
                 )
                 # Clear the hash so the file can be re-uploaded after fixing the issue
                 Files.update_file_hash_by_id(file.id, None, db=session)
+                notify_file_status(file.id, db=session)
 
             if "No pandoc was found" in str(e):
                 raise HTTPException(
@@ -2399,8 +2567,12 @@ async def query_doc_handler(
             form_data.hybrid is None or form_data.hybrid
         ):
             collection_results = {}
-            collection_results[form_data.collection_name] = VECTOR_DB_CLIENT.get(
-                collection_name=form_data.collection_name
+            collection_results[form_data.collection_name] = (
+                None
+                if has_bm25_index()
+                else await ASYNC_VECTOR_DB_CLIENT.get(
+                    collection_name=form_data.collection_name
+                )
             )
             return await query_doc_with_hybrid_search(
                 collection_name=form_data.collection_name,
@@ -1,13 +1,10 @@
 import asyncio
-import random
 
 import socketio
 import logging
 import sys
-import time
-from typing import Dict, Set
+from typing import Dict, Optional, Set
 from redis import asyncio as aioredis
-import pycrdt as Y
 
 from open_webui.models.users import Users, UserNameResponse
 from open_webui.models.channels import Channels
@@ -28,7 +25,6 @@ from open_webui.env import (
     WEBSOCKET_MANAGER,
     WEBSOCKET_REDIS_URL,
     WEBSOCKET_REDIS_CLUSTER,
-    WEBSOCKET_REDIS_LOCK_TIMEOUT,
     WEBSOCKET_SENTINEL_PORT,
     WEBSOCKET_SENTINEL_HOSTS,
     REDIS_KEY_PREFIX,
@@ -37,9 +33,22 @@ from open_webui.env import (
     WEBSOCKET_SERVER_PING_INTERVAL,
     WEBSOCKET_SERVER_LOGGING,
     WEBSOCKET_SERVER_ENGINEIO_LOGGING,
+    WEBSOCKET_EVENT_FLUSH_INTERVAL,
+    WEBSOCKET_EVENT_FLUSH_MAX_SIZE,
+    WEBSOCKET_YDOC_COMPACTION_THRESHOLD,
+    WEBSOCKET_YDOC_CACHE_SIZE,
 )
 from open_webui.utils.auth import decode_token
-from open_webui.socket.utils import RedisDict, RedisLock, YdocManager
+from open_webui.socket.utils import (
+    FileStatusEvents,
+    MessageEventBuffer,
+    AsyncDict,
+    AsyncRedisDict,
+    RedisDict,
+    RedisUsagePool,
+    UsagePool,
+    YdocManager,
+)
 from open_webui.tasks import create_task, stop_item_tasks
 from open_webui.utils.redis import get_redis_connection
 from open_webui.utils.access_control import has_access, get_users_with_access
@@ -124,94 +133,85 @@ if WEBSOCKET_MANAGER == "redis":
         redis_cluster=WEBSOCKET_REDIS_CLUSTER,
     )
 
-    SESSION_POOL = RedisDict(
-        f"{REDIS_KEY_PREFIX}:session_pool",
-        redis_url=WEBSOCKET_REDIS_URL,
-        redis_sentinels=redis_sentinels,
-        redis_cluster=WEBSOCKET_REDIS_CLUSTER,
-    )
-    USAGE_POOL = RedisDict(
-        f"{REDIS_KEY_PREFIX}:usage_pool",
-        redis_url=WEBSOCKET_REDIS_URL,
-        redis_sentinels=redis_sentinels,
-        redis_cluster=WEBSOCKET_REDIS_CLUSTER,
+    SESSION_POOL = AsyncRedisDict(f"{REDIS_KEY_PREFIX}:session_pool", redis=REDIS)
+    USAGE_POOL = RedisUsagePool(
+        f"{REDIS_KEY_PREFIX}:usage", redis=REDIS, timeout=TIMEOUT_DURATION
     )
 
-    clean_up_lock = RedisLock(
+    FILE_STATUS_EVENTS = FileStatusEvents(
+        f"{REDIS_KEY_PREFIX}:file_status",
         redis_url=WEBSOCKET_REDIS_URL,
-        lock_name=f"{REDIS_KEY_PREFIX}:usage_cleanup_lock",
-        timeout_secs=WEBSOCKET_REDIS_LOCK_TIMEOUT,
         redis_sentinels=redis_sentinels,
         redis_cluster=WEBSOCKET_REDIS_CLUSTER,
     )
-    aquire_func = clean_up_lock.aquire_lock
-    renew_func = clean_up_lock.renew_lock
-    release_func = clean_up_lock.release_lock
 else:
     MODELS = {}
 
-    SESSION_POOL = {}
-    USAGE_POOL = {}
+    SESSION_POOL = AsyncDict()
+    USAGE_POOL = UsagePool(timeout=TIMEOUT_DURATION)
 
-    aquire_func = release_func = renew_func = lambda: True
+    FILE_STATUS_EVENTS = FileStatusEvents(f"{REDIS_KEY_PREFIX}:file_status")
 
 
 YDOC_MANAGER = YdocManager(
     redis=REDIS,
     redis_key_prefix=f"{REDIS_KEY_PREFIX}:ydoc:documents",
+    redis_session_key_prefix=f"{REDIS_KEY_PREFIX}:ydoc:sessions",
+    compaction_threshold=WEBSOCKET_YDOC_COMPACTION_THRESHOLD,
+    cache_size=WEBSOCKET_YDOC_CACHE_SIZE,
 )
 
 
-async def periodic_usage_pool_cleanup():
-    max_retries = 2
-    retry_delay = random.uniform(
-        WEBSOCKET_REDIS_LOCK_TIMEOUT / 2, WEBSOCKET_REDIS_LOCK_TIMEOUT
-    )
-    for attempt in range(max_retries + 1):
-        if aquire_func():
-            break
-        else:
-            if attempt < max_retries:
-                log.debug(
-                    f"Cleanup lock already exists. Retry {attempt + 1} after {retry_delay}s..."
-                )
-                await asyncio.sleep(retry_delay)
-            else:
-                log.warning(
-                    "Failed to acquire cleanup lock after retries. Skipping cleanup."
-                )
-                return
+def flush_message_events(chat_id: str, message_id: str, pending: dict):
+    """Persist a batch of buffered message events with a single message upsert."""
+    message = Chats.get_message_by_id_and_message_id(chat_id, message_id)
+    if not message:
+        return
 
+    update = {}
+
+    if pending["replace"] is not None or pending["content"]:
+        content = (
+            pending["replace"]
+            if pending["replace"] is not None
+            else message.get("content", "")
+        )
+        update["content"] = content + pending["content"]
+
+    if pending["status"]:
+        update["statusHistory"] = [
+            *message.get("statusHistory", []),
+            *pending["status"],
+        ]
+
+    if pending["embeds"]:
+        update["embeds"] = pending["embeds"] + message.get("embeds", [])
+
+    if pending["files"]:
+        update["files"] = pending["files"] + message.get("files", [])
+
+    if pending["sources"]:
+        update["sources"] = [*message.get("sources", []), *pending["sources"]]
+
+    if update:
+        Chats.upsert_message_to_chat_by_id_and_message_id(chat_id, message_id, update)
+
+
+MESSAGE_EVENT_BUFFER = MessageEventBuffer(
+    flush_message_events,
+    interval=WEBSOCKET_EVENT_FLUSH_INTERVAL,
+    max_size=WEBSOCKET_EVENT_FLUSH_MAX_SIZE,
+)
+
+
+async def periodic_usage_pool_cleanup():
     log.debug("Running periodic_cleanup")
-    try:
-        while True:
-            if not renew_func():
-                log.error(f"Unable to renew cleanup lock. Exiting usage pool cleanup.")
-                raise Exception("Unable to renew usage pool cleanup lock.")
-
-            now = int(time.time())
-            send_usage = False
-            for model_id, connections in list(USAGE_POOL.items()):
-                # Creating a list of sids to remove if they have timed out
-                expired_sids = [
-                    sid
-                    for sid, details in connections.items()
-                    if now - details["updated_at"] > TIMEOUT_DURATION
-                ]
-
-                for sid in expired_sids:
-                    del connections[sid]
-
-                if not connections:
-                    log.debug(f"Cleaning up model {model_id} from usage pool")
-                    del USAGE_POOL[model_id]
-                else:
-                    USAGE_POOL[model_id] = connections
-
-                send_usage = True
-            await asyncio.sleep(TIMEOUT_DURATION)
-    finally:
-        release_func()
+    while True:
+        try:
+            await USAGE_POOL.remove_expired()
+        except Exception as e:
+            log.warning(f"Failed to clean up usage pool: {e}")
+        await asyncio.sleep(TIMEOUT_DURATION)
 
 
 app = socketio.ASGIApp(
@@ -220,14 +220,14 @@ app = socketio.ASGIApp(
 )
 
 
-def get_models_in_use():
+async def get_models_in_use():
     # List models that are currently in use
-    models_in_use = list(USAGE_POOL.keys())
+    models_in_use = await USAGE_POOL.get_model_ids()
     return models_in_use
 
 
-def get_user_id_from_session_pool(sid):
-    user = SESSION_POOL.get(sid)
+async def get_user_id_from_session_pool(sid):
+    user = await SESSION_POOL.get(sid)
     if user:
         return user["id"]
     return None
@@ -242,18 +242,11 @@ def get_session_ids_from_room(room):
     return [session_id[0] for session_id in active_session_ids]
 
 
-def get_user_ids_from_room(room):
+async def get_user_ids_from_room(room):
     active_session_ids = get_session_ids_from_room(room)
 
-    active_user_ids = list(
-        set(
-            [
-                SESSION_POOL.get(session_id)["id"]
-                for session_id in active_session_ids
-                if SESSION_POOL.get(session_id) is not None
-            ]
-        )
-    )
+    sessions = await SESSION_POOL.get_many(active_session_ids)
+    active_user_ids = list(set([session["id"] for session in sessions.values()]))
     return active_user_ids
 
 
@@ -273,6 +266,21 @@ async def emit_to_users(event: str, data: dict, user_ids: list[str]):
         log.debug(f"Failed to emit event {event} to users {user_ids}: {e}")
 
 
+def publish_file_status(file_id: str, user_id: Optional[str], status: dict):
+    """
+    Notify the process status streams of a file, and the sessions of its
+    owner through a "file:status" event. Safe to call from worker threads.
+    """
+    FILE_STATUS_EVENTS.publish(file_id, status)
+
+    loop = FILE_STATUS_EVENTS.loop
+    if user_id and loop is not None and not loop.is_closed():
+        asyncio.run_coroutine_threadsafe(
+            emit_to_users("file:status", {"file_id": file_id, **status}, [user_id]),
+            loop,
+        )
+
+
 async def enter_room_for_users(room: str, user_ids: list[str]):
     """
     Make all sessions of a user join a specific room.
@@ -291,16 +299,9 @@ async def enter_room_for_users(room: str, user_ids: list[str]):
 
 @sio.on("usage")
 async def usage(sid, data):
-    if sid in SESSION_POOL:
-        model_id = data["model"]
+    if await SESSION_POOL.contains(sid):
         # Record the timestamp for the last update
-        current_time = int(time.time())
-
-        # Store the new usage data and task
-        USAGE_POOL[model_id] = {
-            **(USAGE_POOL[model_id] if model_id in USAGE_POOL else {}),
-            sid: {"updated_at": current_time},
-        }
+        await USAGE_POOL.touch(data["model"], sid)
 
 
 @sio.event
@@ -313,8 +314,8 @@ async def connect(sid, environ, auth):
             user = Users.get_user_by_id(data["id"])
 
         if user:
-            SESSION_POOL[sid] = user.model_dump(
-                exclude=["date_of_birth", "bio", "gender"]
+            await SESSION_POOL.set(
+                sid, user.model_dump(exclude=["date_of_birth", "bio", "gender"])
             )
             await sio.enter_room(sid, f"user:{user.id}")
 
@@ -334,14 +335,17 @@ async def user_join(sid, data):
     if not user:
         return
 
-    SESSION_POOL[sid] = user.model_dump(
-        exclude=[
-            "profile_image_url",
-            "profile_banner_image_url",
-            "date_of_birth",
-            "bio",
-            "gender",
-        ]
+    await SESSION_POOL.set(
+        sid,
+        user.model_dump(
+            exclude=[
+                "profile_image_url",
+                "profile_banner_image_url",
+                "date_of_birth",
+                "bio",
+                "gender",
+            ]
+        ),
     )
 
     await sio.enter_room(sid, f"user:{user.id}")
@@ -357,9 +361,9 @@ async def user_join(sid, data):
 
 @sio.on("heartbeat")
 async def heartbeat(sid, data):
-    user = SESSION_POOL.get(sid)
+    user = await SESSION_POOL.get(sid)
     if user:
-        Users.update_last_active_by_id(user["id"])
+        Users.mark_user_active_by_id(user["id"])
 
 
 @sio.on("join-channels")
@@ -429,7 +433,7 @@ async def channel_events(sid, data):
     event_data = data["data"]
     event_type = event_data["type"]
 
-    user = SESSION_POOL.get(sid)
+    user = await SESSION_POOL.get(sid)
 
     if not user:
         return
@@ -452,7 +456,7 @@ async def channel_events(sid, data):
 @sio.on("ydoc:document:join")
 async def ydoc_document_join(sid, data):
     """Handle user joining a document"""
-    user = SESSION_POOL.get(sid)
+    user = await SESSION_POOL.get(sid)
 
     try:
         document_id = data["document_id"]
@@ -488,19 +492,16 @@ async def ydoc_document_join(sid, data):
 
         active_session_ids = get_session_ids_from_room(f"doc_{document_id}")
 
-        # Get the Yjs document state
-        ydoc = Y.Doc()
-        updates = await YDOC_MANAGER.get_updates(document_id)
-        for update in updates:
-            ydoc.apply_update(bytes(update))
-
-        # Encode the entire document state as an update
-        state_update = ydoc.get_update()
+        # Encode the document state the user is missing as an update
+        state_update, state_vector = await YDOC_MANAGER.get_state(
+            document_id, data.get("state_vector")
+        )
         await sio.emit(
             "ydoc:document:state",
             {
                 "document_id": document_id,
                 "state": list(state_update),  # Convert bytes to list for JSON
+                "state_vector": list(state_vector),
                 "sessions": active_session_ids,
             },
             room=sid,
@@ -564,20 +565,17 @@ async def yjs_document_state(sid, data):
             log.warning(f"Document {document_id} not found")
             return
 
-        # Get the Yjs document state
-        ydoc = Y.Doc()
-        updates = await YDOC_MANAGER.get_updates(document_id)
-        for update in updates:
-            ydoc.apply_update(bytes(update))
-
-        # Encode the entire document state as an update
-        state_update = ydoc.get_update()
+        # Encode the document state the user is missing as an update
+        state_update, state_vector = await YDOC_MANAGER.get_state(
+            document_id, data.get("state_vector")
+        )
 
         await sio.emit(
             "ydoc:document:state",
             {
                 "document_id": document_id,
                 "state": list(state_update),  # Convert bytes to list for JSON
+                "state_vector": list(state_vector),
                 "sessions": active_session_ids,
             },
             room=sid,
@@ -622,7 +620,7 @@ async def yjs_document_update(sid, data):
         async def debounced_save():
             await asyncio.sleep(0.5)
             await document_save_handler(
-                document_id, data.get("data", {}), SESSION_POOL.get(sid)
+                document_id, data.get("data", {}), await SESSION_POOL.get(sid)
             )
 
         if data.get("data"):
@@ -687,9 +685,9 @@ async def yjs_awareness_update(sid, data):
 
 @sio.event
 async def disconnect(sid):
-    if sid in SESSION_POOL:
-        user = SESSION_POOL[sid]
-        del SESSION_POOL[sid]
+    user = await SESSION_POOL.get(sid)
+    if user:
+        await SESSION_POOL.delete(sid)
         await YDOC_MANAGER.remove_user_from_all_documents(sid)
     else:
         pass
@@ -717,94 +715,14 @@ def get_event_emitter(request_info, update_db=True):
             and not request_info.get("chat_id", "").startswith("local:")
         ):
 
-            if "type" in event_data and event_data["type"] == "status":
-                Chats.add_message_status_to_chat_by_id_and_message_id(
-                    request_info["chat_id"],
-                    request_info["message_id"],
-                    event_data.get("data", {}),
-                )
-
-            if "type" in event_data and event_data["type"] == "message":
-                message = Chats.get_message_by_id_and_message_id(
-                    request_info["chat_id"],
-                    request_info["message_id"],
-                )
-
-                if message:
-                    content = message.get("content", "")
-                    content += event_data.get("data", {}).get("content", "")
-
-                    Chats.upsert_message_to_chat_by_id_and_message_id(
-                        request_info["chat_id"],
-                        request_info["message_id"],
-                        {
-                            "content": content,
-                        },
-                    )
-
-            if "type" in event_data and event_data["type"] == "replace":
-                content = event_data.get("data", {}).get("content", "")
-
-                Chats.upsert_message_to_chat_by_id_and_message_id(
-                    request_info["chat_id"],
-                    request_info["message_id"],
-                    {
-                        "content": content,
-                    },
-                )
-
-            if "type" in event_data and event_data["type"] == "embeds":
-                message = Chats.get_message_by_id_and_message_id(
-                    request_info["chat_id"],
-                    request_info["message_id"],
-                )
+            event_type = event_data.get("type")
+            data = event_data.get("data", {})
 
-                embeds = event_data.get("data", {}).get("embeds", [])
-                embeds.extend(message.get("embeds", []))
-
-                Chats.upsert_message_to_chat_by_id_and_message_id(
-                    request_info["chat_id"],
-                    request_info["message_id"],
-                    {
-                        "embeds": embeds,
-                    },
-                )
-
-            if "type" in event_data and event_data["type"] == "files":
-                message = Chats.get_message_by_id_and_message_id(
-                    request_info["chat_id"],
-                    request_info["message_id"],
-                )
-
-                files = event_data.get("data", {}).get("files", [])
-                files.extend(message.get("files", []))
-
-                Chats.upsert_message_to_chat_by_id_and_message_id(
-                    request_info["chat_id"],
-                    request_info["message_id"],
-                    {
-                        "files": files,
-                    },
-                )
+            if event_type in ["status", "message", "replace", "embeds", "files"]:
+                await MESSAGE_EVENT_BUFFER.add(chat_id, message_id, event_type, data)
 
-            if event_data.get("type") in ["source", "citation"]:
-                data = event_data.get("data", {})
-                if data.get("type") == None:
-                    message = Chats.get_message_by_id_and_message_id(
-                        request_info["chat_id"],
-                        request_info["message_id"],
-                    )
-
-                    sources = message.get("sources", [])
-                    sources.append(data)
-
-                    Chats.upsert_message_to_chat_by_id_and_message_id(
-                        request_info["chat_id"],
-                        request_info["message_id"],
-                        {
-                            "sources": sources,
-                        },
-                    )
+            if event_type in ["source", "citation"] and data.get("type") == None:
+                await MESSAGE_EVENT_BUFFER.add(chat_id, message_id, "source", data)
 
     if (
         "user_id" in request_info
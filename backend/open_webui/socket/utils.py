@@ -1,9 +1,24 @@
+import asyncio
 import json
+import logging
+import time
 import uuid
+from collections import OrderedDict
 from open_webui.utils.redis import get_redis_connection
 from open_webui.env import REDIS_KEY_PREFIX
-from typing import Optional, List, Tuple
+from typing import Callable, Optional, List, Tuple
 import pycrdt as Y
+from redis.client import NEVER_DECODE
+from opentelemetry import metrics
+
+log = logging.getLogger(__name__)
+
+meter = metrics.get_meter(__name__)
+message_event_flush_histogram = meter.create_histogram(
+    name="webui.chat.message_events.flush.duration",
+    description="Time taken to persist a batch of buffered chat message events",
+    unit="ms",
+)
 
 
 class RedisLock:
@@ -117,45 +132,394 @@ class RedisDict:
         return self[key]
 
 
+class AsyncDict:
+    """
+    In-memory pool with the same async interface as `AsyncRedisDict`, used
+    when websockets are not managed through Redis.
+    """
+
+    def __init__(self):
+        self._data = {}
+
+    async def get(self, key, default=None):
+        return self._data.get(key, default)
+
+    async def get_many(self, keys) -> dict:
+        return {key: self._data[key] for key in keys if key in self._data}
+
+    async def set(self, key, value):
+        self._data[key] = value
+
+    async def delete(self, key):
+        self._data.pop(key, None)
+
+    async def contains(self, key) -> bool:
+        return key in self._data
+
+    async def keys(self) -> list:
+        return list(self._data.keys())
+
+
+class AsyncRedisDict(AsyncDict):
+    """
+    Redis hash accessed through the async client, with a node-local
+    read-through cache. Entries read from Redis are kept for `cache_ttl`
+    seconds, writes and deletes from this node update the cache directly.
+    """
+
+    def __init__(self, name, redis, cache_ttl: float = 30, cache_size: int = 10000):
+        self.name = name
+        self.redis = redis
+        self.cache_ttl = cache_ttl
+        self.cache_size = cache_size
+        self._cache: dict = {}
+
+    def _cache_get(self, key):
+        cached = self._cache.get(key)
+        if cached is None:
+            return None
+        expires_at, value = cached
+        if expires_at < time.monotonic():
+            del self._cache[key]
+            return None
+        return cached
+
+    def _cache_set(self, key, value):
+        if len(self._cache) >= self.cache_size:
+            now = time.monotonic()
+            self._cache = {
+                k: cached for k, cached in self._cache.items() if cached[0] >= now
+            }
+            if len(self._cache) >= self.cache_size:
+                self._cache.clear()
+        self._cache[key] = (time.monotonic() + self.cache_ttl, value)
+
+    async def get(self, key, default=None):
+        cached = self._cache_get(key)
+        if cached is not None:
+            return cached[1]
+
+        value = await self.redis.hget(self.name, key)
+        if value is None:
+            return default
+
+        value = json.loads(value)
+        self._cache_set(key, value)
+        return value
+
+    async def get_many(self, keys) -> dict:
+        result = {}
+        missing = []
+        for key in keys:
+            cached = self._cache_get(key)
+            if cached is not None:
+                result[key] = cached[1]
+            else:
+                missing.append(key)
+
+        if missing:
+            values = await self.redis.hmget(self.name, missing)
+            for key, value in zip(missing, values):
+                if value is not None:
+                    result[key] = json.loads(value)
+                    self._cache_set(key, result[key])
+
+        return result
+
+    async def set(self, key, value):
+        await self.redis.hset(self.name, key, json.dumps(value))
+        self._cache_set(key, value)
+
+    async def delete(self, key):
+        self._cache.pop(key, None)
+        await self.redis.hdel(self.name, key)
+
+    async def contains(self, key) -> bool:
+        return await self.get(key) is not None
+
+    async def keys(self) -> list:
+        return list(await self.redis.hkeys(self.name))
+
+
+class UsagePool:
+    """
+    Tracks which models are in use, as the time each session last reported
+    using a model. Entries older than `timeout` seconds no longer count.
+    """
+
+    def __init__(self, timeout: float = 3):
+        self.timeout = timeout
+        self._data: dict[Tuple[str, str], float] = {}
+
+    async def touch(self, model_id: str, sid: str):
+        self._data[(model_id, sid)] = time.time()
+
+    async def get_model_ids(self) -> List[str]:
+        since = time.time() - self.timeout
+        return list(
+            {
+                model_id
+                for (model_id, _), updated_at in self._data.items()
+                if updated_at >= since
+            }
+        )
+
+    async def remove_expired(self):
+        since = time.time() - self.timeout
+        self._data = {
+            key: updated_at
+            for key, updated_at in self._data.items()
+            if updated_at >= since
+        }
+
+
+class RedisUsagePool(UsagePool):
+    """
+    Usage pool stored as a Redis sorted set of (model id, session id) pairs
+    scored by the time they were last reported, so reporting usage is a
+    single ZADD and expired entries are dropped with one range delete.
+    """
+
+    def __init__(self, name, redis, timeout: float = 3):
+        super().__init__(timeout)
+        self.name = name
+        self.redis = redis
+
+    async def touch(self, model_id: str, sid: str):
+        await self.redis.zadd(self.name, {json.dumps([model_id, sid]): time.time()})
+
+    async def get_model_ids(self) -> List[str]:
+        members = await self.redis.zrangebyscore(
+            self.name, time.time() - self.timeout, "+inf"
+        )
+        return list({json.loads(member)[0] for member in members})
+
+    async def remove_expired(self):
+        await self.redis.zremrangebyscore(
+            self.name, "-inf", f"({time.time() - self.timeout}"
+        )
+
+
+# Yjs updates are stored in Redis as raw bytes behind this marker, entries
+# without it are JSON int arrays written by older versions.
+YDOC_UPDATE_PREFIX = b"\x00"
+
+
+def encode_ydoc_update(update) -> bytes:
+    return YDOC_UPDATE_PREFIX + bytes(update)
+
+
+def decode_ydoc_update(value) -> bytes:
+    if isinstance(value, str):
+        return bytes(json.loads(value))
+    if value[:1] == YDOC_UPDATE_PREFIX:
+        return bytes(value[1:])
+    return bytes(json.loads(value))
+
+
+class YdocCacheEntry:
+    def __init__(self, version: str, ydoc: Y.Doc, length: int = 0):
+        self.version = version
+        self.ydoc = ydoc
+        # Number of entries of the Redis update list already applied to ydoc
+        self.length = length
+
+
 class YdocManager:
+    """
+    Stores collaborative Yjs documents.
+
+    Without Redis each document is a single in-memory `Y.Doc`. With Redis the
+    updates are appended to a list that is periodically compacted: once it
+    holds `compaction_threshold` entries they are merged into one snapshot
+    update and only the tail written since is kept. Every node caches up to
+    `cache_size` documents as `Y.Doc`s and only applies the entries appended
+    since its last read. The `:version` key changes whenever the list is
+    compacted or cleared, which invalidates those caches.
+
+    The documents each session joined are indexed under
+    `redis_session_key_prefix`, so a disconnect only touches those documents.
+    """
+
     def __init__(
         self,
         redis=None,
         redis_key_prefix: str = f"{REDIS_KEY_PREFIX}:ydoc:documents",
+        redis_session_key_prefix: str = f"{REDIS_KEY_PREFIX}:ydoc:sessions",
+        compaction_threshold: int = 500,
+        cache_size: int = 128,
     ):
-        self._updates = {}
+        self._ydocs: dict[str, Y.Doc] = {}
         self._users = {}
+        self._sessions: dict[str, set[str]] = {}
         self._redis = redis
         self._redis_key_prefix = redis_key_prefix
+        self._redis_session_key_prefix = redis_session_key_prefix
+        self._compaction_threshold = compaction_threshold
+        self._cache_size = cache_size
+        self._cache: OrderedDict[str, YdocCacheEntry] = OrderedDict()
+        self._compaction_tasks: set[asyncio.Task] = set()
+
+    def _get_redis_key(self, document_id: str, name: str) -> str:
+        return f"{self._redis_key_prefix}:{document_id}:{name}"
+
+    async def _get_version(self, document_id: str) -> Optional[str]:
+        version = await self._redis.get(self._get_redis_key(document_id, "version"))
+        if isinstance(version, bytes):
+            version = version.decode()
+        return version
+
+    async def _get_raw_updates(self, document_id: str, start: int = 0) -> list:
+        # Read the list undecoded, the shared connection decodes responses
+        return await self._redis.execute_command(
+            "LRANGE",
+            self._get_redis_key(document_id, "updates"),
+            start,
+            -1,
+            **{NEVER_DECODE: True},
+        )
+
+    def _cache_put(self, document_id: str, entry: YdocCacheEntry):
+        self._cache[document_id] = entry
+        self._cache.move_to_end(document_id)
+        while len(self._cache) > self._cache_size:
+            self._cache.popitem(last=False)
+
+    async def _load_ydoc(self, document_id: str) -> Tuple[Y.Doc, int]:
+        version = await self._get_version(document_id)
+        cacheable = version is not None and not version.endswith(":compacting")
+
+        entry = self._cache.get(document_id)
+        if entry is None or not cacheable or entry.version != version:
+            entry = YdocCacheEntry(version, Y.Doc())
+
+        start = entry.length
+        updates = await self._get_raw_updates(document_id, start)
+
+        if cacheable and await self._get_version(document_id) == version:
+            for update in updates:
+                entry.ydoc.apply_update(decode_ydoc_update(update))
+            entry.length = max(entry.length, start + len(updates))
+            self._cache_put(document_id, entry)
+            return entry.ydoc, entry.length
+
+        # The list was compacted or cleared while reading, rebuild without caching
+        self._cache.pop(document_id, None)
+        ydoc = Y.Doc()
+        updates = await self._get_raw_updates(document_id)
+        for update in updates:
+            ydoc.apply_update(decode_ydoc_update(update))
+        return ydoc, len(updates)
 
     async def append_to_updates(self, document_id: str, update: bytes):
         document_id = document_id.replace(":", "_")
         if self._redis:
-            redis_key = f"{self._redis_key_prefix}:{document_id}:updates"
-            await self._redis.rpush(redis_key, json.dumps(list(update)))
+            pipe = self._redis.pipeline(transaction=False)
+            pipe.rpush(
+                self._get_redis_key(document_id, "updates"),
+                encode_ydoc_update(update),
+            )
+            pipe.set(
+                self._get_redis_key(document_id, "version"),
+                uuid.uuid4().hex,
+                nx=True,
+            )
+            length, _ = await pipe.execute()
+
+            if length >= self._compaction_threshold:
+                task = asyncio.create_task(self.compact(document_id))
+                self._compaction_tasks.add(task)
+                task.add_done_callback(self._compaction_tasks.discard)
         else:
-            if document_id not in self._updates:
-                self._updates[document_id] = []
-            self._updates[document_id].append(update)
+            if document_id not in self._ydocs:
+                self._ydocs[document_id] = Y.Doc()
+            self._ydocs[document_id].apply_update(bytes(update))
+
+    async def compact(self, document_id: str):
+        """Merge the stored updates of a document into a single snapshot update."""
+        document_id = document_id.replace(":", "_")
+        if not self._redis:
+            return
+
+        lock_key = self._get_redis_key(document_id, "compaction")
+        lock_id = str(uuid.uuid4())
+        if not await self._redis.set(lock_key, lock_id, nx=True, ex=60):
+            return
+
+        try:
+            ydoc, length = await self._load_ydoc(document_id)
+            if length < 2:
+                return
+
+            updates_key = self._get_redis_key(document_id, "updates")
+            version_key = self._get_redis_key(document_id, "version")
+            version = uuid.uuid4().hex
+
+            # Replace the last merged entry with the snapshot before trimming
+            # the ones before it, so readers never see a partial document.
+            await self._redis.set(version_key, f"{version}:compacting", xx=True)
+            await self._redis.lset(
+                updates_key, length - 1, encode_ydoc_update(ydoc.get_update())
+            )
+            await self._redis.ltrim(updates_key, length - 1, -1)
+            if await self._redis.set(version_key, version, xx=True):
+                self._cache_put(document_id, YdocCacheEntry(version, ydoc, 1))
+
+            log.debug(f"Compacted {length} updates of document {document_id}")
+        except Exception as e:
+            log.warning(f"Failed to compact document {document_id}: {e}")
+        finally:
+            if await self._redis.get(lock_key) == lock_id:
+                await self._redis.delete(lock_key)
+
+    async def get_ydoc(self, document_id: str) -> Y.Doc:
+        document_id = document_id.replace(":", "_")
+
+        if self._redis:
+            ydoc, _ = await self._load_ydoc(document_id)
+            return ydoc
+        else:
+            if document_id not in self._ydocs:
+                return Y.Doc()
+            return self._ydocs[document_id]
+
+    async def get_state(
+        self, document_id: str, state_vector: Optional[bytes] = None
+    ) -> Tuple[bytes, bytes]:
+        """
+        Encode the document as a single update, along with its state vector.
+        Given the state vector of a client, the update only holds the changes
+        that client is missing.
+        """
+        ydoc = await self.get_ydoc(document_id)
+
+        if state_vector:
+            try:
+                return ydoc.get_update(bytes(state_vector)), ydoc.get_state()
+            except Exception as e:
+                log.debug(f"Invalid state vector for document {document_id}: {e}")
+
+        return ydoc.get_update(), ydoc.get_state()
 
     async def get_updates(self, document_id: str) -> List[bytes]:
         document_id = document_id.replace(":", "_")
 
         if self._redis:
-            redis_key = f"{self._redis_key_prefix}:{document_id}:updates"
-            updates = await self._redis.lrange(redis_key, 0, -1)
-            return [bytes(json.loads(update)) for update in updates]
+            updates = await self._get_raw_updates(document_id)
+            return [decode_ydoc_update(update) for update in updates]
         else:
-            return self._updates.get(document_id, [])
+            if document_id not in self._ydocs:
+                return []
+            return [self._ydocs[document_id].get_update()]
 
     async def document_exists(self, document_id: str) -> bool:
         document_id = document_id.replace(":", "_")
 
         if self._redis:
-            redis_key = f"{self._redis_key_prefix}:{document_id}:updates"
+            redis_key = self._get_redis_key(document_id, "updates")
             return await self._redis.exists(redis_key) > 0
         else:
-            return document_id in self._updates
+            return document_id in self._ydocs
 
     async def get_users(self, document_id: str) -> List[str]:
         document_id = document_id.replace(":", "_")
@@ -171,57 +535,309 @@ class YdocManager:
         document_id = document_id.replace(":", "_")
 
         if self._redis:
-            redis_key = f"{self._redis_key_prefix}:{document_id}:users"
-            await self._redis.sadd(redis_key, user_id)
+            pipe = self._redis.pipeline(transaction=False)
+            pipe.sadd(self._get_redis_key(document_id, "users"), user_id)
+            pipe.sadd(f"{self._redis_session_key_prefix}:{user_id}", document_id)
+            await pipe.execute()
         else:
             if document_id not in self._users:
                 self._users[document_id] = set()
             self._users[document_id].add(user_id)
+            self._sessions.setdefault(user_id, set()).add(document_id)
 
     async def remove_user(self, document_id: str, user_id: str):
         document_id = document_id.replace(":", "_")
 
         if self._redis:
-            redis_key = f"{self._redis_key_prefix}:{document_id}:users"
-            await self._redis.srem(redis_key, user_id)
+            pipe = self._redis.pipeline(transaction=False)
+            pipe.srem(self._get_redis_key(document_id, "users"), user_id)
+            pipe.srem(f"{self._redis_session_key_prefix}:{user_id}", document_id)
+            await pipe.execute()
         else:
             if document_id in self._users and user_id in self._users[document_id]:
                 self._users[document_id].remove(user_id)
+            if user_id in self._sessions:
+                self._sessions[user_id].discard(document_id)
+                if not self._sessions[user_id]:
+                    del self._sessions[user_id]
 
     async def remove_user_from_all_documents(self, user_id: str):
+        """
+        Remove a session from the documents it joined, looked up through the
+        per-session index kept by `add_user`, and clear the documents it was
+        the last user of.
+        """
         if self._redis:
-            keys = []
-            async for key in self._redis.scan_iter(
-                match=f"{self._redis_key_prefix}:*", count=100
-            ):
-                keys.append(key)
-            for key in keys:
-                if key.endswith(":users"):
-                    await self._redis.srem(key, user_id)
-
-                    document_id = key.split(":")[-2]
-                    if len(await self.get_users(document_id)) == 0:
-                        await self.clear_document(document_id)
+            session_key = f"{self._redis_session_key_prefix}:{user_id}"
+            document_ids = list(await self._redis.smembers(session_key))
+
+            pipe = self._redis.pipeline(transaction=False)
+            for document_id in document_ids:
+                users_key = self._get_redis_key(document_id, "users")
+                pipe.srem(users_key, user_id)
+                pipe.scard(users_key)
+            pipe.delete(session_key)
+            results = await pipe.execute()
+
+            await self.clear_documents(
+                [
+                    document_id
+                    for document_id, remaining in zip(document_ids, results[1::2])
+                    if remaining == 0
+                ]
+            )
 
         else:
-            for document_id in list(self._users.keys()):
-                if user_id in self._users[document_id]:
+            for document_id in self._sessions.pop(user_id, set()):
+                if user_id in self._users.get(document_id, set()):
                     self._users[document_id].remove(user_id)
                     if not self._users[document_id]:
                         del self._users[document_id]
 
                         await self.clear_document(document_id)
 
-    async def clear_document(self, document_id: str):
-        document_id = document_id.replace(":", "_")
+    async def clear_documents(self, document_ids: List[str]):
+        document_ids = [document_id.replace(":", "_") for document_id in document_ids]
 
         if self._redis:
-            redis_key = f"{self._redis_key_prefix}:{document_id}:updates"
-            await self._redis.delete(redis_key)
-            redis_users_key = f"{self._redis_key_prefix}:{document_id}:users"
-            await self._redis.delete(redis_users_key)
+            if not document_ids:
+                return
+
+            pipe = self._redis.pipeline(transaction=False)
+            for document_id in document_ids:
+                for name in ("updates", "users", "version"):
+                    pipe.delete(self._get_redis_key(document_id, name))
+                self._cache.pop(document_id, None)
+            await pipe.execute()
         else:
-            if document_id in self._updates:
-                del self._updates[document_id]
-            if document_id in self._users:
-                del self._users[document_id]
+            for document_id in document_ids:
+                if document_id in self._ydocs:
+                    del self._ydocs[document_id]
+                if document_id in self._users:
+                    del self._users[document_id]
+
+    async def clear_document(self, document_id: str):
+        await self.clear_documents([document_id])
+
+
+class MessageEventBuffer:
+    """
+    Write-behind buffer for chat message events.
+
+    Events for the same (chat_id, message_id) are coalesced in memory and
+    handed to `flush_fn` in a worker thread once `interval` seconds have
+    passed, once `max_size` characters are buffered, or when `flush` is
+    awaited explicitly (e.g. on completion or shutdown).
+    """
+
+    def __init__(
+        self,
+        flush_fn: Callable[[str, str, dict], None],
+        interval: float = 1.0,
+        max_size: int = 16384,
+    ):
+        self.flush_fn = flush_fn
+        self.interval = interval
+        self.max_size = max_size
+
+        self._pending: dict[Tuple[str, str], dict] = {}
+        self._timers: dict[Tuple[str, str], asyncio.Task] = {}
+        self._locks: dict[Tuple[str, str], asyncio.Lock] = {}
+        self._lock_refs: dict[Tuple[str, str], int] = {}
+
+    def _get_pending(self, key: Tuple[str, str]) -> dict:
+        if key not in self._pending:
+            self._pending[key] = {
+                "content": "",
+                "replace": None,
+                "status": [],
+                "embeds": [],
+                "files": [],
+                "sources": [],
+                "size": 0,
+            }
+        return self._pending[key]
+
+    async def add(self, chat_id: str, message_id: str, event_type: str, data: dict):
+        key = (chat_id, message_id)
+        pending = self._get_pending(key)
+
+        if event_type == "message":
+            content = data.get("content", "")
+            pending["content"] += content
+            pending["size"] += len(content)
+        elif event_type == "replace":
+            pending["replace"] = data.get("content", "")
+            pending["content"] = ""
+            pending["size"] += len(pending["replace"])
+        elif event_type == "status":
+            pending["status"].append(data)
+            pending["size"] += 1
+        elif event_type in ("embeds", "files"):
+            items = data.get(event_type, [])
+            # Newer items go first, matching the unbuffered behaviour
+            pending[event_type] = items + pending[event_type]
+            pending["size"] += len(items)
+        elif event_type == "source":
+            pending["sources"].append(data)
+            pending["size"] += 1
+
+        if self.interval <= 0 or pending["size"] >= self.max_size:
+            await self.flush(chat_id, message_id)
+        elif key not in self._timers:
+            self._timers[key] = asyncio.create_task(self._flush_later(key))
+
+    async def _flush_later(self, key: Tuple[str, str]):
+        try:
+            await asyncio.sleep(self.interval)
+        except asyncio.CancelledError:
+            return
+
+        self._timers.pop(key, None)
+        await self.flush(*key)
+
+    async def flush(self, chat_id: str, message_id: str):
+        key = (chat_id, message_id)
+
+        timer = self._timers.pop(key, None)
+        if timer is not None and timer is not asyncio.current_task():
+            timer.cancel()
+
+        if key not in self._pending and key not in self._locks:
+            return
+
+        # Flushes for the same message must not interleave their read-modify-write
+        lock = self._locks.setdefault(key, asyncio.Lock())
+        self._lock_refs[key] = self._lock_refs.get(key, 0) + 1
+        try:
+            async with lock:
+                pending = self._pending.pop(key, None)
+                if pending is None:
+                    return
+
+                start_time = time.perf_counter()
+                try:
+                    await asyncio.to_thread(self.flush_fn, chat_id, message_id, pending)
+                except Exception as e:
+                    log.exception(
+                        f"Error flushing events for chat {chat_id} message {message_id}: {e}"
+                    )
+                finally:
+                    message_event_flush_histogram.record(
+                        (time.perf_counter() - start_time) * 1000.0
+                    )
+        finally:
+            self._lock_refs[key] -= 1
+            if self._lock_refs[key] == 0:
+                del self._lock_refs[key]
+                del self._locks[key]
+
+    async def flush_all(self):
+        await asyncio.gather(
+            *[
+                self.flush(chat_id, message_id)
+                for chat_id, message_id in list(self._pending)
+            ]
+        )
+
+
+class FileStatusEvents:
+    """
+    Fan-out of file processing status changes to the subscribers of this
+    process (the /files/{id}/process/status streams).
+
+    Without Redis, changes are delivered in-process. With Redis they are
+    published on `channel`, and every process subscribed to the channel
+    delivers them to its own subscribers. `publish` may be called from any
+    thread; subscribers live on the event loop passed to `start`.
+    """
+
+    def __init__(
+        self,
+        channel: str = f"{REDIS_KEY_PREFIX}:file_status",
+        redis_url: Optional[str] = None,
+        redis_sentinels=[],
+        redis_cluster=False,
+    ):
+        self.channel = channel
+        self.redis = None
+        self.async_redis = None
+        if redis_url:
+            self.redis = get_redis_connection(
+                redis_url,
+                redis_sentinels,
+                redis_cluster=redis_cluster,
+                decode_responses=True,
+            )
+            self.async_redis = get_redis_connection(
+                redis_url,
+                redis_sentinels,
+                redis_cluster=redis_cluster,
+                async_mode=True,
+                decode_responses=True,
+            )
+
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self._listener: Optional[asyncio.Task] = None
+        self._subscribers: dict[str, set[asyncio.Queue]] = {}
+
+    def start(self):
+        """Bind to the running event loop and listen for remote events."""
+        self.loop = asyncio.get_running_loop()
+        if self.async_redis is not None and (
+            self._listener is None or self._listener.done()
+        ):
+            self._listener = asyncio.create_task(self._listen())
+
+    def subscribe(self, file_id: str) -> asyncio.Queue:
+        if self.loop is None:
+            self.loop = asyncio.get_running_loop()
+
+        queue = asyncio.Queue()
+        self._subscribers.setdefault(file_id, set()).add(queue)
+        return queue
+
+    def unsubscribe(self, file_id: str, queue: asyncio.Queue):
+        queues = self._subscribers.get(file_id)
+        if queues is not None:
+            queues.discard(queue)
+            if not queues:
+                del self._subscribers[file_id]
+
+    def _deliver(self, file_id: str, event: dict):
+        for queue in self._subscribers.get(file_id, ()):
+            queue.put_nowait(event)
+
+    def publish(self, file_id: str, event: dict):
+        if self.redis is not None:
+            try:
+                self.redis.publish(
+                    self.channel, json.dumps({"file_id": file_id, "event": event})
+                )
+                return
+            except Exception as e:
+                log.warning(f"Failed to publish file status to Redis: {e}")
+
+        if self.loop is not None and not self.loop.is_closed():
+            self.loop.call_soon_threadsafe(self._deliver, file_id, event)
+
+    async def _listen(self):
+        while True:
+            pubsub = self.async_redis.pubsub()
+            try:
+                await pubsub.subscribe(self.channel)
+                async for message in pubsub.listen():
+                    if message.get("type") != "message":
+                        continue
+                    data = json.loads(message["data"])
+                    self._deliver(data["file_id"], data["event"])
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                log.warning(f"File status subscription lost, reconnecting: {e}")
+                await asyncio.sleep(1)
+            finally:
+                try:
+                    await pubsub.aclose()
+                except Exception:
+                    pass
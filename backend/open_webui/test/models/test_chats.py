@@ -0,0 +1,157 @@
+import json
+import uuid
+
+import pytest
+
+from open_webui.internal.db import Base, engine, get_db
+from open_webui.models.chats import Chat, ChatFile, ChatForm, ChatMessage, Chats
+from open_webui.routers import chats as chats_router
+
+
+@pytest.fixture(autouse=True)
+def setup_db():
+    Base.metadata.create_all(
+        engine, tables=[Chat.__table__, ChatFile.__table__, ChatMessage.__table__]
+    )
+
+
+@pytest.fixture
+def user_id():
+    return str(uuid.uuid4())
+
+
+def insert_chats(user_id, count, created_at=1000):
+    ids = []
+    for i in range(count):
+        chat = Chats.insert_new_chat(user_id, ChatForm(chat={"title": f"Chat {i}"}))
+        ids.append(chat.id)
+
+    # Several chats per timestamp, pages have to break ties on id
+    with get_db() as db:
+        for i, id in enumerate(ids):
+            db.query(Chat).filter_by(id=id).update(
+                {"created_at": created_at + i // 3, "updated_at": created_at + i // 3}
+            )
+        db.commit()
+    return ids
+
+
+def touch_chat(id, updated_at):
+    with get_db() as db:
+        db.query(Chat).filter_by(id=id).update({"updated_at": updated_at})
+        db.commit()
+
+
+class TestGetChatsByCursor:
+    def test_pages_cover_every_chat_once(self, user_id):
+        ids = insert_chats(user_id, 10)
+
+        exported, cursor = [], None
+        while chats := Chats.get_chats_by_cursor(user_id, cursor=cursor, limit=4):
+            exported += [chat.id for chat in chats]
+            cursor = (chats[-1].created_at, chats[-1].id)
+
+        assert sorted(exported) == sorted(ids)
+        created_at = [Chats.get_chat_by_id(id).created_at for id in exported]
+        assert created_at == sorted(created_at, reverse=True)
+
+    def test_chat_updated_during_export_is_not_skipped(self, user_id):
+        ids = insert_chats(user_id, 10)
+
+        first = Chats.get_chats_by_cursor(user_id, limit=4)
+        exported = [chat.id for chat in first]
+        cursor = (first[-1].created_at, first[-1].id)
+
+        # Updating an unexported chat used to move it ahead of the cursor
+        remaining = [id for id in ids if id not in exported]
+        touch_chat(remaining[0], 9999)
+
+        while chats := Chats.get_chats_by_cursor(user_id, cursor=cursor, limit=4):
+            exported += [chat.id for chat in chats]
+            cursor = (chats[-1].created_at, chats[-1].id)
+
+        assert sorted(exported) == sorted(ids)
+
+    def test_direction_and_updated_at_filter(self, user_id):
+        ids = insert_chats(user_id, 6)
+
+        chats = Chats.get_chats_by_cursor(
+            user_id, filter={"updated_at": 1000, "direction": "asc"}
+        )
+
+        assert sorted(chat.id for chat in chats) == sorted(ids[3:])
+        assert [(chat.created_at, chat.id) for chat in chats] == sorted(
+            (chat.created_at, chat.id) for chat in chats
+        )
+
+    def test_json_export(self, user_id, monkeypatch):
+        monkeypatch.setattr(chats_router, "CHAT_EXPORT_BATCH_SIZE", 2)
+        ids = insert_chats(user_id, 5)
+
+        exported = json.loads(
+            "".join(chats_router.generate_chats_json_generator(user_id))
+        )
+
+        assert sorted(chat["id"] for chat in exported) == sorted(ids)
+
+
+def insert_chat_with_reply(user_id):
+    chat = Chats.insert_new_chat(
+        user_id,
+        ChatForm(
+            chat={
+                "title": "Chat",
+                "history": {
+                    "currentId": "user",
+                    "messages": {
+                        "user": {"id": "user", "role": "user", "content": "Hi"}
+                    },
+                },
+            }
+        ),
+    )
+    Chats.upsert_message_to_chat_by_id_and_message_id(
+        chat.id, "reply", {"role": "assistant", "parentId": "user", "content": "Hello"}
+    )
+    return chat
+
+
+class TestChatMessages:
+    def test_status_write_keeps_current_id(self, user_id):
+        chat = insert_chat_with_reply(user_id)
+        Chats.add_message_status_to_chat_by_id_and_message_id(
+            chat.id, "reply", {"action": "web_search"}
+        )
+
+        history = Chats.get_chat_by_id(chat.id).chat["history"]
+        # Only a completed response makes the reply current
+        assert history["currentId"] == "user"
+        assert history["messages"]["reply"]["content"] == "Hello"
+        assert history["messages"]["reply"]["statusHistory"] == [
+            {"action": "web_search"}
+        ]
+
+    def test_list_readers_overlay_rows(self, user_id):
+        chat = insert_chat_with_reply(user_id)
+
+        readers = [
+            Chats.get_chats_by_user_id(user_id).items,
+            Chats.get_chats_by_cursor(user_id),
+            Chats.get_chats_by_user_id_and_search_text(user_id, "Chat"),
+        ]
+        for chats in readers:
+            [item] = [item for item in chats if item.id == chat.id]
+            messages = item.chat["history"]["messages"]
+            assert messages["reply"]["content"] == "Hello"
+
+    def test_compact_folds_rows_and_sets_current_id(self, user_id):
+        chat = insert_chat_with_reply(user_id)
+
+        Chats.compact_chat_messages_by_id(chat.id, message_id="reply")
+
+        with get_db() as db:
+            assert db.query(ChatMessage).filter_by(chat_id=chat.id).count() == 0
+            history = db.get(Chat, chat.id).chat["history"]
+        assert history["currentId"] == "reply"
+        assert history["messages"]["reply"]["content"] == "Hello"
+        assert history["messages"]["user"]["content"] == "Hi"
@@ -0,0 +1,174 @@
+import uuid
+
+import pytest
+from sqlalchemy import event
+
+from open_webui.internal.db import Base, engine, get_db
+from open_webui.models.channels import (
+    ChannelMember,
+    Channels,
+    ChannelWebhook,
+    ChannelWebhookForm,
+)
+from open_webui.models.messages import Message, MessageForm, MessageReaction, Messages
+from open_webui.models.users import User, Users
+
+
+@pytest.fixture(autouse=True)
+def setup_db():
+    Base.metadata.create_all(
+        engine,
+        tables=[
+            User.__table__,
+            ChannelMember.__table__,
+            ChannelWebhook.__table__,
+            Message.__table__,
+            MessageReaction.__table__,
+        ],
+    )
+
+
+@pytest.fixture
+def channel_id():
+    return str(uuid.uuid4())
+
+
+def insert_user(name="User"):
+    id = str(uuid.uuid4())
+    return Users.insert_new_user(id, name, f"{id}@example.com", role="user")
+
+
+def insert_message(channel_id, user_id, content="Hi", **kwargs):
+    return Messages.insert_new_message(
+        MessageForm(content=content, **kwargs), channel_id, user_id
+    )
+
+
+def get_messages(ids):
+    with get_db() as db:
+        messages = {
+            message.id: message
+            for message in db.query(Message).filter(Message.id.in_(ids)).all()
+        }
+        return Messages.get_message_responses([messages[id] for id in ids], db=db)
+
+
+class QueryCounter:
+    def __init__(self):
+        self.count = 0
+
+    def __enter__(self):
+        event.listen(engine, "before_cursor_execute", self.on_execute)
+        return self
+
+    def __exit__(self, *args):
+        event.remove(engine, "before_cursor_execute", self.on_execute)
+
+    def on_execute(self, *args):
+        self.count += 1
+
+
+class TestReplyStats:
+    def test_replies_update_parent(self, channel_id):
+        user = insert_user()
+        parent = insert_message(channel_id, user.id)
+
+        first = insert_message(channel_id, user.id, parent_id=parent.id)
+        second = insert_message(channel_id, user.id, parent_id=parent.id)
+
+        parent = Messages.get_message_by_id(parent.id)
+        assert parent.reply_count == 2
+        assert parent.latest_reply_at == second.created_at
+        assert first.created_at <= second.created_at
+
+    def test_deleting_a_reply_recounts_parent(self, channel_id):
+        user = insert_user()
+        parent = insert_message(channel_id, user.id)
+        first = insert_message(channel_id, user.id, parent_id=parent.id)
+        second = insert_message(channel_id, user.id, parent_id=parent.id)
+
+        Messages.delete_message_by_id(second.id)
+
+        parent = Messages.get_message_by_id(parent.id)
+        assert parent.reply_count == 1
+        assert parent.latest_reply_at == first.created_at
+
+    def test_deleting_replies_resets_parent(self, channel_id):
+        user = insert_user()
+        parent = insert_message(channel_id, user.id)
+        insert_message(channel_id, user.id, parent_id=parent.id)
+
+        Messages.delete_replies_by_id(parent.id)
+
+        parent = Messages.get_message_by_id(parent.id)
+        assert parent.reply_count == 0
+        assert parent.latest_reply_at is None
+
+
+class TestGetMessageResponses:
+    def test_builds_responses(self, channel_id):
+        user = insert_user("Alice")
+        other_user = insert_user("Bob")
+        webhook = Channels.insert_webhook(
+            channel_id, user.id, ChannelWebhookForm(name="CI")
+        )
+
+        message = insert_message(channel_id, user.id, content="Question")
+        insert_message(channel_id, other_user.id, parent_id=message.id)
+        reply = insert_message(
+            channel_id, other_user.id, content="Answer", reply_to_id=message.id
+        )
+        webhook_message = insert_message(
+            channel_id,
+            user.id,
+            meta={"webhook": {"id": webhook.id}},
+        )
+        Messages.add_reaction_to_message(message.id, user.id, "+1")
+        Messages.add_reaction_to_message(message.id, other_user.id, "+1")
+
+        responses = get_messages([message.id, reply.id, webhook_message.id])
+
+        assert [response.id for response in responses] == [
+            message.id,
+            reply.id,
+            webhook_message.id,
+        ]
+        assert responses[0].user.name == "Alice"
+        assert responses[0].reply_count == 1
+        assert [(r.name, r.count) for r in responses[0].reactions] == [("+1", 2)]
+        assert responses[1].user.name == "Bob"
+        assert responses[1].reply_to_message.content == "Question"
+        assert responses[1].reply_to_message.user.name == "Alice"
+        assert responses[1].reactions == []
+        assert responses[2].user.name == "CI"
+
+    def test_deleted_webhook(self, channel_id):
+        user = insert_user()
+        message = insert_message(
+            channel_id, user.id, meta={"webhook": {"id": "deleted"}}
+        )
+
+        [response] = get_messages([message.id])
+
+        assert response.user.name == "Deleted Webhook"
+
+    def test_query_count_does_not_grow_with_page_size(self, channel_id):
+        def count_queries(message_count):
+            user = insert_user()
+            parent = insert_message(channel_id, user.id)
+            ids = []
+            for _ in range(message_count):
+                message = insert_message(
+                    channel_id, insert_user().id, reply_to_id=parent.id
+                )
+                Messages.add_reaction_to_message(message.id, user.id, "+1")
+                ids.append(message.id)
+
+            with get_db() as db:
+                messages = db.query(Message).filter(Message.id.in_(ids)).all()
+                with QueryCounter() as counter:
+                    Messages.get_message_responses(messages, db=db)
+            return counter.count
+
+        small, large = count_queries(2), count_queries(10)
+        assert 0 < small == large
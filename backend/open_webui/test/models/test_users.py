@@ -0,0 +1,100 @@
+import uuid
+
+import pytest
+
+from open_webui.internal.db import Base, engine
+from open_webui.models import users as users_module
+from open_webui.models.users import ApiKey, User, Users
+
+
+@pytest.fixture(autouse=True)
+def setup_db(monkeypatch):
+    Base.metadata.create_all(engine, tables=[User.__table__, ApiKey.__table__])
+    monkeypatch.setattr(users_module, "AUTH_USER_CACHE_TTL", 30)
+
+
+@pytest.fixture
+def user():
+    id = str(uuid.uuid4())
+    return Users.insert_new_user(id, "User", f"{id}@example.com", role="user")
+
+
+@pytest.fixture
+def reads(monkeypatch):
+    """Count the user lookups that reach the database."""
+    reads = []
+    get_user_by_id = Users.get_user_by_id
+    get_user_by_api_key = Users.get_user_by_api_key
+
+    def counted_get_user_by_id(id, db=None):
+        reads.append(id)
+        return get_user_by_id(id, db=db)
+
+    def counted_get_user_by_api_key(api_key, db=None):
+        reads.append(api_key)
+        return get_user_by_api_key(api_key, db=db)
+
+    monkeypatch.setattr(Users, "get_user_by_id", counted_get_user_by_id)
+    monkeypatch.setattr(Users, "get_user_by_api_key", counted_get_user_by_api_key)
+    return reads
+
+
+class TestCachedUsers:
+    def test_user_is_read_once(self, user, reads):
+        for _ in range(3):
+            assert Users.get_cached_user_by_id(user.id).id == user.id
+
+        assert reads == [user.id]
+
+    def test_missing_user_is_not_cached(self, reads):
+        assert Users.get_cached_user_by_id("missing") is None
+        assert Users.get_cached_user_by_id("missing") is None
+
+        assert reads == ["missing", "missing"]
+
+    def test_updates_invalidate_the_cache(self, user, reads):
+        Users.get_cached_user_by_id(user.id)
+
+        Users.update_user_role_by_id(user.id, "admin")
+
+        assert Users.get_cached_user_by_id(user.id).role == "admin"
+        assert reads == [user.id, user.id]
+
+    def test_cache_can_be_disabled(self, user, reads, monkeypatch):
+        monkeypatch.setattr(users_module, "AUTH_USER_CACHE_TTL", 0)
+
+        Users.get_cached_user_by_id(user.id)
+        Users.get_cached_user_by_id(user.id)
+
+        assert reads == [user.id, user.id]
+
+    def test_api_key(self, user, reads):
+        api_key = f"sk-{uuid.uuid4().hex}"
+        Users.update_user_api_key_by_id(user.id, api_key)
+
+        assert Users.get_cached_user_by_api_key(api_key).id == user.id
+        assert Users.get_cached_user_by_api_key(api_key).id == user.id
+        assert reads == [api_key]
+
+        # A replaced key stops authenticating at once
+        Users.update_user_api_key_by_id(user.id, f"sk-{uuid.uuid4().hex}")
+        assert Users.get_cached_user_by_api_key(api_key) is None
+
+
+class TestLastActive:
+    def test_flush_writes_pending_timestamps(self, user, monkeypatch):
+        other_user = Users.insert_new_user(
+            str(uuid.uuid4()), "Other", f"{uuid.uuid4()}@example.com"
+        )
+        monkeypatch.setattr(users_module.time, "time", lambda: 2_000_000_000)
+
+        Users.mark_user_active_by_id(user.id)
+        Users.mark_user_active_by_id(other_user.id)
+        Users.mark_user_active_by_id(user.id)
+        # Nothing is written until the flush
+        assert Users.get_user_by_id(user.id).last_active_at != 2_000_000_000
+
+        assert Users.flush_last_active() == 2
+        assert Users.get_user_by_id(user.id).last_active_at == 2_000_000_000
+        assert Users.get_user_by_id(other_user.id).last_active_at == 2_000_000_000
+        assert Users.flush_last_active() == 0
@@ -0,0 +1,191 @@
+import importlib
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from open_webui.retrieval.vector import factory
+from open_webui.retrieval.vector.main import ThreadedAsyncVectorDB
+from open_webui.retrieval.vector.type import VectorType
+
+ITEMS = [{"id": "id", "text": "text", "vector": [1.0, 0.0], "metadata": {}}]
+
+
+@pytest.fixture
+def executor():
+    executor = ThreadPoolExecutor(max_workers=1)
+    yield executor
+    executor.shutdown()
+
+
+def import_backend(library, module_name):
+    pytest.importorskip(library)
+    return importlib.import_module(f"open_webui.retrieval.vector.dbs.{module_name}")
+
+
+def create_async_client(async_client_class, executor, **attributes):
+    """The backend's async client over a mocked sync client and native client."""
+    client = MagicMock(**attributes)
+    async_db = async_client_class(client, executor)
+    async_db._async_client = AsyncMock()
+    return async_db, client
+
+
+class TestGetAsyncVector:
+    @pytest.mark.parametrize(
+        "vector_type, library, module_name, class_name",
+        [
+            (VectorType.QDRANT, "qdrant_client", "qdrant", "AsyncQdrantClient"),
+            (VectorType.MILVUS, "pymilvus", "milvus", "AsyncMilvusClient"),
+            (
+                VectorType.ELASTICSEARCH,
+                "elasticsearch",
+                "elasticsearch",
+                "AsyncElasticsearchClient",
+            ),
+            (
+                VectorType.OPENSEARCH,
+                "opensearchpy",
+                "opensearch",
+                "AsyncOpenSearchClient",
+            ),
+        ],
+    )
+    def test_native_async_clients(
+        self, monkeypatch, executor, vector_type, library, module_name, class_name
+    ):
+        module = import_backend(library, module_name)
+        monkeypatch.setattr(factory, "ENABLE_QDRANT_MULTITENANCY_MODE", False)
+        monkeypatch.setattr(factory, "ENABLE_MILVUS_MULTITENANCY_MODE", False)
+
+        async_db = factory.Vector.get_async_vector(vector_type, MagicMock(), executor)
+
+        assert type(async_db) is getattr(module, class_name)
+
+    @pytest.mark.parametrize("vector_type", [VectorType.CHROMA, VectorType.NUMPY])
+    def test_threaded_fallback(self, executor, vector_type):
+        client = MagicMock()
+
+        async_db = factory.Vector.get_async_vector(vector_type, client, executor)
+
+        assert type(async_db) is ThreadedAsyncVectorDB
+        assert async_db.client is client
+
+
+class TestQdrant:
+    @pytest.mark.asyncio
+    async def test_search(self, executor):
+        qdrant = import_backend("qdrant_client", "qdrant")
+        async_db, client = create_async_client(
+            qdrant.AsyncQdrantClient, executor, collection_prefix="open-webui"
+        )
+
+        result = await async_db.search("collection", [[1.0, 0.0]], limit=3)
+
+        async_db.async_client.query_batch_points.assert_awaited_once_with(
+            collection_name="open-webui_collection",
+            requests=client._get_query_requests.return_value,
+        )
+        assert result is client._responses_to_search_result.return_value
+        client.search.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_upsert(self, executor):
+        qdrant = import_backend("qdrant_client", "qdrant")
+        async_db, client = create_async_client(
+            qdrant.AsyncQdrantClient, executor, collection_prefix="open-webui"
+        )
+
+        await async_db.upsert("collection", ITEMS)
+
+        client._create_collection_if_not_exists.assert_called_once_with("collection", 2)
+        async_db.async_client.upsert.assert_awaited_once_with(
+            "open-webui_collection", client._create_points.return_value
+        )
+        client.upsert.assert_not_called()
+
+
+class TestMilvus:
+    @pytest.mark.asyncio
+    async def test_search(self, executor):
+        milvus = import_backend("pymilvus", "milvus")
+        async_db, client = create_async_client(
+            milvus.AsyncMilvusClient, executor, collection_prefix="open_webui"
+        )
+
+        result = await async_db.search("collection-a", [[1.0, 0.0]], limit=3)
+
+        async_db.async_client.search.assert_awaited_once_with(
+            collection_name="open_webui_collection_a",
+            data=[[1.0, 0.0]],
+            limit=3,
+            output_fields=["data", "metadata"],
+        )
+        assert result is client._result_to_search_result.return_value
+        client.search.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_upsert(self, executor):
+        milvus = import_backend("pymilvus", "milvus")
+        async_db, client = create_async_client(
+            milvus.AsyncMilvusClient, executor, collection_prefix="open_webui"
+        )
+        client.has_collection.return_value = True
+
+        await async_db.upsert("collection", ITEMS)
+
+        async_db.async_client.upsert.assert_awaited_once_with(
+            collection_name="open_webui_collection",
+            data=client._get_rows.return_value,
+        )
+        client.upsert.assert_not_called()
+
+
+@pytest.mark.parametrize(
+    "library, module_name, class_name, msearch_argument",
+    [
+        ("elasticsearch", "elasticsearch", "AsyncElasticsearchClient", "searches"),
+        ("opensearchpy", "opensearch", "AsyncOpenSearchClient", "body"),
+    ],
+)
+class TestSearchEngines:
+    @pytest.mark.asyncio
+    async def test_search(
+        self, executor, library, module_name, class_name, msearch_argument
+    ):
+        module = import_backend(library, module_name)
+        async_db, client = create_async_client(
+            getattr(module, class_name), executor, index_prefix="open_webui"
+        )
+        client._msearch_to_search_results.return_value = {"collection": "result"}
+
+        result = await async_db.search("collection", [[1.0, 0.0]], limit=3)
+
+        async_db.async_client.msearch.assert_awaited_once_with(
+            **{msearch_argument: client._get_msearch_body.return_value}
+        )
+        client._get_msearch_body.assert_called_once_with(
+            ["collection"], [[1.0, 0.0]], 3
+        )
+        assert result == "result"
+        client.search.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_upsert(
+        self, monkeypatch, executor, library, module_name, class_name, msearch_argument
+    ):
+        module = import_backend(library, module_name)
+        async_bulk = AsyncMock()
+        monkeypatch.setattr(module, "async_bulk", async_bulk)
+        async_db, client = create_async_client(
+            getattr(module, class_name), executor, index_prefix="open_webui"
+        )
+        client._create_batches.return_value = [ITEMS]
+
+        await async_db.upsert("collection", ITEMS)
+
+        async_bulk.assert_awaited_once_with(
+            async_db.async_client, client._get_upsert_actions.return_value
+        )
+        client._get_upsert_actions.assert_called_once_with("collection", ITEMS)
+        client.upsert.assert_not_called()
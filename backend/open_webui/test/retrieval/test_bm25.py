@@ -0,0 +1,234 @@
+import math
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import AsyncMock
+
+import pytest
+
+from open_webui.retrieval.bm25 import (
+    AsyncBM25IndexedVectorDB,
+    BM25Index,
+    BM25IndexedVectorDB,
+    BM25IndexVersions,
+)
+from open_webui.retrieval.vector.dbs.numpy_vector import NumpyVectorClient
+from open_webui.retrieval.vector.main import GetResult, ThreadedAsyncVectorDB
+
+
+class FakeRedis:
+    """The hash commands BM25IndexVersions uses, shared by every "node"."""
+
+    def __init__(self):
+        self.hashes = {}
+
+    def hmget(self, key, *fields):
+        return [self.hashes.get(key, {}).get(field) for field in fields]
+
+    def hget(self, key, field):
+        return self.hashes.get(key, {}).get(field)
+
+    def hincrby(self, key, field, amount):
+        values = self.hashes.setdefault(key, {})
+        values[field] = str(int(values.get(field) or 0) + amount)
+        return int(values[field])
+
+    def pipeline(self):
+        return FakePipeline(self)
+
+
+class FakePipeline:
+    def __init__(self, redis):
+        self.redis = redis
+        self.commands = []
+
+    def __getattr__(self, name):
+        return lambda *args: self.commands.append((name, args))
+
+    def execute(self):
+        return [getattr(self.redis, name)(*args) for name, args in self.commands]
+
+
+def item(text, metadata=None):
+    return {
+        "id": str(uuid.uuid4()),
+        "text": text,
+        "vector": [1.0, 0.0, 0.0],
+        "metadata": metadata or {},
+    }
+
+
+def get_result(items):
+    return GetResult(
+        ids=[[item["id"] for item in items]],
+        documents=[[item["text"] for item in items]],
+        metadatas=[[item["metadata"] for item in items]],
+    )
+
+
+@pytest.fixture
+def index(tmp_path):
+    return BM25Index(str(tmp_path / "bm25" / "index.db"))
+
+
+class TestBM25Index:
+    def test_search_ranks_matching_documents(self, index):
+        items = [
+            item("the quick brown fox"),
+            item("the lazy dog"),
+            item("fox fox fox"),
+        ]
+        index.build("collection", get_result(items))
+
+        result = index.search("collection", "fox", k=10)
+
+        assert result.documents[0] == ["fox fox fox", "the quick brown fox"]
+        assert result.distances[0][0] > result.distances[0][1] > 0
+
+    def test_search_limits_results(self, index):
+        index.build("collection", get_result([item(f"fox {i}") for i in range(5)]))
+
+        assert len(index.search("collection", "fox", k=2).ids[0]) == 2
+
+    def test_add_and_remove(self, index):
+        fox = item("fox", {"file_id": "a"})
+        index.build("collection", get_result([fox]))
+
+        dog = item("dog", {"file_id": "b"})
+        index.add("collection", [dog])
+        assert index.get_document_count("collection") == 2
+        assert index.search("collection", "dog", k=1).ids[0] == [dog["id"]]
+
+        index.remove("collection", filter={"file_id": "b"})
+        assert index.get_document_count("collection") == 1
+        assert index.search("collection", "dog", k=1).ids[0] == []
+
+        index.remove("collection", ids=[fox["id"]])
+        assert index.get_document_count("collection") == 0
+
+    def test_add_ignores_unindexed_collections(self, index):
+        index.add("collection", [item("fox")])
+        assert not index.has_collection("collection")
+
+    def test_enriched_search_uses_metadata(self, index):
+        items = [item("report", {"name": "budget.pdf"}), item("report")]
+        index.build("collection", get_result(items))
+
+        assert len(index.search("collection", "budget", k=10).ids[0]) == 0
+        result = index.search("collection", "budget", k=10, enriched=True)
+        assert result.ids[0] == [items[0]["id"]]
+
+    def test_scores_match_okapi_bm25(self, index):
+        texts = ["a b c", "a a d", "b e f g"]
+        index.build("collection", get_result([item(text) for text in texts]))
+
+        result = index.search("collection", "d", k=1)
+
+        # Okapi BM25 (k1=1.5, b=0.75) with idf = ln(1 + (N - df + 0.5) / (df + 0.5))
+        idf = math.log(1 + (3 - 1 + 0.5) / (1 + 0.5))
+        avg_length = 10 / 3
+        score = idf * 1 * 2.5 / (1 + 1.5 * (1 - 0.75 + 0.75 * 3 / avg_length))
+        assert result.documents[0] == ["a a d"]
+        assert result.distances[0][0] == pytest.approx(score)
+
+
+class TestBM25IndexedVectorDB:
+    @pytest.fixture
+    def client(self, tmp_path):
+        return NumpyVectorClient(path=str(tmp_path / "vector_db"))
+
+    def test_mirrors_writes(self, client, index):
+        db = BM25IndexedVectorDB(client, index)
+        db.insert("collection", [item("fox")])
+        assert db.get_bm25_document_count("collection") == 1
+
+        dog = item("dog")
+        db.upsert("collection", [dog])
+        assert db.bm25_search("collection", "dog", k=1).ids[0] == [dog["id"]]
+
+        db.delete("collection", ids=[dog["id"]])
+        assert db.get_bm25_document_count("collection") == 1
+
+        db.delete_collection("collection")
+        assert not index.has_collection("collection")
+
+    def test_writes_on_other_nodes_rebuild_the_index(self, client, tmp_path):
+        versions = BM25IndexVersions(FakeRedis(), "bm25:versions")
+        node = BM25IndexedVectorDB(
+            client, BM25Index(str(tmp_path / "node" / "index.db")), versions
+        )
+        other_node = BM25IndexedVectorDB(
+            client, BM25Index(str(tmp_path / "other" / "index.db")), versions
+        )
+
+        node.insert("collection", [item("fox")])
+        assert node.get_bm25_document_count("collection") == 1
+
+        dog = item("dog")
+        other_node.insert("collection", [dog])
+        assert node.bm25_search("collection", "dog", k=1).ids[0] == [dog["id"]]
+
+        # Writes of this node keep its index current without a rebuild
+        node.insert("collection", [item("cat")])
+        assert node.index.get_version("collection") == versions.get("collection")
+        assert node.get_bm25_document_count("collection") == 3
+
+        # A write this node missed is not applied on top of a stale index
+        other_node.insert("collection", [item("cow")])
+        node.insert("collection", [item("owl")])
+        assert not node.index.has_collection("collection")
+        assert node.get_bm25_document_count("collection") == 5
+
+    def test_reset_on_other_node(self, client, tmp_path):
+        versions = BM25IndexVersions(FakeRedis(), "bm25:versions")
+        node = BM25IndexedVectorDB(
+            client, BM25Index(str(tmp_path / "node" / "index.db")), versions
+        )
+        other_node = BM25IndexedVectorDB(
+            client, BM25Index(str(tmp_path / "other" / "index.db")), versions
+        )
+
+        node.insert("collection", [item("fox")])
+        assert node.get_bm25_document_count("collection") == 1
+
+        other_node.reset()
+        assert node.get_bm25_document_count("collection") == 0
+
+
+class TestAsyncBM25IndexedVectorDB:
+    @pytest.fixture
+    def executor(self):
+        executor = ThreadPoolExecutor(max_workers=1)
+        yield executor
+        executor.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_uses_the_async_client(self, tmp_path, index, executor):
+        client = NumpyVectorClient(path=str(tmp_path / "vector_db"))
+        indexed_client = BM25IndexedVectorDB(client, index)
+        # Stands in for a backend's native async client
+        async_client = AsyncMock(wraps=ThreadedAsyncVectorDB(client, executor))
+        db = AsyncBM25IndexedVectorDB(indexed_client, async_client, executor)
+
+        fox = item("fox")
+        await db.insert("collection", [fox])
+        assert indexed_client.get_bm25_document_count("collection") == 1
+
+        dog = item("dog")
+        await db.upsert("collection", [dog])
+        assert indexed_client.bm25_search("collection", "dog", k=1).ids[0] == [
+            dog["id"]
+        ]
+
+        result = await db.search("collection", [[1.0, 0.0, 0.0]], limit=1)
+        assert len(result.ids[0]) == 1
+        assert (await db.get("collection")).ids[0]
+
+        await db.delete("collection", ids=[dog["id"]])
+        assert indexed_client.get_bm25_document_count("collection") == 1
+
+        await db.delete_collection("collection")
+        assert not index.has_collection("collection")
+
+        for method in ["insert", "upsert", "search", "get", "delete"]:
+            getattr(async_client, method).assert_awaited_once()
+        async_client.delete_collection.assert_awaited_once_with("collection")
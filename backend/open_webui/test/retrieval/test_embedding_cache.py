@@ -0,0 +1,103 @@
+import pytest
+
+from open_webui.retrieval.embedding_cache import EmbeddingCache
+
+
+class RecordingEmbeddingFunction:
+    def __init__(self):
+        self.calls = []
+
+    async def __call__(self, query, prefix=None, user=None):
+        self.calls.append(query)
+        if isinstance(query, list):
+            return [[float(len(text)), 1.0] for text in query]
+        return [float(len(query)), 1.0]
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return EmbeddingCache(str(tmp_path / "cache" / "embeddings.db"))
+
+
+class TestEmbeddingCache:
+    def test_get_key(self):
+        key = EmbeddingCache.get_key("openai", "model", None, "text")
+
+        assert key == EmbeddingCache.get_key("openai", "model", "", "text")
+        assert key != EmbeddingCache.get_key("openai", "other", None, "text")
+        assert key != EmbeddingCache.get_key("openai", "model", "query: ", "text")
+        assert key != EmbeddingCache.get_key("ollama", "model", None, "text")
+
+    def test_set_and_get_many(self, cache):
+        a = cache.get_key("", "model", None, "a")
+        b = cache.get_key("", "model", None, "b")
+
+        cache.set_many({a: [0.5, 0.25]})
+
+        assert cache.get_many([a, b]) == {a: [0.5, 0.25]}
+
+    def test_float16_storage(self, tmp_path):
+        cache = EmbeddingCache(str(tmp_path / "embeddings.db"), dtype="float16")
+        key = cache.get_key("", "model", None, "a")
+
+        cache.set_many({key: [0.1, 1.0]})
+
+        [vector] = cache.get_many([key]).values()
+        assert vector == pytest.approx([0.1, 1.0], abs=1e-3)
+
+    def test_evicts_least_recently_used(self, tmp_path, monkeypatch):
+        cache = EmbeddingCache(str(tmp_path / "embeddings.db"), max_entries=10)
+        keys = [cache.get_key("", "model", None, str(i)) for i in range(11)]
+
+        now = [1000]
+        monkeypatch.setattr(
+            "open_webui.retrieval.embedding_cache.time.time", lambda: now[0]
+        )
+        cache.set_many({key: [1.0] for key in keys[:10]})
+        now[0] += 1
+        cache.get_many(keys[:1])
+        cache.set_many({keys[10]: [1.0]})
+
+        remaining = cache.get_many(keys)
+        assert len(remaining) == 10
+        assert keys[0] in remaining
+        assert keys[10] in remaining
+
+    @pytest.mark.asyncio
+    async def test_wrap_only_embeds_missing_texts(self, cache):
+        embedding_function = RecordingEmbeddingFunction()
+        cached_embedding_function = cache.wrap(embedding_function, "", "model")
+
+        assert await cached_embedding_function(["a", "bb"]) == [[1.0, 1.0], [2.0, 1.0]]
+        assert await cached_embedding_function(["bb", "ccc", "a"]) == [
+            [2.0, 1.0],
+            [3.0, 1.0],
+            [1.0, 1.0],
+        ]
+        assert await cached_embedding_function("ccc") == [3.0, 1.0]
+
+        assert embedding_function.calls == [["a", "bb"], ["ccc"]]
+
+    @pytest.mark.asyncio
+    async def test_wrap_keys_on_prefix(self, cache):
+        embedding_function = RecordingEmbeddingFunction()
+        cached_embedding_function = cache.wrap(embedding_function, "", "model")
+
+        await cached_embedding_function("a", prefix="query: ")
+        await cached_embedding_function("a", prefix="passage: ")
+
+        assert embedding_function.calls == ["a", "a"]
+
+    @pytest.mark.asyncio
+    async def test_wrap_does_not_cache_failures(self, cache):
+        calls = []
+
+        async def embedding_function(query, prefix=None, user=None):
+            calls.append(query)
+            return None
+
+        cached_embedding_function = cache.wrap(embedding_function, "", "model")
+
+        assert await cached_embedding_function(["a"]) is None
+        assert await cached_embedding_function(["a"]) is None
+        assert calls == [["a"], ["a"]]
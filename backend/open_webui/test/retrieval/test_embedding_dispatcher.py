@@ -0,0 +1,151 @@
+import asyncio
+from contextlib import asynccontextmanager
+from types import SimpleNamespace
+
+import aiohttp
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from open_webui.retrieval.embedding_dispatcher import EmbeddingDispatcher
+from open_webui.utils.session_pool import CLIENT_SESSION_POOL
+
+
+class FakeEmbeddingFunction:
+    """Embeds a text as [index], answering later batches first."""
+
+    def __init__(self, fail_on=None):
+        self.batches = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.fail_on = fail_on
+
+    async def __call__(self, texts, prefix=None, user=None):
+        self.batches.append(texts)
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(0.05 / len(self.batches))
+            if self.fail_on in texts:
+                raise ValueError("Upstream error")
+            return [[int(text)] for text in texts]
+        finally:
+            self.in_flight -= 1
+
+
+@asynccontextmanager
+async def run_upstream(responses):
+    """A fake embedding endpoint answering with `responses` in turn, then 200."""
+    requests = []
+
+    async def embeddings(request):
+        requests.append(await request.json())
+        if responses:
+            status, headers = responses.pop(0)
+            return web.json_response({}, status=status, headers=headers)
+        return web.json_response({"data": [{"embedding": [1.0]}]})
+
+    app = web.Application()
+    app.router.add_post("/embeddings", embeddings)
+
+    server = TestServer(app)
+    await server.start_server()
+    try:
+        yield str(server.make_url("/embeddings")), requests
+    finally:
+        await CLIENT_SESSION_POOL.close()
+        await server.close()
+
+
+class TestEmbed:
+    def test_get_batches(self):
+        dispatcher = EmbeddingDispatcher(max_batch_tokens=10)
+
+        assert dispatcher.get_batches(["a"] * 5, 2) == [["a", "a"], ["a", "a"], ["a"]]
+        # Cut by the token budget before the batch size is reached
+        long = "x" * 40
+        assert dispatcher.get_batches(["a", long, "b", "c"], 10) == [
+            ["a"],
+            [long],
+            ["b", "c"],
+        ]
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("parallel", [True, False])
+    async def test_batches_keep_input_order(self, parallel):
+        dispatcher = EmbeddingDispatcher(max_concurrency=2, coalesce_window=0)
+        embedding_function = FakeEmbeddingFunction()
+        texts = [str(i) for i in range(10)]
+
+        embeddings = await dispatcher.embed(
+            embedding_function, texts, batch_size=3, parallel=parallel
+        )
+
+        assert embeddings == [[i] for i in range(10)]
+        assert [len(batch) for batch in embedding_function.batches] == [3, 3, 3, 1]
+        assert embedding_function.max_in_flight == (2 if parallel else 1)
+
+    @pytest.mark.asyncio
+    async def test_failed_batch_fails_the_call(self):
+        dispatcher = EmbeddingDispatcher(coalesce_window=0)
+        embedding_function = FakeEmbeddingFunction(fail_on="4")
+
+        with pytest.raises(ValueError):
+            await dispatcher.embed(
+                embedding_function, [str(i) for i in range(6)], batch_size=2
+            )
+
+        # The other batches were still sent
+        assert len(embedding_function.batches) == 3
+
+
+class TestPost:
+    def test_retry_delay(self):
+        dispatcher = EmbeddingDispatcher(backoff_base=1, backoff_max=10)
+
+        def response(headers):
+            return SimpleNamespace(headers=headers)
+
+        assert dispatcher._get_retry_delay(response({"Retry-After": "3"}), 0) == 3
+        assert dispatcher._get_retry_delay(response({"Retry-After": "60"}), 0) == 10
+        assert 2 <= dispatcher._get_retry_delay(response({}), 2) <= 6
+        assert 0.5 <= dispatcher._get_retry_delay(response({"Retry-After": "x"}), 0)
+
+    @pytest.mark.asyncio
+    async def test_retries_honour_retry_after(self):
+        # Without Retry-After the backoff would be far longer than the timeout
+        dispatcher = EmbeddingDispatcher(backoff_base=60, backoff_max=60)
+
+        async with run_upstream(
+            [(429, {"Retry-After": "0"}), (503, {"Retry-After": "0"})]
+        ) as (url, requests):
+            data = await asyncio.wait_for(
+                dispatcher.post(url, json={"input": ["a"]}), timeout=5
+            )
+
+        assert data == {"data": [{"embedding": [1.0]}]}
+        assert requests == [{"input": ["a"]}] * 3
+
+    @pytest.mark.asyncio
+    async def test_gives_up_after_max_retries(self):
+        dispatcher = EmbeddingDispatcher(max_retries=2)
+
+        async with run_upstream([(503, {"Retry-After": "0"})] * 5) as (
+            url,
+            requests,
+        ):
+            with pytest.raises(aiohttp.ClientResponseError) as e:
+                await dispatcher.post(url, json={"input": ["a"]})
+
+        assert e.value.status == 503
+        assert len(requests) == 3
+
+    @pytest.mark.asyncio
+    async def test_client_errors_are_not_retried(self):
+        dispatcher = EmbeddingDispatcher()
+
+        async with run_upstream([(400, {})]) as (url, requests):
+            with pytest.raises(aiohttp.ClientResponseError):
+                await dispatcher.post(url, json={"input": ["a"]})
+
+        assert len(requests) == 1
@@ -0,0 +1,155 @@
+import numpy as np
+import pytest
+
+from open_webui.retrieval.vector.dbs import numpy_vector
+from open_webui.retrieval.vector.dbs.numpy_vector import NumpyVectorClient
+
+
+def item(id, vector, **metadata):
+    return {"id": id, "text": f"text {id}", "vector": vector, "metadata": metadata}
+
+
+@pytest.fixture
+def path(tmp_path):
+    return str(tmp_path / "vector_db")
+
+
+@pytest.fixture
+def client(path):
+    return NumpyVectorClient(path=path)
+
+
+class TestNumpyVectorClient:
+    def test_search_ranks_by_cosine_similarity(self, client):
+        client.insert(
+            "collection",
+            [item("a", [1.0, 0.0]), item("b", [1.0, 1.0]), item("c", [0.0, 2.0])],
+        )
+
+        result = client.search("collection", [[1.0, 0.0], [0.0, 1.0]], limit=2)
+
+        assert result.ids == [["a", "b"], ["c", "b"]]
+        assert result.documents[0] == ["text a", "text b"]
+        assert result.distances[0][0] == pytest.approx(1.0)
+        assert result.distances[0][1] == pytest.approx((np.sqrt(0.5) + 1) / 2)
+
+    def test_missing_collection(self, client):
+        assert not client.has_collection("collection")
+        assert client.search("collection", [[1.0, 0.0]]) is None
+        assert client.query("collection", filter={}) is None
+        assert client.get("collection") is None
+
+    def test_upsert_replaces_existing_ids(self, client):
+        client.insert("collection", [item("a", [1.0, 0.0]), item("b", [0.0, 1.0])])
+        client.upsert("collection", [{**item("a", [0.0, 1.0]), "text": "updated"}])
+
+        result = client.get("collection")
+        assert sorted(zip(result.ids[0], result.documents[0])) == [
+            ("a", "updated"),
+            ("b", "text b"),
+        ]
+        assert client.search("collection", [[0.0, 1.0]], limit=2).distances[0] == [
+            pytest.approx(1.0),
+            pytest.approx(1.0),
+        ]
+
+    def test_dimension_mismatch(self, client):
+        client.insert("collection", [item("a", [1.0, 0.0])])
+
+        with pytest.raises(ValueError):
+            client.insert("collection", [item("b", [1.0, 0.0, 0.0])])
+        assert client.search("collection", [[1.0, 0.0, 0.0]]) is None
+
+    def test_metadata_filters(self, client):
+        client.insert(
+            "collection",
+            [
+                item("a", [1.0, 0.0], file_id="1"),
+                item("b", [1.0, 0.1], file_id="2"),
+                item("c", [1.0, 0.2], file_id="3"),
+            ],
+        )
+
+        def ids(filter):
+            return sorted(client.query("collection", filter=filter).ids[0])
+
+        assert ids({"file_id": "1"}) == ["a"]
+        assert ids({"file_id": {"$ne": "1"}}) == ["b", "c"]
+        assert ids({"file_id": {"$in": ["1", "3"]}}) == ["a", "c"]
+        assert ids({"file_id": {"$nin": ["1", "3"]}}) == ["b"]
+        assert ids({"file_id": {"$in": []}}) == []
+
+        result = client.search(
+            "collection", [[1.0, 0.0]], filter={"file_id": {"$ne": "1"}}
+        )
+        assert result.ids == [["b", "c"]]
+
+    def test_delete_by_id_and_filter(self, client):
+        client.insert(
+            "collection",
+            [
+                item("a", [1.0, 0.0], file_id="1"),
+                item("b", [0.0, 1.0], file_id="2"),
+                item("c", [1.0, 1.0], file_id="2"),
+            ],
+        )
+
+        client.delete("collection", ids=["a"])
+        assert sorted(client.get("collection").ids[0]) == ["b", "c"]
+
+        client.delete("collection", filter={"file_id": "2"})
+        assert client.get("collection").ids == [[]]
+        assert client.search("collection", [[1.0, 0.0]]).ids == [[]]
+
+    def test_deleted_rows_are_reused(self, client):
+        client.insert("collection", [item("a", [1.0, 0.0])])
+        client.delete("collection", ids=["a"])
+        client.insert("collection", [item("b", [0.0, 1.0])])
+
+        assert client.query_with_vectors("collection", filter={}).vectors == [
+            [[0.0, 1.0]]
+        ]
+
+    def test_collections_grow_by_shards(self, path, monkeypatch):
+        monkeypatch.setattr(numpy_vector, "FIRST_SHARD_SIZE", 2)
+        client = NumpyVectorClient(path=path, shard_size=4)
+
+        client.insert("collection", [item(str(i), [1.0, i / 10]) for i in range(10)])
+
+        assert [len(shard) for shard in client._collections["collection"].shards] == [
+            2,
+            4,
+            4,
+        ]
+        result = client.search("collection", [[1.0, 0.0]], limit=10)
+        assert result.ids == [[str(i) for i in range(10)]]
+
+    def test_writes_are_visible_to_other_clients(self, path):
+        client = NumpyVectorClient(path=path)
+        other_client = NumpyVectorClient(path=path)
+
+        client.insert("collection", [item("a", [1.0, 0.0])])
+        assert other_client.search("collection", [[1.0, 0.0]]).ids == [["a"]]
+
+        client.insert("collection", [item("b", [0.0, 1.0])])
+        client.delete("collection", ids=["a"])
+        assert other_client.search("collection", [[1.0, 0.0]]).ids == [["b"]]
+
+        client.delete_collection("collection")
+        assert not other_client.has_collection("collection")
+
+    def test_float16_storage(self, path):
+        client = NumpyVectorClient(path=path, dtype="float16")
+        client.insert("collection", [item("a", [3.0, 4.0])])
+
+        [[vector]] = client.query_with_vectors("collection", filter={}).vectors
+        assert vector == pytest.approx([0.6, 0.8], abs=1e-3)
+
+    def test_reset(self, client):
+        client.insert("a", [item("a", [1.0, 0.0])])
+        client.insert("b", [item("b", [1.0, 0.0])])
+
+        client.reset()
+
+        assert not client.has_collection("a")
+        assert not client.has_collection("b")
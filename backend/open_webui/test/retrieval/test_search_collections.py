@@ -0,0 +1,115 @@
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from open_webui.retrieval import utils as retrieval_utils
+from open_webui.retrieval.vector.dbs.numpy_vector import NumpyVectorClient
+from open_webui.retrieval.vector.main import SearchResult, ThreadedAsyncVectorDB
+
+
+def item(text, vector):
+    return {"id": str(uuid.uuid4()), "text": text, "vector": vector, "metadata": {}}
+
+
+@pytest.fixture
+def client(tmp_path):
+    client = NumpyVectorClient(path=str(tmp_path / "vector_db"))
+    client.insert("a", [item("a x", [1.0, 0.0]), item("a y", [0.0, 1.0])])
+    client.insert("b", [item("b x", [1.0, 0.1]), item("b y", [0.1, 1.0])])
+    return client
+
+
+@pytest.fixture
+def executor():
+    executor = ThreadPoolExecutor(max_workers=2)
+    yield executor
+    executor.shutdown()
+
+
+class BatchingClient(NumpyVectorClient):
+    """A backend that searches several collections in one request."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.calls = []
+
+    def search_collections(self, collection_names, vectors, limit=10):
+        self.calls.append(list(collection_names))
+        return {
+            collection_name: self.search(collection_name, vectors, limit=limit)
+            for collection_name in collection_names
+        }
+
+
+class TestSearchCollections:
+    def test_result_per_collection_and_query_vector(self, client):
+        results = client.search_collections(
+            ["a", "b", "missing"], [[1.0, 0.0], [0.0, 1.0]], limit=1
+        )
+
+        assert list(results) == ["a", "b", "missing"]
+        assert results["a"].documents == [["a x"], ["a y"]]
+        assert results["b"].documents == [["b x"], ["b y"]]
+        assert results["missing"] is None
+
+    def test_failed_collection_does_not_fail_the_others(self, client, monkeypatch):
+        search = client.search
+
+        def failing_search(collection_name, vectors, filter=None, limit=10):
+            if collection_name == "a":
+                raise RuntimeError("collection is corrupt")
+            return search(collection_name, vectors, filter=filter, limit=limit)
+
+        monkeypatch.setattr(client, "search", failing_search)
+        results = client.search_collections(["a", "b"], [[1.0, 0.0]], limit=1)
+
+        assert results["a"] is None
+        assert results["b"].documents == [["b x"]]
+
+    @pytest.mark.asyncio
+    async def test_async_client_searches_each_collection_once(self, client, executor):
+        async_client = ThreadedAsyncVectorDB(client, executor)
+
+        results = await async_client.search_collections(
+            ["a", "b", "a"], [[1.0, 0.0]], limit=1
+        )
+
+        assert list(results) == ["a", "b"]
+        assert isinstance(results["a"], SearchResult)
+        assert results["a"].documents == [["a x"]]
+
+    @pytest.mark.asyncio
+    async def test_async_client_uses_backend_batching(self, tmp_path, executor):
+        client = BatchingClient(path=str(tmp_path / "vector_db"))
+        client.insert("a", [item("a x", [1.0, 0.0])])
+        async_client = ThreadedAsyncVectorDB(client, executor)
+
+        results = await async_client.search_collections(["a", "b"], [[1.0, 0.0]])
+
+        assert client.calls == [["a", "b"]]
+        assert results["a"].documents == [["a x"]]
+
+
+class TestQueryCollection:
+    @pytest.mark.asyncio
+    async def test_merges_collections_and_queries(self, client, executor, monkeypatch):
+        monkeypatch.setattr(
+            retrieval_utils,
+            "ASYNC_VECTOR_DB_CLIENT",
+            ThreadedAsyncVectorDB(client, executor),
+        )
+        embedded = []
+
+        async def embedding_function(queries, prefix=None, user=None):
+            embedded.append(queries)
+            return [[1.0, 0.0] if query == "x" else [0.0, 1.0] for query in queries]
+
+        result = await retrieval_utils.query_collection(
+            ["a", "b", ""], ["x", "y"], embedding_function, k=3
+        )
+
+        # All queries are embedded in one call
+        assert embedded == [["x", "y"]]
+        assert result["documents"][0] == ["a x", "a y", "b x"]
+        assert result["distances"][0] == sorted(result["distances"][0], reverse=True)
@@ -0,0 +1,122 @@
+import pytest
+
+from open_webui import config
+from open_webui.config import AppConfig, PersistentConfig
+
+
+class FakeRedis:
+    def __init__(self):
+        self.values = {}
+        self.gets = 0
+
+    def get(self, key):
+        self.gets += 1
+        return self.values.get(key)
+
+    def set(self, key, value):
+        self.values[key] = value
+
+    def incr(self, key):
+        self.values[key] = str(int(self.values.get(key) or 0) + 1)
+        return int(self.values[key])
+
+    def pipeline(self):
+        return FakePipeline(self)
+
+
+class FakePipeline:
+    def __init__(self, redis):
+        self.redis = redis
+        self.keys = []
+
+    def get(self, key):
+        self.keys.append(key)
+
+    def execute(self):
+        return [self.redis.get(key) for key in self.keys]
+
+
+@pytest.fixture
+def now(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(config.time, "monotonic", lambda: now[0])
+    monkeypatch.setattr(config, "REDIS_CONFIG_SYNC_INTERVAL", 1000)
+    monkeypatch.setattr(config, "ENABLE_PERSISTENT_CONFIG", True)
+    monkeypatch.setattr(config, "save_to_db", lambda data: None)
+    return now
+
+
+def create_worker(redis):
+    """An AppConfig as set up by one worker process."""
+    app_config = AppConfig()
+    object.__setattr__(app_config, "_redis", redis)
+    object.__setattr__(app_config, "_redis_key_prefix", "open-webui")
+    app_config.WEBUI_NAME = PersistentConfig(
+        "TEST_WEBUI_NAME", "test.webui_name", "Open WebUI"
+    )
+    app_config.ENABLE_SIGNUP = PersistentConfig(
+        "TEST_ENABLE_SIGNUP", "test.enable_signup", True
+    )
+    return app_config
+
+
+class TestAppConfig:
+    def test_reads_are_served_locally(self, now):
+        redis = FakeRedis()
+        worker = create_worker(redis)
+
+        worker.WEBUI_NAME
+        gets = redis.gets
+        for _ in range(10):
+            assert worker.WEBUI_NAME == "Open WebUI"
+            assert worker.ENABLE_SIGNUP is True
+
+        assert redis.gets == gets
+
+    def test_writes_reach_other_workers(self, now):
+        redis = FakeRedis()
+        worker = create_worker(redis)
+        other_worker = create_worker(redis)
+        assert other_worker.WEBUI_NAME == "Open WebUI"
+
+        worker.WEBUI_NAME = "Renamed"
+        worker.ENABLE_SIGNUP = False
+        assert worker.WEBUI_NAME == "Renamed"
+
+        # Stale until the next version check
+        assert other_worker.WEBUI_NAME == "Open WebUI"
+        now[0] += 1
+        assert other_worker.WEBUI_NAME == "Renamed"
+        assert other_worker.ENABLE_SIGNUP is False
+
+    def test_unchanged_version_skips_reload(self, now):
+        redis = FakeRedis()
+        worker = create_worker(redis)
+        worker.WEBUI_NAME = "Renamed"
+        other_worker = create_worker(redis)
+        assert other_worker.WEBUI_NAME == "Renamed"
+
+        gets = redis.gets
+        now[0] += 1
+        assert other_worker.WEBUI_NAME == "Renamed"
+
+        # Only the version key is read
+        assert redis.gets == gets + 1
+
+    def test_newly_registered_key_is_synced(self, now):
+        redis = FakeRedis()
+        worker = create_worker(redis)
+        worker.WEBUI_NAME = "Renamed"
+
+        other_worker = create_worker(redis)
+        other_worker.WEBUI_NAME
+
+        other_worker.WEBUI_NAME = PersistentConfig(
+            "TEST_WEBUI_NAME", "test.webui_name", "Open WebUI"
+        )
+        now[0] += 1
+        assert other_worker.WEBUI_NAME == "Renamed"
+
+    def test_unknown_key(self, now):
+        with pytest.raises(AttributeError):
+            create_worker(FakeRedis()).UNKNOWN
@@ -0,0 +1,99 @@
+from open_webui.utils import cache as cache_module
+from open_webui.utils.cache import VersionedCache
+
+
+class FakeRedis:
+    def __init__(self):
+        self.values = {}
+
+    def get(self, key):
+        return self.values.get(key)
+
+    def incr(self, key):
+        self.values[key] = str(int(self.values.get(key) or 0) + 1)
+        return int(self.values[key])
+
+
+def create_cache(redis=None, **kwargs):
+    cache = VersionedCache("test", **kwargs)
+    cache._redis = redis
+    cache._redis_initialized = True
+    return cache
+
+
+class TestVersionedCache:
+    def test_get_and_set(self):
+        cache = create_cache()
+
+        assert cache.get("a") is None
+        assert cache.get("a", "default") == "default"
+
+        cache.set("a", 1)
+        cache.set("none", None)
+        assert cache.get("a") == 1
+        assert cache.get("none", "default") is None
+
+    def test_entries_expire(self, monkeypatch):
+        now = [100.0]
+        monkeypatch.setattr(cache_module.time, "monotonic", lambda: now[0])
+        cache = create_cache(ttl=10)
+
+        cache.set("a", 1)
+        now[0] += 5
+        assert cache.get("a") == 1
+        now[0] += 6
+        assert cache.get("a") is None
+
+    def test_evicts_least_recently_used(self):
+        cache = create_cache(maxsize=2)
+
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+
+        assert cache.get("a") == 1
+        assert cache.get("b") is None
+        assert cache.get("c") == 3
+
+    def test_invalidate(self):
+        cache = create_cache()
+        cache.set("a", 1)
+        cache.set("b", 2)
+
+        cache.invalidate("a")
+        assert cache.get("a") is None
+        assert cache.get("b") == 2
+
+        cache.invalidate()
+        assert cache.get("b") is None
+
+    def test_invalidation_reaches_other_workers(self):
+        redis = FakeRedis()
+        worker = create_cache(redis, sync_interval=0)
+        other_worker = create_cache(redis, sync_interval=0)
+
+        worker.set("a", 1)
+        other_worker.set("a", 1)
+        assert worker.get("a") == 1
+        assert other_worker.get("a") == 1
+
+        other_worker.invalidate("a")
+
+        assert worker.get("a") is None
+
+    def test_version_is_checked_once_per_interval(self, monkeypatch):
+        now = [100.0]
+        monkeypatch.setattr(cache_module.time, "monotonic", lambda: now[0])
+        redis = FakeRedis()
+        worker = create_cache(redis, sync_interval=1)
+        other_worker = create_cache(redis, sync_interval=1)
+
+        worker.set("a", 1)
+        assert worker.get("a") == 1
+        other_worker.invalidate("a")
+
+        # Stale until the next version check
+        assert worker.get("a") == 1
+        now[0] += 1
+        assert worker.get("a") is None
@@ -0,0 +1,117 @@
+from types import SimpleNamespace
+
+import pytest
+from pydantic import BaseModel
+
+from open_webui.models.functions import Functions
+from open_webui.utils import filter as filter_module
+from open_webui.utils.filter import FilterPipeline
+
+
+class AppendFilter:
+    """A filter module appending its name to the body on every hook."""
+
+    class Valves(BaseModel):
+        suffix: str = ""
+
+    def __init__(self, name, calls):
+        self.name = name
+        self.calls = calls
+        self.valves = self.Valves()
+
+    def inlet(self, body, __id__):
+        self.calls.append(__id__)
+        return {**body, "path": body["path"] + [self.name + self.valves.suffix]}
+
+    async def outlet(self, body):
+        self.calls.append(self.name)
+        return {**body, "path": body["path"] + [self.name]}
+
+    def stream(self, event):
+        self.calls.append(self.name)
+        return {**event, "path": event["path"] + [self.name]}
+
+
+class FailingFilter:
+    def inlet(self, body):
+        raise ValueError("Rejected")
+
+
+@pytest.fixture
+def modules(monkeypatch):
+    modules = {}
+    monkeypatch.setattr(
+        filter_module,
+        "get_function_module",
+        lambda request, function_id, load_from_db=True: modules[function_id],
+    )
+    return modules
+
+
+@pytest.fixture
+def valves(monkeypatch):
+    valves = {}
+    monkeypatch.setattr(
+        Functions, "get_cached_function_valves_by_id", lambda id: valves.get(id)
+    )
+    return valves
+
+
+def create_pipeline(filter_ids, filter_type="inlet"):
+    functions = [SimpleNamespace(id=filter_id) for filter_id in filter_ids]
+    return FilterPipeline(None, functions, filter_type, {"__user__": None})
+
+
+class TestFilterPipeline:
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("filter_type", ["inlet", "outlet", "stream"])
+    async def test_filters_run_in_order(self, modules, valves, filter_type):
+        calls = []
+        for name in ["a", "b", "c"]:
+            modules[name] = AppendFilter(name, calls)
+
+        pipeline = create_pipeline(["c", "a", "b"], filter_type)
+        form_data, _ = await pipeline.run({"path": []})
+
+        # Each filter receives the output of the previous one
+        assert form_data == {"path": ["c", "a", "b"]}
+        assert calls == ["c", "a", "b"]
+
+    @pytest.mark.asyncio
+    async def test_error_stops_the_pipeline(self, modules, valves):
+        calls = []
+        modules["a"] = AppendFilter("a", calls)
+        modules["failing"] = FailingFilter()
+        modules["b"] = AppendFilter("b", calls)
+
+        pipeline = create_pipeline(["a", "failing", "b"])
+        with pytest.raises(ValueError):
+            await pipeline.run({"path": []})
+
+        assert calls == ["a"]
+
+    @pytest.mark.asyncio
+    async def test_filters_without_the_hook_are_skipped(self, modules, valves):
+        calls = []
+        modules["a"] = AppendFilter("a", calls)
+        modules["failing"] = FailingFilter()
+
+        pipeline = create_pipeline(["failing", "a"], "outlet")
+        form_data, _ = await pipeline.run({"path": []})
+
+        assert [filter["id"] for filter in pipeline.filters] == ["a"]
+        assert form_data == {"path": ["a"]}
+
+    @pytest.mark.asyncio
+    async def test_valves_are_rebuilt_on_change(self, modules, valves):
+        modules["a"] = AppendFilter("a", [])
+        pipeline = create_pipeline(["a"])
+
+        valves["a"] = {"suffix": "-1"}
+        assert (await pipeline.run({"path": []}))[0] == {"path": ["a-1"]}
+        a_valves = modules["a"].valves
+        assert (await pipeline.run({"path": []}))[0] == {"path": ["a-1"]}
+        assert modules["a"].valves is a_valves
+
+        valves["a"] = {"suffix": "-2"}
+        assert (await pipeline.run({"path": []}))[0] == {"path": ["a-2"]}
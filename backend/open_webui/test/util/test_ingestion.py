@@ -0,0 +1,150 @@
+import uuid
+
+import pytest
+
+from open_webui.internal.db import Base, engine, get_db
+from open_webui.models.files import File, FileForm, Files
+from open_webui.models.ingestion_jobs import IngestionJob, IngestionJobs
+from open_webui.models.users import User, Users
+from open_webui.retrieval.vector.dbs.numpy_vector import NumpyVectorClient
+from open_webui.routers import files as files_router
+from open_webui.utils import ingestion, reindex
+
+WORKER_ID = "test-worker"
+
+
+@pytest.fixture(autouse=True)
+def setup_db():
+    Base.metadata.create_all(
+        engine, tables=[User.__table__, File.__table__, IngestionJob.__table__]
+    )
+    with get_db() as db:
+        db.query(IngestionJob).delete()
+        db.commit()
+
+
+@pytest.fixture
+def vector_db(tmp_path, monkeypatch):
+    client = NumpyVectorClient(path=str(tmp_path / "vector_db"))
+    monkeypatch.setattr(reindex, "VECTOR_DB_CLIENT", client)
+    return client
+
+
+@pytest.fixture
+def file():
+    user_id = str(uuid.uuid4())
+    Users.insert_new_user(user_id, "User", f"{user_id}@example.com", role="user")
+    return Files.insert_new_file(
+        user_id,
+        FileForm(id=str(uuid.uuid4()), filename="file.txt", path="", meta={}),
+    )
+
+
+def chunk(text, file_id):
+    return {
+        "id": str(uuid.uuid4()),
+        "text": text,
+        "vector": [1.0, 0.0, 0.0],
+        "metadata": {"file_id": file_id},
+    }
+
+
+class TestIngestionJobs:
+    def test_claim_next_job(self, file):
+        job = IngestionJobs.insert_new_job(file.id, file.user_id)
+
+        claimed = IngestionJobs.claim_next_job(WORKER_ID)
+        assert claimed.id == job.id
+        assert claimed.status == "running"
+        assert claimed.worker_id == WORKER_ID
+        assert claimed.attempts == 1
+
+        # Running jobs are not handed out twice
+        assert IngestionJobs.claim_next_job("other-worker") is None
+
+    def test_fair_share_between_users(self, file):
+        other_user_id = str(uuid.uuid4())
+        first = IngestionJobs.insert_new_job(file.id, file.user_id)
+        IngestionJobs.insert_new_job(file.id, file.user_id)
+        other = IngestionJobs.insert_new_job(file.id, other_user_id)
+
+        assert IngestionJobs.claim_next_job(WORKER_ID).id == first.id
+        # The first user already has a running job
+        assert IngestionJobs.claim_next_job(WORKER_ID).id == other.id
+
+    def test_fail_job_retries_then_dead_letters(self, file):
+        IngestionJobs.insert_new_job(file.id, file.user_id)
+
+        job = IngestionJobs.claim_next_job(WORKER_ID)
+        job = IngestionJobs.fail_job(job.id, WORKER_ID, "error", 2, 0)
+        assert job.status == "queued"
+        assert job.error == "error"
+
+        job = IngestionJobs.claim_next_job(WORKER_ID)
+        assert job.attempts == 2
+        job = IngestionJobs.fail_job(job.id, WORKER_ID, "error", 2, 0)
+        assert job.status == "dead"
+        assert IngestionJobs.claim_next_job(WORKER_ID) is None
+
+    def test_retry_delay(self, file):
+        IngestionJobs.insert_new_job(file.id, file.user_id)
+
+        job = IngestionJobs.claim_next_job(WORKER_ID)
+        IngestionJobs.fail_job(job.id, WORKER_ID, "error", 3, 60)
+        assert IngestionJobs.claim_next_job(WORKER_ID) is None
+
+    def test_complete_job_requires_lease(self, file):
+        IngestionJobs.insert_new_job(file.id, file.user_id)
+
+        job = IngestionJobs.claim_next_job(WORKER_ID)
+        assert not IngestionJobs.complete_job(job.id, "other-worker")
+        assert IngestionJobs.complete_job(job.id, WORKER_ID)
+        assert IngestionJobs.get_job_by_id(job.id).status == "completed"
+
+
+class TestProcessJob:
+    def test_retry_drops_partial_vectors(self, file, vector_db, monkeypatch):
+        collection_name = f"file-{file.id}"
+        processed = []
+
+        def process_file_item(request, file_item, user, db):
+            # Processing skips files whose collection already exists
+            processed.append(vector_db.has_collection(collection_name))
+            vector_db.insert(collection_name, [chunk("partial", file_item.id)])
+
+        monkeypatch.setattr(files_router, "process_file_item", process_file_item)
+        IngestionJobs.insert_new_job(file.id, file.user_id)
+
+        job = IngestionJobs.claim_next_job(WORKER_ID)
+        ingestion._process_job(None, job, {})
+        IngestionJobs.fail_job(job.id, WORKER_ID, "timeout", 3, 0)
+
+        job = IngestionJobs.claim_next_job(WORKER_ID)
+        ingestion._process_job(None, job, {})
+
+        assert processed == [False, False]
+        assert vector_db.get(collection_name).documents[0] == ["partial"]
+
+    @pytest.mark.asyncio
+    async def test_publishes_completed_status(self, file, vector_db, monkeypatch):
+        published = []
+
+        def process_file_item(request, file_item, user, db):
+            Files.update_file_data_by_id(file_item.id, {"status": "completed"})
+            ingestion.notify_file_status(file_item.id)
+
+        monkeypatch.setattr(files_router, "process_file_item", process_file_item)
+        monkeypatch.setattr(
+            ingestion,
+            "publish_file_status",
+            lambda file_id, user_id, status: published.append(status),
+        )
+        monkeypatch.setattr(ingestion, "INGESTION_WORKER_ID", WORKER_ID)
+        IngestionJobs.insert_new_job(file.id, file.user_id)
+
+        job = IngestionJobs.claim_next_job(WORKER_ID)
+        await ingestion.process_ingestion_job(None, job)
+
+        # Published by process_file while the job was still running
+        assert published[-2]["status"] == "pending"
+        assert published[-1] == {"status": "completed"}
@@ -0,0 +1,99 @@
+from fastapi import FastAPI, WebSocket
+from fastapi.responses import StreamingResponse
+from starlette.testclient import TestClient
+
+from open_webui.utils.telemetry.metrics import MetricsMiddleware
+
+
+class FakeInstrument:
+    def __init__(self):
+        self.values = []
+
+    def add(self, value, attributes):
+        self.values.append((value, attributes))
+
+    def record(self, value, attributes):
+        self.values.append((value, attributes))
+
+
+def create_app():
+    app = FastAPI()
+
+    @app.get("/items/{id}")
+    async def item(id: str):
+        return {"id": id}
+
+    @app.get("/stream")
+    async def stream():
+        async def generator():
+            yield b"a"
+            yield b"b"
+
+        return StreamingResponse(generator())
+
+    @app.get("/error")
+    async def error():
+        raise ValueError("Failed")
+
+    @app.websocket("/ws")
+    async def websocket_endpoint(websocket: WebSocket):
+        await websocket.accept()
+        await websocket.close()
+
+    app.state.request_counter = FakeInstrument()
+    app.state.duration_histogram = FakeInstrument()
+    app.add_middleware(
+        MetricsMiddleware,
+        request_counter=app.state.request_counter,
+        duration_histogram=app.state.duration_histogram,
+    )
+    return app
+
+
+class TestMetricsMiddleware:
+    def test_records_route_template(self):
+        app = create_app()
+        client = TestClient(app)
+
+        assert client.get("/items/1").status_code == 200
+        client.get("/stream")
+        client.get("/missing")
+
+        attrs = {"http.method": "GET", "http.route": "/items/{id}"}
+        assert app.state.request_counter.values == [
+            (1, {**attrs, "http.status_code": 200}),
+            (1, {**attrs, "http.route": "/stream", "http.status_code": 200}),
+            (1, {**attrs, "http.route": "/missing", "http.status_code": 404}),
+        ]
+        durations = app.state.duration_histogram.values
+        assert [attributes for _, attributes in durations] == [
+            attributes for _, attributes in app.state.request_counter.values
+        ]
+        assert all(duration >= 0 for duration, _ in durations)
+
+    def test_records_errors(self):
+        app = create_app()
+        client = TestClient(app, raise_server_exceptions=False)
+
+        assert client.get("/error").status_code == 500
+
+        # Recorded once, by the middleware or by the error response
+        assert app.state.request_counter.values == [
+            (
+                1,
+                {
+                    "http.method": "GET",
+                    "http.route": "/error",
+                    "http.status_code": 500,
+                },
+            )
+        ]
+
+    def test_websocket_and_lifespan_scopes_are_not_recorded(self):
+        app = create_app()
+
+        with TestClient(app) as client:
+            with client.websocket_connect("/ws"):
+                pass
+
+        assert app.state.request_counter.values == []
@@ -0,0 +1,95 @@
+from types import SimpleNamespace
+
+import pytest
+
+from open_webui.models.functions import Functions
+from open_webui.utils import models as models_module
+from open_webui.utils.models import ModelRegistry
+from open_webui.utils.plugin import load_function_module_by_id
+
+
+def make_request(arena_models=None):
+    config = SimpleNamespace(
+        ENABLE_EVALUATION_ARENA_MODELS=bool(arena_models),
+        EVALUATION_ARENA_MODELS=arena_models or [],
+    )
+    return SimpleNamespace(app=SimpleNamespace(state=SimpleNamespace(config=config)))
+
+
+def fetch_base_models(name="Model"):
+    # Base models are refetched into a new list on every request
+    return [{"id": "model", "name": name, "owned_by": "openai"}]
+
+
+class TestModelRegistry:
+    def test_hit_on_refetched_base_models(self):
+        registry = ModelRegistry()
+        request = make_request()
+        models = [{"id": "model"}]
+
+        registry.set_models(registry.get_key(request, fetch_base_models()), models)
+
+        assert (
+            registry.get_models(registry.get_key(request, fetch_base_models()))
+            is models
+        )
+
+    def test_miss_on_changed_base_models(self):
+        registry = ModelRegistry()
+        request = make_request()
+        registry.set_models(registry.get_key(request, fetch_base_models()), [])
+
+        key = registry.get_key(request, fetch_base_models(name="Renamed"))
+        assert registry.get_models(key) is None
+
+    def test_miss_on_changed_arena_models(self):
+        registry = ModelRegistry()
+        base_models = fetch_base_models()
+        registry.set_models(registry.get_key(make_request(), base_models), [])
+
+        request = make_request(arena_models=[{"id": "arena"}])
+        assert registry.get_models(registry.get_key(request, base_models)) is None
+
+    def test_invalidate(self):
+        registry = ModelRegistry()
+        request = make_request()
+        registry.set_models(registry.get_key(request, fetch_base_models()), [])
+
+        registry.invalidate()
+
+        assert (
+            registry.get_models(registry.get_key(request, fetch_base_models())) is None
+        )
+
+    def test_invalidate_during_build(self):
+        registry = ModelRegistry()
+        request = make_request()
+
+        key = registry.get_key(request, fetch_base_models())
+        # A model is updated while the stale list is being built
+        registry.invalidate()
+        registry.set_models(key, [{"id": "stale"}])
+
+        assert (
+            registry.get_models(registry.get_key(request, fetch_base_models())) is None
+        )
+
+    def test_function_deactivated_on_load_failure(self, monkeypatch):
+        registry = ModelRegistry()
+        monkeypatch.setattr(models_module, "MODEL_REGISTRY", registry)
+        updates = []
+        monkeypatch.setattr(
+            Functions,
+            "update_function_by_id",
+            lambda id, updated, db=None: updates.append((id, updated)),
+        )
+        request = make_request()
+        registry.set_models(registry.get_key(request, fetch_base_models()), [])
+
+        with pytest.raises(Exception):
+            load_function_module_by_id("broken", content="class Pipe(:")
+
+        assert updates == [("broken", {"is_active": False})]
+        assert (
+            registry.get_models(registry.get_key(request, fetch_base_models())) is None
+        )
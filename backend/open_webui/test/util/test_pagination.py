@@ -0,0 +1,110 @@
+import uuid
+
+import pytest
+
+from open_webui.internal.db import Base, engine, get_db
+from open_webui.models.channels import ChannelMember
+from open_webui.models.messages import Message, MessageReaction, Messages
+from open_webui.models.users import User
+from open_webui.utils.db.pagination import paginate_by_cursor, parse_cursor
+
+
+@pytest.fixture(autouse=True)
+def setup_db():
+    Base.metadata.create_all(
+        engine,
+        tables=[
+            User.__table__,
+            ChannelMember.__table__,
+            Message.__table__,
+            MessageReaction.__table__,
+        ],
+    )
+
+
+@pytest.fixture
+def channel_id():
+    channel_id = str(uuid.uuid4())
+    with get_db() as db:
+        # Several messages per timestamp, pages have to break ties on id
+        for i in range(10):
+            db.add(
+                Message(
+                    id=str(uuid.uuid4()),
+                    user_id="user",
+                    channel_id=channel_id,
+                    content=f"Message {i}",
+                    created_at=1000 + i // 3,
+                    updated_at=1000 + i // 3,
+                )
+            )
+        db.commit()
+    return channel_id
+
+
+def get_page(channel_id, cursor=None, descending=True, limit=4):
+    with get_db() as db:
+        query = db.query(Message).filter_by(channel_id=channel_id)
+        return [
+            (message.created_at, message.id)
+            for message in paginate_by_cursor(
+                query, Message.created_at, Message.id, cursor, descending
+            )
+            .limit(limit)
+            .all()
+        ]
+
+
+class TestParseCursor:
+    def test_parse_cursor(self):
+        assert parse_cursor(None) is None
+        assert parse_cursor("") is None
+        assert parse_cursor("1700000000:abc") == (1700000000, "abc")
+        # Only the first colon separates the timestamp from the id
+        assert parse_cursor("1:local:abc") == (1, "local:abc")
+
+    @pytest.mark.parametrize("cursor", ["1700000000", "1700000000:", "abc:def"])
+    def test_invalid_cursor(self, cursor):
+        with pytest.raises(ValueError):
+            parse_cursor(cursor)
+
+
+class TestPaginateByCursor:
+    @pytest.mark.parametrize("descending", [True, False])
+    def test_pages_cover_every_row_once(self, channel_id, descending):
+        rows, cursor = [], None
+        while page := get_page(channel_id, cursor, descending):
+            rows += page
+            cursor = page[-1]
+
+        assert len(rows) == 10
+        assert rows == sorted(rows, reverse=descending)
+
+    def test_rows_inserted_before_the_cursor_do_not_shift_pages(self, channel_id):
+        first = get_page(channel_id)
+        second = get_page(channel_id, first[-1])
+
+        with get_db() as db:
+            db.add(
+                Message(
+                    id=str(uuid.uuid4()),
+                    user_id="user",
+                    channel_id=channel_id,
+                    content="New message",
+                    created_at=2000,
+                    updated_at=2000,
+                )
+            )
+            db.commit()
+
+        assert get_page(channel_id, first[-1]) == second
+
+    def test_get_messages_by_channel_id(self, channel_id):
+        ids, cursor = [], None
+        while messages := Messages.get_messages_by_channel_id(
+            channel_id, limit=4, cursor=cursor
+        ):
+            ids += [message.id for message in messages]
+            cursor = (messages[-1].created_at, messages[-1].id)
+
+        assert sorted(ids) == sorted(id for _, id in get_page(channel_id, limit=10))
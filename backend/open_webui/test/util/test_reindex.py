@@ -0,0 +1,172 @@
+import asyncio
+import uuid
+
+import pytest
+
+from open_webui.internal.db import Base, engine
+from open_webui.models.reindex_jobs import (
+    ReindexJob,
+    ReindexJobFile,
+    ReindexJobKnowledge,
+    ReindexJobs,
+)
+from open_webui.retrieval.vector.dbs.numpy_vector import NumpyVectorClient
+from open_webui.utils import reindex
+
+
+@pytest.fixture(autouse=True)
+def vector_db(tmp_path, monkeypatch):
+    Base.metadata.create_all(
+        engine,
+        tables=[
+            ReindexJob.__table__,
+            ReindexJobKnowledge.__table__,
+            ReindexJobFile.__table__,
+        ],
+    )
+    client = NumpyVectorClient(path=str(tmp_path / "vector_db"))
+    monkeypatch.setattr(reindex, "VECTOR_DB_CLIENT", client)
+    return client
+
+
+def chunk(text, file_id=None, vector=(1.0, 0.0, 0.0)):
+    return {
+        "id": str(uuid.uuid4()),
+        "text": text,
+        "vector": list(vector),
+        "metadata": {"file_id": file_id} if file_id else {},
+    }
+
+
+def live_documents(client, collection_name):
+    return sorted(client.get(collection_name=collection_name).documents[0])
+
+
+class TestSwapShadowCollection:
+    def test_replaces_only_completed_files(self, vector_db):
+        knowledge_id = str(uuid.uuid4())
+        job = ReindexJobs.insert_new_job("user", {knowledge_id: ["a", "b"]})
+        shadow = reindex.get_shadow_collection_name(knowledge_id, job.id)
+
+        vector_db.insert(
+            knowledge_id,
+            [
+                chunk("old a", "a"),
+                chunk("old b", "b"),
+                chunk("added during job", "c"),
+                chunk("no file id"),
+            ],
+        )
+        vector_db.insert(shadow, [chunk("new a", "a")])
+        ReindexJobs.update_file_status(job.id, knowledge_id, "a", "completed")
+        ReindexJobs.update_file_status(job.id, knowledge_id, "b", "failed")
+
+        reindex.swap_shadow_collection(job.id, knowledge_id, shadow)
+
+        assert live_documents(vector_db, knowledge_id) == [
+            "added during job",
+            "new a",
+            "no file id",
+            "old b",
+        ]
+        assert not vector_db.has_collection(collection_name=shadow)
+
+    def test_swap_is_idempotent(self, vector_db):
+        knowledge_id = str(uuid.uuid4())
+        job = ReindexJobs.insert_new_job("user", {knowledge_id: ["a"]})
+        shadow = reindex.get_shadow_collection_name(knowledge_id, job.id)
+
+        vector_db.insert(knowledge_id, [chunk("old a", "a")])
+        vector_db.insert(shadow, [chunk("new a", "a")])
+        ReindexJobs.update_file_status(job.id, knowledge_id, "a", "completed")
+
+        # Interrupted after inserting the new chunks, before deleting the old
+        result = vector_db.query_with_vectors(shadow, filter={"file_id": "a"})
+        vector_db.insert(
+            knowledge_id,
+            [
+                {
+                    "id": str(uuid.uuid4()),
+                    "text": result.documents[0][0],
+                    "vector": result.vectors[0][0],
+                    "metadata": result.metadatas[0][0],
+                }
+            ],
+        )
+
+        reindex.swap_shadow_collection(job.id, knowledge_id, shadow)
+        reindex.swap_shadow_collection(job.id, knowledge_id, shadow)
+
+        assert live_documents(vector_db, knowledge_id) == ["new a"]
+
+
+class TestReindexKnowledge:
+    @pytest.mark.asyncio
+    async def test_file_added_mid_job_survives_swap(self, vector_db, monkeypatch):
+        knowledge_id = str(uuid.uuid4())
+        job = ReindexJobs.insert_new_job("user", {knowledge_id: ["a", "b"]})
+        vector_db.insert(knowledge_id, [chunk("old a", "a"), chunk("old b", "b")])
+
+        def add_file_to_collection(request, file, collection_name, user):
+            if file.id == "a":
+                # A file attached to the knowledge base while the job runs
+                vector_db.insert(knowledge_id, [chunk("new file", "new")])
+            vector_db.insert(collection_name, [chunk(f"reindexed {file.id}", file.id)])
+            return True
+
+        monkeypatch.setattr(reindex, "add_file_to_collection", add_file_to_collection)
+        monkeypatch.setattr(
+            reindex.Files,
+            "get_file_by_id",
+            lambda id, db=None: type("File", (), {"id": id})(),
+        )
+
+        knowledge = ReindexJobs.get_knowledge_by_job_id(job.id)[0]
+        semaphore = asyncio.Semaphore(1)
+        await reindex.reindex_knowledge(None, job.id, knowledge, None, semaphore)
+
+        assert live_documents(vector_db, knowledge_id) == [
+            "new file",
+            "reindexed a",
+            "reindexed b",
+        ]
+        assert ReindexJobs.get_knowledge_by_job_id(job.id)[0].status == "completed"
+
+    @pytest.mark.asyncio
+    async def test_in_place_reindex_keeps_other_files_live(
+        self, vector_db, monkeypatch
+    ):
+        knowledge_id = str(uuid.uuid4())
+        job = ReindexJobs.insert_new_job("user", {knowledge_id: ["a", "b"]})
+        vector_db.insert(
+            knowledge_id,
+            [chunk("old a", "a"), chunk("old b", "b"), chunk("no file id")],
+        )
+        live = {}
+
+        def add_file_to_collection(request, file, collection_name, user):
+            live[file.id] = live_documents(vector_db, knowledge_id)
+            vector_db.insert(collection_name, [chunk(f"reindexed {file.id}", file.id)])
+            return True
+
+        monkeypatch.setattr(reindex, "supports_vector_copy", lambda: False)
+        monkeypatch.setattr(reindex, "add_file_to_collection", add_file_to_collection)
+        monkeypatch.setattr(
+            reindex.Files,
+            "get_file_by_id",
+            lambda id, db=None: type("File", (), {"id": id})(),
+        )
+
+        knowledge = ReindexJobs.get_knowledge_by_job_id(job.id)[0]
+        semaphore = asyncio.Semaphore(1)
+        await reindex.reindex_knowledge(None, job.id, knowledge, None, semaphore)
+
+        # Only the file being reindexed is missing while it is rebuilt
+        assert live["a"] == ["no file id", "old b"]
+        assert live["b"] == ["no file id", "reindexed a"]
+        assert live_documents(vector_db, knowledge_id) == [
+            "no file id",
+            "reindexed a",
+            "reindexed b",
+        ]
+        assert ReindexJobs.get_knowledge_by_job_id(job.id)[0].status == "completed"
@@ -0,0 +1,163 @@
+from types import SimpleNamespace
+
+import pytest
+from starlette.applications import Starlette
+from starlette.responses import JSONResponse, PlainTextResponse
+from starlette.routing import Route, WebSocketRoute
+from starlette.testclient import TestClient
+
+from open_webui.main import RequestMiddleware
+
+
+def create_app(**config):
+    async def endpoint(request):
+        return JSONResponse(
+            {
+                "token": getattr(request.state.token, "credentials", None),
+                "enable_api_keys": request.state.enable_api_keys,
+            }
+        )
+
+    async def websocket_endpoint(websocket):
+        await websocket.accept()
+        await websocket.send_text("connected")
+        await websocket.close()
+
+    async def socket_io(request):
+        return PlainTextResponse("socket.io")
+
+    started = []
+
+    async def on_startup():
+        started.append(True)
+
+    app = Starlette(
+        routes=[
+            Route("/api/v1/chats", endpoint, methods=["GET", "POST"]),
+            Route("/api/v1/chats/{id}", endpoint),
+            Route("/api/v1/chats_archive", endpoint),
+            Route("/api/v1/users", endpoint),
+            Route("/ws/socket.io/", socket_io),
+            WebSocketRoute("/ws", websocket_endpoint),
+        ],
+        on_startup=[on_startup],
+    )
+    app.state.started = started
+    app.state.config = SimpleNamespace(
+        **{
+            "ENABLE_API_KEYS": True,
+            "ENABLE_API_KEYS_ENDPOINT_RESTRICTIONS": False,
+            "API_KEYS_ALLOWED_ENDPOINTS": "",
+            **config,
+        }
+    )
+    app.add_middleware(RequestMiddleware)
+    return app
+
+
+@pytest.fixture(autouse=True)
+def security_headers(monkeypatch):
+    monkeypatch.setenv("XFRAME_OPTIONS", "DENY")
+    monkeypatch.setenv("XCONTENT_TYPE", "nosniff")
+
+
+class TestRequestMiddleware:
+    def test_request_state_and_headers(self):
+        client = TestClient(create_app())
+
+        response = client.get(
+            "/api/v1/chats", headers={"Authorization": "Bearer token"}
+        )
+
+        assert response.json() == {"token": "token", "enable_api_keys": True}
+        assert response.headers["X-Frame-Options"] == "DENY"
+        assert response.headers["X-Content-Type-Options"] == "nosniff"
+        assert int(response.headers["X-Process-Time"]) >= 0
+
+    @pytest.mark.parametrize(
+        "path, allowed",
+        [
+            ("/api/v1/chats", True),
+            ("/api/v1/chats/id", True),
+            ("/api/v1/chats_archive", False),
+            ("/api/v1/users", False),
+        ],
+    )
+    def test_api_key_endpoint_restrictions(self, path, allowed):
+        client = TestClient(
+            create_app(
+                ENABLE_API_KEYS_ENDPOINT_RESTRICTIONS=True,
+                API_KEYS_ALLOWED_ENDPOINTS=" /api/v1/chats, /api/models",
+            )
+        )
+
+        response = client.get(path, headers={"Authorization": "Bearer sk-key"})
+
+        assert response.status_code == (200 if allowed else 403)
+        if not allowed:
+            assert response.json() == {
+                "detail": "API key not allowed to access this endpoint."
+            }
+            assert "X-Frame-Options" not in response.headers
+
+        # Other tokens are not restricted
+        response = client.get(path, headers={"Authorization": "Bearer jwt"})
+        assert response.status_code == 200
+
+    @pytest.mark.parametrize(
+        "url, location",
+        [
+            ("/watch?v=abc", "/?youtube=abc"),
+            ("/?shared=some+text", "/?q=some+text"),
+            (
+                "/?shared=https%3A%2F%2Fexample.com%2Fpage",
+                "/?load-url=https%3A%2F%2Fexample.com%2Fpage",
+            ),
+            (
+                "/?shared=https%3A%2F%2Fwww.youtube.com%2Fwatch%3Fv%3Ddqw4w9wgxcq",
+                "/?youtube=dqw4w9wgxcq",
+            ),
+        ],
+    )
+    def test_redirects(self, url, location):
+        client = TestClient(create_app(), follow_redirects=False)
+
+        response = client.get(url)
+
+        assert response.status_code == 307
+        assert response.headers["Location"] == location
+        assert response.headers["X-Frame-Options"] == "DENY"
+
+    def test_post_is_not_redirected(self):
+        client = TestClient(create_app(), follow_redirects=False)
+
+        assert client.post("/watch?v=abc").status_code == 404
+
+    def test_trailing_slash_redirect(self):
+        client = TestClient(create_app(), follow_redirects=False)
+
+        response = client.get("/api/v1/chats/")
+
+        # Redirects made by the router get the same headers
+        assert response.status_code == 307
+        assert response.headers["Location"].endswith("/api/v1/chats")
+        assert response.headers["X-Frame-Options"] == "DENY"
+        assert "X-Process-Time" in response.headers
+
+    def test_websocket_upgrade_validation(self):
+        client = TestClient(create_app())
+
+        response = client.get("/ws/socket.io/?transport=websocket")
+        assert response.status_code == 400
+        assert response.json() == {"detail": "Invalid WebSocket upgrade request"}
+
+        response = client.get("/ws/socket.io/?transport=polling")
+        assert response.text == "socket.io"
+
+    def test_websocket_and_lifespan_scopes_pass_through(self):
+        app = create_app()
+
+        with TestClient(app) as client:
+            assert app.state.started == [True]
+            with client.websocket_connect("/ws") as websocket:
+                assert websocket.receive_text() == "connected"
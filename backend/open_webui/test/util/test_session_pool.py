@@ -0,0 +1,97 @@
+import asyncio
+from contextlib import asynccontextmanager
+
+import aiohttp
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from open_webui.utils.session_pool import ClientSessionPool
+
+
+@asynccontextmanager
+async def run_server():
+    async def peer(request):
+        # The client port identifies the connection the request arrived on
+        return web.json_response(request.transport.get_extra_info("peername")[1])
+
+    async def slow(request):
+        await asyncio.sleep(float(request.query["delay"]))
+        return web.json_response(True)
+
+    app = web.Application()
+    app.router.add_get("/peer", peer)
+    app.router.add_get("/slow", slow)
+
+    server = TestServer(app)
+    await server.start_server()
+    try:
+        yield server
+    finally:
+        await server.close()
+
+
+class TestClientSessionPool:
+    @pytest.mark.asyncio
+    async def test_sessions_are_reused_per_origin(self):
+        async with run_server() as server:
+            pool = ClientSessionPool()
+            url = str(server.make_url("/peer"))
+
+            session = await pool.get_session(url)
+            assert await pool.get_session(str(server.make_url("/slow"))) is session
+            assert await pool.get_session("http://other.example/") is not session
+            # No limit on concurrent connections by default
+            assert session.connector.limit == 0
+
+            ports = []
+            for _ in range(3):
+                async with pool.session(url) as session:
+                    async with session.get(url) as response:
+                        ports.append(await response.json())
+
+            # Every request went over the same keep-alive connection
+            assert len(set(ports)) == 1
+            await pool.close()
+
+    @pytest.mark.asyncio
+    async def test_close(self):
+        async with run_server() as server:
+            pool = ClientSessionPool()
+            sessions = [
+                await pool.get_session(str(server.make_url("/peer"))),
+                await pool.get_session("http://other.example/"),
+            ]
+
+            await pool.close()
+
+            assert all(session.closed for session in sessions)
+            assert pool.get_stats() == {}
+            # A new session is opened on the next request
+            session = await pool.get_session(str(server.make_url("/peer")))
+            assert session not in sessions and not session.closed
+            await pool.close()
+
+    @pytest.mark.asyncio
+    async def test_per_request_timeout(self):
+        async with run_server() as server:
+            pool = ClientSessionPool()
+            url = str(server.make_url("/slow"))
+            session = await pool.get_session(url)
+
+            with pytest.raises(asyncio.TimeoutError):
+                async with session.get(
+                    url,
+                    params={"delay": "1"},
+                    timeout=aiohttp.ClientTimeout(total=0.05),
+                ):
+                    pass
+
+            # The timeout applied to that request only, the pooled session is still usable
+            async with session.get(
+                url,
+                params={"delay": "0.1"},
+                timeout=aiohttp.ClientTimeout(total=5),
+            ) as response:
+                assert await response.json() is True
+            await pool.close()
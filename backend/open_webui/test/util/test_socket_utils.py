@@ -0,0 +1,555 @@
+import asyncio
+import json
+from unittest.mock import AsyncMock
+
+import pycrdt as Y
+import pytest
+
+from open_webui.socket import main as socket_main
+from open_webui.socket import utils as socket_utils
+from open_webui.socket.utils import (
+    AsyncRedisDict,
+    MessageEventBuffer,
+    RedisUsagePool,
+    UsagePool,
+    YdocManager,
+)
+
+
+class FakeRedis:
+    """The subset of the async Redis client used by the socket utils."""
+
+    def __init__(self):
+        self.values = {}
+        self.lists = {}
+        self.sets = {}
+        self.hashes = {}
+        self.sorted_sets = {}
+
+    async def get(self, key):
+        return self.values.get(key)
+
+    async def set(self, key, value, nx=False, xx=False, ex=None):
+        if (nx and key in self.values) or (xx and key not in self.values):
+            return None
+        self.values[key] = value
+        return True
+
+    async def delete(self, *keys):
+        for key in keys:
+            for store in (self.values, self.lists, self.sets):
+                store.pop(key, None)
+
+    async def exists(self, key):
+        return int(any(key in store for store in (self.values, self.lists, self.sets)))
+
+    async def rpush(self, key, value):
+        self.lists.setdefault(key, []).append(value)
+        return len(self.lists[key])
+
+    async def lset(self, key, index, value):
+        self.lists[key][index] = value
+
+    async def ltrim(self, key, start, end):
+        values = self.lists.get(key, [])
+        self.lists[key] = values[start:] if end == -1 else values[start : end + 1]
+
+    async def execute_command(self, command, key, start, end, **kwargs):
+        assert command == "LRANGE" and end == -1
+        return self.lists.get(key, [])[start:]
+
+    async def sadd(self, key, value):
+        self.sets.setdefault(key, set()).add(value)
+
+    async def srem(self, key, value):
+        self.sets.get(key, set()).discard(value)
+
+    async def scard(self, key):
+        return len(self.sets.get(key, set()))
+
+    async def smembers(self, key):
+        return set(self.sets.get(key, set()))
+
+    async def hget(self, key, field):
+        return self.hashes.get(key, {}).get(field)
+
+    async def hmget(self, key, fields):
+        return [self.hashes.get(key, {}).get(field) for field in fields]
+
+    async def hset(self, key, field, value):
+        self.hashes.setdefault(key, {})[field] = value
+
+    async def hdel(self, key, field):
+        self.hashes.get(key, {}).pop(field, None)
+
+    async def hkeys(self, key):
+        return list(self.hashes.get(key, {}))
+
+    async def zadd(self, key, mapping):
+        self.sorted_sets.setdefault(key, {}).update(mapping)
+
+    async def zrangebyscore(self, key, min, max):
+        return [
+            member
+            for member, score in self.sorted_sets.get(key, {}).items()
+            if in_score_range(score, min, max)
+        ]
+
+    async def zremrangebyscore(self, key, min, max):
+        members = await self.zrangebyscore(key, min, max)
+        for member in members:
+            del self.sorted_sets[key][member]
+        return len(members)
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+
+def in_score_range(score, min, max) -> bool:
+    def parse(bound):
+        bound = str(bound)
+        if bound.startswith("("):
+            return float(bound[1:]), True
+        return float(bound), False
+
+    (min, min_exclusive), (max, max_exclusive) = parse(min), parse(max)
+    return (score > min if min_exclusive else score >= min) and (
+        score < max if max_exclusive else score <= max
+    )
+
+
+class FakePipeline:
+    def __init__(self, redis):
+        self.redis = redis
+        self.commands = []
+
+    def __getattr__(self, name):
+        def queue(*args, **kwargs):
+            self.commands.append((getattr(self.redis, name), args, kwargs))
+
+        return queue
+
+    async def execute(self):
+        return [await method(*args, **kwargs) for method, args, kwargs in self.commands]
+
+
+class TextDocument:
+    """Produces the Yjs updates of a shared text, one per edit."""
+
+    def __init__(self):
+        self.ydoc = Y.Doc()
+        self.ydoc["text"] = self.text = Y.Text()
+
+    def edit(self, value: str) -> bytes:
+        state = self.ydoc.get_state()
+        self.text += value
+        return self.ydoc.get_update(state)
+
+
+def get_text(ydoc) -> str:
+    return str(ydoc.get("text", type=Y.Text))
+
+
+def create_manager(redis=None, **kwargs):
+    return YdocManager(
+        redis=redis,
+        redis_key_prefix="documents",
+        redis_session_key_prefix="sessions",
+        **kwargs,
+    )
+
+
+class RecordingFlush:
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, chat_id, message_id, pending):
+        self.calls.append((chat_id, message_id, pending))
+
+
+class TestMessageEventBuffer:
+    @pytest.mark.asyncio
+    async def test_coalesces_events_until_flush(self):
+        flush_fn = RecordingFlush()
+        buffer = MessageEventBuffer(flush_fn, interval=60)
+
+        await buffer.add("chat", "message", "message", {"content": "Hello"})
+        await buffer.add("chat", "message", "message", {"content": " world"})
+        await buffer.add("chat", "message", "status", {"action": "web_search"})
+        await buffer.add("chat", "message", "files", {"files": [{"id": "a"}]})
+        await buffer.add("chat", "message", "files", {"files": [{"id": "b"}]})
+        assert flush_fn.calls == []
+
+        await buffer.flush("chat", "message")
+
+        [(chat_id, message_id, pending)] = flush_fn.calls
+        assert (chat_id, message_id) == ("chat", "message")
+        assert pending["content"] == "Hello world"
+        assert pending["replace"] is None
+        assert pending["status"] == [{"action": "web_search"}]
+        assert pending["files"] == [{"id": "b"}, {"id": "a"}]
+
+    @pytest.mark.asyncio
+    async def test_replace_drops_earlier_content(self):
+        flush_fn = RecordingFlush()
+        buffer = MessageEventBuffer(flush_fn, interval=60)
+
+        await buffer.add("chat", "message", "message", {"content": "draft"})
+        await buffer.add("chat", "message", "replace", {"content": "final"})
+        await buffer.add("chat", "message", "message", {"content": "!"})
+        await buffer.flush_all()
+
+        [(_, _, pending)] = flush_fn.calls
+        assert pending["replace"] == "final"
+        assert pending["content"] == "!"
+
+    @pytest.mark.asyncio
+    async def test_flushes_after_interval(self):
+        flush_fn = RecordingFlush()
+        buffer = MessageEventBuffer(flush_fn, interval=0.01)
+
+        await buffer.add("chat", "message", "message", {"content": "Hello"})
+        await asyncio.sleep(0.1)
+
+        assert [pending["content"] for _, _, pending in flush_fn.calls] == ["Hello"]
+
+    @pytest.mark.asyncio
+    async def test_flushes_at_max_size(self):
+        flush_fn = RecordingFlush()
+        buffer = MessageEventBuffer(flush_fn, interval=60, max_size=10)
+
+        await buffer.add("chat", "message", "message", {"content": "12345"})
+        assert flush_fn.calls == []
+        await buffer.add("chat", "message", "message", {"content": "67890"})
+
+        assert [pending["content"] for _, _, pending in flush_fn.calls] == [
+            "1234567890"
+        ]
+
+    @pytest.mark.asyncio
+    async def test_messages_are_buffered_separately(self):
+        flush_fn = RecordingFlush()
+        buffer = MessageEventBuffer(flush_fn, interval=60)
+
+        await buffer.add("chat", "a", "message", {"content": "A"})
+        await buffer.add("chat", "b", "message", {"content": "B"})
+        await buffer.flush("chat", "a")
+
+        assert [
+            (message_id, pending["content"])
+            for _, message_id, pending in flush_fn.calls
+        ] == [("a", "A")]
+
+        await buffer.flush_all()
+        assert [message_id for _, message_id, _ in flush_fn.calls] == ["a", "b"]
+
+    @pytest.mark.asyncio
+    async def test_flush_error_does_not_raise(self):
+        def flush_fn(chat_id, message_id, pending):
+            raise RuntimeError("database is locked")
+
+        buffer = MessageEventBuffer(flush_fn, interval=60)
+        await buffer.add("chat", "message", "message", {"content": "Hello"})
+
+        await buffer.flush("chat", "message")
+        await buffer.flush("chat", "message")
+
+    @pytest.mark.asyncio
+    async def test_flush_cancels_pending_timer(self):
+        flush_fn = RecordingFlush()
+        buffer = MessageEventBuffer(flush_fn, interval=0.05)
+
+        await buffer.add("chat", "message", "message", {"content": "Hello"})
+        await buffer.flush("chat", "message")
+        # Written by the response handler after the explicit flush
+        await asyncio.sleep(0.1)
+
+        assert [pending["content"] for _, _, pending in flush_fn.calls] == ["Hello"]
+        assert buffer._timers == {}
+
+
+class TestEventEmitter:
+    @pytest.mark.asyncio
+    async def test_completion_events_do_not_flush(self, monkeypatch):
+        flush_fn = RecordingFlush()
+        buffer = MessageEventBuffer(flush_fn, interval=60)
+        monkeypatch.setattr(socket_main, "MESSAGE_EVENT_BUFFER", buffer)
+        monkeypatch.setattr(socket_main.sio, "emit", AsyncMock())
+
+        event_emitter = socket_main.get_event_emitter(
+            {"user_id": "user", "chat_id": "chat", "message_id": "message"}
+        )
+        for content in ["Hello", " world"]:
+            await event_emitter({"type": "message", "data": {"content": content}})
+            await event_emitter(
+                {"type": "chat:completion", "data": {"content": content}}
+            )
+        await event_emitter({"type": "chat:tasks:cancel"})
+
+        assert flush_fn.calls == []
+        await buffer.flush("chat", "message")
+        assert [pending["content"] for _, _, pending in flush_fn.calls] == [
+            "Hello world"
+        ]
+
+
+class TestYdocManagerCompaction:
+    @pytest.mark.asyncio
+    async def test_compact_merges_updates(self):
+        redis = FakeRedis()
+        manager = create_manager(redis)
+        document = TextDocument()
+        for word in ["a", "b", "c"]:
+            await manager.append_to_updates("note:1", document.edit(word))
+        version = await redis.get("documents:note_1:version")
+
+        await manager.compact("note:1")
+
+        assert len(redis.lists["documents:note_1:updates"]) == 1
+        assert await redis.get("documents:note_1:version") != version
+        assert "documents:note_1:compaction" not in redis.values
+        assert get_text(await manager.get_ydoc("note:1")) == "abc"
+        # Readers with an empty cache rebuild the same document
+        assert get_text(await create_manager(redis).get_ydoc("note:1")) == "abc"
+
+    @pytest.mark.asyncio
+    async def test_compacts_at_threshold(self):
+        redis = FakeRedis()
+        manager = create_manager(redis, compaction_threshold=3)
+        document = TextDocument()
+
+        for word in ["a", "b", "c", "d"]:
+            await manager.append_to_updates("note", document.edit(word))
+            await asyncio.gather(*manager._compaction_tasks)
+
+        assert len(redis.lists["documents:note:updates"]) == 2
+        assert get_text(await manager.get_ydoc("note")) == "abcd"
+
+    @pytest.mark.asyncio
+    async def test_compaction_invalidates_other_caches(self):
+        redis = FakeRedis()
+        manager = create_manager(redis)
+        other_manager = create_manager(redis)
+        document = TextDocument()
+
+        await manager.append_to_updates("note", document.edit("a"))
+        await manager.append_to_updates("note", document.edit("b"))
+        assert get_text(await other_manager.get_ydoc("note")) == "ab"
+
+        await manager.compact("note")
+        await manager.append_to_updates("note", document.edit("c"))
+
+        assert get_text(await other_manager.get_ydoc("note")) == "abc"
+
+    @pytest.mark.asyncio
+    async def test_skips_locked_document(self):
+        redis = FakeRedis()
+        manager = create_manager(redis)
+        document = TextDocument()
+        await manager.append_to_updates("note", document.edit("a"))
+        await manager.append_to_updates("note", document.edit("b"))
+        await redis.set("documents:note:compaction", "other-node")
+
+        await manager.compact("note")
+
+        assert len(redis.lists["documents:note:updates"]) == 2
+        assert await redis.get("documents:note:compaction") == "other-node"
+
+    @pytest.mark.asyncio
+    async def test_reads_legacy_json_updates(self):
+        redis = FakeRedis()
+        manager = create_manager(redis)
+        document = TextDocument()
+        await redis.rpush(
+            "documents:note:updates", json.dumps(list(document.edit("a")))
+        )
+        await manager.append_to_updates("note", document.edit("b"))
+
+        assert get_text(await manager.get_ydoc("note")) == "ab"
+        await manager.compact("note")
+        assert get_text(await create_manager(redis).get_ydoc("note")) == "ab"
+
+
+class TestYdocManagerSessions:
+    @pytest.mark.asyncio
+    async def test_remove_user_from_all_documents_with_redis(self):
+        redis = FakeRedis()
+        manager = create_manager(redis)
+        document = TextDocument()
+        for document_id in ["note:1", "note:2", "note:3"]:
+            await manager.append_to_updates(document_id, document.edit("a"))
+        await manager.add_user("note:1", "sid")
+        await manager.add_user("note:2", "sid")
+        await manager.add_user("note:2", "other-sid")
+        await manager.add_user("note:3", "other-sid")
+
+        await manager.remove_user_from_all_documents("sid")
+
+        assert not await manager.document_exists("note:1")
+        assert await manager.get_users("note:2") == ["other-sid"]
+        assert await manager.document_exists("note:2")
+        assert await manager.document_exists("note:3")
+        assert "sessions:sid" not in redis.sets
+        assert await redis.smembers("sessions:other-sid") == {"note_2", "note_3"}
+
+    @pytest.mark.asyncio
+    async def test_remove_user_only_touches_joined_documents(self):
+        redis = FakeRedis()
+        manager = create_manager(redis)
+        document = TextDocument()
+        await manager.append_to_updates("note", document.edit("a"))
+        await manager.add_user("note", "sid")
+        await manager.remove_user("note", "sid")
+        await manager.add_user("other-note", "sid")
+
+        await manager.remove_user_from_all_documents("sid")
+
+        # Left before disconnecting, so no longer in the session index
+        assert await manager.document_exists("note")
+        assert "sessions:sid" not in redis.sets
+
+    @pytest.mark.asyncio
+    async def test_remove_user_from_all_documents_in_memory(self):
+        manager = create_manager()
+        document = TextDocument()
+        for document_id in ["note:1", "note:2"]:
+            await manager.append_to_updates(document_id, document.edit("a"))
+        await manager.add_user("note:1", "sid")
+        await manager.add_user("note:2", "sid")
+        await manager.add_user("note:2", "other-sid")
+
+        await manager.remove_user_from_all_documents("sid")
+
+        assert not await manager.document_exists("note:1")
+        assert await manager.document_exists("note:2")
+        assert await manager.get_users("note:2") == {"other-sid"}
+        assert "sid" not in manager._sessions
+
+
+@pytest.fixture
+def now(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(socket_utils.time, "monotonic", lambda: now[0])
+    monkeypatch.setattr(socket_utils.time, "time", lambda: now[0])
+    return now
+
+
+class TestAsyncRedisDict:
+    @pytest.mark.asyncio
+    async def test_set_get_delete(self):
+        redis = FakeRedis()
+        pool = AsyncRedisDict("session_pool", redis)
+
+        await pool.set("a", {"id": "user"})
+        assert await pool.get("a") == {"id": "user"}
+        assert await pool.get("missing", "default") == "default"
+        assert await pool.contains("a")
+        assert await pool.keys() == ["a"]
+        assert json.loads(redis.hashes["session_pool"]["a"]) == {"id": "user"}
+
+        await pool.delete("a")
+        assert await pool.get("a") is None
+        assert not await pool.contains("a")
+        assert redis.hashes["session_pool"] == {}
+
+    @pytest.mark.asyncio
+    async def test_get_many(self):
+        redis = FakeRedis()
+        pool = AsyncRedisDict("session_pool", redis)
+        await pool.set("a", 1)
+        await AsyncRedisDict("session_pool", redis).set("b", 2)
+
+        assert await pool.get_many(["a", "b", "missing"]) == {"a": 1, "b": 2}
+
+    @pytest.mark.asyncio
+    async def test_reads_are_cached(self, now):
+        redis = FakeRedis()
+        pool = AsyncRedisDict("session_pool", redis, cache_ttl=30)
+        other_pool = AsyncRedisDict("session_pool", redis, cache_ttl=30)
+
+        await other_pool.set("a", 1)
+        assert await pool.get("a") == 1
+
+        # Writes from other nodes are seen once the cached entry expires
+        await other_pool.set("a", 2)
+        assert await pool.get("a") == 1
+        now[0] += 31
+        assert await pool.get("a") == 2
+
+        # Entries deleted elsewhere are dropped the same way
+        await other_pool.delete("a")
+        now[0] += 31
+        assert await pool.get("a") is None
+
+    @pytest.mark.asyncio
+    async def test_cache_size(self, now):
+        pool = AsyncRedisDict("session_pool", FakeRedis(), cache_size=2)
+
+        await pool.set("a", 1)
+        now[0] += 31
+        await pool.set("b", 2)
+        # Expired entries are evicted first
+        await pool.set("c", 3)
+        assert set(pool._cache) == {"b", "c"}
+
+        await pool.set("d", 4)
+        assert len(pool._cache) <= 2
+        assert await pool.get_many(["b", "c", "d"]) == {"b": 2, "c": 3, "d": 4}
+
+
+class TestUsagePool:
+    @pytest.fixture(params=["memory", "redis"])
+    def pool(self, request):
+        if request.param == "redis":
+            return RedisUsagePool("usage", FakeRedis(), timeout=3)
+        return UsagePool(timeout=3)
+
+    @pytest.mark.asyncio
+    async def test_stale_entries_expire(self, pool, now):
+        await pool.touch("model-a", "sid-1")
+        await pool.touch("model-b", "sid-2")
+        now[0] += 2
+        await pool.touch("model-a", "sid-3")
+        assert sorted(await pool.get_model_ids()) == ["model-a", "model-b"]
+
+        now[0] += 2
+        assert await pool.get_model_ids() == ["model-a"]
+
+        # Touching again keeps a session's model in use
+        await pool.touch("model-b", "sid-2")
+        assert sorted(await pool.get_model_ids()) == ["model-a", "model-b"]
+
+    @pytest.mark.asyncio
+    async def test_remove_expired(self, pool, now):
+        await pool.touch("model-a", "sid-1")
+        now[0] += 2
+        await pool.touch("model-b", "sid-2")
+        now[0] += 2
+
+        await pool.remove_expired()
+
+        if isinstance(pool, RedisUsagePool):
+            members = pool.redis.sorted_sets["usage"]
+        else:
+            members = pool._data
+        assert len(members) == 1
+        assert await pool.get_model_ids() == ["model-b"]
+
+    @pytest.mark.asyncio
+    async def test_periodic_cleanup(self, monkeypatch):
+        pool = UsagePool()
+        pool.remove_expired = AsyncMock(side_effect=[Exception("Unavailable"), None])
+        monkeypatch.setattr(socket_main, "USAGE_POOL", pool)
+        monkeypatch.setattr(socket_main, "TIMEOUT_DURATION", 0.01)
+
+        async def cleaned_up_twice():
+            while pool.remove_expired.await_count < 2:
+                await asyncio.sleep(0.01)
+
+        task = asyncio.create_task(socket_main.periodic_usage_pool_cleanup())
+        # A failed cleanup does not stop the loop
+        await asyncio.wait_for(cleaned_up_twice(), timeout=5)
+
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
@@ -4,9 +4,16 @@ from open_webui.models.groups import Groups
 
 
 from open_webui.config import DEFAULT_USER_PERMISSIONS
+from open_webui.env import GROUP_MEMBERSHIP_CACHE_TTL
+from open_webui.utils.cache import VersionedCache
 import json
 
 
+# user_id -> (groups, default_permissions, permissions). An entry is only reused
+# while the cached group list is still current and the defaults are unchanged.
+PERMISSIONS_CACHE = VersionedCache("permissions", ttl=GROUP_MEMBERSHIP_CACHE_TTL)
+
+
 def fill_missing_permissions(
     permissions: Dict[str, Any], default_permissions: Dict[str, Any]
 ) -> Dict[str, Any]:
@@ -56,7 +63,17 @@ def get_permissions(
 
     user_groups = Groups.get_groups_by_member_id(user_id, db=db)
 
+    if GROUP_MEMBERSHIP_CACHE_TTL:
+        cached = PERMISSIONS_CACHE.get(user_id)
+        if (
+            cached is not None
+            and cached[0] is user_groups
+            and cached[1] == default_permissions
+        ):
+            return cached[2]
+
     # Deep copy default permissions to avoid modifying the original dict
+    default_permissions_copy = json.loads(json.dumps(default_permissions))
     permissions = json.loads(json.dumps(default_permissions))
 
     # Combine permissions from all user groups
@@ -66,6 +83,11 @@ def get_permissions(
     # Ensure all fields from default_permissions are present and filled in
     permissions = fill_missing_permissions(permissions, default_permissions)
 
+    if GROUP_MEMBERSHIP_CACHE_TTL:
+        PERMISSIONS_CACHE.set(
+            user_id, (user_groups, default_permissions_copy, permissions)
+        )
+
     return permissions
 
 
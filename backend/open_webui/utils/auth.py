@@ -1,3 +1,4 @@
+import asyncio
 import logging
 import uuid
 import jwt
@@ -36,6 +37,7 @@ from open_webui.env import (
     PASSWORD_VALIDATION_HINT,
     PASSWORD_VALIDATION_REGEX_PATTERN,
     REDIS_KEY_PREFIX,
+    DATABASE_USER_ACTIVE_STATUS_FLUSH_INTERVAL,
     pk,
     WEBUI_SECRET_KEY,
     TRUSTED_SIGNATURE_KEY,
@@ -325,7 +327,7 @@ async def get_current_user(
                     detail="Invalid token",
                 )
 
-            user = Users.get_user_by_id(data["id"])
+            user = Users.get_cached_user_by_id(data["id"])
             if user is None:
                 raise HTTPException(
                     status_code=status.HTTP_401_UNAUTHORIZED,
@@ -350,10 +352,8 @@ async def get_current_user(
                     current_span.set_attribute("client.user.role", user.role)
                     current_span.set_attribute("client.auth.type", "jwt")
 
-                # Refresh the user's last active timestamp asynchronously
-                # to prevent blocking the request
-                if background_tasks:
-                    background_tasks.add_task(Users.update_last_active_by_id, user.id)
+                # Refresh the user's last active timestamp in the next batched write
+                Users.mark_user_active_by_id(user.id)
             return user
         else:
             raise HTTPException(
@@ -375,9 +375,19 @@ async def get_current_user(
         raise e
 
 
+async def periodic_user_last_active_flush():
+    """Write users' pending last_active_at timestamps in one batch per interval."""
+    while True:
+        await asyncio.sleep(DATABASE_USER_ACTIVE_STATUS_FLUSH_INTERVAL)
+        try:
+            await asyncio.to_thread(Users.flush_last_active)
+        except Exception as e:
+            log.error(f"Error flushing user activity: {e}")
+
+
 def get_current_user_by_api_key(request, api_key: str):
     # Each function call manages its own short-lived session internally
-    user = Users.get_user_by_api_key(api_key)
+    user = Users.get_cached_user_by_api_key(api_key)
 
     if user is None:
         raise HTTPException(
@@ -405,7 +415,7 @@ def get_current_user_by_api_key(request, api_key: str):
         current_span.set_attribute("client.user.role", user.role)
         current_span.set_attribute("client.auth.type", "api_key")
 
-    Users.update_last_active_by_id(user.id)
+    Users.mark_user_active_by_id(user.id)
     return user
 
 
@@ -0,0 +1,131 @@
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+
+from open_webui.env import (
+    REDIS_URL,
+    REDIS_CLUSTER,
+    REDIS_KEY_PREFIX,
+    REDIS_SENTINEL_HOSTS,
+    REDIS_SENTINEL_PORT,
+)
+from open_webui.utils.redis import get_redis_connection, get_sentinels_from_env
+
+log = logging.getLogger(__name__)
+
+
+class VersionedCache:
+    """
+    Process-local LRU cache with a TTL whose entries can be invalidated
+    across workers.
+
+    Invalidations drop the entry locally and bump a version counter in Redis
+    (when configured). Every worker compares its last seen version at most
+    once every `sync_interval` seconds and clears its local entries when the
+    counter has moved, so stale reads are bounded by that interval.
+    """
+
+    _MISSING = object()
+
+    def __init__(
+        self,
+        name: str,
+        ttl: float = 60,
+        maxsize: int = 10000,
+        sync_interval: float = 1.0,
+    ):
+        self.name = name
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self.sync_interval = sync_interval
+
+        self._entries: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+
+        self._redis = None
+        self._redis_initialized = False
+        self._version: Optional[str] = None
+        self._version_checked_at = 0.0
+
+    def _get_redis(self):
+        if not self._redis_initialized:
+            self._redis_initialized = True
+            if REDIS_URL:
+                try:
+                    self._redis = get_redis_connection(
+                        redis_url=REDIS_URL,
+                        redis_sentinels=get_sentinels_from_env(
+                            REDIS_SENTINEL_HOSTS, REDIS_SENTINEL_PORT
+                        ),
+                        redis_cluster=REDIS_CLUSTER,
+                        decode_responses=True,
+                    )
+                except Exception as e:
+                    log.error(f"Failed to connect to Redis for {self.name} cache: {e}")
+        return self._redis
+
+    def _get_version_key(self) -> str:
+        return f"{REDIS_KEY_PREFIX}:cache:{self.name}:version"
+
+    def _sync(self):
+        redis = self._get_redis()
+        if redis is None:
+            return
+
+        now = time.monotonic()
+        if now - self._version_checked_at < self.sync_interval:
+            return
+        self._version_checked_at = now
+
+        try:
+            version = redis.get(self._get_version_key())
+        except Exception as e:
+            log.error(f"Failed to check {self.name} cache version: {e}")
+            return
+
+        if version != self._version:
+            self._version = version
+            with self._lock:
+                self._entries.clear()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        self._sync()
+
+        with self._lock:
+            entry = self._entries.get(key, self._MISSING)
+            if entry is self._MISSING:
+                return default
+
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return default
+
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: Hashable, value: Any):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, *keys: Hashable):
+        """Drop the given keys (or every entry if none are given) on all workers."""
+        with self._lock:
+            if keys:
+                for key in keys:
+                    self._entries.pop(key, None)
+            else:
+                self._entries.clear()
+
+        redis = self._get_redis()
+        if redis is not None:
+            try:
+                redis.incr(self._get_version_key())
+            except Exception as e:
+                log.error(f"Failed to publish {self.name} cache invalidation: {e}")
@@ -0,0 +1,46 @@
+from typing import Optional
+
+from sqlalchemy import and_, or_
+
+
+def parse_cursor(cursor: Optional[str]) -> Optional[tuple[int, str]]:
+    """
+    Parse a keyset pagination cursor, "<timestamp>:<id>" of the last item of
+    the previous page. Raises ValueError for malformed cursors.
+    """
+    if not cursor:
+        return None
+
+    timestamp, _, id = cursor.partition(":")
+    if not id:
+        raise ValueError(f"Invalid cursor: {cursor}")
+    return int(timestamp), id
+
+
+def paginate_by_cursor(
+    query,
+    column,
+    id_column,
+    cursor: Optional[tuple[int, str]] = None,
+    descending: bool = True,
+):
+    """
+    Order `query` by (column, id_column) and keep only the rows after `cursor`,
+    the (column, id_column) values of the last row of the previous page. Unlike
+    OFFSET, the database seeks straight to the page instead of scanning every
+    row before it.
+    """
+    if cursor:
+        value, id = cursor
+        if descending:
+            query = query.filter(
+                or_(column < value, and_(column == value, id_column < id))
+            )
+        else:
+            query = query.filter(
+                or_(column > value, and_(column == value, id_column > id))
+            )
+
+    if descending:
+        return query.order_by(column.desc(), id_column.desc())
+    return query.order_by(column.asc(), id_column.asc())
@@ -55,45 +55,39 @@ def get_sorted_filter_ids(request, model: dict, enabled_filter_ids: list = None)
     return filter_ids
 
 
-async def process_filter_functions(
-    request, filter_functions, filter_type, form_data, extra_params
-):
-    skip_files = None
-
-    for function in filter_functions:
-        filter = function
-        filter_id = function.id
-        if not filter:
-            continue
-
-        function_module = get_function_module(
-            request, filter_id, load_from_db=(filter_type != "stream")
-        )
-        # Prepare handler function
-        handler = getattr(function_module, filter_type, None)
-        if not handler:
-            continue
-
-        # Check if the function has a file_handler variable
-        if filter_type == "inlet" and hasattr(function_module, "file_handler"):
-            skip_files = function_module.file_handler
-
-        # Apply valves to the function
-        if hasattr(function_module, "valves") and hasattr(function_module, "Valves"):
-            valves = Functions.get_function_valves_by_id(filter_id)
-            function_module.valves = function_module.Valves(
-                **(valves if valves else {})
-            )
+class FilterPipeline:
+    """
+    Filter functions of one type, resolved once: module, handler, accepted
+    parameters and valves. Build it once per request and call `run` for every
+    payload, which keeps the per-chunk "stream" hook free of DB queries and
+    signature inspection. Valves are re-read from the per-worker cache on each
+    run and only rebuilt when they have changed.
+    """
 
-        try:
-            # Prepare parameters
-            sig = inspect.signature(handler)
+    def __init__(self, request, filter_functions, filter_type, extra_params):
+        self.filter_type = filter_type
+        self.skip_files = None
+        self.filters = []
 
-            params = {"body": form_data}
-            if filter_type == "stream":
-                params = {"event": form_data}
+        for function in filter_functions:
+            if not function:
+                continue
 
-            params = params | {
+            filter_id = function.id
+            function_module = get_function_module(
+                request, filter_id, load_from_db=(filter_type != "stream")
+            )
+            # Prepare handler function
+            handler = getattr(function_module, filter_type, None)
+            if not handler:
+                continue
+
+            # Check if the function has a file_handler variable
+            if filter_type == "inlet" and hasattr(function_module, "file_handler"):
+                self.skip_files = function_module.file_handler
+
+            sig = inspect.signature(handler)
+            params = {
                 k: v
                 for k, v in {
                     **extra_params,
@@ -102,33 +96,92 @@ async def process_filter_functions(
                 if k in sig.parameters
             }
 
-            # Handle user parameters
-            if "__user__" in sig.parameters:
-                if hasattr(function_module, "UserValves"):
-                    try:
-                        params["__user__"]["valves"] = function_module.UserValves(
-                            **Functions.get_user_valves_by_id_and_user_id(
-                                filter_id, params["__user__"]["id"]
-                            )
-                        )
-                    except Exception as e:
-                        log.exception(f"Failed to get user values: {e}")
-
-            # Execute handler
-            if inspect.iscoroutinefunction(handler):
-                form_data = await handler(**params)
-            else:
-                form_data = handler(**params)
+            self.filters.append(
+                {
+                    "id": filter_id,
+                    "module": function_module,
+                    "handler": handler,
+                    "is_coroutine": inspect.iscoroutinefunction(handler),
+                    "params": params,
+                    "has_valves": hasattr(function_module, "valves")
+                    and hasattr(function_module, "Valves"),
+                    "has_user_valves": "__user__" in sig.parameters
+                    and hasattr(function_module, "UserValves"),
+                    "valves_data": None,
+                    "valves": None,
+                    "user_valves_data": None,
+                    "user_valves": None,
+                }
+            )
+
+    def _apply_valves(self, filter):
+        function_module = filter["module"]
+
+        valves_data = Functions.get_cached_function_valves_by_id(filter["id"]) or {}
+        if filter["valves"] is None or valves_data != filter["valves_data"]:
+            filter["valves"] = function_module.Valves(**valves_data)
+            filter["valves_data"] = valves_data
 
+        function_module.valves = filter["valves"]
+
+    def _apply_user_valves(self, filter, params):
+        function_module = filter["module"]
+
+        try:
+            user_valves_data = Functions.get_cached_user_valves_by_id_and_user_id(
+                filter["id"], params["__user__"]["id"]
+            )
+            if (
+                filter["user_valves"] is None
+                or user_valves_data != filter["user_valves_data"]
+            ):
+                filter["user_valves"] = function_module.UserValves(**user_valves_data)
+                filter["user_valves_data"] = user_valves_data
+
+            params["__user__"]["valves"] = filter["user_valves"]
         except Exception as e:
-            log.debug(f"Error in {filter_type} handler {filter_id}: {e}")
-            raise e
+            log.exception(f"Failed to get user values: {e}")
+
+    async def run(self, form_data):
+        for filter in self.filters:
+            # Apply valves to the function
+            if filter["has_valves"]:
+                self._apply_valves(filter)
+
+            try:
+                # Prepare parameters
+                params = {"body": form_data}
+                if self.filter_type == "stream":
+                    params = {"event": form_data}
+
+                params = params | filter["params"]
+
+                # Handle user parameters
+                if filter["has_user_valves"]:
+                    self._apply_user_valves(filter, params)
 
-    # Handle file cleanup for inlet
-    if skip_files:
-        if "files" in form_data.get("metadata", {}):
-            del form_data["metadata"]["files"]
-        if "files" in form_data:
-            del form_data["files"]
+                # Execute handler
+                if filter["is_coroutine"]:
+                    form_data = await filter["handler"](**params)
+                else:
+                    form_data = filter["handler"](**params)
 
-    return form_data, {}
+            except Exception as e:
+                log.debug(f"Error in {self.filter_type} handler {filter['id']}: {e}")
+                raise e
+
+        # Handle file cleanup for inlet
+        if self.skip_files:
+            if "files" in form_data.get("metadata", {}):
+                del form_data["metadata"]["files"]
+            if "files" in form_data:
+                del form_data["files"]
+
+        return form_data, {}
+
+
+async def process_filter_functions(
+    request, filter_functions, filter_type, form_data, extra_params
+):
+    pipeline = FilterPipeline(request, filter_functions, filter_type, extra_params)
+    return await pipeline.run(form_data)
@@ -0,0 +1,253 @@
+import asyncio
+import logging
+import os
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Optional
+
+from fastapi import FastAPI
+from fastapi.concurrency import run_in_threadpool
+from opentelemetry import metrics
+from sqlalchemy.orm import Session
+
+from open_webui.config import (
+    INGESTION_LEASE_TIMEOUT,
+    INGESTION_MAX_ATTEMPTS,
+    INGESTION_POLL_INTERVAL,
+    INGESTION_WORKER_CONCURRENCY,
+)
+from open_webui.env import INSTANCE_ID
+from open_webui.internal.db import SessionLocal
+from open_webui.models.files import FileModel, Files
+from open_webui.models.ingestion_jobs import IngestionJobModel, IngestionJobs
+from open_webui.models.users import Users
+from open_webui.socket.main import FILE_STATUS_EVENTS, publish_file_status
+
+log = logging.getLogger(__name__)
+meter = metrics.get_meter(__name__)
+
+ingestion_stage_duration = meter.create_histogram(
+    name="webui.ingestion.stage.duration",
+    description="Time spent in each document ingestion stage",
+    unit="s",
+)
+
+# INSTANCE_ID may be shared by the uvicorn workers of one instance
+INGESTION_WORKER_ID = f"{INSTANCE_ID}:{os.getpid()}"
+
+# Keep completed jobs (and their stage timings) around for a day
+COMPLETED_JOB_RETENTION = 24 * 60 * 60
+
+# Stage timings of the ingestion job running in the current context
+ingestion_timings: ContextVar[Optional[dict]] = ContextVar(
+    "ingestion_timings", default=None
+)
+
+# Set by the worker of this process so local uploads skip the poll interval
+_worker_wakeup: Optional[tuple[asyncio.AbstractEventLoop, asyncio.Event]] = None
+
+
+@contextmanager
+def ingestion_stage(stage: str):
+    """Time a processing stage (load, split, embed, ...) of the current file."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        ingestion_stage_duration.record(elapsed, {"stage": stage})
+
+        timings = ingestion_timings.get()
+        if timings is not None:
+            timings[stage] = round(timings.get(stage, 0) + elapsed, 3)
+
+
+def get_file_processing_status(file: FileModel, db: Optional[Session] = None) -> dict:
+    data = file.data or {}
+    result = {"status": data["status"]} if data.get("status") else {}
+
+    job = IngestionJobs.get_latest_job_by_file_id(file.id, db=db)
+    if job is not None and job.status in ("queued", "running"):
+        # Still in the ingestion queue, possibly waiting for a retry
+        result = {"status": "pending", "attempts": job.attempts}
+        if job.status == "queued":
+            result["queue_position"] = IngestionJobs.get_queue_position(job, db=db)
+    elif result.get("status") == "failed":
+        result["error"] = data.get("error")
+
+    return result
+
+
+def notify_file_status(file_id: str, db: Optional[Session] = None):
+    """Push the current processing status of a file to its subscribers."""
+    try:
+        file = Files.get_file_by_id(file_id, db=db)
+        if file is not None:
+            publish_file_status(
+                file.id, file.user_id, get_file_processing_status(file, db=db)
+            )
+    except Exception as e:
+        log.debug(f"Failed to publish status of file {file_id}: {e}")
+
+
+def enqueue_file(file_id: str, user_id: str, db: Optional[Session] = None):
+    """Queue an uploaded file for processing by an ingestion worker."""
+    job = IngestionJobs.insert_new_job(file_id, user_id, db=db)
+    notify_file_status(file_id, db=db)
+
+    if _worker_wakeup is not None:
+        loop, event = _worker_wakeup
+        try:
+            loop.call_soon_threadsafe(event.set)
+        except RuntimeError:
+            # Worker loop closed
+            pass
+    return job
+
+
+def get_retry_delay(attempts: int) -> int:
+    return min(10 * 2 ** max(attempts - 1, 0), 600)
+
+
+def _process_job(app: FastAPI, job: IngestionJobModel, timings: dict):
+    # Imported here, the routers import this module
+    from open_webui.routers.files import process_file_item
+    from open_webui.utils.reindex import (
+        delete_collection_if_exists,
+        get_background_request,
+    )
+
+    file = Files.get_file_by_id(job.file_id)
+    if file is None:
+        log.info(f"File {job.file_id} was deleted before it was processed")
+        return
+    notify_file_status(file.id)
+
+    if job.attempts > 1:
+        # An earlier attempt may have stored part of the file's chunks, and
+        # processing skips files whose collection already exists
+        delete_collection_if_exists(f"file-{file.id}")
+
+    user = Users.get_user_by_id(job.user_id)
+    if user is None:
+        raise ValueError(f"User {job.user_id} not found")
+
+    token = ingestion_timings.set(timings)
+    try:
+        with SessionLocal() as db:
+            process_file_item(get_background_request(app), file, user, db=db)
+    finally:
+        ingestion_timings.reset(token)
+
+
+async def heartbeat_ingestion_job(job_id: str):
+    while True:
+        await asyncio.sleep(max(INGESTION_LEASE_TIMEOUT / 3, 1))
+        try:
+            if not await asyncio.to_thread(
+                IngestionJobs.heartbeat_job, job_id, INGESTION_WORKER_ID
+            ):
+                return
+        except Exception as e:
+            log.error(f"Error updating ingestion job {job_id} heartbeat: {e}")
+
+
+async def process_ingestion_job(app: FastAPI, job: IngestionJobModel):
+    timings = {"queue": job.started_at - job.available_at}
+    log.info(
+        f"Processing file {job.file_id} (job {job.id}, attempt {job.attempts}/{INGESTION_MAX_ATTEMPTS})"
+    )
+
+    heartbeat = asyncio.create_task(heartbeat_ingestion_job(job.id))
+    try:
+        await run_in_threadpool(_process_job, app, job, timings)
+        if await asyncio.to_thread(
+            IngestionJobs.complete_job, job.id, INGESTION_WORKER_ID, timings
+        ):
+            # process_file published its status while the job was still running
+            await asyncio.to_thread(notify_file_status, job.file_id)
+        log.info(f"Processed file {job.file_id} in {timings}")
+    except Exception as e:
+        error = str(e.detail) if hasattr(e, "detail") else str(e)
+        log.error(f"Error processing file {job.file_id} (job {job.id}): {error}")
+
+        job = await asyncio.to_thread(
+            IngestionJobs.fail_job,
+            job.id,
+            INGESTION_WORKER_ID,
+            error,
+            INGESTION_MAX_ATTEMPTS,
+            get_retry_delay(job.attempts),
+            timings,
+        )
+        if job is not None:
+            await asyncio.to_thread(
+                Files.update_file_data_by_id,
+                job.file_id,
+                (
+                    {"status": "failed", "error": error}
+                    if job.status == "dead"
+                    else {"status": "pending", "error": None}
+                ),
+            )
+            await asyncio.to_thread(notify_file_status, job.file_id)
+    finally:
+        heartbeat.cancel()
+
+
+def release_stale_ingestion_jobs():
+    for job in IngestionJobs.requeue_stale_jobs(
+        INGESTION_LEASE_TIMEOUT, INGESTION_MAX_ATTEMPTS
+    ):
+        log.warning(f"Ingestion job {job.id} exhausted its attempts: {job.error}")
+        Files.update_file_data_by_id(
+            job.file_id, {"status": "failed", "error": job.error}
+        )
+        notify_file_status(job.file_id)
+    IngestionJobs.delete_completed_jobs(int(time.time()) - COMPLETED_JOB_RETENTION)
+
+
+async def run_ingestion_worker(app: FastAPI):
+    """
+    Process queued file uploads, at most INGESTION_WORKER_CONCURRENCY at a
+    time. Any number of workers, in the API processes or started with
+    `open-webui worker`, can share the queue.
+    """
+    global _worker_wakeup
+
+    FILE_STATUS_EVENTS.start()
+    wakeup = asyncio.Event()
+    _worker_wakeup = (asyncio.get_running_loop(), wakeup)
+    semaphore = asyncio.Semaphore(max(INGESTION_WORKER_CONCURRENCY, 1))
+    tasks: set[asyncio.Task] = set()
+    last_maintenance = 0.0
+
+    log.info(f"Ingestion worker {INGESTION_WORKER_ID} started")
+    while True:
+        await semaphore.acquire()
+        job = None
+        try:
+            if time.monotonic() - last_maintenance > INGESTION_LEASE_TIMEOUT / 2:
+                last_maintenance = time.monotonic()
+                await asyncio.to_thread(release_stale_ingestion_jobs)
+
+            wakeup.clear()
+            job = await asyncio.to_thread(
+                IngestionJobs.claim_next_job, INGESTION_WORKER_ID
+            )
+        except Exception as e:
+            log.error(f"Error claiming ingestion job: {e}")
+
+        if job is None:
+            semaphore.release()
+            try:
+                await asyncio.wait_for(wakeup.wait(), timeout=INGESTION_POLL_INTERVAL)
+            except asyncio.TimeoutError:
+                pass
+            continue
+
+        task = asyncio.create_task(process_ingestion_job(app, job))
+        tasks.add(task)
+        task.add_done_callback(tasks.discard)
+        task.add_done_callback(lambda _: semaphore.release())
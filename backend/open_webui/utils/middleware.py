@@ -32,6 +32,7 @@ from open_webui.models.users import Users
 from open_webui.socket.main import (
     get_event_call,
     get_event_emitter,
+    MESSAGE_EVENT_BUFFER,
 )
 from open_webui.routers.tasks import (
     generate_queries,
@@ -101,6 +102,7 @@ from open_webui.utils.tools import (
 )
 from open_webui.utils.plugin import load_function_module_by_id
 from open_webui.utils.filter import (
+    FilterPipeline,
     get_sorted_filter_ids,
     process_filter_functions,
 )
@@ -2245,6 +2247,11 @@ async def process_chat_response(
                                 }
                             )
 
+                            # Persist buffered events first, the final content wins
+                            await MESSAGE_EVENT_BUFFER.flush(
+                                metadata["chat_id"], metadata["message_id"]
+                            )
+
                             # Save message in the database
                             Chats.upsert_message_to_chat_by_id_and_message_id(
                                 metadata["chat_id"],
@@ -2881,6 +2888,13 @@ async def process_chat_response(
                     )
                     last_delta_data = None
 
+                    stream_filter_pipeline = FilterPipeline(
+                        request=request,
+                        filter_functions=filter_functions,
+                        filter_type="stream",
+                        extra_params={"__body__": form_data, **extra_params},
+                    )
+
                     async def flush_pending_delta_data(threshold: int = 0):
                         nonlocal delta_count
                         nonlocal last_delta_data
@@ -2917,13 +2931,7 @@ async def process_chat_response(
                         try:
                             data = json.loads(data)
 
-                            data, _ = await process_filter_functions(
-                                request=request,
-                                filter_functions=filter_functions,
-                                filter_type="stream",
-                                form_data=data,
-                                extra_params={"__body__": form_data, **extra_params},
-                            )
+                            data, _ = await stream_filter_pipeline.run(data)
 
                             if data:
                                 if "event" in data and not getattr(
@@ -3735,6 +3743,11 @@ async def process_chat_response(
                     "title": title,
                 }
 
+                # Persist buffered events first, the final content wins
+                await MESSAGE_EVENT_BUFFER.flush(
+                    metadata["chat_id"], metadata["message_id"]
+                )
+
                 if not ENABLE_REALTIME_CHAT_SAVE:
                     # Save message in the database
                     Chats.upsert_message_to_chat_by_id_and_message_id(
@@ -3774,6 +3787,10 @@ async def process_chat_response(
                 log.warning("Task was cancelled!")
                 await event_emitter({"type": "chat:tasks:cancel"})
 
+                await MESSAGE_EVENT_BUFFER.flush(
+                    metadata["chat_id"], metadata["message_id"]
+                )
+
                 if not ENABLE_REALTIME_CHAT_SAVE:
                     # Save message in the database
                     Chats.upsert_message_to_chat_by_id_and_message_id(
@@ -3792,30 +3809,25 @@ async def process_chat_response(
 
     else:
         # Fallback to the original response
+        stream_filter_pipeline = FilterPipeline(
+            request=request,
+            filter_functions=filter_functions,
+            filter_type="stream",
+            extra_params=extra_params,
+        )
+
         async def stream_wrapper(original_generator, events):
             def wrap_item(item):
                 return f"data: {item}\n\n"
 
             for event in events:
-                event, _ = await process_filter_functions(
-                    request=request,
-                    filter_functions=filter_functions,
-                    filter_type="stream",
-                    form_data=event,
-                    extra_params=extra_params,
-                )
+                event, _ = await stream_filter_pipeline.run(event)
 
                 if event:
                     yield wrap_item(json.dumps(event))
 
             async for data in original_generator:
-                data, _ = await process_filter_functions(
-                    request=request,
-                    filter_functions=filter_functions,
-                    filter_type="stream",
-                    form_data=data,
-                    extra_params=extra_params,
-                )
+                data, _ = await stream_filter_pipeline.run(data)
 
                 if data:
                     yield data
@@ -6,8 +6,9 @@ import uuid
 import logging
 from datetime import timedelta
 from pathlib import Path
-from typing import Callable, Optional, Sequence, Union
+from typing import Callable, Iterable, Iterator, Optional, Sequence, Union
 import json
+import zipfile
 import aiohttp
 import mimeparse
 
@@ -797,3 +798,44 @@ def stream_chunks_handler(stream: aiohttp.StreamReader):
             yield b"\n"
 
     return yield_safe_stream_chunks()
+
+
+class _ZipStreamBuffer:
+    """
+    Write-only file object for zipfile. It has no tell() or seek(), so
+    zipfile writes a data descriptor after each entry instead of seeking back.
+    """
+
+    def __init__(self):
+        self.chunks = []
+
+    def write(self, data) -> int:
+        self.chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self) -> bytes:
+        data = b"".join(self.chunks)
+        self.chunks.clear()
+        return data
+
+
+def stream_zip(entries: Iterable[tuple[str, Union[str, bytes]]]) -> Iterator[bytes]:
+    """
+    Yield a deflated zip archive of (filename, content) entries, entry by entry,
+    so memory use stays at about one entry regardless of the archive size.
+
+    :param entries: An iterable of filename and content pairs, consumed lazily.
+    :return: A generator of zip archive bytes.
+    """
+    buffer = _ZipStreamBuffer()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as zf:
+        for filename, content in entries:
+            zf.writestr(filename, content)
+            if data := buffer.drain():
+                yield data
+
+    # Central directory, written when the archive is closed
+    yield buffer.drain()
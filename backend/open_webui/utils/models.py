@@ -1,12 +1,16 @@
 import time
+import json
+import hashlib
 import logging
 import asyncio
 import sys
+from typing import Optional
 
 from aiocache import cached
 from fastapi import Request
 
 from open_webui.socket.utils import RedisDict
+from open_webui.utils.redis import get_redis_connection, get_sentinels_from_env
 from open_webui.routers import openai, ollama, responses, anthropic, gemini
 from open_webui.functions import get_function_models
 
@@ -28,7 +32,16 @@ from open_webui.config import (
     DEFAULT_ARENA_MODEL,
 )
 
-from open_webui.env import BYPASS_MODEL_ACCESS_CONTROL, GLOBAL_LOG_LEVEL
+from open_webui.env import (
+    BYPASS_MODEL_ACCESS_CONTROL,
+    GLOBAL_LOG_LEVEL,
+    REDIS_KEY_PREFIX,
+    WEBSOCKET_MANAGER,
+    WEBSOCKET_REDIS_CLUSTER,
+    WEBSOCKET_REDIS_URL,
+    WEBSOCKET_SENTINEL_HOSTS,
+    WEBSOCKET_SENTINEL_PORT,
+)
 from open_webui.models.users import UserModel
 
 
@@ -163,118 +176,148 @@ async def get_all_base_models(request: Request, user: UserModel = None):
     )
 
 
-async def get_all_models(request, refresh: bool = False, user: UserModel = None):
-    if (
-        request.app.state.MODELS
-        and request.app.state.BASE_MODELS
-        and (request.app.state.config.ENABLE_BASE_MODELS_CACHE and not refresh)
-    ):
-        base_models = request.app.state.BASE_MODELS
+def get_arena_models(request) -> list[dict]:
+    if not request.app.state.config.ENABLE_EVALUATION_ARENA_MODELS:
+        return []
+
+    if len(request.app.state.config.EVALUATION_ARENA_MODELS) > 0:
+        return [
+            {
+                "id": model["id"],
+                "name": model["name"],
+                "info": {
+                    "meta": model["meta"],
+                },
+                "object": "model",
+                "created": int(time.time()),
+                "owned_by": "arena",
+                "arena": True,
+            }
+            for model in request.app.state.config.EVALUATION_ARENA_MODELS
+        ]
     else:
-        base_models = await get_all_base_models(request, user=user)
-        request.app.state.BASE_MODELS = base_models
+        # Add default arena model
+        return [
+            {
+                "id": DEFAULT_ARENA_MODEL["id"],
+                "name": DEFAULT_ARENA_MODEL["name"],
+                "info": {
+                    "meta": DEFAULT_ARENA_MODEL["meta"],
+                },
+                "object": "model",
+                "created": int(time.time()),
+                "owned_by": "arena",
+                "arena": True,
+            }
+        ]
 
-    # deep copy the base models to avoid modifying the original list
-    models = [model.copy() for model in base_models]
 
-    # If there are no models, return an empty list
-    if len(models) == 0:
-        return []
+# Process action_ids to get the actions
+def get_action_items_from_module(function, module):
+    actions = []
+    if hasattr(module, "actions"):
+        actions = module.actions
+        return [
+            {
+                "id": f"{function.id}.{action['id']}",
+                "name": action.get("name", f"{function.name} ({action['id']})"),
+                "description": function.meta.description,
+                "icon": action.get(
+                    "icon_url",
+                    function.meta.manifest.get("icon_url", None)
+                    or getattr(module, "icon_url", None)
+                    or getattr(module, "icon", None),
+                ),
+            }
+            for action in actions
+        ]
+    else:
+        return [
+            {
+                "id": function.id,
+                "name": function.name,
+                "description": function.meta.description,
+                "icon": function.meta.manifest.get("icon_url", None)
+                or getattr(module, "icon_url", None)
+                or getattr(module, "icon", None),
+            }
+        ]
 
-    # Add arena models
-    if request.app.state.config.ENABLE_EVALUATION_ARENA_MODELS:
-        arena_models = []
-        if len(request.app.state.config.EVALUATION_ARENA_MODELS) > 0:
-            arena_models = [
-                {
-                    "id": model["id"],
-                    "name": model["name"],
-                    "info": {
-                        "meta": model["meta"],
-                    },
-                    "object": "model",
-                    "created": int(time.time()),
-                    "owned_by": "arena",
-                    "arena": True,
-                }
-                for model in request.app.state.config.EVALUATION_ARENA_MODELS
-            ]
-        else:
-            # Add default arena model
-            arena_models = [
-                {
-                    "id": DEFAULT_ARENA_MODEL["id"],
-                    "name": DEFAULT_ARENA_MODEL["name"],
-                    "info": {
-                        "meta": DEFAULT_ARENA_MODEL["meta"],
-                    },
-                    "object": "model",
-                    "created": int(time.time()),
-                    "owned_by": "arena",
-                    "arena": True,
-                }
-            ]
-        models = models + arena_models
 
-    global_action_ids = [
-        function.id for function in Functions.get_global_action_functions()
-    ]
-    enabled_action_ids = [
-        function.id
-        for function in Functions.get_functions_by_type("action", active_only=True)
+# Process filter_ids to get the filters
+def get_filter_items_from_module(function, module):
+    return [
+        {
+            "id": function.id,
+            "name": function.name,
+            "description": function.meta.description,
+            "icon": function.meta.manifest.get("icon_url", None)
+            or getattr(module, "icon_url", None)
+            or getattr(module, "icon", None),
+            "has_user_valves": hasattr(module, "UserValves"),
+        }
     ]
 
-    global_filter_ids = [
-        function.id for function in Functions.get_global_filter_functions()
-    ]
-    enabled_filter_ids = [
-        function.id
-        for function in Functions.get_functions_by_type("filter", active_only=True)
-    ]
+
+def build_models(request, base_models: list[dict]) -> list[dict]:
+    """
+    Assemble the model list: base models, arena models, custom models
+    (overrides of base models and presets) and their actions and filters.
+    """
+    # copy the base models to avoid modifying the original list
+    models = [model.copy() for model in base_models]
+    models = models + get_arena_models(request)
+
+    # Models by id, and by id without the Ollama tag, in list order
+    models_by_id = {}
+    models_by_key = {}
+    removed = set()
+
+    def index_model(model):
+        models_by_id.setdefault(model["id"], []).append(model)
+        for key in dict.fromkeys([model["id"], model["id"].split(":")[0]]):
+            models_by_key.setdefault(key, []).append(model)
+
+    for model in models:
+        index_model(model)
 
     custom_models = Models.get_all_models()
     for custom_model in custom_models:
         if custom_model.base_model_id is None:
             # Applied directly to a base model
-            for model in models:
-                if (
-                    custom_model.id == model["id"]
-                    or (
-                        model.get("owned_by") == "ollama"
-                        and custom_model.id
-                        == model["id"].split(":")[
-                            0
-                        ]  # Ollama may return model ids in different formats (e.g., 'llama3' vs. 'llama3:7b')
-                    )
-                ):
-                    if custom_model.is_active:
-                        model["name"] = custom_model.name
-                        model["info"] = custom_model.model_dump()
-
-                        # Set action_ids and filter_ids
-                        action_ids = []
-                        filter_ids = []
-
-                        if "info" in model:
-                            if "meta" in model["info"]:
-                                action_ids.extend(
-                                    model["info"]["meta"].get("actionIds", [])
-                                )
-                                filter_ids.extend(
-                                    model["info"]["meta"].get("filterIds", [])
-                                )
-
-                            if "params" in model["info"]:
-                                # Remove params to avoid exposing sensitive info
-                                del model["info"]["params"]
-
-                        model["action_ids"] = action_ids
-                        model["filter_ids"] = filter_ids
-                    else:
-                        models.remove(model)
-
-        elif custom_model.is_active and (
-            custom_model.id not in [model["id"] for model in models]
+            # Ollama may return model ids in different formats (e.g., 'llama3' vs. 'llama3:7b')
+            matches = [
+                model
+                for model in models_by_key.get(custom_model.id, [])
+                if id(model) not in removed
+                and (
+                    custom_model.id == model["id"] or model.get("owned_by") == "ollama"
+                )
+            ]
+            for model in matches:
+                if custom_model.is_active:
+                    model["name"] = custom_model.name
+                    model["info"] = custom_model.model_dump()
+
+                    # Set action_ids and filter_ids
+                    action_ids = []
+                    filter_ids = []
+
+                    if "meta" in model["info"]:
+                        action_ids.extend(model["info"]["meta"].get("actionIds", []))
+                        filter_ids.extend(model["info"]["meta"].get("filterIds", []))
+
+                    if "params" in model["info"]:
+                        # Remove params to avoid exposing sensitive info
+                        del model["info"]["params"]
+
+                    model["action_ids"] = action_ids
+                    model["filter_ids"] = filter_ids
+                else:
+                    removed.add(id(model))
+
+        elif custom_model.is_active and not any(
+            id(model) not in removed for model in models_by_id.get(custom_model.id, [])
         ):
             # Custom model based on a base model
             owned_by = "openai"
@@ -282,17 +325,20 @@ async def get_all_models(request, refresh: bool = False, user: UserModel = None)
 
             pipe = None
 
-            for m in models:
-                if (
-                    custom_model.base_model_id == m["id"]
-                    or custom_model.base_model_id == m["id"].split(":")[0]
-                ):
-                    owned_by = m.get("owned_by", "unknown")
-                    if "pipe" in m:
-                        pipe = m["pipe"]
+            base_model = next(
+                (
+                    m
+                    for m in models_by_key.get(custom_model.base_model_id, [])
+                    if id(m) not in removed
+                ),
+                None,
+            )
+            if base_model is not None:
+                owned_by = base_model.get("owned_by", "unknown")
+                if "pipe" in base_model:
+                    pipe = base_model["pipe"]
 
-                    connection_type = m.get("connection_type", None)
-                    break
+                connection_type = base_model.get("connection_type", None)
 
             model = {
                 "id": f"{custom_model.id}",
@@ -328,55 +374,51 @@ async def get_all_models(request, refresh: bool = False, user: UserModel = None)
             model["filter_ids"] = filter_ids
 
             models.append(model)
+            index_model(model)
+
+    models = [model for model in models if id(model) not in removed]
+
+    functions = {
+        function.id: function
+        for function in Functions.get_functions(active_only=True)
+        if function.type in ("action", "filter")
+    }
+    enabled_action_ids = {
+        function.id for function in functions.values() if function.type == "action"
+    }
+    enabled_filter_ids = {
+        function.id for function in functions.values() if function.type == "filter"
+    }
+    global_action_ids = [
+        function.id
+        for function in functions.values()
+        if function.type == "action" and function.is_global
+    ]
+    global_filter_ids = [
+        function.id
+        for function in functions.values()
+        if function.type == "filter" and function.is_global
+    ]
 
-    # Process action_ids to get the actions
-    def get_action_items_from_module(function, module):
-        actions = []
-        if hasattr(module, "actions"):
-            actions = module.actions
-            return [
-                {
-                    "id": f"{function.id}.{action['id']}",
-                    "name": action.get("name", f"{function.name} ({action['id']})"),
-                    "description": function.meta.description,
-                    "icon": action.get(
-                        "icon_url",
-                        function.meta.manifest.get("icon_url", None)
-                        or getattr(module, "icon_url", None)
-                        or getattr(module, "icon", None),
-                    ),
-                }
-                for action in actions
-            ]
-        else:
-            return [
-                {
-                    "id": function.id,
-                    "name": function.name,
-                    "description": function.meta.description,
-                    "icon": function.meta.manifest.get("icon_url", None)
-                    or getattr(module, "icon_url", None)
-                    or getattr(module, "icon", None),
-                }
-            ]
+    # Each function module is loaded once, however many models use it
+    function_items = {}
 
-    # Process filter_ids to get the filters
-    def get_filter_items_from_module(function, module):
-        return [
-            {
-                "id": function.id,
-                "name": function.name,
-                "description": function.meta.description,
-                "icon": function.meta.manifest.get("icon_url", None)
-                or getattr(module, "icon_url", None)
-                or getattr(module, "icon", None),
-                "has_user_valves": hasattr(module, "UserValves"),
-            }
-        ]
+    def get_function_items(function_id):
+        if function_id not in function_items:
+            function = functions[function_id]
+            function_module, _, _ = get_function_module_from_cache(request, function_id)
 
-    def get_function_module_by_id(function_id):
-        function_module, _, _ = get_function_module_from_cache(request, function_id)
-        return function_module
+            if function.type == "action":
+                function_items[function_id] = get_action_items_from_module(
+                    function, function_module
+                )
+            elif getattr(function_module, "toggle", None):
+                function_items[function_id] = get_filter_items_from_module(
+                    function, function_module
+                )
+            else:
+                function_items[function_id] = []
+        return function_items[function_id]
 
     for model in models:
         action_ids = [
@@ -392,37 +434,147 @@ async def get_all_models(request, refresh: bool = False, user: UserModel = None)
 
         model["actions"] = []
         for action_id in action_ids:
-            action_function = Functions.get_function_by_id(action_id)
-            if action_function is None:
-                raise Exception(f"Action not found: {action_id}")
-
-            function_module = get_function_module_by_id(action_id)
-            model["actions"].extend(
-                get_action_items_from_module(action_function, function_module)
-            )
+            model["actions"].extend(get_function_items(action_id))
 
         model["filters"] = []
         for filter_id in filter_ids:
-            filter_function = Functions.get_function_by_id(filter_id)
-            if filter_function is None:
-                raise Exception(f"Filter not found: {filter_id}")
+            model["filters"].extend(get_function_items(filter_id))
+
+    return models
 
-            function_module = get_function_module_by_id(filter_id)
 
-            if getattr(function_module, "toggle", None):
-                model["filters"].extend(
-                    get_filter_items_from_module(filter_function, function_module)
-                )
+class ModelRegistry:
+    """
+    The assembled model list, kept in memory until something it is built
+    from changes: the base models, the arena settings, or a model or
+    function (signalled with `invalidate`).
 
-    log.debug(f"get_all_models() returned {len(models)} models")
+    Invalidations bump a version counter, in Redis when available so every
+    node rebuilds its registry on the next request.
+    """
 
-    models_dict = {model["id"]: model for model in models}
-    if isinstance(request.app.state.MODELS, RedisDict):
-        request.app.state.MODELS.set(models_dict)
+    def __init__(
+        self,
+        version_key: str = f"{REDIS_KEY_PREFIX}:models:version",
+        redis_url: Optional[str] = None,
+        redis_sentinels=[],
+        redis_cluster=False,
+    ):
+        self.version_key = version_key
+        self.redis = (
+            get_redis_connection(
+                redis_url,
+                redis_sentinels,
+                redis_cluster=redis_cluster,
+                decode_responses=True,
+            )
+            if redis_url
+            else None
+        )
+
+        self._local_version = 0
+        self._key = None
+        self._base_models = None
+        self._base_models_hash = None
+        self._models: Optional[list[dict]] = None
+
+    def get_version(self):
+        if self.redis is not None:
+            try:
+                return self.redis.get(self.version_key)
+            except Exception as e:
+                log.warning(f"Failed to read model registry version: {e}")
+                # Unknown version, rebuild
+                return object()
+        return self._local_version
+
+    def invalidate(self):
+        self._local_version += 1
+        self._models = None
+        if self.redis is not None:
+            try:
+                self.redis.incr(self.version_key)
+            except Exception as e:
+                log.warning(f"Failed to update model registry version: {e}")
+
+    def get_key(self, request, base_models: list[dict]) -> tuple:
+        """
+        Everything the models are built from. Compute it before building and
+        pass it to set_models, so an invalidation during the build is not
+        stamped onto the stale models.
+        """
+        return (
+            self.get_version(),
+            self._get_base_models_hash(base_models),
+            request.app.state.config.ENABLE_EVALUATION_ARENA_MODELS,
+            json.dumps(
+                request.app.state.config.EVALUATION_ARENA_MODELS, sort_keys=True
+            ),
+        )
+
+    def get_models(self, key: tuple) -> Optional[list[dict]]:
+        """Returns the models if they are up to date, else None."""
+        if self._models is not None and self._key == key:
+            return self._models
+        return None
+
+    def set_models(self, key: tuple, models: list[dict]):
+        self._key = key
+        self._models = models
+
+    def _get_base_models_hash(self, base_models: list[dict]) -> str:
+        # Base models are refetched into a new list on every request unless
+        # ENABLE_BASE_MODELS_CACHE is set, compare their content instead
+        if self._base_models is base_models:
+            return self._base_models_hash
+
+        base_models_hash = hashlib.sha256(
+            json.dumps(base_models, sort_keys=True, default=str).encode()
+        ).hexdigest()
+        self._base_models = base_models
+        self._base_models_hash = base_models_hash
+        return base_models_hash
+
+
+MODEL_REGISTRY = ModelRegistry(
+    redis_url=WEBSOCKET_REDIS_URL if WEBSOCKET_MANAGER == "redis" else None,
+    redis_sentinels=get_sentinels_from_env(
+        WEBSOCKET_SENTINEL_HOSTS, WEBSOCKET_SENTINEL_PORT
+    ),
+    redis_cluster=WEBSOCKET_REDIS_CLUSTER,
+)
+
+
+async def get_all_models(request, refresh: bool = False, user: UserModel = None):
+    if (
+        request.app.state.MODELS
+        and request.app.state.BASE_MODELS
+        and (request.app.state.config.ENABLE_BASE_MODELS_CACHE and not refresh)
+    ):
+        base_models = request.app.state.BASE_MODELS
     else:
-        request.app.state.MODELS = models_dict
+        base_models = await get_all_base_models(request, user=user)
+        request.app.state.BASE_MODELS = base_models
 
-    return models
+    # If there are no models, return an empty list
+    if len(base_models) == 0:
+        return []
+
+    key = MODEL_REGISTRY.get_key(request, base_models)
+    models = MODEL_REGISTRY.get_models(key)
+    if models is None:
+        models = build_models(request, base_models)
+        MODEL_REGISTRY.set_models(key, models)
+        log.debug(f"get_all_models() rebuilt {len(models)} models")
+
+        models_dict = {model["id"]: model for model in models}
+        if isinstance(request.app.state.MODELS, RedisDict):
+            request.app.state.MODELS.set(models_dict)
+        else:
+            request.app.state.MODELS = models_dict
+
+    # Callers may modify the returned models, not the registry's
+    return [model.copy() for model in models]
 
 
 def check_model_access(user, model, db=None):
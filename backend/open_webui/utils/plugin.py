@@ -298,6 +298,10 @@ def load_function_module_by_id(function_id: str, content: str | None = None):
         del sys.modules[module_name]
 
         Functions.update_function_by_id(function_id, {"is_active": False})
+        # Imported here, utils.models depends on this module
+        from open_webui.utils.models import MODEL_REGISTRY
+
+        MODEL_REGISTRY.invalidate()
         raise e
     finally:
         os.unlink(temp_file.name)
@@ -0,0 +1,308 @@
+import asyncio
+import logging
+import os
+import uuid
+
+from fastapi import FastAPI, Request
+from fastapi.concurrency import run_in_threadpool
+from starlette.datastructures import Headers
+
+from open_webui.config import RAG_REINDEX_CONCURRENCY, RAG_REINDEX_LEASE_TIMEOUT
+from open_webui.constants import ERROR_MESSAGES
+from open_webui.env import INSTANCE_ID
+from open_webui.models.files import Files
+from open_webui.models.reindex_jobs import ReindexJobs, ReindexJobKnowledgeModel
+from open_webui.models.users import UserModel, Users
+from open_webui.retrieval.vector.factory import VECTOR_DB_CLIENT
+from open_webui.retrieval.vector.main import VectorDBBase
+from open_webui.routers.retrieval import add_file_to_collection
+
+log = logging.getLogger(__name__)
+
+# INSTANCE_ID may be shared by the uvicorn workers of one instance
+REINDEX_WORKER_ID = f"{INSTANCE_ID}:{os.getpid()}"
+
+# Reindex jobs run by this worker
+reindex_tasks: dict[str, asyncio.Task] = {}
+
+
+def supports_vector_copy() -> bool:
+    """Whether the vector DB can return stored vectors, see VectorDBBase.query_with_vectors."""
+    method = getattr(VECTOR_DB_CLIENT.query_with_vectors, "__func__", None)
+    return method is not None and method is not VectorDBBase.query_with_vectors
+
+
+def get_shadow_collection_name(knowledge_id: str, job_id: str) -> str:
+    return f"{knowledge_id}-reindex-{job_id[:8]}"
+
+
+def get_background_request(app: FastAPI) -> Request:
+    # Request handlers called from background jobs only use request.app
+    return Request(
+        {
+            "type": "http",
+            "asgi.version": "3.0",
+            "asgi.spec_version": "2.0",
+            "method": "POST",
+            "path": "/internal/reindex",
+            "query_string": b"",
+            "headers": Headers({}).raw,
+            "client": ("127.0.0.1", 12345),
+            "server": ("127.0.0.1", 80),
+            "scheme": "http",
+            "app": app,
+        }
+    )
+
+
+def delete_collection_if_exists(collection_name: str):
+    if VECTOR_DB_CLIENT.has_collection(collection_name=collection_name):
+        VECTOR_DB_CLIENT.delete_collection(collection_name=collection_name)
+
+
+def delete_file_chunks(collection_name: str, file_id: str):
+    if VECTOR_DB_CLIENT.has_collection(collection_name=collection_name):
+        VECTOR_DB_CLIENT.delete(
+            collection_name=collection_name, filter={"file_id": file_id}
+        )
+
+
+def swap_shadow_collection(job_id: str, knowledge_id: str, shadow_collection_name: str):
+    """
+    Replace the live chunks of the files reindexed by this job with the chunks
+    built in the shadow collection. New chunks are inserted before the old
+    ones are deleted, so the knowledge base stays searchable throughout. Only
+    chunks of the job's completed files are replaced; chunks of failed files,
+    of files added while the job ran and without a file_id are kept. Safe to
+    run again after an interruption.
+    """
+    if not VECTOR_DB_CLIENT.has_collection(collection_name=shadow_collection_name):
+        # Nothing was reindexed, or an earlier swap already finished
+        return
+
+    files = ReindexJobs.get_files_by_job_id_and_knowledge_id(
+        job_id, knowledge_id, status="completed"
+    )
+    completed_file_ids = {file.file_id for file in files}
+
+    stale_ids = []
+    if VECTOR_DB_CLIENT.has_collection(collection_name=knowledge_id):
+        existing = VECTOR_DB_CLIENT.get(collection_name=knowledge_id)
+        if existing is not None and existing.ids:
+            stale_ids = [
+                id
+                for id, metadata in zip(existing.ids[0], existing.metadatas[0])
+                if (metadata or {}).get("file_id") in completed_file_ids
+            ]
+
+    for file in files:
+        result = VECTOR_DB_CLIENT.query_with_vectors(
+            collection_name=shadow_collection_name, filter={"file_id": file.file_id}
+        )
+        if result is None or not result.ids or not result.ids[0]:
+            continue
+
+        VECTOR_DB_CLIENT.insert(
+            collection_name=knowledge_id,
+            items=[
+                {
+                    "id": str(uuid.uuid4()),
+                    "text": result.documents[0][idx],
+                    "vector": result.vectors[0][idx],
+                    "metadata": result.metadatas[0][idx],
+                }
+                for idx in range(len(result.ids[0]))
+            ],
+        )
+
+    if stale_ids:
+        VECTOR_DB_CLIENT.delete(collection_name=knowledge_id, ids=stale_ids)
+    VECTOR_DB_CLIENT.delete_collection(collection_name=shadow_collection_name)
+
+
+async def reindex_file(
+    request: Request,
+    job_id: str,
+    knowledge_id: str,
+    file_id: str,
+    collection_name: str,
+    user: UserModel,
+    semaphore: asyncio.Semaphore,
+):
+    async with semaphore:
+        ReindexJobs.update_file_status(job_id, knowledge_id, file_id, "running")
+        try:
+            file = Files.get_file_by_id(file_id)
+            if file is None:
+                raise ValueError(ERROR_MESSAGES.NOT_FOUND)
+
+            if collection_name == knowledge_id:
+                # Rebuilt in place, replace this file's chunks only so the
+                # rest of the knowledge base stays searchable
+                await run_in_threadpool(delete_file_chunks, collection_name, file_id)
+
+            if not await run_in_threadpool(
+                add_file_to_collection, request, file, collection_name, user
+            ):
+                raise ValueError("Error saving document to vector database")
+
+            ReindexJobs.update_file_status(job_id, knowledge_id, file_id, "completed")
+        except Exception as e:
+            log.error(
+                f"Error reindexing file {file_id} in knowledge base {knowledge_id}: {e}"
+            )
+            ReindexJobs.update_file_status(
+                job_id, knowledge_id, file_id, "failed", error=str(e)
+            )
+
+
+async def reindex_knowledge(
+    request: Request,
+    job_id: str,
+    knowledge: ReindexJobKnowledgeModel,
+    user: UserModel,
+    semaphore: asyncio.Semaphore,
+):
+    knowledge_id = knowledge.knowledge_id
+    status = knowledge.status
+    shadow_collection_name = knowledge.shadow_collection_name
+
+    try:
+        if status == "pending":
+            # Without vector copy the chunks cannot be moved out of a shadow
+            # collection, files are then reindexed in place one by one
+            if supports_vector_copy():
+                shadow_collection_name = get_shadow_collection_name(
+                    knowledge_id, job_id
+                )
+                await run_in_threadpool(
+                    delete_collection_if_exists, shadow_collection_name
+                )
+
+            status = "building"
+            ReindexJobs.update_knowledge_status(
+                job_id,
+                knowledge_id,
+                status,
+                shadow_collection_name=shadow_collection_name,
+            )
+
+        if status == "building":
+            files = ReindexJobs.get_files_by_job_id_and_knowledge_id(
+                job_id, knowledge_id, status="pending"
+            )
+            await asyncio.gather(
+                *[
+                    reindex_file(
+                        request,
+                        job_id,
+                        knowledge_id,
+                        file.file_id,
+                        shadow_collection_name or knowledge_id,
+                        user,
+                        semaphore,
+                    )
+                    for file in files
+                ]
+            )
+
+            status = "swapping"
+            ReindexJobs.update_knowledge_status(job_id, knowledge_id, status)
+
+        if shadow_collection_name:
+            await run_in_threadpool(
+                swap_shadow_collection, job_id, knowledge_id, shadow_collection_name
+            )
+
+        ReindexJobs.update_knowledge_status(job_id, knowledge_id, "completed")
+    except Exception as e:
+        log.exception(f"Error reindexing knowledge base {knowledge_id}: {e}")
+        ReindexJobs.update_knowledge_status(job_id, knowledge_id, "failed")
+
+
+async def heartbeat_reindex_job(job_id: str, task: asyncio.Task):
+    while True:
+        await asyncio.sleep(max(RAG_REINDEX_LEASE_TIMEOUT / 3, 1))
+        try:
+            alive = await asyncio.to_thread(
+                ReindexJobs.heartbeat_job, job_id, REINDEX_WORKER_ID
+            )
+        except Exception as e:
+            log.error(f"Error updating reindex job {job_id} heartbeat: {e}")
+            continue
+
+        if not alive:
+            # Cancelled, or taken over by another worker
+            task.cancel()
+            return
+
+
+async def run_reindex_job(app: FastAPI, job_id: str):
+    if not ReindexJobs.claim_job(job_id, REINDEX_WORKER_ID, RAG_REINDEX_LEASE_TIMEOUT):
+        return
+
+    job = ReindexJobs.get_job_by_id(job_id)
+    user = Users.get_user_by_id(job.user_id)
+    request = get_background_request(app)
+
+    log.info(f"Running reindex job {job_id}")
+    heartbeat = asyncio.create_task(
+        heartbeat_reindex_job(job_id, asyncio.current_task())
+    )
+    try:
+        semaphore = asyncio.Semaphore(max(RAG_REINDEX_CONCURRENCY, 1))
+        await asyncio.gather(
+            *[
+                reindex_knowledge(request, job_id, knowledge, user, semaphore)
+                for knowledge in ReindexJobs.get_knowledge_by_job_id(job_id)
+                if knowledge.status not in ("completed", "failed")
+            ]
+        )
+        ReindexJobs.update_job_status_by_id(job_id, "completed")
+        log.info(f"Reindex job {job_id} completed")
+    except asyncio.CancelledError:
+        job = ReindexJobs.get_job_by_id(job_id)
+        if job is not None and job.status == "cancelled":
+            for knowledge in ReindexJobs.get_knowledge_by_job_id(job_id):
+                if knowledge.shadow_collection_name and knowledge.status not in (
+                    "completed",
+                    "failed",
+                ):
+                    await run_in_threadpool(
+                        delete_collection_if_exists, knowledge.shadow_collection_name
+                    )
+        log.info(f"Reindex job {job_id} stopped")
+        raise
+    finally:
+        heartbeat.cancel()
+
+
+def start_reindex_job(app: FastAPI, job_id: str):
+    task = reindex_tasks.get(job_id)
+    if task is not None and not task.done():
+        return
+
+    task = asyncio.create_task(run_reindex_job(app, job_id))
+    reindex_tasks[job_id] = task
+    task.add_done_callback(lambda _: reindex_tasks.pop(job_id, None))
+
+
+def cancel_reindex_job(job_id: str):
+    ReindexJobs.update_job_status_by_id(job_id, "cancelled")
+
+    # Workers running the job elsewhere stop at their next heartbeat
+    task = reindex_tasks.get(job_id)
+    if task is not None:
+        task.cancel()
+
+
+async def periodic_reindex_job_resume(app: FastAPI):
+    """Resume unfinished reindex jobs whose worker stopped sending heartbeats."""
+    while True:
+        try:
+            for job in ReindexJobs.get_resumable_jobs(RAG_REINDEX_LEASE_TIMEOUT):
+                log.info(f"Resuming reindex job {job.id}")
+                start_reindex_job(app, job.id)
+        except Exception as e:
+            log.error(f"Error resuming reindex jobs: {e}")
+        await asyncio.sleep(RAG_REINDEX_LEASE_TIMEOUT)
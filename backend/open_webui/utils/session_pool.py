@@ -0,0 +1,130 @@
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+from urllib.parse import urlparse
+
+import aiohttp
+
+from open_webui.env import (
+    AIOHTTP_CLIENT_POOL_LIMIT,
+    AIOHTTP_CLIENT_POOL_LIMIT_PER_HOST,
+    AIOHTTP_CLIENT_POOL_KEEPALIVE_TIMEOUT,
+    AIOHTTP_CLIENT_POOL_DNS_CACHE_TTL,
+)
+
+log = logging.getLogger(__name__)
+
+
+class ClientSessionPool:
+    """
+    App-lifetime aiohttp sessions, one per upstream origin (scheme://host:port)
+    and event loop, so requests to the same provider reuse keep-alive
+    connections instead of paying a TCP + TLS handshake each time.
+
+    Sessions are created lazily and closed in the app lifespan. Callers must
+    not close them: release responses instead so the connection goes back to
+    the pool. Sessions use a DummyCookieJar so cookies set by one upstream
+    response never leak into another user's request.
+    """
+
+    def __init__(
+        self,
+        limit: int = 0,
+        limit_per_host: int = 0,
+        keepalive_timeout: float = 30.0,
+        ttl_dns_cache: int = 300,
+    ):
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.keepalive_timeout = keepalive_timeout
+        self.ttl_dns_cache = ttl_dns_cache
+
+        self._sessions: dict[
+            tuple[int, str], tuple[asyncio.AbstractEventLoop, aiohttp.ClientSession]
+        ] = {}
+
+    @staticmethod
+    def _get_origin(url: str) -> str:
+        parsed = urlparse(url)
+        return f"{parsed.scheme}://{parsed.netloc}".lower()
+
+    def _prune_closed_loops(self):
+        for key, (loop, session) in list(self._sessions.items()):
+            if loop.is_closed() or session.closed:
+                del self._sessions[key]
+
+    async def get_session(self, url: str) -> aiohttp.ClientSession:
+        loop = asyncio.get_running_loop()
+        key = (id(loop), self._get_origin(url))
+
+        entry = self._sessions.get(key)
+        if entry is not None and entry[0] is loop and not entry[1].closed:
+            return entry[1]
+
+        self._prune_closed_loops()
+
+        connector = aiohttp.TCPConnector(
+            limit=self.limit,
+            limit_per_host=self.limit_per_host,
+            keepalive_timeout=self.keepalive_timeout,
+            ttl_dns_cache=self.ttl_dns_cache,
+            use_dns_cache=True,
+        )
+        session = aiohttp.ClientSession(
+            connector=connector,
+            cookie_jar=aiohttp.DummyCookieJar(),
+            trust_env=True,
+        )
+        self._sessions[key] = (loop, session)
+        return session
+
+    @asynccontextmanager
+    async def session(self, url: str) -> AsyncIterator[aiohttp.ClientSession]:
+        """Drop-in for `async with aiohttp.ClientSession() as session` that keeps the session open."""
+        yield await self.get_session(url)
+
+    async def close(self):
+        loop = asyncio.get_running_loop()
+        for key, (session_loop, session) in list(self._sessions.items()):
+            if session_loop is loop and not session.closed:
+                try:
+                    await session.close()
+                except Exception as e:
+                    log.debug(f"Error closing client session: {e}")
+            del self._sessions[key]
+
+    def get_stats(self) -> dict:
+        stats = {}
+        for (_, origin), (_, session) in self._sessions.items():
+            connector = session.connector
+            if connector is None or session.closed:
+                continue
+
+            entry = stats.setdefault(
+                origin,
+                {
+                    "limit": connector.limit,
+                    "limit_per_host": connector.limit_per_host,
+                    "in_use": 0,
+                    "idle": 0,
+                },
+            )
+            # aiohttp does not expose these counters publicly
+            entry["in_use"] += len(getattr(connector, "_acquired", ()))
+            entry["idle"] += sum(
+                len(conns) for conns in getattr(connector, "_conns", {}).values()
+            )
+        return stats
+
+
+CLIENT_SESSION_POOL = ClientSessionPool(
+    limit=AIOHTTP_CLIENT_POOL_LIMIT,
+    limit_per_host=AIOHTTP_CLIENT_POOL_LIMIT_PER_HOST,
+    keepalive_timeout=AIOHTTP_CLIENT_POOL_KEEPALIVE_TIMEOUT,
+    ttl_dns_cache=AIOHTTP_CLIENT_POOL_DNS_CACHE_TTL,
+)
+
+
+async def get_client_session(url: str) -> aiohttp.ClientSession:
+    return await CLIENT_SESSION_POOL.get_session(url)
@@ -8,6 +8,12 @@ Metrics collected:
 
 * http.server.requests (counter)
 * http.server.duration (histogram, milliseconds)
+* webui.chat.message_events.flush.duration (histogram, milliseconds)
+* webui.http_client.connections.in_use (gauge, per upstream origin)
+* webui.http_client.connections.idle (gauge, per upstream origin)
+* webui.rag.embedding_cache.hits (counter)
+* webui.rag.embedding_cache.misses (counter)
+* webui.ingestion.stage.duration (histogram, per stage)
 
 Attributes used: http.method, http.route, http.status_code
 
@@ -36,6 +42,7 @@ from opentelemetry.sdk.metrics.export import (
     PeriodicExportingMetricReader,
 )
 from opentelemetry.sdk.resources import Resource
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 from open_webui.env import (
     OTEL_SERVICE_NAME,
@@ -46,6 +53,7 @@ from open_webui.env import (
     OTEL_METRICS_EXPORTER_OTLP_INSECURE,
 )
 from open_webui.models.users import Users
+from open_webui.utils.session_pool import CLIENT_SESSION_POOL
 
 _EXPORT_INTERVAL_MILLIS = 10_000  # 10 seconds
 
@@ -101,6 +109,27 @@ def _build_meter_provider(resource: Resource) -> MeterProvider:
         View(
             instrument_name="webui.users.active.today",
         ),
+        View(
+            instrument_name="webui.chat.message_events.flush.duration",
+        ),
+        View(
+            instrument_name="webui.http_client.connections.in_use",
+            attribute_keys=["origin"],
+        ),
+        View(
+            instrument_name="webui.http_client.connections.idle",
+            attribute_keys=["origin"],
+        ),
+        View(
+            instrument_name="webui.rag.embedding_cache.hits",
+        ),
+        View(
+            instrument_name="webui.rag.embedding_cache.misses",
+        ),
+        View(
+            instrument_name="webui.ingestion.stage.duration",
+            attribute_keys=["stage"],
+        ),
     ]
 
     provider = MeterProvider(
@@ -111,6 +140,62 @@ def _build_meter_provider(resource: Resource) -> MeterProvider:
     return provider
 
 
+class MetricsMiddleware:
+    """
+    Pure ASGI middleware recording request count and duration per route.
+    The duration runs until the response starts, streamed bodies excluded.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        request_counter: metrics.Counter,
+        duration_histogram: metrics.Histogram,
+    ):
+        self.app = app
+        self.request_counter = request_counter
+        self.duration_histogram = duration_histogram
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start_time = time.perf_counter()
+        recorded = False
+
+        def record(status_code: int):
+            nonlocal recorded
+            if recorded:
+                return
+            recorded = True
+            elapsed_ms = (time.perf_counter() - start_time) * 1000.0
+
+            # Route template e.g. "/items/{item_id}" instead of real path.
+            route = scope.get("route")
+            route_path = getattr(route, "path", None) or Request(scope).url.path
+
+            attrs: Dict[str, str | int] = {
+                "http.method": scope["method"],
+                "http.route": route_path,
+                "http.status_code": status_code,
+            }
+
+            self.request_counter.add(1, attrs)
+            self.duration_histogram.record(elapsed_ms, attrs)
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                record(message["status"])
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        except Exception:
+            record(500)
+            raise
+
+
 def setup_metrics(app: FastAPI, resource: Resource) -> None:
     """Attach OTel metrics middleware to *app* and initialise provider."""
 
@@ -176,31 +261,33 @@ def setup_metrics(app: FastAPI, resource: Resource) -> None:
         callbacks=[observe_users_active_today],
     )
 
-    # FastAPI middleware
-    @app.middleware("http")
-    async def _metrics_middleware(request: Request, call_next):
-        start_time = time.perf_counter()
+    def observe_http_client_connections(field: str):
+        def callback(
+            options: metrics.CallbackOptions,
+        ) -> Sequence[metrics.Observation]:
+            return [
+                metrics.Observation(value=stats[field], attributes={"origin": origin})
+                for origin, stats in CLIENT_SESSION_POOL.get_stats().items()
+            ]
 
-        status_code = None
-        try:
-            response = await call_next(request)
-            status_code = getattr(response, "status_code", 500)
-            return response
-        except Exception:
-            status_code = 500
-            raise
-        finally:
-            elapsed_ms = (time.perf_counter() - start_time) * 1000.0
+        return callback
 
-            # Route template e.g. "/items/{item_id}" instead of real path.
-            route = request.scope.get("route")
-            route_path = getattr(route, "path", request.url.path)
+    meter.create_observable_gauge(
+        name="webui.http_client.connections.in_use",
+        description="Pooled upstream connections currently serving a request",
+        unit="connections",
+        callbacks=[observe_http_client_connections("in_use")],
+    )
 
-            attrs: Dict[str, str | int] = {
-                "http.method": request.method,
-                "http.route": route_path,
-                "http.status_code": status_code,
-            }
+    meter.create_observable_gauge(
+        name="webui.http_client.connections.idle",
+        description="Pooled upstream connections kept alive for reuse",
+        unit="connections",
+        callbacks=[observe_http_client_connections("idle")],
+    )
 
-            request_counter.add(1, attrs)
-            duration_histogram.record(elapsed_ms, attrs)
+    app.add_middleware(
+        MetricsMiddleware,
+        request_counter=request_counter,
+        duration_histogram=duration_histogram,
+    )
@@ -35,6 +35,7 @@ from langchain_core.utils.function_calling import (
 
 
 from open_webui.utils.misc import is_string_allowed
+from open_webui.utils.session_pool import CLIENT_SESSION_POOL
 from open_webui.models.tools import Tools
 from open_webui.models.users import UserModel
 from open_webui.models.groups import Groups
@@ -397,9 +398,8 @@ def get_builtin_tools(
 
     # Helper to get model capabilities (defaults to True if not specified)
     def get_model_capability(name: str, default: bool = True) -> bool:
-        return (
-            (model.get("info", {}).get("meta", {}).get("capabilities") or {})
-            .get(name, default)
+        return (model.get("info", {}).get("meta", {}).get("capabilities") or {}).get(
+            name, default
         )
 
     # Helper to check if a builtin tool category is enabled via meta.builtinTools
@@ -472,13 +472,17 @@ def get_builtin_tools(
         builtin_functions.append(execute_code)
 
     # Notes tools - search, view, create, and update user's notes (if builtin category enabled AND notes enabled globally)
-    if is_builtin_tool_enabled("notes") and getattr(request.app.state.config, "ENABLE_NOTES", False):
+    if is_builtin_tool_enabled("notes") and getattr(
+        request.app.state.config, "ENABLE_NOTES", False
+    ):
         builtin_functions.extend(
             [search_notes, view_note, write_note, replace_note_content]
         )
 
     # Channels tools - search channels and messages (if builtin category enabled AND channels enabled globally)
-    if is_builtin_tool_enabled("channels") and getattr(request.app.state.config, "ENABLE_CHANNELS", False):
+    if is_builtin_tool_enabled("channels") and getattr(
+        request.app.state.config, "ENABLE_CHANNELS", False
+    ):
         builtin_functions.extend(
             [
                 search_channels,
@@ -794,9 +798,12 @@ async def get_tool_server_data(url: str, headers: Optional[dict]) -> Dict[str, A
     error = None
     try:
         timeout = aiohttp.ClientTimeout(total=AIOHTTP_CLIENT_TIMEOUT_TOOL_SERVER_DATA)
-        async with aiohttp.ClientSession(timeout=timeout, trust_env=True) as session:
+        async with CLIENT_SESSION_POOL.session(url) as session:
             async with session.get(
-                url, headers=_headers, ssl=AIOHTTP_CLIENT_SESSION_TOOL_SERVER_SSL
+                url,
+                headers=_headers,
+                timeout=timeout,
+                ssl=AIOHTTP_CLIENT_SESSION_TOOL_SERVER_SSL,
             ) as response:
                 if response.status != 200:
                     error_body = await response.json()
@@ -991,9 +998,8 @@ async def execute_tool_server(
             if params:
                 body_params = params
 
-        async with aiohttp.ClientSession(
-            trust_env=True, timeout=aiohttp.ClientTimeout(total=AIOHTTP_CLIENT_TIMEOUT)
-        ) as session:
+        timeout = aiohttp.ClientTimeout(total=AIOHTTP_CLIENT_TIMEOUT)
+        async with CLIENT_SESSION_POOL.session(final_url) as session:
             request_method = getattr(session, http_method.lower())
 
             if http_method in ["post", "put", "patch", "delete"]:
@@ -1002,6 +1008,7 @@ async def execute_tool_server(
                     json=body_params,
                     headers=headers,
                     cookies=cookies,
+                    timeout=timeout,
                     ssl=AIOHTTP_CLIENT_SESSION_TOOL_SERVER_SSL,
                     allow_redirects=False,
                 ) as response:
@@ -1021,6 +1028,7 @@ async def execute_tool_server(
                     final_url,
                     headers=headers,
                     cookies=cookies,
+                    timeout=timeout,
                     ssl=AIOHTTP_CLIENT_SESSION_TOOL_SERVER_SSL,
                     allow_redirects=False,
                 ) as response:
@@ -90,7 +90,8 @@ export class SocketIOCollaborationProvider {
 			document_id: this.documentId,
 			user_id: this.user?.id,
 			user_name: this.user?.name,
-			user_color: userColor
+			user_color: userColor,
+			state_vector: Array.from(Y.encodeStateVector(this.doc))
 		});
 
 		// Set user awareness info
@@ -123,7 +124,13 @@ export class SocketIOCollaborationProvider {
 					if (data.state) {
 						const state = new Uint8Array(data.state);
 
-						if (state.length === 2 && state[0] === 0 && state[1] === 0) {
+						// The state only holds what this client is missing, so check
+						// the server state vector to tell whether the document is empty
+						const isEmptyState = data.state_vector
+							? data.state_vector.length === 1 && data.state_vector[0] === 0
+							: state.length === 2 && state[0] === 0 && state[1] === 0;
+
+						if (isEmptyState) {
 							// Empty state, check if we have content to initialize
 							// check if editor empty as well
 							// const editor = await getEditorInstance();
@@ -170,7 +177,8 @@ export class SocketIOCollaborationProvider {
 
 					this.synced = false;
 					this.socket.emit('ydoc:document:state', {
-						document_id: this.documentId
+						document_id: this.documentId,
+						state_vector: Array.from(Y.encodeStateVector(this.doc))
 					});
 				}
 			}